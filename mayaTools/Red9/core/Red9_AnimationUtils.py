@@ -72,14 +72,19 @@ from __future__ import print_function
 
 import maya.cmds as cmds
 import maya.mel as mel
+import maya.OpenMaya as OpenMaya
+import maya.OpenMayaAnim as OpenMayaAnim
 
 import Red9.startup.setup as r9Setup
 import Red9_CoreUtils as r9Core
 import Red9_General as r9General
 import Red9_PoseSaver as r9Pose
+import Red9_PoseIndex as r9PoseIndex
+import Red9_CurveEngine as r9CurveEngine
 import Red9_Meta as r9Meta
 
 from functools import partial
+from array import array
 import os
 import random
 import sys
@@ -508,6 +513,138 @@ def animCurve_get_bounds(curve, bounds_only=False, skip_static=True):
             return [minV[0], maxV[0]]
     return bounds
 
+def animCurve_get_keys(curve, time=(), selected=False):
+    '''
+    bulk read of an animCurve's keys, one query for the lot
+
+    :param curve: the anim curve to read
+    :param time: timeRange to read, default () is all keys
+    :param selected: only read the selected keys
+    :return: (times, values)
+    '''
+    kws = {'q': True, 'timeChange': True, 'valueChange': True}
+    if selected:
+        kws['sl'] = True
+    elif time:
+        kws['time'] = time
+    keyList = cmds.keyframe(curve, **kws) or []
+    return keyList[0::2], keyList[1::2]
+
+def animCurve_evaluate(curve, times):
+    '''
+    evaluate an animCurve at the given times through the API, rather than going
+    back to the plug a frame at a time. Values are returned in UI units to match
+    cmds.keyframe
+
+    :param curve: a time input animCurve
+    :param times: frames to evaluate at
+    '''
+    mSel = OpenMaya.MSelectionList()
+    mSel.add(curve)
+    mObj = OpenMaya.MObject()
+    mSel.getDependNode(0, mObj)
+    mFnCurve = OpenMayaAnim.MFnAnimCurve(mObj)
+    curveType = mFnCurve.animCurveType()
+    convert = None
+    if curveType == OpenMayaAnim.MFnAnimCurve.kAnimCurveTA:
+        unit = OpenMaya.MAngle.uiUnit()
+        convert = lambda v: OpenMaya.MAngle(v).asUnits(unit)
+    elif curveType == OpenMayaAnim.MFnAnimCurve.kAnimCurveTL:
+        unit = OpenMaya.MDistance.uiUnit()
+        convert = lambda v: OpenMaya.MDistance(v).asUnits(unit)
+    timeUnit = OpenMaya.MTime.uiUnit()
+    values = [mFnCurve.evaluate(OpenMaya.MTime(t, timeUnit)) for t in times]
+    if convert:
+        values = [convert(v) for v in values]
+    return values
+
+def animCurve_set_keys(curve, times, values=None, replaceRange=None):
+    '''
+    bulk, undoable write of keys back to an animCurve. Keys missing at the given
+    times are inserted in one call, then the times and values are pushed straight
+    into the curve's keyTimeValue array, one setAttr per run of contiguous keys.
+    Inserted keys get the default tangent types, existing keys keep theirs.
+
+    :param curve: the anim curve to edit
+    :param times: key times to write, sorted
+    :param values: key values, if None the keys are left as they are and only
+        the replaceRange clean up is run
+    :param replaceRange: (start, end), keys inside this range that aren't in times
+        are removed, so the curve ends up with exactly the keys given
+    '''
+    timeKey = r9CurveEngine.timeKey
+    existing = cmds.keyframe(curve, q=True, timeChange=True) or []
+    newKeys = set([timeKey(t) for t in times])
+    if replaceRange:
+        start = replaceRange[0] - r9CurveEngine.TIME_TOLERANCE
+        end = replaceRange[1] + r9CurveEngine.TIME_TOLERANCE
+        remove = [t for t in existing if start <= t <= end and timeKey(t) not in newKeys]
+        if remove:
+            cmds.cutKey(curve, time=[(t, t) for t in remove], clear=True)
+    if values is None:
+        return
+    existingKeys = set([timeKey(t) for t in existing])
+    missing = [t for t in times if timeKey(t) not in existingKeys]
+    # tangent types of the keys we're about to write, so they can be put back
+    # once the values have moved
+    tangents = {}
+    written = [(t, t) for t in existing if timeKey(t) in newKeys]
+    if written:
+        for t, itt, ott in zip(cmds.keyframe(curve, q=True, time=written, timeChange=True) or [],
+                               cmds.keyTangent(curve, q=True, time=written, itt=True) or [],
+                               cmds.keyTangent(curve, q=True, time=written, ott=True) or []):
+            if 'fixed' not in (itt, ott):
+                tangents.setdefault((itt, ott), []).append((t, t))
+    if missing:
+        cmds.setKeyframe(curve, insert=True, time=missing)
+        existing = cmds.keyframe(curve, q=True, timeChange=True) or []
+    elif replaceRange:
+        existing = cmds.keyframe(curve, q=True, timeChange=True) or []
+
+    indexes = dict([(timeKey(t), i) for i, t in enumerate(existing)])
+    keys = sorted([(indexes[timeKey(t)], t, v) for t, v in zip(times, values) if timeKey(t) in indexes])
+    run = []
+    for key in keys + [None]:
+        if run and (key is None or key[0] != run[-1][0] + 1):
+            flat = []
+            for _, t, v in run:
+                flat.extend((t, v))
+            cmds.setAttr('%s.ktv[%i:%i]' % (curve, run[0][0], run[-1][0]), *flat)
+            run = []
+        if key:
+            run.append(key)
+
+    # inserted keys come in fixed with the slopes of the old curve, give them the
+    # user's default tangents. A fixed default is solved as spline first so the
+    # slopes fit the new values
+    if missing:
+        itt = cmds.keyTangent(q=True, g=True, itt=True)[0]
+        ott = cmds.keyTangent(q=True, g=True, ott=True)[0]
+        if 'fixed' in (itt, ott):
+            cmds.keyTangent(curve, time=[(t, t) for t in missing], itt='spline', ott='spline')
+        tangents.setdefault((itt, ott), []).extend([(t, t) for t in missing])
+    for (itt, ott), keyTimes in tangents.items():
+        cmds.keyTangent(curve, time=keyTimes, itt=itt, ott=ott)
+
+def animCurves_preview_subset(curves, selected=False, limit=None):
+    '''
+    evenly spaced subset of the curves to process while an interactive slider
+    is being dragged, capped at r9CurveEngine.RED9_CURVE_PREVIEW_KEYS keys in total
+
+    :param curves: anim curves
+    :param selected: count only the selected keys
+    :param limit: override the key limit
+    '''
+    if limit is None:
+        limit = r9CurveEngine.RED9_CURVE_PREVIEW_KEYS
+    sizes = []
+    for curve in curves:
+        count = 0
+        if selected:
+            count = cmds.keyframe(curve, q=True, sl=True, keyframeCount=True)
+        sizes.append(count or cmds.keyframe(curve, q=True, keyframeCount=True))
+    return r9CurveEngine.decimate(curves, sizes, limit)
+
 def animRangeFromNodes(nodes, setTimeline=True, decimals=-1, transforms_only=False, skip_static=True, bounds_only=True):
     '''
     return the extent of the animation range for the given objects
@@ -774,6 +911,7 @@ class AnimationUI(object):
         self.poseGridMode = 'thumb'  # or text
         self.poseRootMode = 'RootNode'  # or MetaRig
         self.poses = None
+        self.poseIndex = None  # r9PoseIndex.PoseIndex for the current pose root
         self.poseButtonBGC = [0.27, 0.3, 0.3]
         self.poseButtonHighLight = r9Setup.red9ButtonBGC('green')
         self.poseProjectMute = False  # whether to disable the save and update funcs in Project mode
@@ -1938,27 +2076,33 @@ class AnimationUI(object):
             raise StandardError('No Pose Selected in the UI')
         return self.poseSelected
 
+    def getPoseIndex(self):
+        '''
+        the persistent pose index for the current pose root, the local or project root path
+        if the posePath is under it so subFolders share the one index, else the posePath itself
+        '''
+        if self.posePathMode == 'projectPoseMode':
+            root = self.posePathProject
+        else:
+            root = self.posePathLocal
+        posePath = os.path.normpath(self.posePath)
+        if not root or not (posePath == os.path.normpath(root) or posePath.startswith(os.path.normpath(root) + os.sep)):
+            root = self.posePath
+        self.poseIndex = r9PoseIndex.getIndex(root)
+        return self.poseIndex
+
     def buildPoseList(self, sortBy='name'):
         '''
         Get a list of poses from the PoseRootDir, this allows us to
-        filter much faster as it stops all the os calls, cached list instead
+        filter much faster as it stops all the os calls, cached list instead.
+        The list comes from the pose index which is only incrementally updated
+        from the folders that have changed since the last refresh
         '''
         self.poses = []
         if not os.path.exists(self.posePath):
             log.debug('posePath is invalid')
             return self.poses
-        files = os.listdir(self.posePath)
-        if files:
-            if sortBy == 'name':
-                files = r9Core.sortNumerically(files)
-                # files.sort()
-            elif sortBy == 'date':
-                files.sort(key=lambda x: os.stat(os.path.join(self.posePath, x)).st_mtime)
-                files.reverse()
-
-            for f in files:
-                if f.lower().endswith('.pose'):
-                    self.poses.append(f.split('.pose')[0])
+        self.poses = self.getPoseIndex().getPoses(self.posePath, sortBy=sortBy)
         return self.poses
 
     def buildFilteredPoseList(self, searchFilter):
@@ -2119,7 +2263,8 @@ class AnimationUI(object):
             log.warning('No current PosePath set')
             return
 
-        dirs = [subdir for subdir in os.listdir(basePath) if os.path.isdir(os.path.join(basePath, subdir))]
+        rootFolder = r9PoseIndex.getIndex(basePath).folders.get('') or {}
+        dirs = sorted([subdir.split('/')[-1] for subdir in rootFolder.get('subFolders', [])])
         if not dirs:
             log.warning('Folder has no subFolders for pose scanning')
         for subdir in dirs:
@@ -2207,7 +2352,7 @@ class AnimationUI(object):
             if searchFilter:
                 cmds.scrollLayout(self.uiglPoseScroll, edit=True, sp='up')
 
-            for pose in r9Core.filterListByString(self.poses, searchFilter, matchcase=False) or []:  # self.buildFilteredPoseList(searchFilter):
+            for pose in self.__uiCB_filterPoses(searchFilter):
                 cmds.textScrollList(self.uitslPoses, edit=True,
                                         append=pose,
                                         sc=partial(self.setPoseSelected))
@@ -2227,12 +2372,17 @@ class AnimationUI(object):
             except StandardError, error:
                 print(error)
 
-            for pose in r9Core.filterListByString(self.poses, searchFilter, matchcase=False) or []:  # self.buildFilteredPoseList(searchFilter):
+            for pose in self.__uiCB_filterPoses(searchFilter):
+                thumb = None
+                if self.poseIndex:
+                    thumb = self.poseIndex.getThumbPath(pose, self.posePath)
+                if not thumb:
+                    thumb = os.path.join(self.posePath, '%s.bmp' % pose)
                 try:
                     # :NOTE we prefix the buttons to get over the issue of non-numeric
                     # first characters which are stripped my Maya!
                     cmds.iconTextCheckBox('_%s' % pose, style='iconAndTextVertical',
-                                            image=os.path.join(self.posePath, '%s.bmp' % pose),
+                                            image=thumb,
                                             label=pose,
                                             bgc=self.poseButtonBGC,
                                             parent=self.uiglPoses,
@@ -2249,6 +2399,15 @@ class AnimationUI(object):
         # Finally Bind the Popup-menu
         cmds.evalDeferred(self.__uiCB_PosePopup)
 
+    def __uiCB_filterPoses(self, searchFilter):
+        '''
+        filter the pose list, via the index when we have one so the
+        search also matches the pose tags and folder tokens
+        '''
+        if self.poseIndex and self.poses:
+            return self.poseIndex.filterPoses(self.poses, searchFilter, self.posePath)
+        return r9Core.filterListByString(self.poses or [], searchFilter, matchcase=False) or []
+
     def __uiCB_fill_mRigsPopup(self, *args):
         '''
         Fill the Pose root mRig popup menu
@@ -2602,6 +2761,7 @@ class AnimationUI(object):
             except:
                 log.error('Unable to delete the Pose Icon file')
         r9General.thumbNailScreen(thumbPath, 128, 128)
+        r9PoseIndex.updateFile(self.getPosePath())
         if sel:
             cmds.select(sel)
         self.__uiCB_fillPoses()
@@ -3012,6 +3172,7 @@ class AnimationUI(object):
                                                       useFilter=poseHierarchy,
                                                       storeThumbnail=storeThumbnail)
         log.info('Pose Stored to : %s' % path)
+        r9PoseIndex.updateFile(path)  # updated poses don't change the folder mtime
         self.__uiCB_fillPoses(rebuildFileList=True)
 
     def __PoseLoad(self):
@@ -4099,6 +4260,7 @@ class RandomizeKeys(object):
         self.contextManager = curveModifierContext
         self.dragActive = False
         self.toggledState = False
+        self.seed = random.random()  # fixed for an interactive session so dragging only scales the noise
 
         # catch the current state of the GrapthEditor so that the toggle respects it
         self.displayTangents = cmds.animCurveEditor('graphEditor1GraphEd', q=True, displayTangents=True)
@@ -4166,7 +4328,8 @@ class RandomizeKeys(object):
                                     pre=2,
                                     value=0,
                                     columnWidth=[(1, 40), (2, 100)],
-                                    dc=self.interactiveWrapper)
+                                    dc=partial(self.interactiveWrapper, True),
+                                    cc=partial(self.interactiveWrapper, False))
             cmds.floatField('ffg_rand_intMax', v=1, precision=2, cc=self.__uicb_setRanges)
             cmds.text(label=LANGUAGE_MAP._Generic_.max)
             cmds.setParent('..')
@@ -4224,6 +4387,8 @@ class RandomizeKeys(object):
                 cmds.checkBox('interactiveRand', e=True, v=False)
                 log.warning('Interactive is ONLY supported in "CurrentKeys" Mode')
                 return
+            self.seed = random.random()
+            self.dragActive = False
             cmds.floatFieldGrp('ffg_rand_damping', e=True, en=False)
             cmds.rowColumnLayout('interactiveLayout', e=True, en=True)
         else:
@@ -4264,25 +4429,32 @@ class RandomizeKeys(object):
         self.__uicb_currentKeysCallback()
         self.__uicb_percentageCallback()
 
-    def __calcualteRangeValue(self, keyValues):
-        vals = sorted(keyValues)
-        rng = abs(vals[0] - vals[-1]) / 2
-        if rng > 1.0:
-            return [-rng, rng]
-        else:
-            return [-1, 1]
+    def interactiveWrapper(self, preview=False, *args):
+        '''
+        slider callback, while dragging (preview) only an evenly spaced subset of the
+        selected curves is processed, see animCurves_preview_subset. On release the
+        preview is undone and the full selection processed with the same noise seed
 
-    def interactiveWrapper(self, *args):
+        :param preview: process the preview subset only
+        '''
+        curves = cmds.keyframe(q=True, sl=True, n=True)
+        if not curves:
+            return
         with self.contextManager(self.dragActive, undoFuncCache=['interactiveWrapper']):
             self.dragActive = True
-            self.addNoise(cmds.keyframe(q=True, sl=True, n=True), time=(), step=1,
+            if preview:
+                curves = animCurves_preview_subset(curves, selected=True)
+            self.addNoise(curves, time=(), step=1,
                           currentKeys=True,
                           damp=cmds.floatSliderGrp('fsg_randfloatValue', q=True, v=True),
-                          percent=cmds.checkBox('cb_rand_percent', q=True, v=True))
+                          percent=cmds.checkBox('cb_rand_percent', q=True, v=True),
+                          seed=self.seed)
 
-    def addNoise(self, curves, time=(), step=1, currentKeys=True, randomRange=[-1, 1], damp=1, percent=False, keepKeys=False):
+    def addNoise(self, curves, time=(), step=1, currentKeys=True, randomRange=[-1, 1], damp=1, percent=False, keepKeys=False, seed=None):
         '''
         Simple noise function designed to add noise to keyframed animation data.
+        Each curve is read in one bulk query, the noise run over the whole value
+        array in r9CurveEngine and the result written back in one bulk edit.
 
         :param curves: Maya animCurves to process
         :param time: timeRange to process
@@ -4290,49 +4462,44 @@ class RandomizeKeys(object):
         :param currentKeys: ONLY randomize keys that already exists
         :param randomRange: range [upper, lower] bounds passed to teh randomizer
         :param damp: damping passed into the randomizer
+        :param percent: damp is a percentage of each curve's value range
         :param keepkeys: if True maintain current keys
+        :param seed: seed for the noise, the same seed gives the same noise per curve
         '''
-        keyTimes = []
         if percent:
-            damp = damp / 100
-        if currentKeys:
-            for curve in curves:
+            damp = damp / 100.0
+        if not currentKeys and not time:
+            selectedKeyTimes = sorted(list(set(cmds.keyframe(q=True, tc=True))))
+            if selectedKeyTimes:
+                time = (selectedKeyTimes[0], selectedKeyTimes[-1])
+
+        for curve in curves:
+            curveSeed = None
+            if seed is not None:
+                curveSeed = '%s:%s' % (seed, curve)
+            if currentKeys:
                 # if keys/curves are already selected, process those only
-                selectedKeys = cmds.keyframe(curve, q=True, vc=True, tc=True, sl=True)
-                if selectedKeys:
-                    keyData = selectedKeys
-                else:
+                times, values = animCurve_get_keys(curve, selected=True)
+                if not times:
                     # else process all keys inside the time
-                    keyData = cmds.keyframe(curve, q=True, vc=True, tc=True, t=time)
-                for t, v in zip(keyData[::2], keyData[1::2]):
-                    if percent:
-                        # figure the upper and lower value bounds
-                        randomRange = self.__calcualteRangeValue(keyData[1::2])
-                        log.debug('Percent data : randomRange=%f>%f, percentage=%f' % (randomRange[0], randomRange[1], damp))
-                    value = self.noiseFunc(v, randomRange, damp)
-                    cmds.setKeyframe(curve, v=value, t=t)
-        else:  # allow to ADD keys at 'step' frms
-            if not time:
-                selectedKeyTimes = sorted(list(set(cmds.keyframe(q=True, tc=True))))
-                if selectedKeyTimes:
-                    time = (selectedKeyTimes[0], selectedKeyTimes[-1])
-            for curve in curves:
+                    times, values = animCurve_get_keys(curve, time=time)
+                if not times:
+                    continue
+                if percent:
+                    # figure the upper and lower value bounds
+                    randomRange = r9CurveEngine.valueRange(values)
+            else:  # allow to ADD keys at 'step' frms
+                times = r9CurveEngine.sampleTimes(time[0], time[1], step)
                 if keepKeys:
-                    keyTimes = cmds.keyframe(curve, q=True)
+                    keyTimes = set([r9CurveEngine.timeKey(t) for t in cmds.keyframe(curve, q=True) or []])
+                    times = [t for t in times if r9CurveEngine.timeKey(t) not in keyTimes]
                 if percent:
                     # figure the upper and lower value bounds
-                    randomRange = self.__calcualteRangeValue(cmds.keyframe(curve, q=True, vc=True, t=time))
-                    log.debug('Percent data : randomRange=%f>%f, percentage=%f' % (randomRange[0], randomRange[1], damp))
-
-                connection = [con for con in cmds.listConnections(curve, source=False, d=True, p=True)
-                              if not cmds.nodeType(con) == 'hyperLayout'][0]
-
-                for t in timeLineRangeProcess(time[0], time[1], step, incEnds=True):
-                    if keepKeys:
-                        if t in keyTimes:
-                            continue
-                    value = self.noiseFunc(cmds.getAttr(connection, t=t), randomRange, damp)
-                    cmds.setKeyframe(connection, v=value, t=t)
+                    randomRange = r9CurveEngine.valueRange(animCurve_get_keys(curve, time=time)[1])
+                values = animCurve_evaluate(curve, times)
+            if percent:
+                log.debug('Percent data : randomRange=%f>%f, percentage=%f' % (randomRange[0], randomRange[1], damp))
+            animCurve_set_keys(curve, times, r9CurveEngine.noise(values, randomRange, damp, seed=curveSeed))
 
     def curveMenuFunc(self, *args):
         self.__storePrefs()
@@ -4373,10 +4540,11 @@ class FilterCurves(object):
         self.win = LANGUAGE_MAP._CurveFilters_.title
         self.contextManager = curveModifierContext
         self.dragActive = False
-        self.undoFuncCache = ['simplifyWrapper', 'snapAnimCurvesToFrms', 'resampleCurves']
+        self.undoFuncCache = ['simplifyWrapper', 'snapAnimCurvesToFrms', 'resampleCurves', 'smoothCurves']
         self.undoDepth = 1
         self.snapToFrame = False
         self.toggledState = False
+        self.lastFilter = None  # the filter the current drag is replacing
 
         # cache the current state of the GrapthEditor so that the toggle respects it
         self.displayTangents = cmds.animCurveEditor('graphEditor1GraphEd', q=True, displayTangents=True)
@@ -4417,8 +4585,8 @@ class FilterCurves(object):
                                 pre=1,
                                 value=1,
                                 columnWidth=[(1, 80), (2, 50), (3, 100)],
-                                dc=self.resampleCurves)
-                                # cc=self.snapAnimCurvesToFrms)  #set the dragActive state back to false on release
+                                dc=partial(self.resampleCurves, True),
+                                cc=partial(self.resampleCurves, False))
         cmds.floatField('stepRange', v=10, pre=2,
                         cc=self.__uicb_setMaxRanges,
                         dc=self.__uicb_setMaxRanges)
@@ -4436,8 +4604,8 @@ class FilterCurves(object):
                                 pre=2,
                                 value=0,
                                 columnWidth=[(1, 80), (2, 50), (3, 50)],
-                                dc=self.simplifyWrapper,
-                                cc=self.snapAnimCurvesToFrms)
+                                dc=partial(self.simplifyWrapper, True),
+                                cc=partial(self.simplifyWrapper, False))
         cmds.floatField('timeRange', v=10, pre=2,
                         cc=self.__uicb_setMaxRanges,
                         dc=self.__uicb_setMaxRanges)
@@ -4449,8 +4617,8 @@ class FilterCurves(object):
                                 pre=2,
                                 value=0,
                                 columnWidth=[(1, 80), (2, 50), (3, 50)],
-                                dc=self.simplifyWrapper,
-                                cc=self.snapAnimCurvesToFrms)
+                                dc=partial(self.simplifyWrapper, True),
+                                cc=partial(self.simplifyWrapper, False))
         cmds.floatField('valueRange', v=1, pre=2,
                         cc=self.__uicb_setMaxRanges,
                         dc=self.__uicb_setMaxRanges)
@@ -4466,7 +4634,33 @@ class FilterCurves(object):
                     command='import maya.cmds as cmds;cmds.delete(sc=True)')
         cmds.button(label=LANGUAGE_MAP._CurveFilters_.single_process,
                     ann=LANGUAGE_MAP._CurveFilters_.single_process_ann,
-                    command=self.simplifyWrapper)
+                    command=partial(self.simplifyWrapper, False))
+        cmds.setParent('..')
+        cmds.separator(h=25, style='in')
+
+        cmds.text(label=LANGUAGE_MAP._CurveFilters_.curve_smoother)
+        cmds.separator(h=5, style='none')
+        cmds.rowColumnLayout(numberOfColumns=2, cw=((1, 350), (2, 40)))
+        cmds.floatSliderGrp('fsg_smoothStrength',
+                                label=LANGUAGE_MAP._CurveFilters_.smooth_strength,
+                                ann=LANGUAGE_MAP._CurveFilters_.smooth_strength_ann,
+                                field=True,
+                                minValue=0,
+                                maxValue=10.0,
+                                pre=2,
+                                value=0,
+                                columnWidth=[(1, 80), (2, 50), (3, 50)],
+                                dc=partial(self.smoothCurves, True),
+                                cc=partial(self.smoothCurves, False))
+        cmds.floatField('smoothRange', v=10, pre=2,
+                        cc=self.__uicb_setMaxRanges,
+                        dc=self.__uicb_setMaxRanges)
+        cmds.setParent('..')
+        cmds.rowColumnLayout(numberOfColumns=1, cw=(1, 350))
+        cmds.optionMenu('om_smoothMethod', label=LANGUAGE_MAP._CurveFilters_.smooth_method,
+                        ann=LANGUAGE_MAP._CurveFilters_.smooth_method_ann)
+        cmds.menuItem(label='gaussian')
+        cmds.menuItem(label='butterworth')
         cmds.setParent('..')
 
         cmds.separator(h=20, style="in")
@@ -4483,7 +4677,7 @@ class FilterCurves(object):
                                  h=22, w=220)
         cmds.separator(h=20, style="none")
         cmds.showWindow(self.win)
-        cmds.window(self.win, e=True, widthHeight=(410, 300))
+        cmds.window(self.win, e=True, widthHeight=(410, 380))
 
         # set close event to restore standard GraphEditor curve status
         cmds.scriptJob(runOnce=True, uiDeleted=[self.win, lambda *x:animCurveDrawStyle(style='full', forceBuffer=False,
@@ -4495,11 +4689,13 @@ class FilterCurves(object):
         cmds.floatSliderGrp('fsg_filtertimeValue', e=True, maxValue=cmds.floatField("timeRange", q=True, v=True))
         cmds.floatSliderGrp('fsg_filterfloatValue', e=True, maxValue=cmds.floatField("valueRange", q=True, v=True))
         cmds.floatSliderGrp('fsg_resampleStep', e=True, maxValue=cmds.floatField("stepRange", q=True, v=True))
+        cmds.floatSliderGrp('fsg_smoothStrength', e=True, maxValue=cmds.floatField("smoothRange", q=True, v=True))
 
     def __uicb_resetSliders(self, *args):
         cmds.floatSliderGrp('fsg_filtertimeValue', e=True, v=0)
         cmds.floatSliderGrp('fsg_filterfloatValue', e=True, v=0)
         cmds.floatSliderGrp('fsg_resampleStep', e=True, v=1)
+        cmds.floatSliderGrp('fsg_smoothStrength', e=True, v=0)
         self.contextManager(self.dragActive,
                             undoFuncCache=self.undoFuncCache,
                             undoDepth=self.undoDepth).undoCall()
@@ -4530,58 +4726,463 @@ class FilterCurves(object):
                                 e=True,
                                 pre=0)
             self.snapToFrame = True
-            self.undoDepth = 2
         else:
             cmds.floatSliderGrp('fsg_resampleStep',
                                 e=True,
                                 pre=1)
-            self.undoDepth = 1
             self.snapToFrame = False
 
-    def simplifyWrapper(self, *args):
+    def __getCurves(self, preview=False):
         '''
-        straight simplify of curves using a managed cmds.simplfy call
+        curves to filter, those with selected keys, else the animCurves on the selected
+        nodes. When previewing a slider drag only a subset of them, see animCurves_preview_subset
+
+        :return: (curves, selectedKeysOnly)
         '''
-        with self.contextManager(initialUndo=self.dragActive,
-                                 undoFuncCache=self.undoFuncCache,
-                                 undoDepth=self.undoDepth):
-            self.dragActive = True  # turn on the undo management
-            simplify = True
-            if simplify:
-                cmds.simplify(animation='keysOrObjects',
-                               timeTolerance=cmds.floatSliderGrp('fsg_filtertimeValue', q=True, v=True),
-                               valueTolerance=cmds.floatSliderGrp('fsg_filterfloatValue', q=True, v=True))
-            else:
-                print('testing filter call')
-                objs = cmds.ls(sl=True)
-                cmds.filterCurve(objs, f='simplify',
-                                 timeTolerance=cmds.floatSliderGrp('fsg_filterfloatValue', q=True, v=True))
+        curves = cmds.keyframe(q=True, sl=True, n=True)
+        selected = bool(curves)
+        if not curves:
+            nodes = cmds.ls(sl=True, l=True)
+            if nodes:
+                curves = cmds.keyframe(nodes, q=True, n=True)
+        curves = curves or []
+        if preview and curves:
+            curves = animCurves_preview_subset(curves, selected=selected)
+        return curves, selected
+
+    def __filterContext(self, filterName):
+        '''
+        dragging a slider replaces the last result of that same filter rather than
+        stacking on top of it, a different filter builds on the last result
+        '''
+        initialUndo = self.dragActive and self.lastFilter == filterName
+        self.dragActive = True  # turn on the undo management
+        self.lastFilter = filterName
+        return self.contextManager(initialUndo=initialUndo,
+                                   undoFuncCache=self.undoFuncCache,
+                                   undoDepth=self.undoDepth)
 
-    def resampleCurves(self, *args):
+    def simplifyWrapper(self, preview=False, *args):
         '''
-        straight resample of curves using a managed cmds.bakeResults call
-        :param args[0]: this is the step used in the resample
+        key reduction of the curves, each curve read in one bulk query and reduced
+        by r9CurveEngine.reduceKeys against the time and value tolerance sliders,
+        then snapped to whole frames if set, and written back in one bulk edit
+
+        :param preview: slider drag, only process the preview subset of the curves
         '''
-        step = args[0]
+        timeTolerance = cmds.floatSliderGrp('fsg_filtertimeValue', q=True, v=True)
+        valueTolerance = cmds.floatSliderGrp('fsg_filterfloatValue', q=True, v=True)
+        with self.__filterContext('simplify'):
+            curves, selected = self.__getCurves(preview)
+            for curve in curves:
+                times, values = animCurve_get_keys(curve, selected=selected)
+                if len(times) < 3:
+                    continue
+                keep = r9CurveEngine.reduceKeys(times, values, valueTolerance, timeTolerance)
+                newTimes = [times[i] for i in keep]
+                newValues = [values[i] for i in keep]
+                if self.snapToFrame and not preview:
+                    newTimes, newValues = r9CurveEngine.snapTimes(newTimes, newValues)
+                    animCurve_set_keys(curve, newTimes, newValues,
+                                       replaceRange=(min(times[0], newTimes[0]), max(times[-1], newTimes[-1])))
+                else:
+                    animCurve_set_keys(curve, newTimes, replaceRange=(times[0], times[-1]))
+
+    def resampleCurves(self, preview=False, *args):
+        '''
+        resample the curves at the step set in the UI, each curve is evaluated at the
+        new times in one API pass and the keys replaced in one bulk edit. If no curves
+        are found we fall back to a managed cmds.bakeResults on the selected nodes
+
+        :param preview: slider drag, only process the preview subset of the curves
+        '''
+        step = cmds.floatSliderGrp('fsg_resampleStep', q=True, v=True)
         if self.snapToFrame:
-            step = int(args[0])
-        # print step
-        curves = cmds.keyframe(q=True, sl=True, n=True)
-        if not curves:
-            curves = cmds.ls(sl=True, l=True)
-            time = ()
-        else:
-            keys = sorted(cmds.keyframe(curves, sl=True, q=True, tc=True))
-            time = (int(keys[0]), keys[-1])  # note the int conversion in case first key is on a sub-frame
-        with self.contextManager(True, undoFuncCache=self.undoFuncCache):
-            cmds.bakeResults(curves, t=time, sb=step, pok=True)
+            step = max(1, int(step))
+        with self.__filterContext('resample'):
+            curves, selected = self.__getCurves(preview)
+            if not curves:
+                nodes = cmds.ls(sl=True, l=True)
+                if nodes:
+                    cmds.bakeResults(nodes, sb=step, pok=True)
+                return
+            for curve in curves:
+                times = animCurve_get_keys(curve, selected=selected)[0]
+                if not times:
+                    continue
+                # note the int conversion in case first key is on a sub-frame
+                newTimes = r9CurveEngine.sampleTimes(int(times[0]), times[-1], step)
+                animCurve_set_keys(curve, newTimes, animCurve_evaluate(curve, newTimes),
+                                   replaceRange=(min(times[0], newTimes[0]), times[-1]))
+
+    def smoothCurves(self, preview=False, *args):
+        '''
+        smooth the key values of the curves with either a gaussian or a zero phase
+        butterworth filter, see r9CurveEngine.smooth. Both treat the keys as evenly
+        spaced so are aimed at baked or resampled data
+
+        :param preview: slider drag, only process the preview subset of the curves
+        '''
+        strength = cmds.floatSliderGrp('fsg_smoothStrength', q=True, v=True)
+        method = cmds.optionMenu('om_smoothMethod', q=True, v=True)
+        fps = mel.eval('currentTimeUnitToFPS')
+        with self.__filterContext('smooth'):
+            curves, selected = self.__getCurves(preview)
+            for curve in curves:
+                times, values = animCurve_get_keys(curve, selected=selected)
+                if len(times) < 3:
+                    continue
+                animCurve_set_keys(curve, times, r9CurveEngine.smooth(values, method, strength, fps))
 
     def snapAnimCurvesToFrms(self, *args):
         '''
-        called after the interaction filters, snap
+        snap the keys of the curves to whole frames, where several keys land on
+        one frame the nearest wins
         '''
-        if self.snapToFrame:
-            cmds.snapKey(timeMultiple=1)
+        curves, selected = self.__getCurves()
+        for curve in curves:
+            times, values = animCurve_get_keys(curve, selected=selected)
+            if not times:
+                continue
+            newTimes, newValues = r9CurveEngine.snapTimes(times, values)
+            animCurve_set_keys(curve, newTimes, newValues,
+                               replaceRange=(min(times[0], newTimes[0]), max(times[-1], newTimes[-1])))
+
+
+class MirrorTable(object):
+    '''
+    Compiled mirror data for a set of nodes. The side, index and axis for each node
+    are read once, in bulk through the API, and held in flat arrays keyed by the
+    node UUIDs with the Left/Right opposites already paired. MirrorHierarchy, the
+    MetaRig mirror calls and the 'mirrorIndex' match methods read from this rather
+    than going back to the nodes one attr at a time.
+
+    >>> table = MirrorTable(nodes)
+    >>> table.getOpposite(node)
+    >>> table.getPairs()  # [(left, right), ...]
+    >>> # have mirrorIDs / mirror attrs changed or nodes been renamed / deleted since we compiled?
+    >>> table.isCurrent()
+    >>> # full re-read of the attrs, for tables loaded back with fromData
+    >>> table.verify()
+
+    The table serializes via getData / fromData so a MetaRig can store it on its node,
+    see MetaRig.saveMirrorTable.
+    '''
+    version = 1
+    SIDES = ('Centre', 'Left', 'Right')
+    NO_INDEX = -2147483648  # no mirrorIndex attr on the node
+
+    def __init__(self, nodes=None, mirrorSide='mirrorSide', mirrorIndex='mirrorIndex', mirrorAxis='mirrorAxis'):
+        self.mirrorSide = mirrorSide
+        self.mirrorIndex = mirrorIndex
+        self.mirrorAxis = mirrorAxis
+        self.nodes = []
+        self.uuids = []
+        self.sides = array('b')
+        self.indexes = array('i')
+        self.axis = []  # raw mirrorAxis string per node, None if the node has no mirrorAxis attr
+        self.opposites = array('i')  # row of the opposite node, -1 if none
+        self._rows = {}  # uuid and node name : row
+        self.epoch = None  # r9Meta.RED9_MIRRORTABLE_EPOCH the table was last built / verified at
+        if nodes:
+            self.build(nodes)
+
+    def _read(self, nodes):
+        '''
+        bulk read of the mirror attrs on the given nodes
+
+        :return: list of (node, uuid, side, index, axis) for the nodes found. Side is the
+            enum string or None, index the int or None, axis the raw string or None
+        '''
+        return [data for _, data in self._iterRead(nodes)]
+
+    def _iterRead(self, nodes):
+        '''
+        generator behind _read, yields (given node, data) so callers can key the results
+        by the names they passed in
+        '''
+        mSel = OpenMaya.MSelectionList()
+        mObj = OpenMaya.MObject()
+        mDag = OpenMaya.MDagPath()
+        for node in nodes:
+            try:
+                mSel.clear()
+                mSel.add(node)
+                mSel.getDependNode(0, mObj)
+            except RuntimeError:
+                log.debug('MirrorTable : node not found : %s' % node)
+                continue
+            mFn = OpenMaya.MFnDependencyNode(mObj)
+            if mObj.hasFn(OpenMaya.MFn.kDagNode):
+                mSel.getDagPath(0, mDag)
+                name = mDag.fullPathName()
+            else:
+                name = mFn.name()
+            try:
+                uuid = mFn.uuid().asString()
+            except:
+                uuid = name  # pre 2016
+            side = None
+            index = None
+            axis = None
+            if mFn.hasAttribute(self.mirrorSide):
+                plug = mFn.findPlug(self.mirrorSide, False)
+                try:
+                    side = OpenMaya.MFnEnumAttribute(plug.attribute()).fieldName(plug.asShort())
+                except RuntimeError:
+                    side = plug.asString()
+            if mFn.hasAttribute(self.mirrorIndex):
+                index = int(mFn.findPlug(self.mirrorIndex, False).asInt())
+            if mFn.hasAttribute(self.mirrorAxis):
+                axis = mFn.findPlug(self.mirrorAxis, False).asString()
+            yield node, (name, uuid, side, index, axis)
+
+    def build(self, nodes):
+        '''
+        compile the table from the given nodes, nodes with no valid mirrorSide are skipped.
+        Duplicate side/index slots resolve to the first node given, the clashes are kept
+        in self.unresolved in the same format as MirrorHierarchy
+        '''
+        self.epoch = r9Meta.RED9_MIRRORTABLE_EPOCH
+        self.nodes = []
+        self.uuids = []
+        self.sides = array('b')
+        self.indexes = array('i')
+        self.axis = []
+        seen = set()
+        for name, uuid, side, index, axis in self._read(nodes):
+            if name in seen or side not in self.SIDES:
+                continue
+            seen.add(name)
+            self.nodes.append(name)
+            self.uuids.append(uuid)
+            self.sides.append(self.SIDES.index(side))
+            self.indexes.append(self.NO_INDEX if index is None else index)
+            self.axis.append(axis)
+        self._compile()
+        self._watch()
+        return self
+
+    def _compile(self):
+        '''
+        build the lookups and pair up the opposites from the arrays
+        '''
+        self._rows = {}
+        self.unresolved = {'Centre': {}, 'Left': {}, 'Right': {}}
+        slots = {}
+        for row, node in enumerate(self.nodes):
+            self._rows[node] = row
+            self._rows[self.uuids[row]] = row
+            key = (self.sides[row], self.indexes[row])
+            if key in slots:
+                side = self.SIDES[key[0]]
+                index = self.getIndex(row)
+                clashes = self.unresolved[side].setdefault(str(index), [self.nodes[slots[key]]])
+                clashes.append(node)
+                continue
+            slots[key] = row
+        self.slots = slots
+
+        self.opposites = array('i', [-1] * len(self.nodes))
+        for (side, index), row in slots.items():
+            if side == 0:
+                self.opposites[row] = row
+            else:
+                self.opposites[row] = slots.get((3 - side, index), -1)
+
+    def getRow(self, node):
+        '''
+        row for the given node, uuid or row, None if it's not in the table
+        '''
+        if isinstance(node, int):
+            return node
+        row = self._rows.get(node)
+        if row is None and node and not node.startswith('|'):
+            longName = cmds.ls(node, l=True)
+            if len(longName) == 1:
+                row = self._rows.get(longName[0])
+        return row
+
+    def getSide(self, node):
+        row = self.getRow(node)
+        if row is not None:
+            return self.SIDES[self.sides[row]]
+
+    def getIndex(self, node):
+        row = self.getRow(node)
+        if row is not None and not self.indexes[row] == self.NO_INDEX:
+            return self.indexes[row]
+
+    def getAxis(self, node, default=None):
+        '''
+        the inverse axis for the node, as MirrorHierarchy.getMirrorAxis
+        '''
+        row = self.getRow(node)
+        if row is None:
+            return default
+        axis = self.axis[row]
+        if axis is None:
+            return default
+        if not axis:
+            return []
+        return axis.rstrip(',').split(',')
+
+    def getCompiledID(self, node):
+        '''
+        mirror data compiled as Side_Index, ie: 'Centre_10'
+        '''
+        return '%s_%s' % (self.getSide(node), self.getIndex(node))
+
+    def getOpposite(self, node):
+        '''
+        the opposite node, Centre nodes return themselves
+        '''
+        row = self.getRow(node)
+        if row is None or self.opposites[row] == -1:
+            return None
+        return self.nodes[self.opposites[row]]
+
+    def getPairs(self, primeSide='Left'):
+        '''
+        all matched pairs [(primeNode, oppositeNode)] for the given side
+        '''
+        side = self.SIDES.index(primeSide)
+        pairs = []
+        for (s, _), row in sorted(self.slots.items()):
+            if s == side and not self.opposites[row] == -1:
+                pairs.append((self.nodes[row], self.nodes[self.opposites[row]]))
+        return pairs
+
+    def getSideNodes(self, side='Centre'):
+        '''
+        all nodes for a given side, ordered by index
+        '''
+        side = self.SIDES.index(side)
+        return [self.nodes[row] for (s, _), row in sorted(self.slots.items()) if s == side]
+
+    def getMirrorDict(self, nodes=None, defaultAxis=[]):
+        '''
+        the data in MirrorHierarchy.mirrorDict format
+        {'Centre':{'id':{'node':node, 'axis':[], 'axisAttr':bool}}, 'Left':{..}, 'Right':{..}}
+
+        :param nodes: only include these nodes, default is the whole table
+        :param defaultAxis: axis used for nodes with no mirrorAxis attr
+        :return: mirrorDict, unresolved
+        '''
+        if nodes is None:
+            rows = range(len(self.nodes))
+        else:
+            rows = [self.getRow(node) for node in nodes]
+            rows = sorted(set(row for row in rows if row is not None))
+        mirrorDict = {'Centre': {}, 'Left': {}, 'Right': {}}
+        unresolved = {'Centre': {}, 'Left': {}, 'Right': {}}
+        for row in rows:
+            side = self.SIDES[self.sides[row]]
+            index = str(self.getIndex(row))
+            if index in mirrorDict[side]:
+                if index not in unresolved[side]:
+                    unresolved[side][index] = [mirrorDict[side][index]['node']]
+                unresolved[side][index].append(self.nodes[row])
+                continue
+            mirrorDict[side][index] = {'node': self.nodes[row],
+                                       'axis': self.getAxis(row, defaultAxis),
+                                       'axisAttr': self.axis[row] is not None}
+        return mirrorDict, unresolved
+
+    def getCompiledIDs(self, nodes):
+        '''
+        bulk version of MirrorHierarchy.getMirrorCompiledID, read straight from the nodes
+
+        :return: {node: 'Side_Index'} keyed by the nodes as given, nodes not found are skipped
+        '''
+        ids = {}
+        for node, data in self._iterRead(nodes):
+            ids[node] = '%s_%s' % (data[2], data[3])
+        return ids
+
+    def isCurrent(self):
+        '''
+        cheap check, no scene reads. The table is current until mirrorIDs are set / removed,
+        the mirror attrs on its nodes are edited, an undo / redo runs or a node is renamed,
+        re-parented or deleted, all of which bump r9Meta.RED9_MIRRORTABLE_EPOCH, see
+        r9Meta.watchMirrorNodes.
+        '''
+        return self.epoch is not None and self.epoch == r9Meta.RED9_MIRRORTABLE_EPOCH
+
+    def verify(self):
+        '''
+        re-read the mirror attrs of the compiled nodes and check nothing has changed,
+        a node renamed, deleted or with edited mirror attrs fails. A verified table is
+        marked current, used for tables loaded back from a node via fromData
+        '''
+        data = self._read(self.nodes)
+        if not len(data) == len(self.nodes):
+            return False
+        for row, (name, uuid, side, index, axis) in enumerate(data):
+            if not name == self.nodes[row] or not uuid == self.uuids[row]:
+                return False
+            if side not in self.SIDES or not self.SIDES.index(side) == self.sides[row]:
+                return False
+            if not (self.NO_INDEX if index is None else index) == self.indexes[row]:
+                return False
+            if not axis == self.axis[row]:
+                return False
+        self.epoch = r9Meta.RED9_MIRRORTABLE_EPOCH
+        self._watch()
+        return True
+
+    def _watch(self):
+        r9Meta.watchMirrorNodes(zip(self.nodes, self.uuids), [self.mirrorSide, self.mirrorIndex, self.mirrorAxis])
+
+    def getData(self):
+        '''
+        serializable data for the table
+        '''
+        return {'version': self.version,
+                'attrs': [self.mirrorSide, self.mirrorIndex, self.mirrorAxis],
+                'nodes': self.nodes,
+                'uuids': self.uuids,
+                'sides': self.sides.tolist(),
+                'indexes': self.indexes.tolist(),
+                'axis': self.axis}
+
+    @classmethod
+    def fromData(cls, data):
+        '''
+        rebuild a table from getData, returns None if the data isn't valid for this version
+        '''
+        try:
+            if not data or not data.get('version') == cls.version:
+                return None
+            table = cls(None, *data['attrs'])
+            table.nodes = [str(n) for n in data['nodes']]
+            table.uuids = [str(u) for u in data['uuids']]
+            table.sides = array('b', data['sides'])
+            table.indexes = array('i', data['indexes'])
+            table.axis = [None if a is None else str(a) for a in data['axis']]
+            table._compile()
+            return table
+        except StandardError, err:
+            log.debug('MirrorTable : failed to load data : %s' % err)
+            return None
+
+
+def getMirrorTable(nodes):
+    '''
+    the MirrorTable covering the given nodes. If they're all part of a MetaRig we use that rig's
+    table, compiled once and stored on the rig, else we compile a table for just these nodes
+    '''
+    nodes = cmds.ls(nodes, l=True)
+    if nodes:
+        try:
+            mRig = r9Meta.getConnectedMetaSystemRoot(nodes[0])
+        except StandardError:
+            mRig = None
+        if mRig and hasattr(mRig, 'getMirrorTable'):
+            table = mRig.getMirrorTable()
+            if all(table.getRow(node) is not None for node in nodes):
+                return table
+    return MirrorTable(nodes)
 
 
 class MirrorHierarchy(object):
@@ -4763,6 +5364,7 @@ class MirrorHierarchy(object):
             if mClass.hasAttr(self.mirrorAxis):
                 delattr(mClass, self.mirrorAxis)
         del(mClass)  # cleanup
+        r9Meta.invalidateMirrorTables()
 
     def deleteMirrorIDs(self, node):
         '''
@@ -4782,6 +5384,7 @@ class MirrorHierarchy(object):
         except:
             pass
         del(mClass)
+        r9Meta.invalidateMirrorTables()
 
     def copyMirrorIDs(self, src, dest):
         '''
@@ -4898,37 +5501,21 @@ class MirrorHierarchy(object):
         if not self.indexednodes:
             raise StandardError('No mirrorMarkers found from the given node list/hierarchy')
 
-        for node in set(self.indexednodes):
-            try:
-                side = self.getMirrorSide(node)
-                index = self.getMirrorIndex(node)
-                axis = self.getMirrorAxis(node)
-                if logging_is_debug():
-                    log.debug('Side : %s Index : %s>> node %s' %
-                              (side, index, r9Core.nodeNameStrip(node)))
-                # self.mirrorDict[side][str(index)]=node #NOTE index is cast to string!
-                if str(index) in self.mirrorDict[side]:
-                    log.warning('Mirror index ( %s : %i ) already assigned : currently node : %s,  duplicate node : %s' %
-                                    (side, index,
-                                     r9Core.nodeNameStrip(self.mirrorDict[side][str(index)]['node']),
-                                     r9Core.nodeNameStrip(node)))
-                    if not str(index) in self.unresolved[side]:
-                        self.unresolved[side][str(index)] = [self.mirrorDict[side][str(index)]['node']]
-                    self.unresolved[side][str(index)].append(node)
-                    continue
-
-                self.mirrorDict[side][str(index)] = {}
-                self.mirrorDict[side][str(index)]['node'] = node
-                self.mirrorDict[side][str(index)]['axis'] = axis
-                if cmds.attributeQuery(self.mirrorAxis, node=node, exists=True):
-                    self.mirrorDict[side][str(index)]['axisAttr'] = True
-                else:
-                    self.mirrorDict[side][str(index)]['axisAttr'] = False
+        # the side/index/axis all come from the compiled table rather than node by node queries
+        nodes = cmds.ls(self.indexednodes, l=True)
+        self.mirrorTable = getMirrorTable(nodes)
+        self.mirrorDict, self.unresolved = self.mirrorTable.getMirrorDict(nodes, defaultAxis=self.defaultMirrorAxis)
 
-            except StandardError, error:
-                log.debug(error)
+        for node in nodes:
+            if self.mirrorTable.getRow(node) is None:
                 log.info('Failed to add Node to Mirror System : %s' % r9Core.nodeNameStrip(node))
-
+        for side, clashes in self.unresolved.items():
+            for index, clashNodes in clashes.items():
+                for node in clashNodes[1:]:
+                    log.warning('Mirror index ( %s : %s ) already assigned : currently node : %s,  duplicate node : %s' %
+                                    (side, index,
+                                     r9Core.nodeNameStrip(clashNodes[0]),
+                                     r9Core.nodeNameStrip(node)))
         return self.indexednodes
 
     def printMirrorDict(self, short=True):
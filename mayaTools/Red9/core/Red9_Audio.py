@@ -26,11 +26,9 @@ import Red9_General as r9General
 import Red9.startup.setup as r9Setup
 import Red9_Meta as r9Meta
 import Red9_CoreUtils as r9Core
+import Red9_AudioStream as r9AudioStream
 
 
-import wave
-import contextlib
-
 import logging
 logging.basicConfig()
 log = logging.getLogger(__name__)
@@ -467,7 +465,10 @@ class AudioHandler(object):
         the issues with Maya not playblasting multiple audio tracks.
 
         :param filepath: filepath to store the combined audioTrack
-        TODO: Deal with offset start and end data + silence
+
+        .. note::
+            the mix is streamed, see Red9_AudioStream.mixdown, each source is read in
+            chunks and the output written as it goes, 24bit sources are supported
         '''
         status = True
         failed = []
@@ -491,10 +492,11 @@ class AudioHandler(object):
         if frmrange[0] < 0:
             neg_adjustment = frmrange[0]
 
-        duration = ((frmrange[1] + abs(neg_adjustment)) / r9General.getCurrentFPS()) * 1000
+        fps = r9General.getCurrentFPS()
+        duration = (frmrange[1] + abs(neg_adjustment)) / fps
         log.info('Audio BaseTrack duration = %f' % duration)
-        baseTrack = audio_segment.AudioSegment.silent(duration)
 
+        sources = {}
         for audio in self.audioNodes:
             if not os.path.exists(audio.path):
                 log.warning('Audio file not found!  : "%s" == %s' % (audio.audioNode, audio.path))
@@ -504,19 +506,20 @@ class AudioHandler(object):
             # deal with any trimming of the audio node in Maya
             sourceStart = cmds.getAttr(audio.audioNode + '.sourceStart')
             sourceEnd = cmds.getAttr(audio.audioNode + '.sourceEnd')
-            sound = audio_segment.AudioSegment.from_wav(audio.path)[(sourceStart / r9General.getCurrentFPS()) * 1000:(sourceEnd / r9General.getCurrentFPS()) * 1000]
-            # sound = audio_segment.AudioSegment.from_wav(audio.path)
-            if sound.sample_width not in [1, 2, 4]:
-                log.warning('24bit Audio is NOT supported in Python audioop lib!  : "%s" == %i' % (audio.audioNode, sound.sample_width))
-                status = False
-                failed.append(audio)
-                continue
             insertFrame = (audio.startFrame + abs(neg_adjustment))
             log.info('inserting sound : %s at %f adjusted to %f' %
                      (audio.audioNode, audio.startFrame, insertFrame))
-            baseTrack = baseTrack.overlay(sound, position=(insertFrame / r9General.getCurrentFPS()) * 1000)
+            source = r9AudioStream.MixSource(audio.path,
+                                             position=insertFrame / fps,
+                                             start=sourceStart / fps,
+                                             end=sourceEnd / fps,
+                                             name=audio.audioNode)
+            sources[source] = audio
+
+        for source in r9AudioStream.mixdown(sources.keys(), filepath, duration=duration):
+            status = False
+            failed.append(sources[source])
 
-        baseTrack.export(filepath, format="wav")
         compiled = AudioNode(filepath=filepath)
         compiled.importAndActivate()
         compiled.stampCompiled(self.mayaNodes)
@@ -641,62 +644,80 @@ class AudioNode(object):
         return data
 
     # ---------------------------------------------------------------------------------
-    # pyDub inspect calls ---
+    # Wav inspect calls ---
     # ---------------------------------------------------------------------------------
-    # https://github.com/jiaaro/pydub/blob/master/API.markdown
+    # format data comes straight from the wav header, the loudness and waveform from
+    # the cached peak file, see Red9_AudioStream. Neither decodes the sample data
+    # once the peaks have been built
+
+    @property
+    def wavInfo(self):
+        '''
+        format data from the wav header : channels, rate, width, bits, frames, duration
+        '''
+        return r9AudioStream.getWavInfo(self.path)
+
+    def getPeaks(self, build=True):
+        '''
+        the cached peak data for the wav, min / max pairs per 'bucket' frames in
+        'mins' and 'maxs' as 16bit ints, for waveform drawing, plus the format
+        data and the overall 'dBFS' and 'max_dBFS'
+
+        :param build: build the peak file if it's not cached, else return None
+        '''
+        return r9AudioStream.getPeaks(self.path, build=build)
 
     @property
     def sampleRate(self):
         '''
-        sample rate in milliseconds
+        sample rate in Hz
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).frame_rate
+        return self.wavInfo['rate']
 
     @property
     def sample_width(self):
         '''
         bytes per sample, is converted by the sample_bits into bitrate
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).sample_width
+        return self.wavInfo['width']
 
     @property
     def sample_bits(self):
         '''
-        bit rate taken from the bytes per sample : 4,8,16,24 bit
+        bit rate taken from the bytes per sample : 8,16,24,32 bit
         '''
-        data = {'1': 8, '2': 16, '3': 24, '4': 32}
-        return data[str(audio_segment.AudioSegment.from_wav(self.path).sample_width)]
+        return self.wavInfo['width'] * 8
 
     @property
     def channels(self):
         '''
         number of channels 1=mone, 2=stereo
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).channels
+        return self.wavInfo['channels']
 
     @property
     def dBFS(self):
         '''
-        loudness of the AudioSegment in dBFS (db relative to the maximum possible loudness)
+        loudness of the wav in dBFS (db relative to the maximum possible loudness)
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).dBFS
+        return self.getPeaks()['dBFS']
 
     @property
     def max_dBFS(self):
         '''
-        The highest amplitude of any sample in the AudioSegment,
+        The highest amplitude of any sample in the wav,
         in dBFS (relative to the highest possible amplitude value).
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).max_dBFS
+        return self.getPeaks()['max_dBFS']
 
     @property
     def duration(self):
         '''
         return the duration of the wav from the file directly
         '''
-        return audio_segment.AudioSegment.from_wav(self.path).duration_seconds
+        return self.wavInfo['duration']
 
-    # pyDub end ---
+    # Wav inspect end ---
 
     @property
     def startFrame(self):
@@ -964,11 +985,7 @@ class AudioNode(object):
         This uses the wav itself bypassing the Maya handling, why?
         In maya.standalone the audio isn't loaded correctly and always is of length 1!
         '''
-        with contextlib.closing(wave.open(self.path, 'r')) as f:
-            frames = f.getnframes()
-            rate = f.getframerate()
-            duration = frames / float(rate)
-            return (duration) * r9General.getCurrentFPS()
+        return self.wavInfo['duration'] * r9General.getCurrentFPS()
 
     def setTimeline(self, full=False):
         '''
@@ -0,0 +1,555 @@
+'''
+..
+    Red9 Studio Pack: Maya Pipeline Solutions
+    Author: Mark Jackson
+    email: rednineinfo@gmail.com
+
+    Red9 blog : http://red9-consultancy.blogspot.co.uk/
+    MarkJ blog: http://markj3d.blogspot.co.uk
+
+
+This is the streaming wav lib behind the AudioHandler.combineAudio mixdown and
+the AudioNode inspect calls. Nothing here decodes a whole file, sources are read
+in fixed size chunks, converted to 32bit int, mixed into a small block buffer via
+audioop and the output written block by block, so memory stays flat no matter
+how long the sequence or how many stems are in it.
+
+8, 16, 24 and 32bit int and 32 / 64bit float wavs are supported, including the
+WAVE_FORMAT_EXTENSIBLE header most 24bit files use which the wave module rejects.
+
+Each source also gets a cached min/max peak file, built in the same pass as
+the mixdown, so the format, duration, loudness and waveform of a wav can be
+read without touching its sample data again.
+
+    >>> sources = [MixSource('c:/dialogue/line1.wav', position=2.0),
+    >>>            MixSource('c:/dialogue/line2.wav', position=10.5, start=0.25, end=3.0)]
+    >>> mixdown(sources, 'c:/temp/combined.wav')
+    >>> getPeaks('c:/dialogue/line1.wav')['max_dBFS']
+
+NOTHING IN THIS MODULE SHOULD REQUIRE MAYA
+
+.. note::
+    sample data is handled in the host byte order, which is little-endian on every
+    platform Maya runs on, matching the wav format
+
+'''
+
+from __future__ import print_function
+
+import os
+import math
+import json
+import struct
+import audioop
+import hashlib
+import tempfile
+import wave
+from array import array
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+RED9_AUDIO_CHUNK = 65536  # frames read / mixed per block
+RED9_AUDIO_PEAK_BUCKET = 512  # source frames per min/max pair in the peak files
+RED9_AUDIO_PEAK_VERSION = 1
+RED9_AUDIO_PEAK_CACHE = os.path.join(tempfile.gettempdir(), 'Red9_AudioPeaks')
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_INT32_MAX = 2147483647
+
+
+class WavReader(object):
+    '''
+    minimal RIFF wav reader, parses the header and reads raw frames by seeking
+    straight into the data chunk
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.channels = 0
+        self.rate = 0
+        self.width = 0  # bytes per sample
+        self.bits = 0
+        self.isFloat = False
+        self.nframes = 0
+        self._dataOffset = 0
+        self._file = open(path, 'rb')
+        try:
+            self._readHeader()
+        except:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @property
+    def frameSize(self):
+        return self.width * self.channels
+
+    @property
+    def duration(self):
+        return self.nframes / float(self.rate)
+
+    def _readHeader(self):
+        f = self._file
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] not in ('RIFF', 'RF64') or not riff[8:12] == 'WAVE':
+            raise IOError('Not a RIFF WAVE file : %s' % self.path)
+        formatTag = None
+        dataSize = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunkId = header[:4]
+            size = struct.unpack('<I', header[4:])[0]
+            if chunkId == 'fmt ':
+                fmt = f.read(size)
+                formatTag, self.channels, self.rate, _, blockAlign, self.bits = struct.unpack('<HHIIHH', fmt[:16])
+                if formatTag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    formatTag = struct.unpack('<H', fmt[24:26])[0]  # first 2 bytes of the SubFormat GUID
+                if self.channels:
+                    self.width = blockAlign // self.channels
+                if size & 1:
+                    f.seek(1, 1)
+            elif chunkId == 'data':
+                self._dataOffset = f.tell()
+                dataSize = size
+                if formatTag is not None:
+                    break
+                f.seek(size + (size & 1), 1)
+            else:
+                f.seek(size + (size & 1), 1)
+
+        if formatTag is None or dataSize is None:
+            raise IOError('Wav has no fmt or data chunk : %s' % self.path)
+        if formatTag == _WAVE_FORMAT_PCM and self.width in (1, 2, 3, 4):
+            self.isFloat = False
+        elif formatTag == _WAVE_FORMAT_FLOAT and self.width in (4, 8):
+            self.isFloat = True
+        else:
+            raise ValueError('Unsupported wav format : tag=%s, width=%i : %s' % (formatTag, self.width, self.path))
+        # streamed / RF64 files often carry a placeholder data size
+        available = os.path.getsize(self.path) - self._dataOffset
+        if dataSize > available or dataSize == 0xFFFFFFFF:
+            dataSize = available
+        self.nframes = dataSize // self.frameSize
+
+    def read(self, start, count):
+        '''
+        raw frames from the data chunk
+
+        :param start: first frame
+        :param count: number of frames, clamped to the end of the data
+        '''
+        count = max(0, min(count, self.nframes - start))
+        if not count:
+            return ''
+        self._file.seek(self._dataOffset + start * self.frameSize)
+        return self._file.read(count * self.frameSize)
+
+    def chunks(self, start=0, end=None, size=None):
+        '''
+        generator of (startFrame, raw data) covering the given frame range
+        '''
+        if end is None or end > self.nframes:
+            end = self.nframes
+        size = size or RED9_AUDIO_CHUNK
+        frame = start
+        while frame < end:
+            count = min(size, end - frame)
+            yield frame, self.read(frame, count)
+            frame += count
+
+    def info(self):
+        return {'channels': self.channels,
+                'rate': self.rate,
+                'width': self.width,
+                'bits': self.bits,
+                'float': self.isFloat,
+                'frames': self.nframes,
+                'duration': self.duration}
+
+
+# -------------------------------------------------------------------------------------
+# Sample conversions, all mixing is done as 32bit int ---
+# -------------------------------------------------------------------------------------
+
+def toInt32(data, width, isFloat=False):
+    '''
+    convert a raw fragment to 32bit signed int samples
+
+    :param data: raw sample data
+    :param width: bytes per sample
+    :param isFloat: the data is 32 / 64bit float
+    '''
+    if isFloat:
+        values = array('f' if width == 4 else 'd', data)
+        return array('i', [int(max(-1.0, min(1.0, v)) * _INT32_MAX) for v in values]).tostring()
+    if width == 4:
+        return data
+    if width == 3:
+        # 24bit into the top 3 bytes of each 32bit sample, the sign comes with the top byte
+        src = bytearray(data)
+        count = len(src) // 3
+        out = bytearray(count * 4)
+        out[1::4] = src[0::3]
+        out[2::4] = src[1::3]
+        out[3::4] = src[2::3]
+        return str(out)
+    if width == 1:
+        data = audioop.bias(data, 1, -128)  # 8bit wavs are unsigned
+    return audioop.lin2lin(data, width, 4)
+
+def fromInt32(data, width):
+    '''
+    convert 32bit int samples to the given output width
+    '''
+    if width == 4:
+        return data
+    if width == 3:
+        src = bytearray(data)
+        count = len(src) // 4
+        out = bytearray(count * 3)
+        out[0::3] = src[1::4]
+        out[1::3] = src[2::4]
+        out[2::3] = src[3::4]
+        return str(out)
+    data = audioop.lin2lin(data, 4, width)
+    if width == 1:
+        data = audioop.bias(data, 1, 128)
+    return data
+
+def convertChannels(data, channels, outChannels):
+    '''
+    mono to stereo and stereo to mono on 32bit data
+    '''
+    if channels == outChannels:
+        return data
+    if channels == 1 and outChannels == 2:
+        return audioop.tostereo(data, 4, 1, 1)
+    if channels == 2 and outChannels == 1:
+        return audioop.tomono(data, 4, 0.5, 0.5)
+    raise ValueError('Unsupported channel conversion : %i > %i' % (channels, outChannels))
+
+
+# -------------------------------------------------------------------------------------
+# Peaks ---
+# -------------------------------------------------------------------------------------
+
+class PeakBuilder(object):
+    '''
+    accumulates min / max pairs per RED9_AUDIO_PEAK_BUCKET frames, plus the overall
+    peak and rms, from 32bit int chunks fed in order
+    '''
+    def __init__(self, reader, bucket=None):
+        self.reader = reader
+        self.bucket = bucket or RED9_AUDIO_PEAK_BUCKET
+        self.mins = array('h')
+        self.maxs = array('h')
+        self._pending = ''
+        self._sumSquares = 0.0
+        self._samples = 0
+        self._peak = 0
+
+    def feed(self, data):
+        '''
+        :param data: 32bit int, interleaved, in source channel layout
+        '''
+        if not data:
+            return
+        rms = audioop.rms(data, 4)
+        samples = len(data) // 4
+        self._sumSquares += float(rms) * rms * samples
+        self._samples += samples
+        self._peak = max(self._peak, audioop.max(data, 4))
+
+        data = self._pending + data
+        step = self.bucket * self.reader.channels * 4
+        end = len(data) - len(data) % step
+        for i in range(0, end, step):
+            low, high = audioop.minmax(data[i:i + step], 4)
+            self.mins.append(low >> 16)
+            self.maxs.append(high >> 16)
+        self._pending = data[end:]
+
+    def result(self):
+        if self._pending:
+            low, high = audioop.minmax(self._pending, 4)
+            self.mins.append(low >> 16)
+            self.maxs.append(high >> 16)
+            self._pending = ''
+        data = self.reader.info()
+        data['path'] = self.reader.path
+        data['bucket'] = self.bucket
+        data['rms'] = math.sqrt(self._sumSquares / self._samples) / _INT32_MAX if self._samples else 0.0
+        data['peak'] = self._peak / float(_INT32_MAX)
+        data['mins'] = self.mins.tolist()
+        data['maxs'] = self.maxs.tolist()
+        return data
+
+
+def peakCachePath(path):
+    '''
+    peak file for the given wav, cached centrally rather than next to the source
+    '''
+    key = hashlib.md5(os.path.normcase(os.path.abspath(path))).hexdigest()
+    return os.path.join(RED9_AUDIO_PEAK_CACHE, '%s.json' % key)
+
+def _sourceStamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+def _addLoudness(data):
+    data['dBFS'] = 20 * math.log10(data['rms']) if data['rms'] else -float('inf')
+    data['max_dBFS'] = 20 * math.log10(data['peak']) if data['peak'] else -float('inf')
+    return data
+
+def readPeaks(path):
+    '''
+    the cached peak data for the wav, None if there's no valid cache
+    '''
+    cache = peakCachePath(path)
+    if not os.path.exists(cache):
+        return None
+    try:
+        with open(cache, 'r') as f:
+            data = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if not data.get('version') == RED9_AUDIO_PEAK_VERSION or not data.get('stamp') == _sourceStamp(path):
+        return None
+    return _addLoudness(data)
+
+def writePeaks(path, data):
+    data = dict(data)
+    data['version'] = RED9_AUDIO_PEAK_VERSION
+    data['stamp'] = _sourceStamp(path)
+    for key in ['dBFS', 'max_dBFS']:
+        data.pop(key, None)
+    cache = peakCachePath(path)
+    try:
+        if not os.path.exists(RED9_AUDIO_PEAK_CACHE):
+            os.makedirs(RED9_AUDIO_PEAK_CACHE)
+        temp = '%s.tmp' % cache
+        with open(temp, 'w') as f:
+            json.dump(data, f)
+        if os.path.exists(cache):
+            os.remove(cache)
+        os.rename(temp, cache)
+    except (IOError, OSError), err:
+        log.warning('Failed to write audio peak cache : %s : %s' % (cache, err))
+    return _addLoudness(data)
+
+def buildPeaks(path):
+    '''
+    streaming pass over the whole wav to build and cache its peak data
+    '''
+    with WavReader(path) as reader:
+        builder = PeakBuilder(reader)
+        for _, data in reader.chunks():
+            builder.feed(toInt32(data, reader.width, reader.isFloat))
+        return writePeaks(path, builder.result())
+
+def getPeaks(path, build=True):
+    '''
+    peak data for the given wav, read from the cache or built if missing / out of date.
+    Along with the min/max arrays this carries the wav format, duration, rms, peak,
+    dBFS and max_dBFS
+
+    :param path: wav to inspect
+    :param build: if False and there's no valid cache, return None rather than building it
+    '''
+    data = readPeaks(path)
+    if data is None and build:
+        data = buildPeaks(path)
+    return data
+
+def getWavInfo(path):
+    '''
+    format of the wav straight from its header, no sample data read
+    '''
+    with WavReader(path) as reader:
+        return reader.info()
+
+
+# -------------------------------------------------------------------------------------
+# Mixdown ---
+# -------------------------------------------------------------------------------------
+
+class MixSource(object):
+    '''
+    a single source in the mixdown
+
+    :param path: wav file
+    :param position: time in seconds in the output the source starts at
+    :param start: trim, time in seconds into the source to start from
+    :param end: trim, time in seconds into the source to stop at, None is the end of the file
+    :param gain: linear gain
+    '''
+    def __init__(self, path, position=0.0, start=0.0, end=None, gain=1.0, name=None):
+        self.path = path
+        self.position = position
+        self.start = start
+        self.end = end
+        self.gain = gain
+        self.name = name or os.path.basename(path)
+        self.reader = None
+
+    def __repr__(self):
+        return "%s(%s : position=%s, start=%s, end=%s)" % (self.__class__.__name__, self.name, self.position, self.start, self.end)
+
+    def open(self):
+        self.reader = WavReader(self.path)
+        return self.reader
+
+    def close(self):
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+
+class _SourceStream(object):
+    '''
+    sequential reader of a MixSource converted to the output format, feeding a
+    PeakBuilder as it goes when the source is read end to end
+    '''
+    def __init__(self, source, rate, channels, chunk):
+        reader = source.reader
+        self.source = source
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+        self.frame = max(0, int(round(source.start * reader.rate)))
+        self.end = reader.nframes
+        if source.end is not None:
+            self.end = min(self.end, int(round(source.end * reader.rate)))
+        self.outStart = int(round(source.position * rate))
+        self.outLength = max(0, int(math.ceil((self.end - self.frame) * rate / float(reader.rate))))
+        self.outEnd = self.outStart + self.outLength
+        self.peaks = None
+        if self.frame == 0 and self.end == reader.nframes and readPeaks(source.path) is None:
+            self.peaks = PeakBuilder(reader)
+        self._buffer = bytearray()
+        self._rateState = None
+
+    def _pull(self):
+        reader = self.source.reader
+        count = min(self.chunk, self.end - self.frame)
+        data = toInt32(reader.read(self.frame, count), reader.width, reader.isFloat)
+        self.frame += count
+        if self.peaks:
+            self.peaks.feed(data)
+        data = convertChannels(data, reader.channels, self.channels)
+        if not reader.rate == self.rate:
+            data, self._rateState = audioop.ratecv(data, 4, self.channels, reader.rate, self.rate, self._rateState)
+        if not self.source.gain == 1.0:
+            data = audioop.mul(data, 4, self.source.gain)
+        self._buffer.extend(data)
+
+    def read(self, count):
+        '''
+        exactly count frames in the output format, zero padded past the end of the source
+        '''
+        size = count * self.channels * 4
+        while len(self._buffer) < size and self.frame < self.end:
+            self._pull()
+        data = self._buffer[:size]
+        del self._buffer[:size]
+        if len(data) < size:
+            data.extend('\x00' * (size - len(data)))
+        return str(data)
+
+    def finish(self):
+        if self.peaks:
+            writePeaks(self.source.path, self.peaks.result())
+            self.peaks = None
+
+
+def mixdown(sources, filepath, rate=None, channels=None, width=None, duration=None, chunk=None):
+    '''
+    streaming mix of the sources into a single wav. Each source is read in chunks,
+    trimmed by its start / end, converted to the output format and summed into a
+    block buffer at its position, the output is written a block at a time. Sources
+    that are read in full have their peak files cached as a side effect.
+
+    :param sources: list of MixSource objects
+    :param filepath: output wav
+    :param rate: output sample rate, default is the highest of the sources
+    :param channels: output channels, default is the most of the sources
+    :param width: output bytes per sample, default is the widest of the sources
+    :param duration: min duration of the output in seconds, the output always runs to
+        the end of the last source
+    :param chunk: frames per block, default RED9_AUDIO_CHUNK
+    :return: list of the sources that failed to open
+    '''
+    chunk = chunk or RED9_AUDIO_CHUNK
+    failed = []
+    valid = []
+    for source in sources:
+        try:
+            reader = source.open()
+            if reader.channels > 2:
+                raise ValueError('Only mono and stereo sources are supported : %i channels' % reader.channels)
+            valid.append(source)
+        except (IOError, OSError, ValueError), err:
+            log.warning('Audio source failed : %s : %s' % (source.name, err))
+            source.close()
+            failed.append(source)
+    if not valid:
+        raise ValueError('No valid audio sources to mix')
+
+    try:
+        rate = rate or max([s.reader.rate for s in valid])
+        channels = channels or max([s.reader.channels for s in valid])
+        width = width or max([4 if s.reader.isFloat else s.reader.width for s in valid])
+        streams = sorted([_SourceStream(s, rate, channels, chunk) for s in valid], key=lambda x: x.outStart)
+        total = max([s.outEnd for s in streams])
+        if duration:
+            total = max(total, int(round(duration * rate)))
+        log.info('Audio mixdown : %i sources, %.2f seconds, %iHz, %i channels, %ibit' %
+                 (len(streams), total / float(rate), rate, channels, width * 8))
+
+        out = wave.open(filepath, 'wb')
+        try:
+            out.setnchannels(channels)
+            out.setsampwidth(width)
+            out.setframerate(rate)
+            frameBytes = channels * 4
+            for blockStart in range(0, total, chunk):
+                blockEnd = min(total, blockStart + chunk)
+                block = bytearray((blockEnd - blockStart) * frameBytes)
+                for stream in streams:
+                    if stream.outStart >= blockEnd:
+                        break  # sorted, nothing further starts in this block
+                    start = max(blockStart, stream.outStart)
+                    end = min(blockEnd, stream.outEnd)
+                    if start >= end:
+                        continue
+                    a = (start - blockStart) * frameBytes
+                    b = (end - blockStart) * frameBytes
+                    block[a:b] = audioop.add(str(block[a:b]), stream.read(end - start), 4)
+                out.writeframesraw(fromInt32(str(block), width))
+        finally:
+            out.close()
+        for stream in streams:
+            if stream.frame < stream.end:
+                continue  # ended early, we won't have seen all of it
+            stream.finish()
+    finally:
+        for source in valid:
+            source.close()
+    return failed
@@ -22,11 +22,14 @@ import re
 import random
 import math
 import os
+import time
+from contextlib import contextmanager
 
 import Red9.packages.configobj as configobj
 import Red9.startup.setup as r9Setup
 
 import Red9_General as r9General
+import Red9_Profiler as r9Profiler
 import Red9_Audio as r9Audio
 import Red9_AnimationUtils as r9Anim
 import Red9_Meta as r9Meta
@@ -430,6 +433,21 @@ class FilterNode_Settings(object):
                     self.searchAttrs == settingsdata.searchAttrs,
                     self.searchPattern == settingsdata.searchPattern])
 
+    def cacheKey(self):
+        '''
+        hashable key of the filters, used by the FilterNode memo. Covers the
+        same args as __eq__
+        '''
+        return repr((self.transformClamp,
+                     self.metaRig,
+                     self.hierarchy,
+                     sorted(self.rigData.items()),
+                     self.incRoots,
+                     self.filterPriority,
+                     self.nodeTypes,
+                     self.searchAttrs,
+                     self.searchPattern))
+
     def filterIsActive(self):
         '''
         the filter is deemed to be active if any of the filterSettings would
@@ -695,6 +713,104 @@ class FilterNode_UI(object):
             cmds.select(nodes)
 
 
+# FilterNode memo -------------------------------------------------------------------
+# processFilter results keyed by (roots, settings.cacheKey()). Any DAG, naming, connection
+# or node add/remove change clears the lot, as does adding/removing attrs on the nodes the
+# attribute filter ran over. The callbacks only exist while the memo has entries.
+
+global RED9_FILTER_MEMO
+RED9_FILTER_MEMO = {}
+if 'RED9_FILTER_CALLBACKS' not in globals():
+    global RED9_FILTER_CALLBACKS
+    RED9_FILTER_CALLBACKS = []
+global RED9_FILTER_WATCHED_ATTRS  # attrs with value tests, setting these clears the memo
+RED9_FILTER_WATCHED_ATTRS = set()
+
+
+def clearFilterMemo(*args):
+    '''
+    clear the FilterNode memo and remove the callbacks that guard it
+    '''
+    RED9_FILTER_MEMO.clear()
+    RED9_FILTER_WATCHED_ATTRS.clear()
+    while RED9_FILTER_CALLBACKS:
+        try:
+            OpenMaya.MMessage.removeCallback(RED9_FILTER_CALLBACKS.pop())
+        except StandardError:
+            pass
+
+
+def _filterMemo_attrChanged(msg, plug, otherPlug, *args):
+    if msg & (OpenMaya.MNodeMessage.kAttributeAdded |
+              OpenMaya.MNodeMessage.kAttributeRemoved |
+              OpenMaya.MNodeMessage.kAttributeRenamed):
+        clearFilterMemo()
+    elif msg & OpenMaya.MNodeMessage.kAttributeSet and RED9_FILTER_WATCHED_ATTRS:
+        try:
+            if plug.partialName(False, False, False, False, False, True) in RED9_FILTER_WATCHED_ATTRS \
+                    or plug.partialName() in RED9_FILTER_WATCHED_ATTRS:
+                clearFilterMemo()
+        except StandardError:
+            clearFilterMemo()
+
+
+def _filterMemo_register(attrNodes=None):
+    '''
+    add the global invalidation callbacks if they're not running and, if given,
+    attr callbacks on the nodes that the attribute filter processed
+    '''
+    if not RED9_FILTER_CALLBACKS:
+        RED9_FILTER_CALLBACKS.extend([
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeOpen, clearFilterMemo),
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeNew, clearFilterMemo),
+            OpenMaya.MDGMessage.addNodeAddedCallback(clearFilterMemo, 'dependNode'),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(clearFilterMemo, 'dependNode'),
+            OpenMaya.MDGMessage.addConnectionCallback(clearFilterMemo),
+            OpenMaya.MDagMessage.addAllDagChangesCallback(clearFilterMemo),
+            OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), clearFilterMemo)])
+    if attrNodes:
+        mSel = OpenMaya.MSelectionList()
+        mObj = OpenMaya.MObject()
+        for node in attrNodes:
+            try:
+                mSel.clear()
+                mSel.add(node)
+                mSel.getDependNode(0, mObj)
+                RED9_FILTER_CALLBACKS.append(OpenMaya.MNodeMessage.addAttributeChangedCallback(mObj, _filterMemo_attrChanged))
+            except RuntimeError:
+                pass
+
+
+def _nodeTypeData(nodes):
+    '''
+    bulk nodeType read via the API rather than cmds.nodeType per node
+
+    :return: list of (nodeType, isShape, isTransform, parentTransform) per node, parentTransform
+        is only filled for shapes. Nodes not found return (None, False, False, None)
+    '''
+    data = []
+    mSel = OpenMaya.MSelectionList()
+    mObj = OpenMaya.MObject()
+    mDag = OpenMaya.MDagPath()
+    for node in nodes:
+        try:
+            mSel.clear()
+            mSel.add(node)
+            mSel.getDependNode(0, mObj)
+        except RuntimeError:
+            data.append((None, False, False, None))
+            continue
+        parent = None
+        isShape = mObj.hasFn(OpenMaya.MFn.kShape)
+        if isShape:
+            mSel.getDagPath(0, mDag)
+            mDag.pop()
+            parent = mDag.fullPathName()
+        data.append((OpenMaya.MFnDependencyNode(mObj).typeName(), isShape,
+                     mObj.hasFn(OpenMaya.MFn.kTransform), parent))
+    return data
+
+
 class FilterNode(object):
     '''
     FilterNode is a class for managing, searching and filtering nodes with the scene.
@@ -754,6 +870,7 @@ class FilterNode(object):
         self.foundPattern = []  # Matched NodeName pattern list from lsSearchNamePattern
         self.intersectionData = []
         self.characterSetMembers = []  # Character Set member list from lsCharacterMembers
+        self._attrSearched = []  # nodes the attribute filter ran over, watched by the memo
         # root objects to filter NOTE: This also switches Processing Mode to suit
         if roots:
             self.rootNodes = roots
@@ -952,14 +1069,15 @@ class FilterNode(object):
             # However, this also will check if we're searching for given shapeNodeTypes and if so
             # question any transforms for child nodes of the correct shapeType
             shapeTypes = list(set(nodeTypes).intersection(set(self.knownShapes())))
+            typeData = _nodeTypeData(nodes)
             if not shapeTypes:
-                typeMatched = [node for node in nodes if cmds.nodeType(node) in nodeTypes]
+                typeMatched = [node for node, data in zip(nodes, typeData) if data[0] in nodeTypes]
             else:
-                for node in nodes:
-                    if cmds.nodeType(node) in nodeTypes:
+                for node, data in zip(nodes, typeData):
+                    if data[0] in nodeTypes:
                         typeMatched.append(node)
                     else:
-                        if 'transform' in cmds.nodeType(node, i=True):
+                        if data[2]:
                             shapeMatched = cmds.listRelatives(node, type=shapeTypes, f=True)
                             if shapeMatched:
                                 typeMatched.extend(shapeMatched)
@@ -992,25 +1110,34 @@ class FilterNode(object):
         if typeMatched:
             if not transformClamp:
                 self.foundNodeTypes = typeMatched
+                found = set(typeMatched)
             else:
-                for node in typeMatched:
-                    # Check if the nodeType is inherited/subclass of 'shape', if so, return
-                    # it's parent transform node. Note: if it is a shape node then we INSERT
-                    # it at the front of the list, rather than appending to the end.
-                    # This is due to the way Maya returns data from the listRelatives cmd
-                    if 'shape' in cmds.nodeType(node, i=True):
-                        parentTransform = cmds.listRelatives(node, f=True, p=True)[0]
-                        if parentTransform not in self.foundNodeTypes:
-                            self.foundNodeTypes.insert(0, parentTransform)
-                    else:
-                        if node not in self.foundNodeTypes:
-                            self.foundNodeTypes.append(node)
+                # Check if the nodeType is inherited/subclass of 'shape', if so, return
+                # it's parent transform node. Note: if it is a shape node then it goes
+                # to the FRONT of the list, rather than appending to the end.
+                # This is due to the way Maya returns data from the listRelatives cmd.
+                # Built as front/back lists against a set rather than list.insert(0)
+                front = []
+                back = []
+                found = set()
+                for node, data in zip(typeMatched, _nodeTypeData(typeMatched)):
+                    if data[1]:
+                        if data[3] not in found:
+                            found.add(data[3])
+                            front.append(data[3])
+                    elif node not in found:
+                        found.add(node)
+                        back.append(node)
+                front.reverse()
+                self.foundNodeTypes = front + back
 
             # test if the roots match the searchTypes if so add them to the end
             if self.processMode == 'Selected':
                 if incRoots:
-                    [self.foundNodeTypes.append(node) for node in self.rootNodes
-                        if cmds.nodeType(node) in nodeTypes and node not in self.foundNodeTypes]
+                    for node, data in zip(self.rootNodes, _nodeTypeData(self.rootNodes)):
+                        if data[0] in nodeTypes and node not in found:
+                            found.add(node)
+                            self.foundNodeTypes.append(node)
                     log.debug('RootNode Matched by incRoots : %s', self.foundNodeTypes)
                 else:
                     try:
@@ -1130,26 +1257,23 @@ class FilterNode(object):
         if not safe:
             return list(set(animCurves))
         else:
-            safeCurves = list(animCurves)
-            for animCurve in animCurves:
+            safeCurves = []
+            for animCurve in set(animCurves):
                 # ignore referenced animCurves
                 if not allow_ref and cmds.referenceQuery(animCurve, inr=True):
-                    safeCurves.remove(animCurve)
                     continue
                 # ignore setDrivens : animCurve have input connections
                 if cmds.listConnections(animCurve, s=True, d=False):
-                    safeCurves.remove(animCurve)
                     continue
                 # ignore animClip curve data : animCurve is part of a TraxClip
                 if cmds.nodeType(cmds.listConnections(animCurve)) == 'clipLibrary':
-                    safeCurves.remove(animCurve)
                     continue
                 # ignore curve if FUCKING animlayer it's a member of is locked!
                 if cmds.getAttr("%s.ktv" % animCurve, l=True):
-                    safeCurves.remove(animCurve)
                     continue
 
                 # if curve.keyTimeValue.isLocked(): return False
+                safeCurves.append(animCurve)
             return safeCurves
 
     # Attribute Management Block
@@ -1471,7 +1595,7 @@ class FilterNode(object):
         return self.processFilter()
 
     # @r9General.Timer
-    def processFilter(self):
+    def processFilter(self, useMemo=True):
             '''
             Uses intersection to allow you to process multiple search flags for
             more accurate filtering.
@@ -1482,12 +1606,36 @@ class FilterNode(object):
             :param settings.searchPattern: name pattern to match on child nodes
             :param settings.transformClamp: Clamp the return to the Transform nodes.
             :param settings.incRoots: Include the given root nodes in the search.
+            :param useMemo: re-use the result of a previous call with the same rootNodes and
+                filters if nothing in the scene has changed since, see RED9_FILTER_MEMO
 
             :return: all nodes which match ALL the given keyword filter searches
             '''
             log.debug(self.settings.__dict__)
             self.intersectionData = []
 
+            memoKey = None
+            if useMemo and self.processMode == 'Selected' and self.settings.filterIsActive():
+                memoKey = (tuple(self.rootNodes), self.settings.cacheKey())
+                if memoKey in RED9_FILTER_MEMO:
+                    log.debug('processFilter : returning memoised result')
+                    self.intersectionData = list(RED9_FILTER_MEMO[memoKey])
+                    return self.intersectionData
+            result = self._processFilter()
+            if memoKey is not None:
+                _filterMemo_register(self._attrSearched)
+                for attr in self.settings.searchAttrs:
+                    if '=' in attr:
+                        RED9_FILTER_WATCHED_ATTRS.add(attr.replace(' ', '').split('=')[0].split('NOT:')[-1])
+                RED9_FILTER_MEMO[memoKey] = list(result)
+            return result
+
+    def _processFilter(self):
+            '''
+            the main filter, see processFilter
+            '''
+            self._attrSearched = []
+
             # wrap the intersector call
             def addToIntersection(nodes):
                 if nodes:
@@ -1536,6 +1684,7 @@ class FilterNode(object):
                 nodes = self.lsSearchAttributes(self.settings.searchAttrs,
                                                 nodes=self.intersectionData,
                                                 incRoots=self.settings.incRoots)
+                self._attrSearched = list(self.intersectionData or self.hierarchy)
                 addToIntersection(nodes)
                 if not nodes:
                     return []
@@ -1614,6 +1763,187 @@ def getBlendTargetIndex(blendNode, targetName):
 # -------------------------------------------------------------------------------------
 # Node Matching ------
 # -------------------------------------------------------------------------------------
+class _MatchIndexQueue(object):
+    '''
+    Ascending queue of nodeB indexes with lazy removal. Indexes are always
+    appended in nodeListB order so the head of the queue is the first
+    un-consumed candidate, exactly as the old linear scan would have found it.
+    '''
+    __slots__ = ('indexes', 'head')
+
+    def __init__(self):
+        self.indexes = []
+        self.head = 0
+
+    def first(self, consumed):
+        indexes = self.indexes
+        while self.head < len(indexes) and consumed[indexes[self.head]]:
+            self.head += 1
+        if self.head < len(indexes):
+            return indexes[self.head]
+
+
+class _MatchSuffixTrie(object):
+    '''
+    Trie built over the REVERSED stripped names of nodeListB. Walking it with a
+    reversed nodeA name gives us, in one pass, every nodeB whose name is a
+    suffix of nodeA ('exact' queues along the walk) and every nodeB that
+    ends with nodeA (the 'subtree' queue of the final trie node).
+    '''
+    __slots__ = ('children', 'exact', 'subtree')
+
+    def __init__(self):
+        self.children = {}
+        self.exact = None
+        self.subtree = _MatchIndexQueue()
+
+    def insert(self, key, index):
+        node = self
+        node.subtree.indexes.append(index)
+        for char in reversed(key):
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _MatchSuffixTrie()
+            node = child
+            node.subtree.indexes.append(index)
+        if node.exact is None:
+            node.exact = _MatchIndexQueue()
+        node.exact.indexes.append(index)
+
+    def first_suffix_match(self, key, consumed):
+        '''
+        lowest un-consumed index such that key.endswith(keyB) or keyB.endswith(key)
+        '''
+        found = None
+        node = self
+        for char in reversed(key):
+            if node.exact is not None:
+                index = node.exact.first(consumed)
+                if index is not None and (found is None or index < found):
+                    found = index
+            node = node.children.get(char)
+            if node is None:
+                return found
+        index = node.subtree.first(consumed)
+        if index is not None and (found is None or index < found):
+            found = index
+        return found
+
+
+def _matchKey_hashable(data):
+    '''
+    convert the metaData connection map into a hashable key for the index
+    '''
+    if isinstance(data, dict):
+        return tuple(sorted(data.items()))
+    if isinstance(data, list):
+        return tuple(data)
+    return data
+
+
+class NodeMatchIndex(object):
+    '''
+    Matching engine used by matchNodeLists. nodeListB is pre-processed ONCE
+    into lookup tables for the given matchMethod (stripped / upper-cased names,
+    mirror IDs or metaData connection maps) so each nodeA resolves its match
+    via dict / trie lookups rather than a full scan of nodeListB, taking the
+    old O(N*M) matching down to roughly O(N+M).
+
+    The pairing is identical to the original linear implementation, each nodeA
+    takes the FIRST remaining nodeB in list order that satisfies the method.
+
+    :param nodeListB: list of nodes to match against
+    :param matchMethod: 'base', 'stripPrefix', 'mirrorIndex' or 'metaData'
+    '''
+    def __init__(self, nodeListB, matchMethod='stripPrefix'):
+        self.nodes = list(nodeListB)
+        self.matchMethod = matchMethod
+        self.consumed = [False] * len(self.nodes)
+        self.keys = []  # the keys used for nodeB, cached for nodeA lookups
+        self._exact = {}  # key : _MatchIndexQueue
+        self._trie = None
+        self._unhashable = []  # metaData maps we couldn't hash, fall back to a scan
+
+        self._keyCache = {}  # mirrorIndex : node : compiledID, bulk read via the MirrorTable
+        if matchMethod == 'mirrorIndex':
+            self._getMirrorID = r9Anim.MirrorHierarchy().getMirrorCompiledID
+            self._keyCache = r9Anim.MirrorTable().getCompiledIDs(self.nodes)
+            self.getKey = self._getCachedMirrorID
+        elif matchMethod == 'metaData':
+            self.getKey = r9Meta.MetaClass.getNodeConnectionMetaDataMap
+        elif matchMethod in ['base', 'stripPrefix']:
+            self.getKey = lambda node: nodeNameStrip(node).upper()
+        else:
+            log.warning('NodeMatchIndex : unsupported matchMethod : %s' % matchMethod)
+            self.getKey = None
+            return
+
+        if matchMethod == 'stripPrefix':
+            self._trie = _MatchSuffixTrie()
+        for index, node in enumerate(self.nodes):
+            key = self.getKey(node)
+            self.keys.append(key)
+            if matchMethod in ['mirrorIndex', 'metaData'] and not key:
+                continue
+            try:
+                hashed = _matchKey_hashable(key)
+                queue = self._exact.get(hashed)
+            except TypeError:
+                self._unhashable.append(index)
+                continue
+            if queue is None:
+                queue = self._exact[hashed] = _MatchIndexQueue()
+            queue.indexes.append(index)
+            if self._trie is not None:
+                self._trie.insert(key, index)
+
+    def _getCachedMirrorID(self, node):
+        try:
+            return self._keyCache[node]
+        except KeyError:
+            return self._getMirrorID(node)
+
+    def prime(self, nodesA):
+        '''
+        bulk read the keys for the nodeA's up front, only used by mirrorIndex
+        where each key would otherwise be a couple of getAttr calls per node
+        '''
+        if self.matchMethod == 'mirrorIndex':
+            self._keyCache.update(r9Anim.MirrorTable().getCompiledIDs(nodesA))
+
+    def match(self, nodeA):
+        '''
+        find, and consume, the matching nodeB for the given nodeA
+
+        :return: nodeB or None if no match was found
+        '''
+        if self.getKey is None:
+            return None
+        keyA = self.getKey(nodeA)
+        found = None
+        if self.matchMethod in ['mirrorIndex', 'metaData'] and not keyA:
+            return None
+        try:
+            queue = self._exact.get(_matchKey_hashable(keyA))
+        except TypeError:
+            queue = None
+        if queue is not None:
+            found = queue.first(self.consumed)
+        if found is None and self._unhashable:
+            for index in self._unhashable:
+                if not self.consumed[index] and keyA == self.keys[index]:
+                    found = index
+                    break
+
+        # stripPrefix always tries the base match first, then relaxes to suffix matching
+        if found is None and self._trie is not None:
+            found = self._trie.first_suffix_match(keyA, self.consumed)
+        if found is None:
+            return None
+        self.consumed[found] = True
+        return self.nodes[found]
+
+
 @r9General.Timer
 def matchNodeLists(nodeListA, nodeListB, matchMethod='stripPrefix', returnfails=False):
     '''
@@ -1636,6 +1966,52 @@ def matchNodeLists(nodeListA, nodeListB, matchMethod='stripPrefix', returnfails=
         | * matchMethod="metaData" : match the nodes based on their wiring connections to the MetaData framework
 
     :return: matched pairs of tuples for processing [(a1,b2),[(a2,b2)]
+
+    .. note::
+        the matching itself is run through the NodeMatchIndex engine, nodeListB is
+        indexed once per call. _matchNodeLists_legacy is the original linear
+        implementation kept as the reference for the unittests and benchmarks.
+    '''
+    infoPrint = ""
+    matchedData = []
+    unmatched = []
+
+    if matchMethod == 'index':
+        matchedData = zip(nodeListA, nodeListB)
+    elif matchMethod == 'indexReversed':
+        nodeListA.reverse()
+        nodeListB.reverse()
+        matchedData = zip(nodeListA, nodeListB)
+    else:
+        debug = logging_is_debug()
+        matchIndex = NodeMatchIndex(nodeListB, matchMethod=matchMethod)
+        matchIndex.prime(nodeListA)
+        for nodeA in nodeListA:
+            nodeB = matchIndex.match(nodeA)
+            if nodeB is None:
+                unmatched.append(nodeA)
+                continue
+            if debug:
+                infoPrint += '\nMatch Method : %s : %s == %s' % \
+                        (matchMethod, nodeA.split('|')[-1], nodeB.split('|')[-1])
+            matchedData.append((nodeA, nodeB))
+
+        if unmatched and debug:
+            for node in unmatched:
+                infoPrint += '\n!! Unresolved Matched Node !! : Match Method : %s : %s' % (matchMethod, node.split('|')[-1])
+
+    log.debug('\nMatched Log : \n%s' % infoPrint)
+    infoPrint = None
+    if returnfails:
+        return matchedData, unmatched
+    else:
+        return matchedData
+
+
+def _matchNodeLists_legacy(nodeListA, nodeListB, matchMethod='stripPrefix', returnfails=False):
+    '''
+    The original O(N*M) implementation of matchNodeLists, kept purely as the
+    reference that the NodeMatchIndex results and benchmarks are compared against.
     '''
     infoPrint = ""
     matchedData = []
@@ -2424,19 +2800,103 @@ class TimeOffset(object):
 
     '''
 
-    # list of nodes processed by the systems so we no longer run the risk of offsetting a node twice!
-    _processed = {'animcurves': [],
-                  'sound': [],
-                  'animclips': [],
-                  'mnodes': [],
-                  'image_planes': [],
-                  'mnode_internals': []}
+    # nodes processed by the systems so we no longer run the risk of offsetting a node twice!
+    # sets per category, see _newCache
+    _processed = {'animcurves': set(),
+                  'sound': set(),
+                  'animclips': set(),
+                  'mnodes': set(),
+                  'image_planes': set(),
+                  'mnode_internals': set()}
+
+    # per category counts and timings of the last offset, see report()
+    _stats = {}
+
+    # True while a fullScene / fromSelected pass runs, the only time the per
+    # category calls share the _processed cache
+    _inPass = False
 
     def __init__(self, cache_object=None):
         if cache_object:
             self._processed = cache_object
             print('consuming current cached object')
 
+    @staticmethod
+    def _newCache():
+        return {'animcurves': set(),
+                'sound': set(),
+                'animclips': set(),
+                'mnodes': set(),
+                'image_planes': set(),
+                'mnode_internals': set()}
+
+    @classmethod
+    @contextmanager
+    def _offsetPass(cls):
+        '''
+        a fullScene / fromSelected pass, the per category calls made inside it share
+        one clean _processed cache so nothing is offset twice
+        '''
+        cls._processed = cls._newCache()
+        cls._stats = {}
+        cls._inPass = True
+        try:
+            yield
+        finally:
+            cls._inPass = False
+
+    @classmethod
+    def _startCall(cls):
+        '''
+        a per category call made on its own, outside of a pass, starts from a clean
+        cache so nodes handled by an earlier call aren't skipped
+        '''
+        if not cls._inPass:
+            cls._processed = cls._newCache()
+            cls._stats = {}
+
+    @classmethod
+    def _isProcessed(cls, node, *categories):
+        for category in categories:
+            if node in cls._processed.get(category, ()):
+                return True
+        return False
+
+    @classmethod
+    def _markProcessed(cls, category, nodes):
+        cls._processed.setdefault(category, set()).update(nodes)
+
+    @classmethod
+    @contextmanager
+    def _timed(cls, category):
+        '''
+        time a block of the offset into the report, also recorded as a span
+        when the r9Profiler is enabled
+        '''
+        start = time.time()
+        try:
+            with r9Profiler.span('TimeOffset.%s' % category, 'timeOffset'):
+                yield
+        finally:
+            cls._stats[category] = cls._stats.get(category, 0.0) + time.time() - start
+
+    @classmethod
+    def report(cls):
+        '''
+        per category counts and timings of the last fullScene / fromSelected offset
+
+        :return: {category: {'count': int, 'time': seconds}}
+        '''
+        data = {}
+        for category, seconds in cls._stats.items():
+            data[category] = {'count': len(cls._processed.get(category, ())), 'time': seconds}
+        return data
+
+    @classmethod
+    def _logReport(cls):
+        for category, data in sorted(cls.report().items()):
+            log.info('TimeOffset : %-15s : %6i nodes : %.3f secs' % (category, data['count'], data['time']))
+
     @classmethod
     def fullScene(cls, offset, timelines=False, timerange=None, ripple=True, startfrm=False):
         '''
@@ -2448,23 +2908,24 @@ class TimeOffset(object):
         :param ripple: manage the upper range of data and ripple them with the offset
         :param startfrm: this turns the offset arg into a new target start frame for the animation,
             calculating the offset for you such that timerange[0] starts at the offset frm value, only works if timerange is passed in
+        :return: the processed cache, {category: set(nodes)}
         '''
         if timerange and startfrm:
             offset = offset - timerange[0]
 
         log.debug('TimeOffset Scene : offset=%s, timelines=%s' %
                   (offset, str(timelines)))
-        cls._processed = {}  # clear the cache
 
 #         with r9General.undoContext():
-        with r9General.AnimationContext(eval_mode='anim', time=False, undo=True):
-            cls._processed['mnodes'], cls._processed['mnode_internals'] = cls.metaNodes(offset, timerange=timerange, ripple=ripple)
-            cls._processed['animcurves'] = cls.animCurves(offset, timerange=timerange, ripple=ripple)
-            cls._processed['sound'] = cls.sound(offset, mode='Scene', timerange=timerange, ripple=ripple)
-            cls._processed['animclips'] = cls.animClips(offset, mode='Scene', timerange=timerange, ripple=ripple)
+        with cls._offsetPass(), r9General.AnimationContext(eval_mode='anim', time=False, undo=True):
+            cls.metaNodes(offset, timerange=timerange, ripple=ripple)
+            cls.animCurves(offset, timerange=timerange, ripple=ripple)
+            cls.sound(offset, mode='Scene', timerange=timerange, ripple=ripple)
+            cls.animClips(offset, mode='Scene', timerange=timerange, ripple=ripple)
             if timelines:
                 cls.timelines(offset)
 
+        cls._logReport()
         print('Scene Offset Successfully')
         return cls._processed
 
@@ -2517,7 +2978,6 @@ class TimeOffset(object):
                 basenodes = [nodes]
             else:
                 basenodes = nodes
-        cls._processed = {}  # clear the cache
 
         # deal with mNodes / mRigs
         # ======================================
@@ -2560,10 +3020,11 @@ class TimeOffset(object):
 
         if filtered:
 #             with r9General.undoContext():
-            with r9General.AnimationContext(eval_mode='anim', time=False, undo=True):
+            with cls._offsetPass(), r9General.AnimationContext(eval_mode='anim', time=False, undo=True):
                 if flocking or randomize:
                     cachedOffset = 0  # Cached last flocking value
                     increment = 0
+                    groups = {}
                     for node in filtered:
                         if randomize and not flocking:
                             increment = random.uniform(0, offset)
@@ -2574,33 +3035,116 @@ class TimeOffset(object):
                             rand = random.uniform(0, offset)
                             increment = cachedOffset + rand
                             cachedOffset += rand
-                        cls._processed['animcurves'] = cls.animCurves(increment, node,
-                                                                      timerange=timerange,
-                                                                      ripple=ripple)
+                        cls._groupAnimCurves(groups, increment, nodes=node, timerange=timerange, ripple=ripple)
                         if logging_is_debug():
                             log.debug('animData randon/flock modified offset : %f on node: %s' % (increment, nodeNameStrip(node)))
+                    with cls._timed('animcurves'):
+                        cls._shiftAnimCurves(groups)
                 else:
-                    cls._processed['mnodes'], cls._processed['mnode_internals'] = cls.metaNodes(offset, mNodes=mNodes,
-                                                                                                timerange=timerange,
-                                                                                                ripple=ripple)
+                    cls.metaNodes(offset, mNodes=mNodes, timerange=timerange, ripple=ripple)
 
-                    cls._processed['animcurves'] = cls.animCurves(offset, nodes=filtered, timerange=timerange, ripple=ripple)
+                    cls.animCurves(offset, nodes=filtered, timerange=timerange, ripple=ripple)
 
-                    cls._processed['sound'] = cls.sound(offset, mode='Selected',
-                                                        audioNodes=FilterNode().lsSearchNodeTypes('audio', filtered),
-                                                        timerange=timerange,
-                                                        ripple=ripple)
+                    cls.sound(offset, mode='Selected',
+                              audioNodes=FilterNode().lsSearchNodeTypes('audio', filtered),
+                              timerange=timerange,
+                              ripple=ripple)
 
-                    cls._processed['animclips'] = cls.animClips(offset, mode='Selected',
-                                                                clips=FilterNode().lsSearchNodeTypes('animClip', filtered),
-                                                                timerange=timerange,
-                                                                ripple=ripple)
+                    cls.animClips(offset, mode='Selected',
+                                  clips=FilterNode().lsSearchNodeTypes('animClip', filtered),
+                                  timerange=timerange,
+                                  ripple=ripple)
+                cls._logReport()
                 log.info('Selected Nodes Offset Successfully')
 
                 return cls._processed
         else:
             raise StandardError('Nothing selected or returned from the Hierarchy filter to offset')
 
+    @staticmethod
+    def _curveShiftRanges(offset, timerange=None, ripple=True):
+        '''
+        the (cutRange, shiftRange) used to offset curves, None where the whole
+        curve is used
+        '''
+        if not timerange:
+            return None, None
+        if offset > 0:
+            # if moving positive in time, cutchunk is from the upper timerange + offset
+            cutTimeBlock = (timerange[1] + 0.1, timerange[1] + offset)
+        else:
+            # else it's from the lower timerange - offset
+            # cutTimeBlock=(timerange[0] + 0.1, timerange[0] - abs(offset + 1))
+            cutTimeBlock = (timerange[0] - 0.1, timerange[0] - abs(offset))  # corrections in the gap being created!!!
+        if ripple:
+            shiftRange = (timerange[0], 1000000000)
+        else:
+            shiftRange = tuple(timerange)
+        if ripple and not offset < 0:
+            cutTimeBlock = None
+        return cutTimeBlock, shiftRange
+
+    @classmethod
+    def _groupAnimCurves(cls, groups, offset, nodes=None, timerange=None, ripple=True, safe=True, allow_ref=False):
+        '''
+        find the curves to offset and add them to the groups dict, keyed by (offset, cutRange, shiftRange)
+        so that every curve sharing the same edit is shifted in a single command. Curves already processed,
+        or already grouped, are skipped
+
+        :return: the curves added
+        '''
+        curves = []
+        for curve in FilterNode.lsAnimCurves(nodes, safe=safe, allow_ref=allow_ref):
+            # bail if already processed
+            if cls._isProcessed(curve, 'animcurves', 'mnode_internals'):
+                log.debug('skipping already processed animcurve : %s' % curve)
+                continue
+            curves.append(curve)
+        if curves:
+            cutRange, shiftRange = cls._curveShiftRanges(offset, timerange, ripple)
+            groups.setdefault((offset, cutRange, shiftRange), []).extend(curves)
+            cls._markProcessed('animcurves', curves)
+        return curves
+
+    @classmethod
+    def _shiftAnimCurves(cls, groups):
+        '''
+        offset the grouped curves, one cutKey / keyframe call per group. If a bulk
+        call fails we drop back to per curve calls for that group to isolate the bad curves
+
+        :param groups: {(offset, cutRange, shiftRange): [curves]} as built by _groupAnimCurves
+        :return: the curves moved
+        '''
+        curves_moved = []
+        for (offset, cutRange, shiftRange), curves in groups.items():
+            log.debug('AnimCurve Offset = %s : %i curves, cut=%s, range=%s' % (offset, len(curves), cutRange, shiftRange))
+            kws = {'edit': True, 'r': True, 'timeChange': offset}
+            if shiftRange:
+                kws['time'] = shiftRange
+            try:
+                if cutRange:
+                    log.debug('cutting moveRange: %f > %f' % (cutRange[0], cutRange[1]))
+                    cmds.cutKey(curves, time=cutRange)
+                cmds.keyframe(curves, **kws)
+                curves_moved.extend(curves)
+                continue
+            except StandardError, err:
+                log.debug('bulk offset failed, processing curves individually : %s' % err)
+            for curve in curves:
+                try:
+                    if cutRange:
+                        try:
+                            cmds.cutKey(curve, time=cutRange)
+                        except:
+                            log.debug('unable to cut keys')
+                    cmds.keyframe(curve, **kws)
+                    curves_moved.append(curve)
+                except StandardError, err:
+                    log.info('Failed to offset curves fully : %s' % curve)
+                    log.debug(err)
+                    cls._processed['animcurves'].discard(curve)
+        return curves_moved
+
     @classmethod
     def animCurves(cls, offset, nodes=None, timerange=None, ripple=True, safe=True, allow_ref=False):
         '''
@@ -2617,50 +3161,12 @@ class TimeOffset(object):
             will strip out SetDrivens, Clips curves etc..
         :param allow_ref: if False and "safe" we remove all references animCurves, else we leave them in the return
         '''
-        safeCurves = FilterNode.lsAnimCurves(nodes, safe=safe, allow_ref=allow_ref)
-        curves_moved = []
-
-        if safeCurves:
-            log.debug('AnimCurve Offset = %s ============================' % offset)
-            # log.debug(''.join([('offset: %s\n' % curve) for curve in safeCurves]))
-            if timerange:
-                rippleRange = (timerange[0], 1000000000)
-                if offset > 0:
-                    # if moving positive in time, cutchunk is from the upper timerange + offset
-                    cutTimeBlock = (timerange[1] + 0.1, timerange[1] + offset)
-                else:
-                    # else it's from the lower timerange - offset
-                    # cutTimeBlock=(timerange[0] + 0.1, timerange[0] - abs(offset + 1))
-                    cutTimeBlock = (timerange[0] - 0.1, timerange[0] - abs(offset))  # corrections in the gap being created!!!
-                log.debug('Cutting time range : %s>%s' % (cutTimeBlock[0], cutTimeBlock[1]))
-
-            for curve in safeCurves:
-                # bail if already processed
-                if 'animcurves' in cls._processed and curve in cls._processed['animcurves']:
-                    log.debug('skipping already processed animcurve : %s' % curve)
-                    continue
-                if 'mnode_internals' in cls._processed and curve in cls._processed['mnode_internals']:
-                    log.debug('skipping already processed animcurve : %s' % curve)
-                    continue
-                try:
-                    if timerange:
-                        try:
-                            if not ripple or offset < 0:
-                                log.debug('cutting moveRange: %f > %f  : %s' % (cutTimeBlock[0], cutTimeBlock[1], curve))
-                                cmds.cutKey(curve, time=cutTimeBlock)
-                        except:
-                            log.debug('unable to cut keys')
-                        if ripple:
-                            cmds.keyframe(curve, edit=True, r=True, timeChange=offset, time=rippleRange)
-                        else:
-                            cmds.keyframe(curve, edit=True, r=True, timeChange=offset, time=timerange)
-                    else:
-                        cmds.keyframe(curve, edit=True, r=True, timeChange=offset)
-                    log.debug('offsetting: %s' % curve)
-                    curves_moved.append(curve)
-                except StandardError, err:
-                    log.info('Failed to offset curves fully : %s' % curve)
-                    log.debug(err)
+        cls._startCall()
+        with cls._timed('animcurves'):
+            groups = {}
+            cls._groupAnimCurves(groups, offset, nodes=nodes, timerange=timerange, ripple=ripple, safe=safe, allow_ref=allow_ref)
+            curves_moved = cls._shiftAnimCurves(groups)
+        if curves_moved:
             log.info('%i : AnimCurves were offset' % len(curves_moved))
         return curves_moved
 
@@ -2687,35 +3193,35 @@ class TimeOffset(object):
         :param ripple: when shifting nodes ripple the offset to sounds after the range,
             if ripple=False we only shift audio that starts in the bounds of the timerange
         '''
+        cls._startCall()
         sounds_offset = []
-        if mode == 'Scene':
-            audioNodes = cmds.ls(type='audio')
-        if audioNodes:
-            log.debug('AudioNodes Offset ============================')
-            for sound in audioNodes:
-                try:
-                    # bail if already processed
-                    if 'sound' in cls._processed and sound in cls._processed['sound']:
-                        log.debug('skipping already processed sound : %s' % sound)
-                        continue
-                    if 'mnode_internals' in cls._processed and sound in cls._processed['mnode_internals']:
-                        log.debug('skipping already processed sound : %s' % sound)
-                        continue
-
-                    audioNode = r9Audio.AudioNode(sound)
-                    if timerange:
-                        if not audioNode.startFrame > timerange[0]:
-                            log.info('Skipping Sound : %s > sound starts before the timerange begins' % sound)
-                            continue
-                        if audioNode.startFrame > timerange[1] and not ripple:
-                            log.info('Skipping Sound : %s > sound starts after the timerange ends' % sound)
+        with cls._timed('sound'):
+            if mode == 'Scene':
+                audioNodes = cmds.ls(type='audio')
+            if audioNodes:
+                log.debug('AudioNodes Offset ============================')
+                for sound in audioNodes:
+                    try:
+                        # bail if already processed
+                        if cls._isProcessed(sound, 'sound', 'mnode_internals'):
+                            log.debug('skipping already processed sound : %s' % sound)
                             continue
-                    audioNode.offsetTime(offset)
-                    sounds_offset.append(sound)
-                    log.debug('offset : %s' % sound)
-                except:
-                    log.debug('Failed to offset audio node %s' % sound)
-            log.info('%i : SoundNodes were offset' % len(sounds_offset))
+
+                        audioNode = r9Audio.AudioNode(sound)
+                        if timerange:
+                            if not audioNode.startFrame > timerange[0]:
+                                log.info('Skipping Sound : %s > sound starts before the timerange begins' % sound)
+                                continue
+                            if audioNode.startFrame > timerange[1] and not ripple:
+                                log.info('Skipping Sound : %s > sound starts after the timerange ends' % sound)
+                                continue
+                        audioNode.offsetTime(offset)
+                        sounds_offset.append(sound)
+                        log.debug('offset : %s' % sound)
+                    except:
+                        log.debug('Failed to offset audio node %s' % sound)
+                cls._markProcessed('sound', sounds_offset)
+                log.info('%i : SoundNodes were offset' % len(sounds_offset))
         return sounds_offset
 
     @classmethod
@@ -2730,35 +3236,35 @@ class TimeOffset(object):
         :param ripple: when shifting nodes ripple the offset to clips after the range,
             if ripple=False we only shift clips that starts in tghe bounds of the timerange
         '''
+        cls._startCall()
         clips_moved = []
-        if mode == 'Scene':
-            clips = cmds.ls(type='animClip')
-        if clips:
-            log.debug('Clips Offset ============================')
-            for clip in clips:
-                try:
-                    # bail if already processed
-                    if 'animclips' in cls._processed and clip in cls._processed['animclips']:
-                        log.debug('skipping already processed animclip : %s' % clip)
-                        continue
-                    if 'mnode_internals' in cls._processed and clip in cls._processed['mnode_internals']:
-                        log.debug('skipping already processed animclip : %s' % clip)
-                        continue
-
-                    startFrame = cmds.getAttr('%s.startFrame' % clip)
-                    if timerange:
-                        if not startFrame > timerange[0]:
-                            log.info('Skipping Clip : %s > clip starts before the timerange begins' % clip)
-                            continue
-                        if startFrame > timerange[1] and not ripple:
-                            log.info('Skipping Clip : %s > clip starts after the timerange begins' % clip)
+        with cls._timed('animclips'):
+            if mode == 'Scene':
+                clips = cmds.ls(type='animClip')
+            if clips:
+                log.debug('Clips Offset ============================')
+                for clip in clips:
+                    try:
+                        # bail if already processed
+                        if cls._isProcessed(clip, 'animclips', 'mnode_internals'):
+                            log.debug('skipping already processed animclip : %s' % clip)
                             continue
-                    cmds.setAttr('%s.startFrame' % clip, startFrame + offset)
-                    clips_moved.append(clip)
-                    log.debug('offset : %s' % clip)
-                except:
-                    pass
-            log.info('%i : AnimClips were offset' % len(clips_moved))
+
+                        startFrame = cmds.getAttr('%s.startFrame' % clip)
+                        if timerange:
+                            if not startFrame > timerange[0]:
+                                log.info('Skipping Clip : %s > clip starts before the timerange begins' % clip)
+                                continue
+                            if startFrame > timerange[1] and not ripple:
+                                log.info('Skipping Clip : %s > clip starts after the timerange begins' % clip)
+                                continue
+                        cmds.setAttr('%s.startFrame' % clip, startFrame + offset)
+                        clips_moved.append(clip)
+                        log.debug('offset : %s' % clip)
+                    except:
+                        pass
+                cls._markProcessed('animclips', clips_moved)
+                log.info('%i : AnimClips were offset' % len(clips_moved))
         return clips_moved
 
     @classmethod
@@ -2779,26 +3285,32 @@ class TimeOffset(object):
         '''
         mNodes_offset = []
         mNodes_internal_offset = []  # nodes OTHER than the mNode itself that the function offset
-        if not mNodes:
-            mNodes = r9Meta.getMetaNodes()
-        if mNodes:
-            log.debug('MetaData Offset ============================')
-            for mNode in set(mNodes):
-                # bail if already processed
-                if 'mnode' in cls._processed and mNode.mNode in cls._processed['mnode']:
-                    log.debug('skipping already processed mNode : %s' % mNode)
-                    continue
+        cls._startCall()
+        with cls._timed('mnodes'):
+            if not mNodes:
+                mNodes = r9Meta.getMetaNodes()
+            if mNodes:
+                log.debug('MetaData Offset ============================')
+                for mNode in set(mNodes):
+                    # bail if already processed
+                    if cls._isProcessed(mNode.mNode, 'mnodes'):
+                        log.debug('skipping already processed mNode : %s' % mNode)
+                        continue
 
-                if 'timeOffset' in dir(mNode) and r9General.is_callable(getattr(mNode, 'timeOffset')):
-                    mNodes_internal_offset.extend(mNode.timeOffset(offset, timerange=timerange, ripple=ripple, cache_object=cls._processed) or [])
-                    mNodes_offset.append(mNode.mNode)  # set to cache as dag path to make sure we cover duplicate systems
-                log.debug('offset mnode : %s' % mNode)
-            if mNodes_offset:
-                log.info('================================')
-                log.info('timeOffset generic mClass called')
-                log.info('================================')
-            for i, node in enumerate(mNodes_offset):
-                log.info('%i : MetaData %s.timeOffset : called %s ' % (i, node.__class__.__name__, node))
+                    if 'timeOffset' in dir(mNode) and r9General.is_callable(getattr(mNode, 'timeOffset')):
+                        internals = mNode.timeOffset(offset, timerange=timerange, ripple=ripple, cache_object=cls._processed) or []
+                        mNodes_internal_offset.extend(internals)
+                        mNodes_offset.append(mNode.mNode)  # set to cache as dag path to make sure we cover duplicate systems
+                        # flag as we go so later mNodes sharing the same internals skip them
+                        cls._markProcessed('mnode_internals', internals)
+                        cls._markProcessed('mnodes', [mNode.mNode])
+                    log.debug('offset mnode : %s' % mNode)
+                if mNodes_offset:
+                    log.info('================================')
+                    log.info('timeOffset generic mClass called')
+                    log.info('================================')
+                for i, node in enumerate(mNodes_offset):
+                    log.info('%i : MetaData %s.timeOffset : called %s ' % (i, node.__class__.__name__, node))
         return mNodes_offset, mNodes_internal_offset
 
 # -------------------------------------------------------------------------------------
@@ -0,0 +1,301 @@
+'''
+..
+    Red9 Studio Pack: Maya Pipeline Solutions
+    Author: Mark Jackson
+    email: rednineinfo@gmail.com
+
+    Red9 blog : http://red9-consultancy.blogspot.co.uk/
+    MarkJ blog: http://markj3d.blogspot.co.uk
+
+
+This is the curve processing engine behind the RandomizeKeys and FilterCurves
+tools. Everything here works on plain time / value lists, one whole curve at a
+time, the Maya side reads each animCurve in one bulk query, runs these passes
+and writes the result back in one bulk edit.
+
+    >>> times, values = [0, 1, 2, 3], [0.0, 1.0, 0.0, 1.0]
+    >>> values = gaussian(values, sigma=1.0)
+    >>> keep = reduceKeys(times, values, valueTolerance=0.1)
+
+NOTHING IN THIS MODULE SHOULD REQUIRE MAYA
+
+'''
+
+import math
+import random
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+# max keys processed in total when the interactive sliders are previewing a drag,
+# the full set is processed on release
+RED9_CURVE_PREVIEW_KEYS = 5000
+
+# times closer than this are considered the same key
+TIME_TOLERANCE = 1e-4
+
+
+def timeKey(t):
+    '''
+    hashable key for a time, so float noise doesn't split one key into two
+    '''
+    return int(round(t / TIME_TOLERANCE))
+
+
+def valueRange(values):
+    '''
+    the randomizer bounds used by the normalized noise, half the curve's
+    value range or [-1, 1] for flat curves
+
+    :param values: key values of the curve
+    '''
+    if not values:
+        return [-1, 1]
+    rng = abs(max(values) - min(values)) / 2.0
+    if rng > 1.0:
+        return [-rng, rng]
+    return [-1, 1]
+
+
+def noise(values, randomRange=(-1, 1), damp=1.0, seed=None):
+    '''
+    add random noise to the given values
+
+    :param values: values to process
+    :param randomRange: [lower, upper] bounds passed to the randomizer
+    :param damp: scale applied to each random value
+    :param seed: seed a private generator, the same seed on the same number of
+        values gives the same noise pattern, used by the interactive slider so that
+        only the amplitude changes while dragging
+    '''
+    rand = random.Random(seed) if seed is not None else random
+    lower, upper = randomRange[0], randomRange[1]
+    return [v + rand.uniform(lower, upper) * damp for v in values]
+
+
+def snapTimes(times, values, multiple=1.0):
+    '''
+    snap key times to a time multiple. Where several keys land on the same
+    frame the one that was nearest to it wins
+
+    :param times: key times, sorted
+    :param values: key values
+    :param multiple: time multiple to snap to
+    :return: (times, values)
+    '''
+    best = {}
+    for t, v in zip(times, values):
+        snapped = round(t / multiple) * multiple
+        key = timeKey(snapped)
+        dist = abs(snapped - t)
+        if key not in best or dist < best[key][0]:
+            best[key] = (dist, snapped, v)
+    keys = sorted(best.values(), key=lambda x: x[1])
+    return [k[1] for k in keys], [k[2] for k in keys]
+
+
+def sampleTimes(start, end, step=1.0):
+    '''
+    times from start to end at the given step, end always included
+
+    :param start: start frame
+    :param end: end frame
+    :param step: frame step, must be positive
+    '''
+    if step <= 0:
+        raise ValueError('sampleTimes : step must be positive')
+    count = int(math.floor((end - start) / float(step) + TIME_TOLERANCE))
+    times = [start + i * step for i in range(count + 1)]
+    if not times or abs(times[-1] - end) > TIME_TOLERANCE:
+        times.append(end)
+    return times
+
+
+def gaussianKernel(sigma):
+    '''
+    normalized gaussian weights, radius 3 sigma
+    '''
+    radius = max(1, int(math.ceil(sigma * 3)))
+    weights = [math.exp(-(i * i) / (2.0 * sigma * sigma)) for i in range(-radius, radius + 1)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+
+def gaussian(values, sigma=1.0):
+    '''
+    gaussian smooth, the curve is padded with its end values so the ends hold
+    rather than being dragged towards zero
+
+    :param values: values to smooth, assumed evenly spaced
+    :param sigma: width of the kernel in keys
+    '''
+    if sigma <= 0 or len(values) < 3:
+        return list(values)
+    kernel = gaussianKernel(sigma)
+    radius = len(kernel) // 2
+    padded = [values[0]] * radius + list(values) + [values[-1]] * radius
+    return [sum([w * padded[i + j] for j, w in enumerate(kernel)]) for i in range(len(values))]
+
+
+def butterworthSections(cutoff, fps, order=2):
+    '''
+    biquad coefficients for a low pass butterworth, bilinear transform of the
+    analogue prototype, one section per pair of poles
+
+    :param cutoff: cutoff frequency in Hz
+    :param fps: sample rate, the frame rate of the keys
+    :param order: filter order, rounded up to an even number
+    :return: list of (b0, b1, b2, a1, a2)
+    '''
+    nyquist = fps / 2.0
+    cutoff = min(max(cutoff, 1e-6), nyquist * 0.99)
+    order = max(2, order + (order % 2))
+    k = math.tan(math.pi * cutoff / fps)
+    sections = []
+    for i in range(order // 2):
+        q = 1.0 / (2.0 * math.cos(math.pi * (2 * i + 1) / (2.0 * order)))
+        norm = 1.0 / (1.0 + k / q + k * k)
+        b0 = k * k * norm
+        sections.append((b0, 2 * b0, b0,
+                         2.0 * (k * k - 1.0) * norm,
+                         (1.0 - k / q + k * k) * norm))
+    return sections
+
+
+def _biquad(values, section):
+    '''
+    run one biquad section over the values, the history starts at the first value
+    so a curve that starts off its rest value doesn't ring in from zero
+    '''
+    b0, b1, b2, a1, a2 = section
+    x1 = x2 = y1 = y2 = values[0]
+    result = []
+    for x in values:
+        y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+        x2, x1 = x1, x
+        y2, y1 = y1, y
+        result.append(y)
+    return result
+
+
+def butterworth(values, cutoff=5.0, fps=24.0, order=2):
+    '''
+    zero phase butterworth low pass, run forwards then backwards so the curve
+    isn't shifted in time. The ends are padded with an odd reflection to hold
+    the curve's slope through the edges
+
+    :param values: values to filter, assumed one key per frame at fps
+    :param cutoff: cutoff frequency in Hz, lower is smoother
+    :param fps: sample rate of the keys
+    :param order: filter order
+    '''
+    if len(values) < 3:
+        return list(values)
+    sections = butterworthSections(cutoff, fps, order)
+    # pad by a few periods of the cutoff so the start up transient dies out before the curve
+    pad = min(len(values) - 1, max(3 * (len(sections) * 2 + 1), int(3 * fps / max(cutoff, 1e-6))))
+    first, last = values[0], values[-1]
+    padded = [2 * first - v for v in values[pad:0:-1]] + list(values) + \
+             [2 * last - v for v in values[-2:-pad - 2:-1]]
+    for section in sections:
+        padded = _biquad(padded, section)
+    padded.reverse()
+    for section in sections:
+        padded = _biquad(padded, section)
+    padded.reverse()
+    return padded[pad:pad + len(values)]
+
+
+def smooth(values, method='gaussian', strength=1.0, fps=24.0):
+    '''
+    wrapper for the smoothing filters used by the FilterCurves UI so a
+    single slider drives either
+
+    :param method: 'gaussian' or 'butterworth'
+    :param strength: gaussian sigma in keys, or for butterworth the cutoff
+        as a period in frames, cutoff = fps / strength
+    '''
+    if strength <= 0:
+        return list(values)
+    if method == 'gaussian':
+        return gaussian(values, sigma=strength)
+    elif method == 'butterworth':
+        return butterworth(values, cutoff=fps / max(strength, 2.0), fps=fps)
+    raise ValueError('smooth : unknown method "%s"' % method)
+
+
+def reduceKeys(times, values, valueTolerance=0.01, timeTolerance=0.0):
+    '''
+    key reduction, Ramer-Douglas-Peucker on the linear curve through the keys.
+    Keys are dropped while the curve stays within valueTolerance of the original,
+    then any left closer than timeTolerance to the previous kept key go too.
+    The first and last keys are always kept
+
+    :param times: key times, sorted
+    :param values: key values
+    :param valueTolerance: max value deviation allowed
+    :param timeTolerance: min time between kept keys
+    :return: sorted list of the indexes kept
+    '''
+    count = len(times)
+    if count < 3:
+        return range(count)
+    keep = [False] * count
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        t0, v0 = times[first], values[first]
+        span = times[last] - t0
+        slope = (values[last] - v0) / span if span else 0.0
+        worst = -1
+        worstIndex = None
+        for i in range(first + 1, last):
+            dist = abs(values[i] - (v0 + slope * (times[i] - t0)))
+            if dist > worst:
+                worst = dist
+                worstIndex = i
+        if worstIndex is not None and worst > valueTolerance:
+            keep[worstIndex] = True
+            stack.append((first, worstIndex))
+            stack.append((worstIndex, last))
+    kept = [i for i in range(count) if keep[i]]
+    if timeTolerance > 0:
+        spaced = [kept[0]]
+        for i in kept[1:-1]:
+            if times[i] - times[spaced[-1]] >= timeTolerance:
+                spaced.append(i)
+        if kept[-1] != spaced[-1]:
+            spaced.append(kept[-1])
+        kept = spaced
+    return kept
+
+
+def decimate(items, sizes, limit=RED9_CURVE_PREVIEW_KEYS):
+    '''
+    evenly spaced subset of items whose summed size fits the limit, used
+    to pick the curves previewed while a slider is dragged
+
+    :param items: items to pick from, curves
+    :param sizes: size of each item, key counts
+    :param limit: max summed size
+    '''
+    total = sum(sizes)
+    if total <= limit or not items:
+        return list(items)
+    stride = float(total) / limit
+    picked = []
+    used = 0
+    nextPick = 0.0
+    for i, item in enumerate(items):
+        if i >= nextPick and used + sizes[i] <= limit:
+            picked.append(item)
+            used += sizes[i]
+            nextPick = i + stride
+    if not picked:
+        # every curve is over the limit on its own, preview the smallest
+        picked = [items[sizes.index(min(sizes))]]
+    return picked
@@ -33,6 +33,7 @@ import datetime
 
 # Only valid Red9 import
 import Red9.startup.setup as r9Setup
+import Red9_Profiler as r9Profiler
 
 import logging
 logging.basicConfig()
@@ -244,16 +245,23 @@ def is_callable(func):
 
 def Timer(func):
     '''
-    DECORATOR : Simple timer function
+    DECORATOR : Simple timer function, also records a span when r9Profiler is enabled
     '''
+    _spanName = r9Profiler.get_funcName(func)
+
     @wraps(func)
     def wrapper(*args, **kws):
         if log.getEffectiveLevel() == 20:
             # Timer Disabled as we're in log.Info mode so the data isn't used
-            res = func(*args, **kws)
+            if r9Profiler.RED9_PROFILING:
+                with r9Profiler.span(_spanName):
+                    res = func(*args, **kws)
+            else:
+                res = func(*args, **kws)
         else:
             t1 = time.time()
-            res = func(*args, **kws)
+            with r9Profiler.span(_spanName):
+                res = func(*args, **kws)
             t2 = time.time()
 
             functionTrace = ''
@@ -294,10 +302,12 @@ def playback_suspend(func):
 def runProfile(func):
     '''
     DECORATOR : run the profiler - only ever used when debugging /optimizing
-    function call speeds.visualize the data using 'runsnakerun' to view the profiles and debug
+    function call speeds.visualize the data using 'runsnakerun' to view the profiles and debug.
+    The call is also recorded as a span when r9Profiler is enabled
     '''
     import cProfile
     from time import gmtime, strftime
+    _spanName = r9Profiler.get_funcName(func)
 
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -306,7 +316,8 @@ def runProfile(func):
 
         def command():
             func(*args, **kwargs)
-        profile = cProfile.runctx("command()", globals(), locals(), dumpFileName)
+        with r9Profiler.span(_spanName, 'profile', dump=dumpFileName):
+            profile = cProfile.runctx("command()", globals(), locals(), dumpFileName)
         return profile
     return wrapper
 
@@ -81,8 +81,7 @@ except:
     # import Red9.packages.simplejson as json
 
 
-global RED9_META_NODECACHE
-RED9_META_NODECACHE = {}
+global RED9_META_NODECACHE  # MetaNodeCache instance, built in the NodeCache management block
 
 global __RED9_META_NODESTORE__
 __RED9_META_NODESTORE__ = []
@@ -90,6 +89,13 @@ __RED9_META_NODESTORE__ = []
 global RED9_META_REGISTERY
 RED9_META_REGISTERY = {}
 
+global RED9_MIRRORTABLES  # rig UUID : compiled r9Anim.MirrorTable, see MetaRig.getMirrorTable
+RED9_MIRRORTABLES = {}
+global RED9_MIRRORTABLE_EPOCH  # bumped when mirrorIDs or mirror attrs change, stale tables are rebuilt
+RED9_MIRRORTABLE_EPOCH = 0
+global RED9_MIRRORTABLE_ATTRS  # mirror attr names watched on the nodes of compiled MirrorTables
+RED9_MIRRORTABLE_ATTRS = set()
+
 global RED9_META_INHERITANCE_MAP
 RED9_META_INHERITANCE_MAP = {}
 
@@ -101,6 +107,8 @@ else:
     RED9_META_CALLBACKS = {}
     RED9_META_CALLBACKS['Open'] = []
     RED9_META_CALLBACKS['New'] = []
+    RED9_META_CALLBACKS['NameChanged'] = []
+    RED9_META_CALLBACKS['NodeRemoved'] = []
     # RED9_META_CALLBACKS['DuplicatePre'] = []
     # RED9_META_CALLBACKS['DuplicatePost'] = []
 
@@ -331,6 +339,126 @@ def resetMClassNodeTypes():
 # --- NodeCache management --- ---------------------------
 # ----------------------------------------------------------------------------
 
+class MetaNodeCache(dict):
+    '''
+    The object behind the global RED9_META_NODECACHE. It's still a dict of
+    {UUID: instantiated mNode} (or {mNode name: mNode} for older pre-UUID systems)
+    so all existing code that reads / pops the global directly still works, but it
+    also manages:
+
+    * a reverse {node name: cache key} index so that validated lookups don't have to
+      hit cmds.ls(uuid=True) and getMObject on every instantiation
+    * per entry invalidation via the global rename / delete callbacks, so a stale node
+      only drops itself from the cache rather than triggering a full cleanCache()
+    * hit / miss / eviction counters, see getMetaCacheStats()
+    '''
+    def __init__(self, *args, **kws):
+        super(MetaNodeCache, self).__init__(*args, **kws)
+        self._nameIndex = {}  # {node name : cache key}
+        self._keyNames = {}  # {cache key : set(node names)} so we can clear the name index per key
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __setitem__(self, key, mNode):
+        if key in self:
+            self._unindex(key)
+        super(MetaNodeCache, self).__setitem__(key, mNode)
+        try:
+            self.index(key, mNode.mNode)
+        except StandardError:
+            pass
+
+    def __delitem__(self, key):
+        self._unindex(key)
+        super(MetaNodeCache, self).__delitem__(key)
+
+    def pop(self, key, *default):
+        self._unindex(key)
+        return super(MetaNodeCache, self).pop(key, *default)
+
+    def clear(self):
+        self._nameIndex.clear()
+        self._keyNames.clear()
+        super(MetaNodeCache, self).clear()
+
+    def index(self, key, name):
+        '''
+        add a name alias for the given cache key, the same node can be looked
+        up by either its full dagPath or any other name we've been passed
+        '''
+        if key in self:
+            self._nameIndex[name] = key
+            self._keyNames.setdefault(key, set()).add(name)
+
+    def _unindex(self, key):
+        for name in self._keyNames.pop(key, ()):
+            if self._nameIndex.get(name) == key:
+                del self._nameIndex[name]
+
+    def invalidate(self, key):
+        '''
+        drop a single stale entry from the cache and count the eviction
+        '''
+        if key in self:
+            self.pop(key)
+            self.stats['evictions'] += 1
+            if logging_is_debug():
+                log.debug('CACHE : %s being Removed from the cache due to invalid MObject' % key)
+            return True
+        return False
+
+    def lookup(self, node):
+        '''
+        validated lookup through the name index only, no scene queries beyond
+        the MObjectHandle check and the name of the cached node itself.
+
+        :param node: str name of the node
+        :return: (key, mNode) or (None, None)
+        '''
+        key = self._nameIndex.get(node)
+        if key is None:
+            return None, None
+        cached = self.get(key)
+        try:
+            if cached is not None and cached.isValidMObject():
+                if cached.mNode == node:
+                    return key, cached
+                # renamed or re-parented since we indexed it, the entry itself is still good
+                del self._nameIndex[node]
+                self._keyNames.get(key, set()).discard(node)
+                return None, None
+        except StandardError:
+            pass
+        self.invalidate(key)
+        return None, None
+
+    def getUUID(self, node):
+        '''
+        return the UUID for a given node, using the name index if the node is cached
+        and only falling back to cmds.ls(uuid=True) if it's not. Maya 2016 onwards only.
+        '''
+        key = self._nameIndex.get(node)
+        if key is not None and self.lookup(node)[0] is not None:
+            return key
+        return cmds.ls(node, uuid=True)[0]
+
+    def getStats(self):
+        '''
+        return the cache counters plus the current cache sizes
+        '''
+        stats = dict(self.stats)
+        stats['size'] = len(self)
+        stats['names'] = len(self._nameIndex)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRatio'] = float(stats['hits']) / lookups if lookups else 0.0
+        return stats
+
+    def resetStats(self):
+        for key in self.stats:
+            self.stats[key] = 0
+
+
+RED9_META_NODECACHE = MetaNodeCache()
+
 def generateUUID():
     '''
     unique UUID used by the caching system
@@ -350,7 +478,7 @@ def registerMClassNodeCache(mNode):
     # Maya 2016 onwards UUID management  ---------
     if version >= 2016:
         UUID = cmds.ls(mNode.mNode, uuid=True)[0]
-        if UUID in RED9_META_NODECACHE.keys():
+        if UUID in RED9_META_NODECACHE:
             # log.debug('CACHE : UUID is already registered in cache')
             if not mNode == RED9_META_NODECACHE[UUID]:
                 log.debug('CACHE : %s : UUID is registered to a different node : modifying UUID: %s' % (UUID, mNode.mNode))
@@ -363,7 +491,7 @@ def registerMClassNodeCache(mNode):
             if not UUID:
                 # log.debug('CACHE : generating fresh UUID')
                 UUID = mNode.setUUID()
-            elif UUID in RED9_META_NODECACHE.keys():
+            elif UUID in RED9_META_NODECACHE:
                 # log.debug('CACHE : UUID is already registered in cache')
                 if not mNode == RED9_META_NODECACHE[UUID]:
                     log.debug('CACHE : %s : UUID is registered to a different node : modifying UUID: %s' % (UUID, mNode.mNode))
@@ -373,12 +501,12 @@ def registerMClassNodeCache(mNode):
 
     else:
         # log.debug('CACHE : UUID attr not bound to this node, must be an older system')
-        if RED9_META_NODECACHE or mNode.mNode not in RED9_META_NODECACHE.keys():
+        if RED9_META_NODECACHE or mNode.mNode not in RED9_META_NODECACHE:
             # log.debug('CACHE : Adding to MetaNode Cache : %s' % mNode.mNode)
             RED9_META_NODECACHE[mNode.mNode] = mNode
             return
 
-    if RED9_META_NODECACHE or UUID not in RED9_META_NODECACHE.keys():
+    if RED9_META_NODECACHE or UUID not in RED9_META_NODECACHE:
         # log.debug('CACHE : Adding to MetaNode UUID Cache : %s > %s' % (mNode.mNode, UUID))
         RED9_META_NODECACHE[UUID] = mNode
 
@@ -417,42 +545,59 @@ def getMetaFromCache(mNode):
     already be instantiated.
 
     :param mNode: str(name) of node from DAG
+
+    .. note::
+        we first try the caches name index which is kept in sync by the rename / delete
+        callbacks, only if that misses do we pay for the UUID lookup. Invalid entries are
+        now evicted individually rather than running a full cleanCache()
     '''
+    if isinstance(mNode, basestring):
+        cached = RED9_META_NODECACHE.lookup(mNode)[1]
+        if cached is not None:
+            RED9_META_NODECACHE.stats['hits'] += 1
+            return cached
     try:
         if r9Setup.mayaVersion() < 2016:
             UUID = cmds.getAttr('%s.UUID' % mNode)  # if this fails we bail to the mNode name block
         else:
             UUID = cmds.ls(mNode, uuid=True)[0]
 
-        if UUID in RED9_META_NODECACHE.keys():
+        if UUID in RED9_META_NODECACHE:
             try:
                 if RED9_META_NODECACHE[UUID].isValidMObject():
                     if not RED9_META_NODECACHE[UUID]._MObject == getMObject(mNode):
                         log.debug('CACHE ABORTED : %s : UUID is already registered but to a different node : %s' % (UUID, mNode))
+                        RED9_META_NODECACHE.stats['misses'] += 1
                         mNode.setUUID()
                         return
                     # log.debug('CACHE : %s Returning mNode from UUID cache! = %s' % (mNode, UUID))
+                    RED9_META_NODECACHE.stats['hits'] += 1
+                    if RED9_META_NODECACHE[UUID].mNode == mNode:
+                        RED9_META_NODECACHE.index(UUID, mNode)
                     return RED9_META_NODECACHE[UUID]
                 else:
                     # log.debug('%s being Removed from the cache due to invalid MObject' % mNode)
-                    cleanCache()
+                    RED9_META_NODECACHE.invalidate(UUID)
             except:
                 log.debug('CACHE : inspection failure')
     except:
-        if mNode in RED9_META_NODECACHE.keys():
+        if mNode in RED9_META_NODECACHE:
             try:
                 if RED9_META_NODECACHE[mNode].isValidMObject():
                     if not RED9_META_NODECACHE[mNode]._MObject == getMObject(mNode):
                         # log.debug('CACHE : %s : ID is already registered but MObjects are different, node may have been renamed' % mNode)
+                        RED9_META_NODECACHE.stats['misses'] += 1
                         return
                     # print 'namebased returned from cache ', mNode
                     # log.debug('CACHE : %s Returning mNode from nameBased cache!' % mNode)
+                    RED9_META_NODECACHE.stats['hits'] += 1
                     return RED9_META_NODECACHE[mNode]
                 else:
                     # log.debug('%s being Removed from the cache due to invalid MObject' % mNode)
-                    cleanCache()
+                    RED9_META_NODECACHE.invalidate(mNode)
             except:
                 log.debug('CACHE : inspection failure')
+    RED9_META_NODECACHE.stats['misses'] += 1
 
 def upgrade_toLatestBindings(*args):
     '''
@@ -491,17 +636,21 @@ def printMetaCacheRegistry():
     cleanCache()
     for k, v in RED9_META_NODECACHE.items():
         print('%s : %s : %s' % (k, r9Core.nodeNameStrip(v.mNode), v))
+    print('Cache Stats : %s' % getMetaCacheStats())
 
 def cleanCache():
     '''
     Run through the current cache of metaNodes and confirm that they're
     all still valid by testing the MObjectHandles.
+
+    .. note::
+        stale entries are now evicted individually by the lookups and the node
+        callbacks so this full sweep should rarely be needed
     '''
     for k, v in RED9_META_NODECACHE.items():
         try:
             if not v.isValidMObject():
-                RED9_META_NODECACHE.pop(k)
-                log.debug('CACHE : %s being Removed from the cache due to invalid MObject' % k)
+                RED9_META_NODECACHE.invalidate(k)
         except:
             log.debug('CACHE : clean failure')
 
@@ -509,9 +658,23 @@ def removeFromCache(mNodes):
     '''
     remove instanciated mNodes from the cache
     '''
+    if not type(mNodes) == list:
+        mNodes = [mNodes]
+    # fast path, the mNodes know the key they were registered under
+    remaining = []
+    for mNode in mNodes:
+        try:
+            key = object.__getattribute__(mNode, '_lastUUID')
+        except:
+            key = None
+        if key is not None and RED9_META_NODECACHE.get(key) is mNode:
+            RED9_META_NODECACHE.pop(key)
+        else:
+            remaining.append(mNode)
+    if not remaining:
+        return
+    mNodes = remaining
     for k, v in RED9_META_NODECACHE.items():
-        if not type(mNodes) == list:
-            mNodes = [mNodes]
         if v and v in mNodes:
             try:
                 RED9_META_NODECACHE.pop(k)
@@ -525,8 +688,53 @@ def resetCache(*args):
     '''
     reset the global cache, called after SceneOpen or NewScene
     '''
-    global RED9_META_NODECACHE
-    RED9_META_NODECACHE = {}
+    RED9_META_NODECACHE.clear()
+    RED9_MIRRORTABLES.clear()
+    unwatchMirrorNodes()
+
+def invalidateMirrorTables(*args):
+    '''
+    mark all compiled MirrorTables as stale, called when mirrorIDs are set or removed
+    so MetaRig.getMirrorTable recompiles on next use
+    '''
+    global RED9_MIRRORTABLE_EPOCH
+    RED9_MIRRORTABLE_EPOCH += 1
+
+def watchMirrorNodes(nodes, attrs):
+    '''
+    add attributeChanged callbacks to the nodes of a compiled MirrorTable so that a
+    direct setAttr, addAttr or deleteAttr on their mirror attrs, undo included,
+    marks the tables stale. Each node is only watched once per scene
+
+    :param nodes: list of (node, key) where key is the node UUID
+    :param attrs: the mirror attr names the table was compiled from
+    '''
+    RED9_MIRRORTABLE_ATTRS.update(attrs)
+    watched = RED9_META_CALLBACKS.setdefault('MirrorAttrs', {})
+    mSel = OpenMaya.MSelectionList()
+    mObj = OpenMaya.MObject()
+    for node, key in nodes:
+        if key in watched:
+            continue
+        try:
+            mSel.clear()
+            mSel.add(node)
+            mSel.getDependNode(0, mObj)
+        except RuntimeError:
+            continue
+        watched[key] = OpenMaya.MNodeMessage.addAttributeChangedCallback(mObj, metaData_mirrorAttrChanged)
+
+def unwatchMirrorNodes():
+    '''
+    remove all the MirrorTable attributeChanged callbacks
+    '''
+    watched = RED9_META_CALLBACKS.setdefault('MirrorAttrs', {})
+    for callbackID in watched.values():
+        try:
+            OpenMaya.MMessage.removeCallback(callbackID)
+        except:
+            pass
+    watched.clear()
 
 def resetCacheOnSceneNew(*args):
     resetCache()
@@ -538,6 +746,92 @@ def getMClassNodeCache():
     '''
     return RED9_META_NODECACHE
 
+def getMetaCacheStats():
+    '''
+    return the RED9_META_NODECACHE counters, hits / misses / evictions plus
+    the current size of the cache and its name index
+    '''
+    return RED9_META_NODECACHE.getStats()
+
+def resetMetaCacheStats(*args):
+    RED9_META_NODECACHE.resetStats()
+
+def _cacheKeyFromMObject(mobj, name=None):
+    '''
+    resolve the cache key for a given MObject, used by the node callbacks
+    '''
+    try:
+        if r9Setup.mayaVersion() >= 2016:
+            return OpenMaya.MFnDependencyNode(mobj).uuid().asString()
+        return RED9_META_NODECACHE._nameIndex.get(name or OpenMaya.MFnDependencyNode(mobj).name())
+    except:
+        pass
+
+def metaData_nameChanged(mobj, prevName, *args):
+    '''
+    Registered as a global nameChanged callback, re-index the cache entry
+    for the renamed node so that name lookups stay valid
+    '''
+    if RED9_MIRRORTABLES:
+        # a rename changes the dagPaths of the whole branch, not just this node
+        invalidateMirrorTables()
+    if not RED9_META_NODECACHE:
+        return
+    key = _cacheKeyFromMObject(mobj, prevName)
+    if key is None or key not in RED9_META_NODECACHE:
+        return
+    RED9_META_NODECACHE._unindex(key)
+    try:
+        if not r9Setup.mayaVersion() >= 2016:
+            # pre UUID systems are keyed by name so the key itself is now stale
+            RED9_META_NODECACHE.invalidate(key)
+            return
+        RED9_META_NODECACHE.index(key, RED9_META_NODECACHE[key].mNode)
+    except:
+        RED9_META_NODECACHE.invalidate(key)
+
+def metaData_nodeRemoved(mobj, *args):
+    '''
+    Registered as a global nodeRemoved callback, evict just this node from the cache
+    '''
+    if RED9_MIRRORTABLES:
+        key = _cacheKeyFromMObject(mobj)
+        if key is None or any(key in table._rows for table in RED9_MIRRORTABLES.values()):
+            invalidateMirrorTables()
+    if not RED9_META_NODECACHE:
+        return
+    key = _cacheKeyFromMObject(mobj)
+    if key is not None:
+        RED9_META_NODECACHE.invalidate(key)
+
+def metaData_parentAdded(child, parent, *args):
+    '''
+    Registered as a global parentAdded callback, a re-parent changes the dagPaths
+    the compiled MirrorTables are keyed by
+    '''
+    if RED9_MIRRORTABLES:
+        invalidateMirrorTables()
+
+def metaData_mirrorAttrChanged(msg, plug, otherPlug, *args):
+    '''
+    attributeChanged callback on the nodes of compiled MirrorTables, see watchMirrorNodes
+    '''
+    if not msg & (OpenMaya.MNodeMessage.kAttributeSet |
+                  OpenMaya.MNodeMessage.kAttributeAdded |
+                  OpenMaya.MNodeMessage.kAttributeRemoved |
+                  OpenMaya.MNodeMessage.kConnectionMade |
+                  OpenMaya.MNodeMessage.kConnectionBroken):
+        return
+    if plug.partialName(False, False, False, False, False, True) in RED9_MIRRORTABLE_ATTRS:
+        invalidateMirrorTables()
+
+def metaData_undoRedo(*args):
+    '''
+    Registered on the Undo and Redo events, an undo of setMirrorIDs or a rig edit can put
+    the mirror data back to a state no compiled MirrorTable was built from
+    '''
+    invalidateMirrorTables()
+
 def __preDuplicateCache(*args):
     '''
     DEPRICATED : PRE-DUPLICATE : on the duplicate call in Maya (bound to a callback) pre-store all current mNodes
@@ -807,6 +1101,74 @@ def isMetaNodeClassGrp(node, mClassGrps=[]):
         except:
             log.debug('mNode has no MClassGrp attr, must be a legacy system and needs updating!! %s' % node)
 
+def getMClassDataFromNodes(nodes):
+    '''
+    Bulk version of getMClassDataFromNode, resolves the mClass binding and the raw mClassGrp
+    for a list of nodes in a single OpenMaya pass rather than a getAttr / nodeType call per node.
+    The mClass resolution follows exactly the same rules as getMClassDataFromNode.
+
+    :param nodes: list of node names to inspect
+    :return: list of (node, mClass, mClassGrp) tuples, mClass None if the node isn't bound
+    '''
+    data = []
+    registry = RED9_META_REGISTERY
+    lowerKeys = dict((key.lower(), key) for key in registry)
+    selList = OpenMaya.MSelectionList()
+    mobj = OpenMaya.MObject()
+    depNodeFn = OpenMaya.MFnDependencyNode()
+
+    for node in nodes:
+        mClass = None
+        mClassGrp = None
+        try:
+            selList.clear()
+            selList.add(node)
+            selList.getDependNode(0, mobj)
+            depNodeFn.setObject(mobj)
+        except:
+            # can't resolve via the API, drop back to the single node calls
+            mClass = getMClassDataFromNode(node, checkInstance=False)
+            try:
+                mClassGrp = cmds.getAttr('%s.mClassGrp' % node)
+            except:
+                pass
+            data.append((node, mClass, mClassGrp))
+            continue
+
+        hasGrp = depNodeFn.hasAttribute('mClassGrp')
+        if hasGrp:
+            try:
+                mClassGrp = depNodeFn.findPlug('mClassGrp', False).asString()
+            except:
+                hasGrp = False
+        try:
+            if not depNodeFn.hasAttribute('mClass'):
+                raise ValueError
+            mClass = depNodeFn.findPlug('mClass', False).asString()
+            if mClass not in registry:
+                # same as getMClassDataFromNode, a missing mClassGrp drops to the nodeType test
+                if not hasGrp:
+                    raise ValueError
+                mClass = mClassGrp if mClassGrp in registry else None
+        except:
+            _nodetype = depNodeFn.typeName()
+            if 'Meta%s' % _nodetype in registry:
+                mClass = 'Meta%s' % _nodetype
+            else:
+                mClass = lowerKeys.get(_nodetype.lower())
+        data.append((node, mClass, mClassGrp))
+    return data
+
+def getMClassInheritedKeys(mInstances):
+    '''
+    return the set of registered mClass keys that inherit from any of the given
+    mInstances, precomputed from the RED9_META_INHERITANCE_MAP so that filtering many
+    nodes is a simple set lookup. Matches the 'short' mode of isMetaNodeInherited.
+    '''
+    instKeys = set(mTypesToRegistryKey(mInstances))
+    return set(mClass for mClass, inheritance in RED9_META_INHERITANCE_MAP.items()
+               if mClass in RED9_META_REGISTERY and instKeys.intersection(inheritance['short']))
+
 @r9General.Timer
 def getMetaNodes(mTypes=[], mInstances=[], mClassGrps=[], mAttrs=None, dataType='mClass', nTypes=None, mSystemRoot=False, byname=[], **kws):
     '''
@@ -822,6 +1184,11 @@ def getMetaNodes(mTypes=[], mInstances=[], mClassGrps=[], mAttrs=None, dataType=
                 the correct class object. If not then return the Maya node itself
     :param nTypes: only inspect nodes of a given Type
     :param byname: [] a specific list of node names to search for
+
+    .. note::
+        the mClass / mClassGrp data for all candidate nodes is read in one bulk pass
+        (getMClassDataFromNodes) and filtered against precomputed registry sets, the
+        MetaClass objects are only instantiated for the final filtered nodes
     '''
     mNodes = []
     if not nTypes:
@@ -836,23 +1203,28 @@ def getMetaNodes(mTypes=[], mInstances=[], mClassGrps=[], mAttrs=None, dataType=
             nodes = cmds.ls(type=nTypes, l=True)
     if not nodes:
         return mNodes
-    for node in nodes:
-        mNode = False
-        if not mInstances:
-            if isMetaNode(node, mTypes=mTypes):
-                mNode = True
-        else:
-            if isMetaNodeInherited(node, mInstances):
-                mNode = True
-        if mNode:
-            if mClassGrps:
-#                 if not hasattr(mClassGrps, '__iter__'):
-                if r9General.is_basestring(mClassGrps):
-                    mClassGrps = [mClassGrps]
-                if isMetaNodeClassGrp(node, mClassGrps):
-                    mNodes.append(node)
-            else:
-                mNodes.append(node)
+
+    # precompute the filters so each node is just a set lookup
+    if mInstances:
+        validKeys = getMClassInheritedKeys(mInstances)
+    elif mTypes:
+        validKeys = set(mTypesToRegistryKey(mTypes))
+    else:
+        validKeys = None
+    if mClassGrps:
+#         if not hasattr(mClassGrps, '__iter__'):
+        if r9General.is_basestring(mClassGrps):
+            mClassGrps = [mClassGrps]
+        mClassGrps = set(mClassGrps)
+
+    for node, mClass, mClassGrp in getMClassDataFromNodes(nodes):
+        if not mClass or mClass not in RED9_META_REGISTERY:
+            continue
+        if validKeys is not None and mClass not in validKeys:
+            continue
+        if mClassGrps and mClassGrp not in mClassGrps:
+            continue
+        mNodes.append(node)
     if not mNodes:
         return mNodes
     if mAttrs:
@@ -1973,7 +2345,7 @@ class MetaClass(object):
         except:
             # if this fails we have a dead node more than likely
             try:
-                RED9_META_NODECACHE.pop(object.__getattribute__(self, "_lastUUID"))
+                RED9_META_NODECACHE.invalidate(object.__getattribute__(self, "_lastUUID"))
                 if logging_is_debug():
                     log.debug("Dead mNode %s removed from cache..." % object.__getattribute__(self, "_lastDagPath"))
             except:
@@ -1990,7 +2362,7 @@ class MetaClass(object):
         # added this is mObject valid check as this was another place stuff breaks on a dead node...same cache clear ability
         if not self._MObjectHandle.isValid():
             try:
-                RED9_META_NODECACHE.pop(object.__getattribute__(self, "_lastUUID"))
+                RED9_META_NODECACHE.invalidate(object.__getattribute__(self, "_lastUUID"))
                 if logging_is_debug():
                     log.debug("Dead mNode %s removed from cache..." % object.__getattribute__(self, "_lastDagPath"))
             except:
@@ -3900,7 +4272,62 @@ class MetaRig(MetaClass):
     # mirror management
     # ---------------------------------------------------------------------------------
 
-    def getMirrorData(self):
+    def getMirrorTable(self, forceRefresh=False):
+        '''
+        The compiled r9Anim.MirrorTable for this rig, built once from the rig's children and
+        cached for the session. It's only rebuilt once mirrorIDs or the mirror attrs have
+        changed, an undo / redo has run or a node in it has been renamed, re-parented or
+        deleted, see r9Anim.MirrorTable.isCurrent.
+        A table stored on the node by saveMirrorTable is verified and used on first call.
+
+        This is read only, nothing is written to the scene, see saveMirrorTable.
+
+        :param forceRefresh: rebuild the table regardless
+        '''
+        key = self.mNode
+        try:
+            key = self.getUUID()
+        except StandardError:
+            pass
+        table = RED9_MIRRORTABLES.get(key)
+        if not forceRefresh:
+            if table is not None and table.isCurrent():
+                return table
+            if table is None and self.hasAttr('mirrorTable'):
+                try:
+                    table = r9Anim.MirrorTable.fromData(self.mirrorTable)
+                except StandardError, err:
+                    log.debug('MirrorTable : failed to read stored table : %s' % err)
+                    table = None
+                if table is not None and table.verify():
+                    RED9_MIRRORTABLES[key] = table
+                    return table
+
+        log.debug('MirrorTable : compiling for %s' % self.mNode)
+        table = r9Anim.MirrorTable(self.getChildren(walk=True))
+        RED9_MIRRORTABLES[key] = table
+        return table
+
+    def saveMirrorTable(self, forceRefresh=False):
+        '''
+        store the compiled MirrorTable on the node in the 'mirrorTable' attr so it survives
+        the session. Referenced rigs are skipped, the table just gets compiled on demand.
+
+        :param forceRefresh: rebuild the table before storing it
+        '''
+        if self.isReferenced():
+            log.debug('MirrorTable : %s is referenced, table not stored' % self.mNode)
+            return False
+        self._storeMirrorTable(self.getMirrorTable(forceRefresh))
+        return True
+
+    @nodeLockManager
+    def _storeMirrorTable(self, table):
+        if not self.hasAttr('mirrorTable'):
+            self.addAttr('mirrorTable', attrType='string', hidden=True)
+        self.mirrorTable = table.getData()
+
+    def getMirrorData(self, forceRefresh=False):
         '''
         Bind the MirrorObject to this instance of MetaRig.
 
@@ -3908,11 +4335,18 @@ class MetaRig(MetaClass):
             you must run this binding function before using any of
             the inbuilt mirror functions
         '''
-        self.MirrorClass = r9Anim.MirrorHierarchy(nodes=self.getChildren(walk=True))
         try:
-            self.MirrorClass.getMirrorSets()
+            table = self.getMirrorTable(forceRefresh)
+            self.MirrorClass = r9Anim.MirrorHierarchy(nodes=list(table.nodes))
+            self.MirrorClass.mirrorTable = table
+            self.MirrorClass.indexednodes = list(table.nodes)
+            self.MirrorClass.mirrorDict, self.MirrorClass.unresolved = table.getMirrorDict(defaultAxis=self.MirrorClass.defaultMirrorAxis)
+            if not table.nodes:
+                log.warning('No Mirror Markers found on the rig')
             log.debug('Filling the MirrorClass attr on demand')
-        except:
+        except StandardError, err:
+            log.debug(err)
+            self.MirrorClass = r9Anim.MirrorHierarchy(nodes=self.getChildren(walk=True))
             log.warning('No Mirror Markers found on the rig')
         return self.MirrorClass
 
@@ -3927,6 +4361,7 @@ class MetaRig(MetaClass):
         if not os.path.exists(mirrorMap):
             raise IOError('Given MirrorMap file not found : %s' % mirrorMap)
         r9Anim.MirrorHierarchy(self.getChildren()).loadMirrorSetups(mirrorMap)
+        self.saveMirrorTable(forceRefresh=True)
 
     def saveMirrorDataMap(self, filepath):
         '''
@@ -3946,22 +4381,15 @@ class MetaRig(MetaClass):
         left[4] mirror node and visa versa. Centre controllers pass straight through
 
         :param nodes: nodes to get the opposites from
-        :param forceRefresh: forces the mirrorDic (which is cached) to be updated
+        :param forceRefresh: forces the mirrorTable to be rebuilt
         '''
-        if not self.MirrorClass or forceRefresh:
-            self.MirrorClass = self.getMirrorData()
+        table = self.getMirrorTable(forceRefresh)
         oppositeNodes = []
 
-        for node in nodes:
-            side = self.MirrorClass.getMirrorSide(node)
-            if not side:
-                continue
-            if side == 'Left':
-                oppositeNodes.append(self.MirrorClass.mirrorDict['Right'][str(self.MirrorClass.getMirrorIndex(node))]['node'])
-            if side == 'Right':
-                oppositeNodes.append(self.MirrorClass.mirrorDict['Left'][str(self.MirrorClass.getMirrorIndex(node))]['node'])
-            if side == 'Centre':
-                oppositeNodes.append(node)
+        for node in cmds.ls(nodes, l=True):
+            opposite = table.getOpposite(node)
+            if opposite:
+                oppositeNodes.append(opposite)
         return oppositeNodes
 
     def getMirror_ctrlSets(self, set='Centre', forceRefresh=False):
@@ -3970,31 +4398,27 @@ class MetaRig(MetaClass):
         based on their mirror side data
 
         :param set: which set/side to get, valid = 'Left' ,'Right', 'Centre'
-        :param forceRefresh: forces the mirrorDic (which is cached) to be updated
+        :param forceRefresh: forces the mirrorTable to be rebuilt
         '''
 #         submNodes=mRig.getChildMetaNodes(mAttrs=['mirrorSide=2'], walk=True)
 #         ctrls=[]
 #         for node in submNodes:
 #             ctrls.extend(node.getChildren())
 #         return ctrls
-        ctrls = []
-        if not self.MirrorClass or forceRefresh:
-            self.MirrorClass = self.getMirrorData()
-        for _, value in self.MirrorClass.mirrorDict[set].items():
-            ctrls.append(value['node'])
-        return ctrls
+        return self.getMirrorTable(forceRefresh).getSideNodes(set)
 
     def getMirror_lastIndexes(self, side, forceRefresh=False):
         '''
         get the last mirror index for a given side
 
         :param side: side to check, valid = 'Left' ,'Right', 'Centre'
-        :param forceRefresh: forces the mirrorDic (which is cached) to be updated
+        :param forceRefresh: forces the mirrorTable to be rebuilt
         '''
-        if not self.MirrorClass or forceRefresh:
-            self.MirrorClass = self.getMirrorData()
-        if side in self.MirrorClass.mirrorDict.keys() and self.MirrorClass.mirrorDict[side]:
-            return max([int(m) for m in self.MirrorClass.mirrorDict[side].keys()])
+        table = self.getMirrorTable(forceRefresh)
+        if side in table.SIDES:
+            indexes = [i for (s, i) in table.slots if s == table.SIDES.index(side) and not i == table.NO_INDEX]
+            if indexes:
+                return max(indexes)
         return 0
 
     def getMirror_nextSlot(self, side, forceRefresh=False):
@@ -4002,7 +4426,7 @@ class MetaRig(MetaClass):
         return the next available slot in the mirrorIndex list for a given side
 
         :param side: side to check, valid = 'Left' ,'Right', 'Centre'
-        :param forceRefresh: forces the mirrorDic (which is cached) to be updated
+        :param forceRefresh: forces the mirrorTable to be rebuilt
         '''
         return self.getMirror_lastIndexes(side, forceRefresh) + 1
 
@@ -5549,6 +5973,17 @@ if not RED9_META_CALLBACKS['Open']:
     RED9_META_CALLBACKS['Open'].append(OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeOpen, metaData_sceneCleanups))
 if not RED9_META_CALLBACKS['New']:
     RED9_META_CALLBACKS['New'].append(OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kBeforeNew, metaData_sceneCleanups))
+# rename / delete callbacks so that the cache can invalidate single entries
+if not RED9_META_CALLBACKS.setdefault('NameChanged', []):
+    RED9_META_CALLBACKS['NameChanged'].append(OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), metaData_nameChanged))
+if not RED9_META_CALLBACKS.setdefault('NodeRemoved', []):
+    RED9_META_CALLBACKS['NodeRemoved'].append(OpenMaya.MDGMessage.addNodeRemovedCallback(metaData_nodeRemoved, 'dependNode'))
+if not RED9_META_CALLBACKS.setdefault('ParentAdded', []):
+    RED9_META_CALLBACKS['ParentAdded'].append(OpenMaya.MDagMessage.addParentAddedCallback(metaData_parentAdded))
+if not RED9_META_CALLBACKS.setdefault('UndoRedo', []):
+    RED9_META_CALLBACKS['UndoRedo'].append(OpenMaya.MEventMessage.addEventCallback('Undo', metaData_undoRedo))
+    RED9_META_CALLBACKS['UndoRedo'].append(OpenMaya.MEventMessage.addEventCallback('Redo', metaData_undoRedo))
+RED9_META_CALLBACKS.setdefault('MirrorAttrs', {})  # node key : attributeChanged callback, see watchMirrorNodes
 
 # if r9Setup.mayaVersion()<=2015:
 #     #dulplicate cache callbacks so the UUIDs are managed correctly
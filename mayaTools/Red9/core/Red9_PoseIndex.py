@@ -0,0 +1,588 @@
+'''
+..
+    Red9 Studio Pack: Maya Pipeline Solutions
+    Author: Mark Jackson
+    email: rednineinfo@gmail.com
+
+    Red9 blog : http://red9-consultancy.blogspot.co.uk/
+    MarkJ blog: http://markj3d.blogspot.co.uk
+
+
+This is the pose library index, a persistent on-disk cache of every pose under a
+pose root so the pose browsers can list, search and sort without walking the filesystem.
+
+Each root gets a json index holding per pose: path, mtime, size, node count, tags,
+thumbnail and search tokens, plus the mtime of every folder. An update only stats the
+folders, a folder whose mtime hasn't changed is taken from the index as is, so on a
+network share with tens of thousands of poses a refresh is one stat per folder.
+Only poses in changed folders are re-stat'd and only new or changed poses are read.
+
+.. note::
+    a pose re-written in place doesn't change its folder's mtime, the UI's save
+    calls updateFile() to refresh that entry directly
+
+    >>> import Red9.core.Red9_PoseIndex as r9PoseIndex
+    >>> index = r9PoseIndex.getIndex('P:/project/poseLib')
+    >>> index.update()
+    >>> index.getPoses('P:/project/poseLib/hands', sortBy='date')
+    >>> index.search('fist,point', recursive=True)
+
+NOTHING IN THIS MODULE SHOULD REQUIRE MAYA
+
+'''
+
+from __future__ import print_function
+
+from collections import OrderedDict
+import os
+import re
+import time
+import json
+import struct
+import hashlib
+import tempfile
+import threading
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+RED9_POSEINDEX_VERSION = 1
+RED9_POSEINDEX_FILE = '.r9poseIndex/index.json'  # in a sub folder so writing it doesn't dirty the root's mtime
+RED9_POSE_THUMB_CACHE = 256  # max thumbnails held in memory
+
+# matches Red9_PoseSaver.POSE_BINARY_MAGIC, not imported as the PoseSaver needs Maya
+POSE_BINARY_MAGIC = 'R9POSEB\x00'
+
+# folders modified this close to the last scan are rescanned next time, covers
+# filesystems with coarse mtime resolution (FAT / some SMB shares are 2secs)
+_MTIME_GRACE = 2.0
+
+_INDEXES = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def naturalKey(text):
+    '''
+    sort key matching r9Core.sortNumerically
+    '''
+    return [int(c) if c.isdigit() else c for c in re.split('([0-9]+)', text)]
+
+def compileFilter(filter_string, matchcase=False):
+    '''
+    compile a search string to the same regex r9Core.filterListByString builds,
+    comma separated OR'd searches and spaces as wildcards
+
+    :return: compiled regex or None if the filter is empty
+    '''
+    if not filter_string:
+        return None
+    filterBy = [f for f in filter_string.rstrip(',').split(',') if f]
+    if not filterBy:
+        return None
+    pattern = []
+    for n in filterBy:
+        if ' ' in n:
+            pattern.append('(%s)' % n.replace(' ', ')+.*('))
+        else:
+            pattern.append(n)
+    if not matchcase:
+        return re.compile('(' + '|'.join(pattern) + ')', re.IGNORECASE)
+    return re.compile('(' + '|'.join(pattern) + ')')
+
+def splitTokens(text):
+    '''
+    lower case search tokens from a name, split on non alphanumerics and camelCase
+    '''
+    text = re.sub('([a-z])([A-Z])', r'\1 \2', text)
+    return [t for t in re.split('[^a-zA-Z0-9]+', text.lower()) if t]
+
+def readPoseInfo(filepath):
+    '''
+    read just the info block and node count from a pose file in any of the
+    PoseSaver formats: binary, json or the legacy ConfigObj.
+    ConfigObj files are line scanned rather than fully parsed
+
+    :return: (infoDict, nodeCount)
+    '''
+    with open(filepath, 'rb') as f:
+        head = f.read(len(POSE_BINARY_MAGIC))
+        if head == POSE_BINARY_MAGIC:
+            version, headerSize = struct.unpack('<II', f.read(8))
+            header = json.loads(f.read(headerSize).decode('utf-8'))
+            return header.get('info') or {}, len(header.get('nodes') or [])
+        if head.lstrip().startswith('{'):
+            f.seek(0)
+            data = json.load(f)
+            return data.get('info') or {}, len(data.get('poseData') or {})
+        f.seek(0)
+        info = {}
+        nodes = 0
+        section = None
+        for line in f:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            if stripped.startswith('['):
+                depth = len(stripped) - len(stripped.lstrip('['))
+                if depth == 1:
+                    section = stripped.strip('[]')
+                elif depth == 2 and section == 'poseData':
+                    nodes += 1
+                if section == 'info' and depth > 1:
+                    section = 'info_sub'
+                continue
+            if section == 'info' and '=' in stripped:
+                key, value = stripped.split('=', 1)
+                info[key.strip()] = value.strip().strip('"')
+        return info, nodes
+
+def poseTags(info):
+    '''
+    tags for a pose from its info block, any 'tags' entry plus the rig data
+    '''
+    tags = info.get('tags') or []
+    if isinstance(tags, basestring):
+        tags = [t.strip() for t in tags.split(',')]
+    tags = [t for t in tags if t]
+    for key in ('rigType', 'metaRigNodeID'):
+        value = info.get(key)
+        if value and value not in ('None', ',') and value not in tags:
+            tags.append(value)
+    return tags
+
+
+class ThumbnailCache(object):
+    '''
+    LRU cache of thumbnail data, loaded lazily on first request. Keyed on the path
+    and its index mtime so an updated thumbnail is reloaded
+
+    :param limit: max number of thumbnails held
+    :param loader: func(path) returning the data to cache, defaults to the raw file bytes
+    '''
+    def __init__(self, limit=RED9_POSE_THUMB_CACHE, loader=None):
+        self.limit = limit
+        self.loader = loader or self._readFile
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _readFile(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def get(self, path, mtime=None):
+        key = (path, mtime)
+        with self._lock:
+            if key in self._cache:
+                data = self._cache.pop(key)
+                self._cache[key] = data
+                return data
+        try:
+            data = self.loader(path)
+        except (IOError, OSError):
+            return None
+        with self._lock:
+            self._cache[key] = data
+            while len(self._cache) > self.limit:
+                self._cache.popitem(last=False)
+        return data
+
+    def invalidate(self, path):
+        with self._lock:
+            for key in [k for k in self._cache if k[0] == path]:
+                self._cache.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class PoseIndex(object):
+    '''
+    persistent index of the poses under a root folder
+
+    :param rootPath: the pose library root
+    :param indexPath: json file to store the index in, defaults to RED9_POSEINDEX_FILE
+        under the root or, if that's not writable, a per-root file in the temp dir
+    :param poseExt: pose file extension
+    :param thumbExt: thumbnail extension, thumbnails share the pose name
+    '''
+    def __init__(self, rootPath, indexPath=None, poseExt='.pose', thumbExt='.bmp'):
+        self.rootPath = os.path.normpath(rootPath)
+        self.poseExt = poseExt
+        self.thumbExt = thumbExt
+        self.indexPath = indexPath or self._defaultIndexPath()
+        self.folders = {}  # relFolder : {'mtime', 'scanned', 'subFolders'}
+        self.poses = {}  # relPath : entry dict
+        self.thumbnails = ThumbnailCache()
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def __repr__(self):
+        return '%s(%s : %i poses)' % (self.__class__.__name__, self.rootPath, len(self.poses))
+
+    def _defaultIndexPath(self):
+        path = os.path.join(self.rootPath, *RED9_POSEINDEX_FILE.split('/'))
+        folder = os.path.dirname(path)
+        if os.access(folder if os.path.exists(folder) else self.rootPath, os.W_OK) and \
+                (not os.path.exists(path) or os.access(path, os.W_OK)):
+            return path
+        return os.path.join(tempfile.gettempdir(),
+                            'r9poseIndex_%s.json' % hashlib.md5(self.rootPath.encode('utf-8')).hexdigest())
+
+    # path handling ---
+
+    def relPath(self, path):
+        '''
+        index key for a path, relative to the root with '/' separators
+        '''
+        if not os.path.isabs(path):
+            return path.replace('\\', '/').strip('/')
+        rel = os.path.relpath(os.path.normpath(path), self.rootPath)
+        if rel == '.':
+            return ''
+        return rel.replace('\\', '/')
+
+    def absPath(self, relPath):
+        if not relPath:
+            return self.rootPath
+        return os.path.join(self.rootPath, *relPath.split('/'))
+
+    # persistence ---
+
+    def load(self):
+        '''
+        load the index from disk, a missing or out of date file just gives an empty index
+        '''
+        with self._lock:
+            self._loaded = True
+            if not os.path.exists(self.indexPath):
+                return False
+            try:
+                with open(self.indexPath, 'r') as f:
+                    data = json.load(f)
+            except (IOError, ValueError), err:
+                log.warning('PoseIndex : failed to read %s : %s' % (self.indexPath, err))
+                return False
+            if data.get('version') != RED9_POSEINDEX_VERSION or \
+                    os.path.normpath(data.get('root', '')) != self.rootPath:
+                log.debug('PoseIndex : index out of date, rebuilding : %s' % self.indexPath)
+                return False
+            self.folders = data.get('folders', {})
+            self.poses = data.get('poses', {})
+            return True
+
+    def _makeIndexFolder(self):
+        folder = os.path.dirname(self.indexPath)
+        if not os.path.exists(folder):
+            try:
+                os.makedirs(folder)
+            except OSError, err:
+                log.debug('PoseIndex : failed to make %s : %s' % (folder, err))
+
+    def save(self):
+        '''
+        write the index, via a temp file so other readers never see a partial index
+        '''
+        with self._lock:
+            data = {'version': RED9_POSEINDEX_VERSION,
+                    'root': self.rootPath,
+                    'folders': self.folders,
+                    'poses': self.poses}
+            tmpPath = '%s.%i.tmp' % (self.indexPath, os.getpid())
+            try:
+                self._makeIndexFolder()
+                with open(tmpPath, 'w') as f:
+                    json.dump(data, f)
+                if os.path.exists(self.indexPath):
+                    os.remove(self.indexPath)  # windows won't rename over an existing file
+                os.rename(tmpPath, self.indexPath)
+            except (IOError, OSError), err:
+                log.warning('PoseIndex : failed to write %s : %s' % (self.indexPath, err))
+                if os.path.exists(tmpPath):
+                    os.remove(tmpPath)
+                return False
+            return True
+
+    # building ---
+
+    def update(self, force=False):
+        '''
+        bring the index up to date with the filesystem. Only folders whose mtime
+        has changed are listed and only their new or changed poses are read
+
+        :param force: ignore the stored folder mtimes and rescan everything
+        :return: True if anything changed
+        '''
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            if not os.path.isdir(self.rootPath):
+                log.debug('PoseIndex : root is invalid : %s' % self.rootPath)
+                return False
+            self._makeIndexFolder()  # before the scan, making it changes the root's mtime
+            start = time.time()
+            changed = False
+            seen = set()
+            stack = ['']
+            while stack:
+                rel = stack.pop()
+                seen.add(rel)
+                folder = self.folders.get(rel)
+                try:
+                    mtime = os.stat(self.absPath(rel)).st_mtime
+                except OSError:
+                    continue
+                if not force and folder and folder['mtime'] == mtime and folder['scanned'] - mtime > _MTIME_GRACE:
+                    stack.extend(folder['subFolders'])
+                    continue
+                subFolders = self._scanFolder(rel, mtime)
+                stack.extend(subFolders)
+                changed = True
+
+            # folders removed since the last scan
+            for rel in [r for r in self.folders if r not in seen]:
+                self._dropFolder(rel)
+                changed = True
+            if changed:
+                self.save()
+            log.debug('PoseIndex : updated %s in %0.3f secs, %i poses' % (self.rootPath, time.time() - start, len(self.poses)))
+            return changed
+
+    def _scanFolder(self, rel, mtime):
+        '''
+        list a changed folder, re-reading only the poses whose mtime or size changed
+        '''
+        path = self.absPath(rel)
+        subFolders = []
+        files = set()
+        for f in os.listdir(path):
+            if f.startswith('.'):
+                continue
+            fullPath = os.path.join(path, f)
+            if os.path.isdir(fullPath):
+                subFolders.append('%s/%s' % (rel, f) if rel else f)
+            else:
+                files.add(f)
+
+        current = set()
+        for f in files:
+            if not f.lower().endswith(self.poseExt):
+                continue
+            key = '%s/%s' % (rel, f) if rel else f
+            current.add(key)
+            name = f[:-len(self.poseExt)]
+            thumb = name + self.thumbExt
+            self._updateEntry(key, thumb if thumb in files else None)
+
+        for key in [k for k, e in self.poses.items() if e['folder'] == rel and k not in current]:
+            self.poses.pop(key)
+        self.folders[rel] = {'mtime': mtime, 'scanned': time.time(), 'subFolders': subFolders}
+        return subFolders
+
+    def _updateEntry(self, key, thumb, force=False):
+        path = self.absPath(key)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.poses.pop(key, None)
+            return None
+        entry = self.poses.get(key)
+        if entry and not force and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            entry['thumb'] = thumb
+            return entry
+        folder, fileName = key.rsplit('/', 1) if '/' in key else ('', key)
+        name = fileName[:-len(self.poseExt)]
+        try:
+            info, nodes = readPoseInfo(path)
+        except (IOError, ValueError, struct.error), err:
+            log.debug('PoseIndex : failed to read pose info %s : %s' % (path, err))
+            info, nodes = {}, 0
+        tags = poseTags(info)
+        tokens = set(splitTokens(name))
+        for t in tags:
+            tokens.update(splitTokens(t))
+        if folder:
+            tokens.update(splitTokens(folder))
+        entry = {'name': name,
+                 'folder': folder,
+                 'mtime': stat.st_mtime,
+                 'size': stat.st_size,
+                 'nodes': nodes,
+                 'tags': tags,
+                 'author': info.get('author', ''),
+                 'thumb': thumb,
+                 'tokens': sorted(tokens)}
+        self.poses[key] = entry
+        return entry
+
+    def _dropFolder(self, rel):
+        self.folders.pop(rel, None)
+        for key in [k for k, e in self.poses.items() if e['folder'] == rel]:
+            self.poses.pop(key)
+
+    def updateFile(self, filepath):
+        '''
+        refresh a single pose entry, for poses re-written in place which
+        don't change their folder's mtime
+        '''
+        with self._lock:
+            if not self._loaded:
+                self.load()
+            key = self.relPath(filepath)
+            thumbPath = filepath[:-len(self.poseExt)] + self.thumbExt
+            thumb = os.path.basename(thumbPath) if os.path.exists(thumbPath) else None
+            entry = self._updateEntry(key, thumb, force=True)
+            self.thumbnails.invalidate(thumbPath)
+            self.save()
+            return entry
+
+    # queries ---
+
+    def getEntries(self, folder=None, recursive=False):
+        '''
+        index entries for a folder
+
+        :param folder: absolute or root relative folder, None for the root
+        :param recursive: include the poses in all subfolders
+        '''
+        rel = self.relPath(folder) if folder else ''
+        with self._lock:
+            if recursive:
+                prefix = rel + '/' if rel else ''
+                return [e for e in self.poses.values() if not rel or e['folder'] == rel or e['folder'].startswith(prefix)]
+            return [e for e in self.poses.values() if e['folder'] == rel]
+
+    @staticmethod
+    def sortEntries(entries, sortBy='name'):
+        '''
+        :param sortBy: 'name' (natural sort) or 'date' (newest first)
+        '''
+        if sortBy == 'date':
+            return sorted(entries, key=lambda e: e['mtime'], reverse=True)
+        return sorted(entries, key=lambda e: naturalKey(e['name']))
+
+    def getPoses(self, folder=None, sortBy='name', recursive=False):
+        '''
+        sorted pose names for a folder, the direct replacement for listing the folder
+        '''
+        return [e['name'] for e in self.sortEntries(self.getEntries(folder, recursive), sortBy)]
+
+    def search(self, searchFilter, folder=None, sortBy='name', recursive=False, matchcase=False):
+        '''
+        entries matching the filter. Uses the r9Core.filterListByString syntax against the
+        pose name, then falls back to the tags and search tokens
+
+        :return: list of entry dicts
+        '''
+        entries = self.sortEntries(self.getEntries(folder, recursive), sortBy)
+        regex = compileFilter(searchFilter, matchcase)
+        if not regex:
+            return entries
+        return [e for e in entries if self._matches(regex, e)]
+
+    @staticmethod
+    def _matches(regex, entry):
+        if regex.search(entry['name']):
+            return True
+        for t in entry['tags']:
+            if regex.search(t):
+                return True
+        for t in entry['tokens']:
+            if regex.search(t):
+                return True
+        return False
+
+    def filterPoses(self, poses, searchFilter, folder=None):
+        '''
+        filter a list of pose names from the given folder, keeping their order
+        '''
+        regex = compileFilter(searchFilter)
+        if not regex:
+            return list(poses)
+        rel = self.relPath(folder) if folder else ''
+        keys = dict([(e['name'], e) for e in self.getEntries(rel)])
+        return [p for p in poses if (p in keys and self._matches(regex, keys[p])) or
+                (p not in keys and regex.search(p))]
+
+    def getEntry(self, name, folder=None):
+        rel = self.relPath(folder) if folder else ''
+        return self.poses.get('%s/%s%s' % (rel, name, self.poseExt) if rel else name + self.poseExt)
+
+    def getThumbPath(self, name, folder=None):
+        '''
+        full thumbnail path for a pose from the index, None if it has no thumbnail
+        '''
+        entry = self.getEntry(name, folder)
+        if entry and entry['thumb']:
+            return self.absPath('%s/%s' % (entry['folder'], entry['thumb']) if entry['folder'] else entry['thumb'])
+        return None
+
+    def getThumbnail(self, name, folder=None):
+        '''
+        thumbnail data for a pose, loaded on first request and held in the LRU cache
+        '''
+        path = self.getThumbPath(name, folder)
+        if not path:
+            return None
+        return self.thumbnails.get(path, self.getEntry(name, folder)['mtime'])
+
+    def getFolderCounts(self):
+        '''
+        {relFolder : number of poses directly in it}
+        '''
+        counts = dict([(rel, 0) for rel in self.folders])
+        for e in self.poses.values():
+            counts[e['folder']] = counts.get(e['folder'], 0) + 1
+        return counts
+
+
+# module level index cache ---
+
+def getIndex(rootPath, update=True):
+    '''
+    the shared PoseIndex for a root, kept for the session so repeated UI
+    refreshes don't reload the json
+
+    :param rootPath: pose library root
+    :param update: run an incremental update before returning
+    '''
+    key = os.path.normpath(rootPath)
+    with _INDEX_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = PoseIndex(key)
+            _INDEXES[key] = index
+    if update:
+        index.update()
+    return index
+
+def findIndex(path):
+    '''
+    the loaded index whose root contains the path, None if there isn't one
+    '''
+    path = os.path.normpath(path)
+    with _INDEX_LOCK:
+        roots = sorted(_INDEXES.keys(), key=len, reverse=True)
+        for root in roots:
+            if path == root or path.startswith(root + os.sep):
+                return _INDEXES[root]
+    return None
+
+def updateFile(filepath):
+    '''
+    refresh a pose in whichever loaded index holds it, call after writing a pose in place
+    '''
+    index = findIndex(os.path.dirname(filepath))
+    if index:
+        return index.updateFile(filepath)
+
+def clearIndexes():
+    with _INDEX_LOCK:
+        _INDEXES.clear()
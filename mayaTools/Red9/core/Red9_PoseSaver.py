@@ -35,6 +35,10 @@ import Red9.packages.configobj as configobj
 import time
 import getpass
 import json
+import ast
+import mmap
+import struct
+from array import array
 
 
 import logging
@@ -62,6 +66,587 @@ def getFolderPoseHandler(posePath):
     return poseHandler
 
 
+# -------------------------------------------------------------------------------------
+# Binary Pose Format -----
+# -------------------------------------------------------------------------------------
+
+'''
+dataformat='binary' : a packed columnar pose container designed for fast library scans and
+lazy loading. All the node keys and their matching data (ID, longName, mirrorID, metaData...)
+live in a small JSON header, the attribute data for ALL nodes is stored as 3 flat packed arrays
+(attr name index, float64 value, uint8 value type) which each node block indexes by [start, count]
+
+    | magic (8 bytes) | version (uint32) | headerSize (uint32) | header JSON (utf-8) | pad to 8 bytes |
+    | attrNameIndex uint32[n] | values float64[n] | types uint8[n] |
+
+On read only the header is decoded, the file is memory-mapped and each node's attr block is
+only unpacked when it's first accessed, ie by the _applyData calls for the nodes actually matched
+'''
+
+POSE_BINARY_MAGIC = 'R9POSEB\x00'
+POSE_BINARY_VERSION = 1
+
+# value type codes stored in the types array
+_POSE_TYPE_FLOAT = 0
+_POSE_TYPE_INT = 1
+_POSE_TYPE_BOOL = 2
+_POSE_TYPE_EXTRA = 3  # non-scalar data, the value is the index into the headers 'extras' list
+
+def isBinaryPoseFile(filepath):
+    '''
+    simple check to see if the given file is in the binary pose format
+    '''
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(POSE_BINARY_MAGIC)) == POSE_BINARY_MAGIC
+    except IOError:
+        return False
+
+def _packPoseValue(val):
+    '''
+    config sourced poses store every value as a string, numeric ones are converted
+    back to their native type so they pack into the arrays rather than the extras
+    '''
+    if isinstance(val, basestring):
+        try:
+            literal = ast.literal_eval(val.strip())
+        except (ValueError, SyntaxError):
+            return val
+        if isinstance(literal, (bool, int, long, float)):
+            return literal
+    return val
+
+def writePoseBinary(filepath, poseDict, infoDict=None, settings=None, skeletonDict=None):
+    '''
+    write the given pose data to the binary pose format
+
+    :param filepath: file to write
+    :param poseDict: the DataMap.poseDict to pack
+    :param infoDict: the DataMap.infoDict
+    :param settings: dict of the filterNode_settings
+    :param skeletonDict: the DataMap.skeletonDict if any
+    '''
+    attrNames = []
+    attrNameMap = {}
+    nameIndexes = []
+    values = []
+    types = []
+    extras = []
+    nodes = []
+
+    for key in sorted(poseDict.keys()):
+        block = dict(poseDict[key])
+        attrs = block.pop('attrs', None)
+        start = len(values)
+        if attrs is not None:
+            for attr, val in sorted(attrs.items()):
+                val = _packPoseValue(val)
+                if attr not in attrNameMap:
+                    attrNameMap[attr] = len(attrNames)
+                    attrNames.append(attr)
+                nameIndexes.append(attrNameMap[attr])
+                if isinstance(val, bool):
+                    types.append(_POSE_TYPE_BOOL)
+                    values.append(float(val))
+                elif isinstance(val, (int, long)) and abs(val) < 2 ** 53:
+                    types.append(_POSE_TYPE_INT)
+                    values.append(float(val))
+                elif isinstance(val, float):
+                    types.append(_POSE_TYPE_FLOAT)
+                    values.append(val)
+                else:
+                    types.append(_POSE_TYPE_EXTRA)
+                    values.append(float(len(extras)))
+                    extras.append(val)
+        # count of -1 means the node had no 'attrs' block at all
+        nodes.append([key, block, start, len(values) - start if attrs is not None else -1])
+
+    count = len(values)
+    header = json.dumps({'info': infoDict or {},
+                         'filterNode_settings': settings or {},
+                         'skeletonDict': skeletonDict or {},
+                         'attrNames': attrNames,
+                         'extras': extras,
+                         'nodes': nodes,
+                         'count': count}).encode('utf-8')
+    padding = (8 - (len(POSE_BINARY_MAGIC) + 8 + len(header)) % 8) % 8
+
+    with open(filepath, 'wb') as f:
+        f.write(POSE_BINARY_MAGIC)
+        f.write(struct.pack('<II', POSE_BINARY_VERSION, len(header) + padding))
+        f.write(header)
+        f.write(' ' * padding)
+        f.write(struct.pack('<%iI' % count, *nameIndexes))
+        f.write(struct.pack('<%id' % count, *values))
+        f.write(struct.pack('<%iB' % count, *types))
+
+
+class PoseBinaryReader(object):
+    '''
+    Reader for the binary pose format. The header is read on init, the attribute
+    arrays are memory-mapped and only decoded per node block via decodeAttrs()
+    '''
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._mmap = None
+        with open(filepath, 'rb') as f:
+            if not f.read(len(POSE_BINARY_MAGIC)) == POSE_BINARY_MAGIC:
+                raise IOError('Not a binary pose file : %s' % filepath)
+            self.version, headerSize = struct.unpack('<II', f.read(8))
+            if self.version > POSE_BINARY_VERSION:
+                raise IOError('Binary pose file version %i is newer than this reader supports (%i) : %s' %
+                              (self.version, POSE_BINARY_VERSION, filepath))
+            self.header = json.loads(f.read(headerSize).decode('utf-8'))
+        self.count = self.header['count']
+        self._namesOffset = len(POSE_BINARY_MAGIC) + 8 + headerSize
+        self._valuesOffset = self._namesOffset + 4 * self.count
+        self._typesOffset = self._valuesOffset + 8 * self.count
+
+    def _map(self):
+        if self._mmap is None:
+            with open(self.filepath, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def close(self):
+        '''
+        release the memory-map, it'll be re-opened if any further blocks need decoding.
+        We close as soon as we can so the file isn't locked on Windows
+        '''
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def decodeAttrs(self, start, count):
+        '''
+        unpack a single node's attr block from the mapped arrays
+
+        :return: dict {attr: value}
+        '''
+        if count <= 0:
+            return {}
+        mapped = self._map()
+        names = struct.unpack_from('<%iI' % count, mapped, self._namesOffset + 4 * start)
+        values = struct.unpack_from('<%id' % count, mapped, self._valuesOffset + 8 * start)
+        types = struct.unpack_from('<%iB' % count, mapped, self._typesOffset + start)
+        attrNames = self.header['attrNames']
+        extras = self.header['extras']
+        attrs = {}
+        for name, val, valType in zip(names, values, types):
+            if valType == _POSE_TYPE_INT:
+                val = int(val)
+            elif valType == _POSE_TYPE_BOOL:
+                val = bool(val)
+            elif valType == _POSE_TYPE_EXTRA:
+                val = extras[int(val)]
+            attrs[attrNames[name]] = val
+        return attrs
+
+    def buildPoseDict(self):
+        '''
+        build the poseDict with lazy 'attrs' blocks that decode on first access
+        '''
+        poseDict = {}
+        for key, block, start, count in self.header['nodes']:
+            if count >= 0:
+                block['attrs'] = LazyPoseAttrs(self, start, count)
+            poseDict[key] = block
+        return poseDict
+
+
+class LazyPoseAttrs(dict):
+    '''
+    dict for a single node's 'attrs' block that only decodes its data
+    from the PoseBinaryReader the first time it's accessed
+    '''
+    def __init__(self, reader, start, count):
+        super(LazyPoseAttrs, self).__init__()
+        self._reader = reader
+        self._start = start
+        self._count = count
+        self._loaded = False
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        if not self._loaded:
+            self._loaded = True
+            dict.update(self, self._reader.decodeAttrs(self._start, self._count))
+        return self
+
+    def __reduce__(self):
+        # copies / pickles are always plain, fully decoded dicts
+        return (dict, (dict(self.load().items()),))
+
+def _lazyPoseAttrsMethod(name):
+    func = getattr(dict, name)
+
+    def wrapper(self, *args, **kws):
+        self.load()
+        return func(self, *args, **kws)
+    wrapper.__name__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+for _name in ['__getitem__', '__setitem__', '__delitem__', '__contains__', '__iter__', '__len__',
+              '__eq__', '__ne__', '__repr__', 'keys', 'values', 'items', 'iterkeys', 'itervalues',
+              'iteritems', 'get', 'pop', 'popitem', 'setdefault', 'update', 'copy', 'has_key']:
+    setattr(LazyPoseAttrs, _name, _lazyPoseAttrsMethod(_name))
+
+def resolvePoseDict(poseDict):
+    '''
+    force any lazy attr blocks in the poseDict to decode, required before handing
+    the data to anything that reads the dict directly such as ConfigObj or json
+    '''
+    for block in poseDict.values():
+        attrs = block.get('attrs') if isinstance(block, dict) else None
+        if isinstance(attrs, LazyPoseAttrs):
+            block['attrs'] = dict(attrs.load().items())
+    return poseDict
+
+def _evalPoseValue(val):
+    '''
+    config poses store all values as strings, json and binary poses
+    store native types, this handles both
+    '''
+    try:
+        return eval(val)
+    except:
+        return val
+
+def convertPoseFile(filepath, dataformat='binary', outputpath=None):
+    '''
+    convert a single pose file between the 'config', 'json' and 'binary' formats
+
+    :param filepath: pose file to convert
+    :param dataformat: format to convert to
+    :param outputpath: if not given we convert in place
+    :return: True if the file was converted, False if it was already in the given format
+    '''
+    pose = DataMap()
+    pose._readPose(filepath, force=True)
+    if pose._dataformat_resolved == dataformat and not outputpath:
+        return False
+    if pose.settings_internal:
+        pose.settings = pose.settings_internal
+    pose.dataformat = dataformat
+    if not outputpath:
+        outputpath = filepath
+    # write to a temp file first so a failed conversion never loses the pose
+    tempfile = '%s.converting' % outputpath
+    pose._writePose(tempfile, force=True)
+    pose._releasePoseFile()
+    if os.path.exists(outputpath):
+        os.remove(outputpath)
+    os.rename(tempfile, outputpath)
+    return True
+
+def convertPoseDirectory(directory, dataformat='binary', recursive=True, extensions=['.pose']):
+    '''
+    convert all the pose files in a given directory to the given dataformat
+
+    :param directory: root folder of the pose library
+    :param dataformat: 'binary', 'json' or 'config'
+    :param recursive: also process all sub-folders
+    :param extensions: file extensions to treat as poses
+    :return: dict {'converted': [], 'skipped': [], 'failed': []}
+    '''
+    results = {'converted': [], 'skipped': [], 'failed': []}
+    for root, dirs, files in os.walk(directory):
+        for f in sorted(files):
+            if not os.path.splitext(f)[-1].lower() in extensions:
+                continue
+            filepath = os.path.join(root, f)
+            try:
+                if convertPoseFile(filepath, dataformat=dataformat):
+                    results['converted'].append(filepath)
+                else:
+                    results['skipped'].append(filepath)
+            except StandardError, err:
+                log.warning('Failed to convert pose : %s : %s' % (filepath, err))
+                results['failed'].append(filepath)
+        if not recursive:
+            break
+    log.info('Pose Directory converted to "%s" : %i converted, %i skipped, %i failed' %
+             (dataformat, len(results['converted']), len(results['skipped']), len(results['failed'])))
+    return results
+
+
+# -------------------------------------------------------------------------------------
+# Pose Apply Plan -----
+# -------------------------------------------------------------------------------------
+
+def _loadPosePlanCmd():
+    '''
+    make sure the PoseApplyPlan plugin is loaded, this is what registers the batched
+    plug edits to the undoStack. If it can't be loaded the plan falls back to cmds.setAttr
+    '''
+    global RED9_POSEPLAN_CMD
+    if RED9_POSEPLAN_CMD is None:
+        RED9_POSEPLAN_CMD = False
+        if hasattr(OpenMaya.MDGModifier, 'newPlugValueDouble'):  # 2016 and above
+            try:
+                if not cmds.pluginInfo('PoseApplyPlan.py', query=True, loaded=True):
+                    cmds.loadPlugin('PoseApplyPlan.py', quiet=True)
+                RED9_POSEPLAN_CMD = True
+            except StandardError, err:
+                log.debug('PoseApplyPlan plugin not available, falling back to cmds : %s' % err)
+    return RED9_POSEPLAN_CMD
+
+RED9_POSEPLAN_CMD = None
+
+
+class PoseApplyPlan(object):
+    '''
+    The matched pose data compiled down for applying. Built once per processPoseFile,
+    every matched (poseKey, node) pair is resolved to its MPlugs with the values evaluated,
+    unit converted, mirror inversed and clamped up front, held in flat typed arrays.
+    Applying is then a single pass filling one MDGModifier, run through the PoseApplyPlan
+    plugin command so it's undoable, and blending is just an interpolation of the arrays.
+
+    >>> plan = PoseApplyPlan(poseData)
+    >>> plan.apply()
+    >>> plan.cacheCurrent()
+    >>> plan.blend(25)  # 25% from the cached current state to the pose
+
+    Plugs that aren't plain numerics, ie compound, time or string attrs, or are driven by
+    something other than an animCurve are still set via cmds.setAttr from the plan.
+    '''
+    DOUBLE = 0  # float, double and distance / angle unit attrs, factor converts UI to internal units
+    INT = 1  # int, short, byte and enum attrs
+    BOOL = 2
+    CMDS = 3  # numeric value but set through cmds.setAttr
+    _attrs_linear = ['translateX', 'translateY', 'translateZ']
+    _pendingModifier = None
+
+    def __init__(self, poseData=None):
+        self.rows = []  # (poseKey, attr) per row
+        self.plugNames = []  # 'node.attr' per row
+        self.plugs = []  # MPlug per row
+        self.kinds = array('b')
+        self.values = array('d')  # pose values in UI units
+        self.factors = array('d')  # UI to internal unit multiplier for the API set
+        self.current = None  # array('d') of the current scene values, filled by cacheCurrent
+        self.other = []  # (plugName, value) for non-numeric data, strings etc
+        self._source = None
+        if poseData is not None:
+            self.compile(poseData)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def popModifier(cls):
+        '''
+        called by the PoseApplyPlan plugin command to take the queued MDGModifier
+        '''
+        modifier = cls._pendingModifier
+        cls._pendingModifier = None
+        return modifier
+
+    def isCurrent(self, poseData):
+        '''
+        is this plan still built from the given poseData's matched data
+        '''
+        return self._source == (id(poseData.poseDict), id(poseData.matchedPairs), len(poseData.matchedPairs))
+
+    @staticmethod
+    def _getPlug(plugName):
+        mSel = OpenMaya.MSelectionList()
+        mSel.add(plugName)
+        mPlug = OpenMaya.MPlug()
+        mSel.getPlug(0, mPlug)
+        return mPlug
+
+    @staticmethod
+    def _limits(attrObj):
+        '''
+        min / max of a numeric attr, None where not set
+        '''
+        lower = upper = None
+        fnAttr = OpenMaya.MFnNumericAttribute(attrObj)
+        util = OpenMaya.MScriptUtil()
+        ptr = util.asDoublePtr()
+        try:
+            if fnAttr.hasMin():
+                fnAttr.getMin(ptr)
+                lower = util.getDouble(ptr)
+            if fnAttr.hasMax():
+                fnAttr.getMax(ptr)
+                upper = util.getDouble(ptr)
+        except StandardError:
+            pass
+        return lower, upper
+
+    def _plugKind(self, mPlug):
+        '''
+        :return: (kind, factor, lower, upper) for the given plug
+        '''
+        if mPlug.isDestination():
+            source = mPlug.source() if hasattr(mPlug, 'source') else None
+            if source is None or source.isNull() or not source.node().hasFn(OpenMaya.MFn.kAnimCurve):
+                return self.CMDS, 1.0, None, None
+        attrObj = mPlug.attribute()
+        if attrObj.hasFn(OpenMaya.MFn.kNumericAttribute):
+            unitType = OpenMaya.MFnNumericAttribute(attrObj).unitType()
+            lower, upper = self._limits(attrObj)
+            if unitType == OpenMaya.MFnNumericData.kBoolean:
+                return self.BOOL, 1.0, None, None
+            if unitType in (OpenMaya.MFnNumericData.kFloat, OpenMaya.MFnNumericData.kDouble):
+                return self.DOUBLE, 1.0, lower, upper
+            if unitType in (OpenMaya.MFnNumericData.kInt, OpenMaya.MFnNumericData.kShort,
+                            OpenMaya.MFnNumericData.kByte, OpenMaya.MFnNumericData.kChar):
+                return self.INT, 1.0, lower, upper
+        elif attrObj.hasFn(OpenMaya.MFn.kUnitAttribute):
+            unitType = OpenMaya.MFnUnitAttribute(attrObj).unitType()
+            if unitType == OpenMaya.MFnUnitAttribute.kDistance:
+                return self.DOUBLE, OpenMaya.MDistance(1.0, OpenMaya.MDistance.uiUnit()).asCentimeters(), None, None
+            if unitType == OpenMaya.MFnUnitAttribute.kAngle:
+                return self.DOUBLE, OpenMaya.MAngle(1.0, OpenMaya.MAngle.uiUnit()).asRadians(), None, None
+        elif attrObj.hasFn(OpenMaya.MFn.kEnumAttribute):
+            return self.INT, 1.0, None, None
+        return self.CMDS, 1.0, None, None
+
+    def compile(self, poseData):
+        '''
+        build the plan from the matchedPairs and poseDict of the given DataMap, after processPoseFile
+
+        :param poseData: DataMap / PoseData instance
+        '''
+        self.__init__()
+        self._source = (id(poseData.poseDict), id(poseData.matchedPairs), len(poseData.matchedPairs))
+        skipAttrs = set(poseData.skipAttrs or [])
+        mirrorInverse = getattr(poseData, 'mirrorInverse', False)
+
+        # setup unit conversions for linear attrs
+        conversion = None
+        sceneunits = cmds.currentUnit(q=True, fullName=True, linear=True)
+        unitsfile = poseData.infoDict.get('sceneUnits') if poseData.infoDict else None
+        if poseData.unitconversion and unitsfile and not unitsfile == sceneunits:
+            conversion = r9Core.convertUnits_uiToInternal(r9Core.convertUnits_internalToUI(1.0, unitsfile), sceneunits)
+        elif not unitsfile:
+            log.debug("This PoseFile doesn't not support scene unit conversion")
+
+        mirror = r9Anim.MirrorHierarchy() if mirrorInverse else None
+        for key, dest in poseData.matchedPairs:
+            block = poseData.poseDict[key]
+            if 'attrs' not in block:
+                log.debug('Pose Object Key : %s : has no Attr block data' % key)
+                continue
+            inverseAxis = []
+            if mirror and block.get('mirrorID'):
+                # this is mainly for the ProPack finger systems support hooks
+                if not block['mirrorID'].split('_')[0] == mirror.getMirrorSide(dest):
+                    inverseAxis = mirror.getMirrorAxis(dest) or []
+            for attr, val in block['attrs'].items():
+                if attr in skipAttrs:
+                    log.debug('Skipping attr as requested : %s' % attr)
+                    continue
+                val = _evalPoseValue(val)
+                plugName = '%s.%s' % (dest, attr)
+                if not isinstance(val, (int, long, float)):
+                    self.other.append((plugName, val))
+                    continue
+                try:
+                    mPlug = self._getPlug(plugName)
+                except RuntimeError:
+                    log.debug('Attr mismatch on destination : %s' % plugName)
+                    continue
+                if mPlug.isLocked():
+                    log.debug('Skipping locked attr : %s' % plugName)
+                    continue
+                if conversion and attr in self._attrs_linear:
+                    val = val * conversion
+                if attr in inverseAxis:
+                    val = 0 - val
+                kind, factor, lower, upper = self._plugKind(mPlug)
+                if lower is not None and val < lower:
+                    val = lower
+                if upper is not None and val > upper:
+                    val = upper
+                self.rows.append((key, attr))
+                self.plugNames.append(plugName)
+                self.plugs.append(mPlug)
+                self.kinds.append(kind)
+                self.values.append(val)
+                self.factors.append(factor)
+        log.debug('PoseApplyPlan compiled : %i plugs, %i cmds only' % (len(self.rows), len(self.other)))
+        return self
+
+    def cacheCurrent(self):
+        '''
+        read the current scene values of all the plugs, the start point for blend()
+        '''
+        current = array('d')
+        for i, mPlug in enumerate(self.plugs):
+            kind = self.kinds[i]
+            try:
+                if kind == self.DOUBLE:
+                    current.append(mPlug.asDouble() / self.factors[i])
+                elif kind == self.INT:
+                    current.append(mPlug.asInt())
+                elif kind == self.BOOL:
+                    current.append(mPlug.asBool())
+                else:
+                    current.append(cmds.getAttr(self.plugNames[i]))
+            except StandardError:
+                log.debug('Failed to read current value : %s' % self.plugNames[i])
+                current.append(self.values[i])
+        self.current = current
+        return current
+
+    def apply(self, values=None):
+        '''
+        push the values to the plugs in one batched MDGModifier
+
+        :param values: array of values in row order, default is the pose values.
+            When given, the non-numeric data in self.other is not applied
+        '''
+        full = values is None
+        if full:
+            values = self.values
+        modifier = OpenMaya.MDGModifier() if self.plugs and _loadPosePlanCmd() else None
+        for i, mPlug in enumerate(self.plugs):
+            kind = self.kinds[i]
+            val = values[i]
+            if modifier and not kind == self.CMDS:
+                if kind == self.DOUBLE:
+                    modifier.newPlugValueDouble(mPlug, val * self.factors[i])
+                elif kind == self.INT:
+                    modifier.newPlugValueInt(mPlug, int(round(val)))
+                else:
+                    modifier.newPlugValueBool(mPlug, bool(round(val)))
+                continue
+            if kind == self.INT or kind == self.BOOL:
+                val = int(round(val))
+            try:
+                cmds.setAttr(self.plugNames[i], val, c=True)
+            except StandardError, err:
+                log.debug(err)
+        if modifier:
+            PoseApplyPlan._pendingModifier = modifier
+            cmds.PoseApplyPlan()
+        if full:
+            for plugName, val in self.other:
+                try:
+                    cmds.setAttr(plugName, val, c=True)
+                except StandardError, err:
+                    log.debug(err)
+
+    def blend(self, percent):
+        '''
+        apply a percentage of the pose, interpolating from the cached current state
+
+        :param percent: 0-100, 100 being the full pose
+        '''
+        if self.current is None or not len(self.current) == len(self.values):
+            self.cacheCurrent()
+        weight = percent / 100.0
+        self.apply(array('d', [c + (v - c) * weight for c, v in zip(self.current, self.values)]))
+
+
 class DataMap(object):
     '''
     New base class for handling data storage and reloading with intelligence
@@ -88,8 +673,9 @@ class DataMap(object):
         self.filename = ''  # short name of the pose
         self._read_mute = False  # a back-door to prevent the _readPose() call happening, allowing us to modify cached data safely
 
-        self.dataformat = 'config'
+        self.dataformat = 'config'  # 'config', 'json' or 'binary'
         self._dataformat_resolved = None
+        self._binaryReader = None  # PoseBinaryReader bound when we read a binary pose
 
         self.mayaUpAxis = r9Setup.mayaUpAxis()
         self.thumbnailRes = [128, 128]
@@ -105,6 +691,8 @@ class DataMap(object):
 
         self.nodesToStore = []  # built by the buildDataMap func
         self.nodesToLoad = []  # build in the processPoseFile func
+        self.matchedPairs = []  # build in the processPoseFile func
+        self.applyPlan = None  # PoseApplyPlan compiled in the processPoseFile func
 
         # make sure we have a settings object
         if filterSettings:
@@ -388,7 +976,7 @@ class DataMap(object):
         Build the internal poseDict up from the given nodes. This is the
         core of the Pose System and the main dataMap used to store and retrieve data
         '''
-        getMirrorID = r9Anim.MirrorHierarchy().getMirrorCompiledID
+        mirrorIDs = r9Anim.MirrorTable().getCompiledIDs(nodes)  # bulk read of the mirror markers
         if self.metaPose:
             getMetaDict = self.metaRig.getNodeConnectionMetaDataMap  # optimisation
 
@@ -397,7 +985,7 @@ class DataMap(object):
             self.poseDict[key] = {}
             self.poseDict[key]['ID'] = i  # selection order index
             self.poseDict[key]['longName'] = node  # longNode name
-            mirrorID = getMirrorID(node)
+            mirrorID = mirrorIDs.get(node)
             if mirrorID:
                 self.poseDict[key]['mirrorID'] = mirrorID  # add the mirrorIndex
             if self.metaPose:
@@ -485,46 +1073,10 @@ class DataMap(object):
         tuples of (poseDict[key], node in scene)
 
         fix: 07/11/18: added the clamp=True to the set calls so we set values to max/min if the input value is out of range
+        update: the data is now compiled to a PoseApplyPlan in processPoseFile, unit conversion,
+        skipAttrs and clamping are all done there and the values pushed in one batched modifier
         '''
-        _attrs_linear = ['translateX', 'translateY', 'translateZ']
-
-        # setup unit conversions for linear attrs
-        _unitsfile = None
-        _conversion_needed = False
-        _sceneunits = cmds.currentUnit(q=True, fullName=True, linear=True)
-        try:
-            _unitsfile = self.infoDict['sceneUnits']
-            if not _unitsfile == _sceneunits:
-                _conversion_needed = True
-        except:
-            log.debug("This PoseFile doesn't not support scene unit conversion")
-
-        for key, dest in self.matchedPairs:
-            log.debug('Applying Key Block : %s' % key)
-            try:
-                if 'attrs' not in self.poseDict[key]:
-                    continue
-                for attr, val in self.poseDict[key]['attrs'].items():
-                    if attr in self.skipAttrs:
-                        log.debug('Skipping attr as requested : %s' % attr)
-                        continue
-                    try:
-                        val = eval(val)
-                    except:
-                        pass
-                    try:
-                        # only unit convert linear attrs if the file supports it and it's needed!
-                        if _conversion_needed and self.unitconversion and attr in _attrs_linear:
-                            _converted = r9Core.convertUnits_uiToInternal(r9Core.convertUnits_internalToUI(val, _unitsfile), _sceneunits)
-                            log.debug('node : %s : attr : %s : UnitConverted : val %s == %s' % (dest, attr, val, _converted))
-                            cmds.setAttr('%s.%s' % (dest, attr), _converted, c=True)
-                        else:
-                            log.debug('node : %s : attr : %s : val %s' % (dest, attr, val))
-                            cmds.setAttr('%s.%s' % (dest, attr), val, c=True)
-                    except StandardError, err:
-                        log.debug(err)
-            except:
-                log.debug('Pose Object Key : %s : has no Attr block data' % key)
+        self.getApplyPlan().apply()
 
     @r9General.Timer
     def _applyData_kWorld_attrs(self, worldspace=True, *args, **kws):
@@ -566,17 +1118,18 @@ class DataMap(object):
 
                     tran_data = []
                     rot_data = self.poseDict[key]['attrs_kWorld']['quaternion']
-                    rot_data = [eval(rot_data[0]), eval(rot_data[1]), eval(rot_data[2]), eval(rot_data[3])]
+                    rot_data = [_evalPoseValue(rot_data[0]), _evalPoseValue(rot_data[1]),
+                                _evalPoseValue(rot_data[2]), _evalPoseValue(rot_data[3])]
 
                     for attr in self.poseDict[key]['attrs_kWorld']['translation']:
                         if _conversion_needed and self.unitconversion:
                             # only unit convert linear attrs if the file supports it and it's needed!
                             _converted = r9Core.convertUnits_uiToInternal(r9Core.convertUnits_internalToUI(attr, _unitsfile), _sceneunits)
                             log.debug('node : %s : UnitConverted : val %s == %s' % (dest, attr, _converted))
-                            tran_data.append(eval(attr))
+                            tran_data.append(_evalPoseValue(attr))
                         else:
                             log.debug('node : %s : val %s' % (dest, attr))
-                            tran_data.append(eval(attr))
+                            tran_data.append(_evalPoseValue(attr))
 
                     trans = OpenMaya.MVector(tran_data[0], tran_data[1], tran_data[2])
                     rots = OpenMaya.MQuaternion(rot_data[0], rot_data[1], rot_data[2], rot_data[3])
@@ -609,6 +1162,9 @@ class DataMap(object):
         if not force:
             if os.path.exists(filepath) and not os.access(filepath, os.W_OK):
                 raise IOError('File is Read-Only - write aborted : %s' % filepath)
+        if not self.dataformat == 'binary':
+            # text formats need the fully decoded data
+            resolvePoseDict(self.poseDict)
         # =========================
         # write to ConfigObject
         # =========================
@@ -636,6 +1192,23 @@ class DataMap(object):
                 f.write(json.dumps(data, sort_keys=True, indent=4))
                 f.close()
             self._dataformat_resolved = 'json'
+        # =========================
+        # write to Binary format
+        # =========================
+        elif self.dataformat == 'binary':
+            writePoseBinary(filepath, self.poseDict,
+                            infoDict=self.infoDict,
+                            settings=self.settings.__dict__,
+                            skeletonDict=self.skeletonDict)
+            self._dataformat_resolved = 'binary'
+
+    def _releasePoseFile(self):
+        '''
+        release any memory-mapped binary pose file, any attr blocks not yet
+        decoded will transparently re-map the file if accessed
+        '''
+        if self._binaryReader:
+            self._binaryReader.close()
 
     @r9General.Timer
     def _readPose(self, filename=None, force=False):
@@ -651,10 +1224,34 @@ class DataMap(object):
             filename = self.filepath
         if filename:
             if os.path.exists(filename):
+                self._releasePoseFile()
+                self._binaryReader = None
+                # =========================
+                # read Binary format, always sniffed regardless of self.dataformat
+                # =========================
+                if isBinaryPoseFile(filename):
+                    self._binaryReader = PoseBinaryReader(filename)
+                    header = self._binaryReader.header
+                    self.poseDict = self._binaryReader.buildPoseDict()
+                    if header.get('info'):
+                        self.infoDict = header['info']
+                    if header.get('skeletonDict'):
+                        self.skeletonDict = header['skeletonDict']
+                    if header.get('filterNode_settings'):
+                        self.settings_internal = r9Core.FilterNode_Settings()
+                        self.settings_internal.setByDict(header['filterNode_settings'])
+                    self._dataformat_resolved = 'binary'
+                    return
+
+                dataformat = self.dataformat
+                if dataformat == 'binary':
+                    # binary requested but this is a legacy text pose, sniff json vs config
+                    with open(filename, 'r') as f:
+                        dataformat = 'json' if f.read(64).lstrip().startswith('{') else 'config'
                 # =========================
                 # read JSON format
                 # =========================
-                if self.dataformat == 'json':
+                if dataformat == 'json':
                     try:
                         with open(filename, 'r') as f:
                             data = json.load(f)
@@ -670,7 +1267,7 @@ class DataMap(object):
                 # =========================
                 # read ConfigObject
                 # =========================
-                if self._dataformat_resolved == 'config' or self.dataformat == 'config':
+                if self._dataformat_resolved == 'config' or dataformat == 'config':
                     # for key, val in configobj.ConfigObj(filename)['filterNode_settings'].items():
                     #    self.settings.__dict__[key]=decodeString(val)
                     data = configobj.ConfigObj(filename, encoding='utf-8')
@@ -711,7 +1308,7 @@ class DataMap(object):
             self.setMetaRig(nodes[0])
             if 'metaPose' in self.infoDict and self.metaRig:
                 try:
-                    if eval(self.infoDict['metaPose']):
+                    if _evalPoseValue(self.infoDict['metaPose']):
                         self.matchMethod = 'metaData'
                 except:
                     self.matchMethod = 'metaData'
@@ -745,8 +1342,19 @@ class DataMap(object):
             if rematched:
                 self.matchedPairs.extend(rematched)
 
+        # compile the matched data down to the plugs and values to apply
+        self.applyPlan = PoseApplyPlan(self)
         return self.nodesToLoad
 
+    def getApplyPlan(self):
+        '''
+        the compiled PoseApplyPlan for the current matchedPairs, recompiled if
+        the matched data has been changed since processPoseFile
+        '''
+        if not self.applyPlan or not self.applyPlan.isCurrent(self):
+            self.applyPlan = PoseApplyPlan(self)
+        return self.applyPlan
+
     @r9General.Timer
     def _matchNodesToPoseData(self, nodes, matchMethod=None, returnfails=False):
         '''
@@ -784,21 +1392,21 @@ class DataMap(object):
                     unmatched.append(node)
 
         if matchMethod == 'mirrorIndex':
-            getMirrorID = r9Anim.MirrorHierarchy().getMirrorCompiledID
+            # index the poseDict once, first key wins as per the old linear search
+            poseIDs = {}
+            for key in self.poseDict.keys():
+                if 'mirrorID' in self.poseDict[key] and self.poseDict[key]['mirrorID']:
+                    poseIDs.setdefault(self.poseDict[key]['mirrorID'], key)
+            mirrorIDs = r9Anim.MirrorTable().getCompiledIDs(nodes)
             for node in nodes:
-                matched = False
-                mirrorID = getMirrorID(node)
+                mirrorID = mirrorIDs.get(node)
                 if not mirrorID:
                     continue
-                for key in self.poseDict.keys():
-                    if 'mirrorID' in self.poseDict[key] and self.poseDict[key]['mirrorID']:
-                        poseID = self.poseDict[key]['mirrorID']
-                        if poseID == mirrorID:
-                            matchedPairs.append((key, node))
-                            log.debug('poseKey : %s %s >> matched MirrorIndex : %s' % (key, node, self.poseDict[key]['mirrorID']))
-                            matched = True
-                            break
-                if not matched:
+                key = poseIDs.get(mirrorID)
+                if key is not None:
+                    matchedPairs.append((key, node))
+                    log.debug('poseKey : %s %s >> matched MirrorIndex : %s' % (key, node, mirrorID))
+                else:
                     unmatched.append(node)
 
         # unlike 'mirrorIndex' this matches JUST the ID's, the above matches SIDE_ID
@@ -953,6 +1561,7 @@ class DataMap(object):
         except StandardError, err:
             log.info('Pose Load Failed! : , %s' % err)
         finally:
+            self._releasePoseFile()
             self._post_load()
 
 
@@ -1085,17 +1694,11 @@ class PoseData(DataMap):
         this is purely for the _applyPose with percent and optimization for the UI's
         '''
         log.info('updating the currentCache')
+        plan = self.getApplyPlan()
+        current = plan.cacheCurrent()
         self.poseCurrentCache = {}
-        for key, dest in self.matchedPairs:
-            log.debug('caching current node data : %s' % key)
-            self.poseCurrentCache[key] = {}
-            if 'attrs' not in self.poseDict[key]:
-                continue
-            for attr, _ in self.poseDict[key]['attrs'].items():
-                try:
-                    self.poseCurrentCache[key][attr] = cmds.getAttr('%s.%s' % (dest, attr))
-                except:
-                    log.debug('Attr mismatch on destination : %s.%s' % (dest, attr))
+        for i, (key, attr) in enumerate(plan.rows):
+            self.poseCurrentCache.setdefault(key, {})[attr] = current[i]
 
     @r9General.Timer
     def _applyData_attrs_complex(self, percent=None):
@@ -1106,57 +1709,16 @@ class PoseData(DataMap):
         manipulating the data via the mirrorIndex, else we divert to
         running the default _applyData_attrs from the DataMap!!
 
-        Limitations are that the DataMap call deals with unitConversion
-        for linear attrs, this doesn't for speed
-
+        The mirrorInverse is resolved when the PoseApplyPlan is compiled, blending
+        interpolates the plan's values from the cached current state
         '''
-        mix_percent = False  # gets over float values of zero from failing
-        if percent is not None or type(percent) == float:
-            mix_percent = True
-            if not self.poseCurrentCache:
+        plan = self.getApplyPlan()
+        if percent is not None:
+            if not self.poseCurrentCache or plan.current is None:
                 self._cacheCurrentNodeStates()
-
-        for key, dest in self.matchedPairs:
-            log.debug('Applying Key Block : %s' % key)
-            try:
-                if 'attrs' not in self.poseDict[key]:
-                    continue
-                for attr, val in self.poseDict[key]['attrs'].items():
-                    if attr in self.skipAttrs:
-                        log.debug('Skipping attr as requested : %s' % attr)
-                        continue
-                    try:
-                        val = eval(val)
-                        # =====================================================================
-                        # inverse the correct mirror attrs if the mirrorInverse flag was thrown
-                        # =====================================================================
-                        # this is mainly for the ProPack finger systems support hooks
-                        if self.mirrorInverse and 'mirrorID' in self.poseDict[key] and self.poseDict[key]['mirrorID']:
-                            axis = r9Anim.MirrorHierarchy().getMirrorAxis(dest)
-                            side = r9Anim.MirrorHierarchy().getMirrorSide(dest)
-                            if attr in axis:
-                                poseSide = self.poseDict[key]['mirrorID'].split('_')[0]
-                                if not poseSide == side:
-                                    val = 0 - val
-                                    log.debug('Inversing Pose Values for Axis: %s, stored side: %s, nodes side: %s, node: %s' % (attr,
-                                                                                                                                  poseSide,
-                                                                                                                                  side,
-                                                                                                                                  r9Core.nodeNameStrip(dest)))
-                    except:
-                        pass
-                    log.debug('node : %s : attr : %s : val %s' % (dest, attr, val))
-                    try:
-                        if not mix_percent:
-                            cmds.setAttr('%s.%s' % (dest, attr), val)
-                        else:
-                            current = self.poseCurrentCache[key][attr]
-                            blendVal = ((val - current) / 100) * percent
-                            # print 'loading at percent : %s (current=%s , stored=%s' % (percent,current,current+blendVal)
-                            cmds.setAttr('%s.%s' % (dest, attr), current + blendVal)
-                    except StandardError, err:
-                        log.debug(err)
-            except:
-                log.debug('Pose Object Key : %s : has no Attr block data' % key)
+            plan.blend(percent)
+        else:
+            plan.apply()
 
     @r9General.Timer
     def _applyData(self, percent=None):
@@ -1164,9 +1726,8 @@ class PoseData(DataMap):
         apply the attrs for the pose.
 
         .. note:
-            when dealing with pose blending or mirrorInverse handling we BY-PASS the
-            sceneUnit conversions done in the main attr handler. This is for speed as generally
-            complex adjustments such as blending in poses wouldn't be done between scenes in different Maya sceneUnits.
+            both paths run from the PoseApplyPlan compiled in processPoseFile so blending
+            and mirrorInverse handling now get the same sceneUnit conversions as a straight load
         '''
         if self.mirrorInverse or percent is not None:
             self._applyData_attrs_complex(percent)
@@ -1347,6 +1908,7 @@ class PoseData(DataMap):
         except StandardError, err:
             log.info('Pose Load Failed! : , %s' % err)
         finally:
+            self._releasePoseFile()
             self._post_load()
 
 class PoseBlender(object):
@@ -0,0 +1,351 @@
+'''
+..
+    Red9 Studio Pack: Maya Pipeline Solutions
+    Author: Mark Jackson
+    email: rednineinfo@gmail.com
+
+    Red9 blog : http://red9-consultancy.blogspot.co.uk/
+    MarkJ blog: http://markj3d.blogspot.co.uk
+
+
+This is the profiling lib, timing spans that the Red9 and cgm timer decorators
+route into so that a whole process, rig build or batch export, lands on one timeline.
+
+Spans nest per thread and are only recorded when profiling is enabled. When it's
+off span() hands back a shared no-op context and the decorators call straight through.
+
+    >>> import Red9.core.Red9_Profiler as r9Profiler
+    >>> r9Profiler.enable()
+    >>> with r9Profiler.span('arm_0_part', 'block'):
+    >>>     with r9Profiler.span('rig_skeleton', 'step'):
+    >>>         ...
+    >>> r9Profiler.export_chromeTrace('c:/temp/build.json')  # load in chrome://tracing or Perfetto
+    >>> r9Profiler.export_csvSummary('c:/temp/build.csv')
+
+NOTHING IN THIS MODULE SHOULD REQUIRE MAYA OR RED9
+
+'''
+
+from __future__ import print_function
+
+from functools import wraps
+import os
+import sys
+import time
+import json
+import tempfile
+import threading
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+# global switch, read by the decorators on every call so keep it a plain bool.
+# Setting the RED9_PROFILING env var turns it on at import, for batch / mayapy runs
+RED9_PROFILING = bool(os.environ.get('RED9_PROFILING'))
+
+# wall clock with the best resolution per platform under py2
+if sys.platform == 'win32':
+    _clock = time.clock
+else:
+    _clock = time.time
+
+
+class _NullSpan(object):
+    '''
+    shared context handed back by span() when profiling is off
+    '''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set(self, **kws):
+        pass
+
+_NULLSPAN = _NullSpan()
+
+
+class Span(object):
+    '''
+    a single timed span, used as a context manager. Times are seconds from the profiler origin
+    '''
+    __slots__ = ('profiler', 'name', 'category', 'args', 'start', 'duration', 'childTime', 'thread', 'depth')
+
+    def __init__(self, profiler, name, category='function', args=None):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args or {}
+        self.start = 0.0
+        self.duration = 0.0
+        self.childTime = 0.0
+        self.thread = None
+        self.depth = 0
+
+    def __enter__(self):
+        self.profiler._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is not None:
+            self.args['error'] = str(exc_value)
+        self.profiler._pop(self)
+        return False
+
+    def __repr__(self):
+        return '%s(%s : %s : %0.3f ms)' % (self.__class__.__name__, self.category, self.name, self.duration * 1000.0)
+
+    def set(self, **kws):
+        '''
+        add args to the span after it's been opened, results, counts etc
+        '''
+        self.args.update(kws)
+
+    @property
+    def selfTime(self):
+        return self.duration - self.childTime
+
+
+class Profiler(object):
+    '''
+    thread safe span recorder. Each thread keeps its own stack for nesting, finished
+    spans go to one shared list under a lock
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.spans = []
+        self.threadNames = {}
+        self.origin = _clock()
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _push(self, span):
+        stack = self._stack()
+        span.depth = len(stack)
+        span.start = _clock() - self.origin
+        stack.append(span)
+
+    def _pop(self, span):
+        end = _clock() - self.origin
+        stack = self._stack()
+        # tolerate spans closed out of order rather than corrupting the stack
+        if span in stack:
+            while stack and stack.pop() is not span:
+                pass
+        span.duration = end - span.start
+        if stack:
+            stack[-1].childTime += span.duration
+        thread = threading.current_thread()
+        span.thread = thread.ident
+        with self._lock:
+            self.spans.append(span)
+            if thread.ident not in self.threadNames:
+                self.threadNames[thread.ident] = thread.name
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+            self.threadNames = {}
+            self.origin = _clock()
+
+    def get_spans(self, category=None):
+        '''
+        finished spans sorted by start time
+
+        :param category: only return spans of this category
+        '''
+        with self._lock:
+            spans = list(self.spans)
+        if category:
+            spans = [s for s in spans if s.category == category]
+        return sorted(spans, key=lambda s: (s.start, s.depth))
+
+    def get_summary(self):
+        '''
+        spans aggregated by category and name, sorted by total time
+
+        :return: list of dicts, times in seconds : category, name, count, total, self, mean, min, max
+        '''
+        data = {}
+        for s in self.get_spans():
+            key = (s.category, s.name)
+            if key not in data:
+                data[key] = {'category': s.category, 'name': s.name, 'count': 0,
+                             'total': 0.0, 'self': 0.0, 'min': s.duration, 'max': s.duration}
+            d = data[key]
+            d['count'] += 1
+            d['total'] += s.duration
+            d['self'] += s.selfTime
+            d['min'] = min(d['min'], s.duration)
+            d['max'] = max(d['max'], s.duration)
+        for d in data.values():
+            d['mean'] = d['total'] / d['count']
+        return sorted(data.values(), key=lambda d: d['total'], reverse=True)
+
+    def get_chromeTrace(self):
+        '''
+        the spans as Chrome trace event format, complete ('X') events in microseconds
+        '''
+        pid = os.getpid()
+        events = []
+        for tid, name in self.threadNames.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        for s in self.get_spans():
+            events.append({'name': s.name,
+                           'cat': s.category,
+                           'ph': 'X',
+                           'ts': round(s.start * 1000000.0, 3),
+                           'dur': round(s.duration * 1000000.0, 3),
+                           'pid': pid,
+                           'tid': s.thread,
+                           'args': _jsonArgs(s.args)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def _jsonArgs(args):
+    data = {}
+    for k, v in args.items():
+        if not isinstance(v, (bool, int, long, float, basestring)) and v is not None:
+            v = str(v)
+        data[str(k)] = v
+    return data
+
+def _csvCell(value):
+    value = str(value)
+    if any(c in value for c in ',"\n'):
+        value = '"%s"' % value.replace('"', '""')
+    return value
+
+
+# module level profiler and the calls most code wants ---
+
+PROFILER = Profiler()
+
+def enable(state=True, clear=True):
+    '''
+    switch profiling on or off
+
+    :param state: enable or disable
+    :param clear: clear any previously recorded spans when enabling
+    '''
+    global RED9_PROFILING
+    if state and clear:
+        PROFILER.clear()
+    RED9_PROFILING = bool(state)
+    log.debug('Profiling : %s' % RED9_PROFILING)
+
+def disable():
+    enable(False)
+
+def isEnabled():
+    return RED9_PROFILING
+
+def clear():
+    PROFILER.clear()
+
+def span(name, category='function', **kws):
+    '''
+    timed context for a block of code, kws are stored as the span args
+
+    :param name: span name
+    :param category: 'function', 'block', 'step', 'file' ... used to filter and colour the trace
+    '''
+    if not RED9_PROFILING:
+        return _NULLSPAN
+    return Span(PROFILER, name, category, kws)
+
+def profile(name=None, category='function'):
+    '''
+    DECORATOR : record each call of the function as a span
+
+    :param name: span name, defaults to module.function
+    :param category: span category
+    '''
+    def decorator(func):
+        _name = name or get_funcName(func)
+
+        @wraps(func)
+        def wrapper(*args, **kws):
+            if not RED9_PROFILING:
+                return func(*args, **kws)
+            with Span(PROFILER, _name, category):
+                return func(*args, **kws)
+        return wrapper
+    return decorator
+
+def get_funcName(func):
+    '''
+    module.function name used for decorator spans
+    '''
+    try:
+        return '%s.%s' % (func.__module__.split('.')[-1], func.__name__)
+    except StandardError:
+        return str(func)
+
+def get_spans(category=None):
+    return PROFILER.get_spans(category)
+
+def get_summary():
+    return PROFILER.get_summary()
+
+def export_chromeTrace(filepath):
+    '''
+    write the recorded spans as a Chrome trace json, open in chrome://tracing or ui.perfetto.dev
+
+    :param filepath: json file to write
+    '''
+    with open(filepath, 'w') as f:
+        json.dump(PROFILER.get_chromeTrace(), f)
+    log.info('Profile trace written : %s' % filepath)
+    return filepath
+
+def export_csvSummary(filepath):
+    '''
+    write the aggregated spans as a flat csv, times in ms
+
+    :param filepath: csv file to write
+    '''
+    keys = ['count', 'total', 'self', 'mean', 'min', 'max']
+    with open(filepath, 'w') as f:
+        f.write('category,name,count,total_ms,self_ms,mean_ms,min_ms,max_ms\n')
+        for d in PROFILER.get_summary():
+            row = [_csvCell(d['category']), _csvCell(d['name']), str(d['count'])]
+            row.extend(['%0.3f' % (d[k] * 1000.0) for k in keys[1:]])
+            f.write(','.join(row) + '\n')
+    log.info('Profile summary written : %s' % filepath)
+    return filepath
+
+def export(basePath=None):
+    '''
+    write both the Chrome trace and csv summary
+
+    :param basePath: path without extension, defaults to the RED9_PROFILING_PATH env var
+        or a timestamped file in the temp dir
+    :return: [jsonPath, csvPath]
+    '''
+    if not basePath:
+        basePath = os.environ.get('RED9_PROFILING_PATH') or \
+            os.path.join(tempfile.gettempdir(), 'r9Profile_%s' % time.strftime('%Y%m%d_%H%M%S'))
+    return [export_chromeTrace(basePath + '.json'), export_csvSummary(basePath + '.csv')]
+
+def report(limit=20):
+    '''
+    log the top spans by total time
+    '''
+    summary = PROFILER.get_summary()
+    log.info('Profile : %i spans, %i unique' % (sum([d['count'] for d in summary]), len(summary)))
+    for d in summary[:limit]:
+        log.info('%-10s %-60s x%-5i total: %0.3f ms | self: %0.3f ms | mean: %0.3f ms' % (d['category'], d['name'], d['count'],
+                                                                                           d['total'] * 1000.0, d['self'] * 1000.0,
+                                                                                           d['mean'] * 1000.0))
+    return summary
@@ -15,6 +15,10 @@ so that the global RED9_META_REGISTERY is built up correctly
 
 '''
 
+import Red9_Profiler as r9Profiler
+import Red9_PoseIndex as r9PoseIndex
+import Red9_CurveEngine as r9CurveEngine
+import Red9_AudioStream as r9AudioStream
 import Red9_General as r9General
 import Red9_Meta as r9Meta
 import Red9_Tools as r9Tools
@@ -0,0 +1,78 @@
+'''
+------------------------------------------
+Red9 Studio Pack : Maya Pipeline Solutions
+email: rednineinfo@gmail.com
+------------------------------------------
+
+This has been wrapped in a MPxCommand purely so that the batched plug edits
+built by the Red9_PoseSaver.PoseApplyPlan are registered to the undoStack.
+The plan fills an MDGModifier with every plug value in the pose and hands it
+over, this command just runs it and keeps it for the undo.
+
+Command= PoseApplyPlan()
+
+'''
+
+import maya.OpenMayaMPx as OpenMayaMPx
+import maya.OpenMaya as OpenMaya
+import sys
+
+
+class PoseApplyPlan(OpenMayaMPx.MPxCommand):
+
+    kPluginCmdName = "PoseApplyPlan"
+
+    def __init__(self):
+        OpenMayaMPx.MPxCommand.__init__(self)
+        self.modifier = None
+
+    def isUndoable(self):
+        '''
+        Required otherwise the undo block won't get registered
+        '''
+        return True
+
+    def doIt(self, args):
+        '''
+        take the modifier queued by the PoseApplyPlan and run it
+        '''
+        import Red9.core.Red9_PoseSaver as r9Pose
+        self.modifier = r9Pose.PoseApplyPlan.popModifier()
+        if self.modifier:
+            self.modifier.doIt()
+
+    def redoIt(self):
+        if self.modifier:
+            self.modifier.doIt()
+
+    def undoIt(self):
+        if self.modifier:
+            self.modifier.undoIt()
+
+    @classmethod
+    def cmdCreator(cls):
+        # Create the command
+        return OpenMayaMPx.asMPxPtr(PoseApplyPlan())
+
+    @classmethod
+    def syntaxCreator(cls):
+        return OpenMaya.MSyntax()
+
+
+# Initialize the plug-in
+def initializePlugin(mobject):
+    mplugin = OpenMayaMPx.MFnPlugin(mobject, "Red9", "1.0", "Any")
+    try:
+        mplugin.registerCommand(PoseApplyPlan.kPluginCmdName, PoseApplyPlan.cmdCreator, PoseApplyPlan.syntaxCreator)
+    except:
+        sys.stderr.write("Failed to register command: %s\n" % PoseApplyPlan.kPluginCmdName)
+        raise
+
+# Uninitialize the plug-in
+def uninitializePlugin(mobject):
+    mplugin = OpenMayaMPx.MFnPlugin(mobject)
+    try:
+        mplugin.deregisterCommand(PoseApplyPlan.kPluginCmdName)
+    except:
+        sys.stderr.write("Failed to unregister command: %s\n" % PoseApplyPlan.kPluginCmdName)
+        raise
@@ -536,6 +536,11 @@ class _CurveFilters_(object):
     delete_redundants_ann = 'on selected nodes delete redundant animCurves - these are curves whos value never change, the curve will be deleted'
     single_process = 'Single Process'
     single_process_ann = 'Single process using the value sliders above'
+    curve_smoother = 'Curve Smoother'
+    smooth_strength = 'Strength'
+    smooth_strength_ann = 'gaussian : width of the filter in keys, butterworth : cutoff period in frames, 0 is off'
+    smooth_method = 'Filter'
+    smooth_method_ann = 'gaussian is a weighted moving average, butterworth is a zero phase low pass that holds peaks better'
     reset_all = 'Reset All'
     toggle_buffers = 'ToggleBuffers'
 
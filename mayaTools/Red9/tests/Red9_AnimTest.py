@@ -113,3 +113,86 @@ class Test_MirrorSetups(object):
         assert self.checkData()
 
 
+
+    def test_mirrorTable(self):
+        self.setMarkers()
+        nodes = cmds.ls([self.leftWrist, self.leftFoot, self.rightWrist, self.rightFoot, self.root], l=True)
+        table = r9Anim.MirrorTable(nodes)
+
+        assert table.getSide(nodes[0]) == 'Left'
+        assert table.getIndex(nodes[0]) == 1
+        assert table.getOpposite(nodes[0]) == nodes[2]
+        assert table.getOpposite(nodes[3]) == nodes[1]
+        assert table.getOpposite(nodes[4]) == nodes[4]
+        assert table.getCompiledIDs([self.leftFoot, 'persp']) == {self.leftFoot: 'Left_2', 'persp': 'None_None'}
+
+        # same data the per node MirrorHierarchy calls give
+        self.MirrorClass.getMirrorSets()
+        legacy = r9Anim.MirrorHierarchy(nodes)
+        mirrorDict, _ = table.getMirrorDict(defaultAxis=legacy.defaultMirrorAxis)
+        for side in ['Left', 'Right', 'Centre']:
+            for index, data in mirrorDict[side].items():
+                node = data['node']
+                assert legacy.getMirrorIndex(node) == int(index)
+                assert data['axis'] == legacy.getMirrorAxis(node)
+
+        # round trips through the stored data, only current once it's been verified
+        loaded = r9Anim.MirrorTable.fromData(table.getData())
+        assert not loaded.isCurrent()
+        assert loaded.verify()
+        assert loaded.isCurrent()
+        cmds.setAttr('%s.mirrorIndex' % self.leftFoot, 5)
+        assert not loaded.isCurrent()
+        assert not loaded.verify()
+
+        # setting mirrorIDs invalidates without any scene reads
+        table = r9Anim.MirrorTable(nodes)
+        assert table.isCurrent()
+        cmds.undoInfo(state=True)
+        self.MirrorClass.setMirrorIDs(self.leftFoot, side='Left', slot=2)
+        assert not table.isCurrent()
+
+        # as does undoing it
+        table = r9Anim.MirrorTable(nodes)
+        assert table.getIndex(nodes[1]) == 2
+        cmds.undo()
+        assert not table.isCurrent()
+
+
+class Test_CurveKeys(object):
+    def setup(self):
+        self.tangents = (cmds.keyTangent(q=True, g=True, itt=True)[0],
+                         cmds.keyTangent(q=True, g=True, ott=True)[0])
+        cmds.keyTangent(g=True, itt='spline', ott='spline')
+        self.node = cmds.createNode('transform')
+        for t, v in [(0, 100), (10, -100), (20, 100)]:
+            cmds.setKeyframe(self.node, at='tx', t=t, v=v)
+        cmds.keyTangent(self.node, at='tx', t=(10, 10), itt='linear', ott='linear')
+        self.curve = cmds.listConnections('%s.tx' % self.node, type='animCurve')[0]
+
+    def teardown(self):
+        cmds.keyTangent(g=True, itt=self.tangents[0], ott=self.tangents[1])
+        cmds.file(new=True, f=True)
+
+    def test_tangents(self):
+        # inserted keys match keying frame by frame, existing keys keep their types
+        cmds.keyTangent(g=True, itt='clamped', ott='step')
+        times = range(0, 21, 2)
+        values = [t * 2.0 for t in times]
+        r9Anim.animCurve_set_keys(self.curve, times, values)
+
+        ref = cmds.createNode('transform')
+        for t, v in zip(times, values):
+            cmds.setKeyframe(ref, at='tx', t=t, v=v)
+        cmds.keyTangent(ref, at='tx', t=(0, 0), itt='spline', ott='spline')
+        cmds.keyTangent(ref, at='tx', t=(10, 10), itt='linear', ott='linear')
+        cmds.keyTangent(ref, at='tx', t=(20, 20), itt='spline', ott='spline')
+
+        assert cmds.keyframe(self.curve, q=True, valueChange=True) == values
+        for flag in ['itt', 'ott', 'inAngle', 'outAngle']:
+            result = cmds.keyTangent(self.curve, q=True, **{flag: True})
+            expected = cmds.keyTangent(ref, at='tx', q=True, **{flag: True})
+            if flag in ['itt', 'ott']:
+                assert result == expected
+            else:
+                assert [round(a, 3) for a in result] == [round(a, 3) for a in expected]
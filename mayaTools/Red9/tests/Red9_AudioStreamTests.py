@@ -0,0 +1,146 @@
+'''
+------------------------------------------
+Red9 Studio Pack: Maya Pipeline Solutions
+Author: Mark Jackson
+email: rednineinfo@gmail.com
+
+Red9 blog : http://red9-consultancy.blogspot.co.uk/
+MarkJ blog: http://markj3d.blogspot.co.uk
+------------------------------------------
+
+This is the unittest for the Red9_AudioStream module, no Maya needed
+================================================================
+
+'''
+
+import os
+import imp
+import shutil
+import struct
+import tempfile
+import wave
+from array import array
+
+# load by path so we don't boot the rest of Red9.core
+r9AudioStream = imp.load_source('Red9_AudioStream',
+                                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core', 'Red9_AudioStream.py'))
+
+
+def _writeWav16(path, samples, rate=8000, channels=1):
+    out = wave.open(path, 'wb')
+    out.setnchannels(channels)
+    out.setsampwidth(2)
+    out.setframerate(rate)
+    out.writeframes(array('h', samples).tostring())
+    out.close()
+
+def _writeWav24(path, samples, rate=8000, channels=1):
+    '''
+    24bit with a WAVE_FORMAT_EXTENSIBLE header, which the wave module won't read
+    '''
+    data = ''.join([struct.pack('<i', s)[:3] for s in samples])
+    fmt = struct.pack('<HHIIHH', 0xFFFE, channels, rate, rate * channels * 3, channels * 3, 24)
+    fmt += struct.pack('<HHI', 22, 24, 0) + struct.pack('<H', 1) + '\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+    with open(path, 'wb') as f:
+        f.write('RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(data)) + 'WAVE')
+        f.write('fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        f.write('data' + struct.pack('<I', len(data)) + data)
+
+def _readWav(path):
+    wav = wave.open(path, 'rb')
+    try:
+        return wav.getparams(), wav.readframes(wav.getnframes())
+    finally:
+        wav.close()
+
+
+class Test_AudioStream():
+    def setup(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = r9AudioStream.RED9_AUDIO_PEAK_CACHE
+        r9AudioStream.RED9_AUDIO_PEAK_CACHE = os.path.join(self.folder, 'peaks')
+        self.wav16 = os.path.join(self.folder, 'mono16.wav')
+        self.wav24 = os.path.join(self.folder, 'mono24.wav')
+        _writeWav16(self.wav16, [1000] * 800)
+        _writeWav24(self.wav24, [256000] * 400 + [-256000] * 400)
+
+    def teardown(self):
+        r9AudioStream.RED9_AUDIO_PEAK_CACHE = self.cache
+        shutil.rmtree(self.folder)
+
+    def test_reader(self):
+        with r9AudioStream.WavReader(self.wav24) as reader:
+            assert reader.width == 3 and reader.channels == 1 and reader.rate == 8000
+            assert reader.nframes == 800
+            assert reader.duration == 0.1
+            data = r9AudioStream.toInt32(reader.read(398, 4), reader.width)
+            assert array('i', data).tolist() == [256000 << 8] * 2 + [-256000 << 8] * 2
+        assert r9AudioStream.getWavInfo(self.wav16)['width'] == 2
+        try:
+            r9AudioStream.WavReader(__file__)
+            assert False
+        except IOError:
+            pass
+
+    def test_conversions(self):
+        values = array('i', [-(1 << 31), -256, 0, 256, (1 << 31) - 256]).tostring()
+        for width in [1, 2, 3, 4]:
+            back = r9AudioStream.toInt32(r9AudioStream.fromInt32(values, width), width)
+            assert array('i', back)[0] == -(1 << 31)
+            assert array('i', back)[2] == 0
+        assert r9AudioStream.fromInt32(values, 3) == ''.join([struct.pack('<i', v)[1:] for v in array('i', values)])
+        floats = array('f', [-2.0, 0.0, 0.5]).tostring()
+        assert array('i', r9AudioStream.toInt32(floats, 4, isFloat=True)).tolist() == [-2147483647, 0, 1073741823]
+        stereo = r9AudioStream.convertChannels(array('i', [10, 20]).tostring(), 1, 2)
+        assert array('i', stereo).tolist() == [10, 10, 20, 20]
+
+    def test_mixdown(self):
+        output = os.path.join(self.folder, 'mix.wav')
+        sources = [r9AudioStream.MixSource(self.wav16, position=0.05),
+                   r9AudioStream.MixSource(self.wav24, position=0.0, start=0.05, end=0.075),
+                   r9AudioStream.MixSource(os.path.join(self.folder, 'missing.wav'))]
+        failed = r9AudioStream.mixdown(sources, output, chunk=64)
+        assert failed == [sources[2]]
+        params, data = _readWav(output)
+        # widest source wins, output runs to the end of the last source
+        assert params[:3] == (1, 3, 8000)
+        assert params[3] == 400 + 800
+        samples = array('i', r9AudioStream.toInt32(data, 3))
+        assert samples[0] >> 8 == -256000
+        assert samples[199] >> 8 == -256000
+        assert samples[200] == 0
+        assert samples[400] >> 8 == 1000 << 8
+        assert samples[1199] >> 8 == 1000 << 8
+        # the full 16bit source got its peaks cached in the same pass, the trimmed 24bit one didn't
+        assert r9AudioStream.readPeaks(self.wav16) is not None
+        assert r9AudioStream.readPeaks(self.wav24) is None
+
+    def test_mixdown_overlap(self):
+        output = os.path.join(self.folder, 'mix.wav')
+        stereo = os.path.join(self.folder, 'stereo.wav')
+        _writeWav16(stereo, [32000, -32000] * 100, rate=16000, channels=2)
+        sources = [r9AudioStream.MixSource(self.wav16), r9AudioStream.MixSource(stereo)]
+        r9AudioStream.mixdown(sources, output, width=2, duration=0.2, chunk=100)
+        params, data = _readWav(output)
+        assert params[:4] == (2, 2, 16000, 3200)
+        samples = array('h', data)
+        # summed, the left channel clips
+        assert samples[100] == 32767
+        assert samples[101] == 1000 - 32000
+        assert samples[-1] == 0
+
+    def test_peaks(self):
+        assert r9AudioStream.getPeaks(self.wav24, build=False) is None
+        peaks = r9AudioStream.getPeaks(self.wav24)
+        assert os.path.exists(r9AudioStream.peakCachePath(self.wav24))
+        assert peaks['frames'] == 800 and peaks['width'] == 3
+        assert len(peaks['mins']) == 2
+        assert peaks['mins'][-1] == (-256000 << 8) >> 16
+        assert peaks['maxs'][0] == (256000 << 8) >> 16
+        assert abs(peaks['max_dBFS'] - peaks['dBFS']) < 0.01
+        assert r9AudioStream.readPeaks(self.wav24)['mins'] == peaks['mins']
+        # the cache goes stale with the source
+        _writeWav24(self.wav24, [0] * 10)
+        os.utime(self.wav24, (0, 0))
+        assert r9AudioStream.readPeaks(self.wav24) is None
+        assert r9AudioStream.getPeaks(self.wav24)['max_dBFS'] == -float('inf')
@@ -0,0 +1,72 @@
+'''
+------------------------------------------
+Red9 Studio Pack: Maya Pipeline Solutions
+Author: Mark Jackson
+email: rednineinfo@gmail.com
+
+Red9 blog : http://red9-consultancy.blogspot.co.uk/
+MarkJ blog: http://markj3d.blogspot.co.uk
+------------------------------------------
+
+Simple timing benchmarks for the Red9_CoreUtils module, these are NOT
+unittests, run them directly in mayapy to compare the optimised code paths
+against the original implementations that are kept for reference
+================================================================
+
+'''
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import random
+import time
+
+import Red9.core.Red9_CoreUtils as r9Core
+
+
+def _build_nodeLists(size, seed=1):
+    '''
+    build a pair of name lists similar to 2 referenced rigs, one side prefixed
+    and nested in a dagPath, the other shuffled so that order doesn't help the matching
+    '''
+    random.seed(seed)
+    parts = ['L_Arm', 'R_Arm', 'L_Leg', 'R_Leg', 'Spine', 'Neck', 'Head', 'Finger', 'Toe']
+    names = ['%s_%i_Ctrl' % (random.choice(parts), i) for i in range(size)]
+    nodesA = ['|World_Root|rigA:%s' % name for name in names]
+    nodesB = ['|World_Root|rigB:Prefix_%s' % name for name in names]
+    random.shuffle(nodesB)
+    return nodesA, nodesB
+
+
+def benchmark_matchNodeLists(sizes=(100, 1000, 10000), matchMethods=('base', 'stripPrefix'), legacyLimit=10000):
+    '''
+    time matchNodeLists against the original _matchNodeLists_legacy implementation
+
+    :param sizes: number of nodes in each list
+    :param matchMethods: the name based matchMethods to run, these need no scene data
+    :param legacyLimit: skip the legacy run above this size, it's O(N*M)
+    :return: list of (matchMethod, size, indexed_secs, legacy_secs or None)
+    '''
+    results = []
+    for size in sizes:
+        nodesA, nodesB = _build_nodeLists(size)
+        for method in matchMethods:
+            start = time.time()
+            matched = r9Core.matchNodeLists(nodesA, nodesB, matchMethod=method)
+            indexed = time.time() - start
+
+            legacy = None
+            if size <= legacyLimit:
+                start = time.time()
+                legacyMatched = r9Core._matchNodeLists_legacy(nodesA, nodesB, matchMethod=method)
+                legacy = time.time() - start
+                assert matched == legacyMatched, 'matchNodeLists result differs from legacy : %s' % method
+
+            results.append((method, size, indexed, legacy))
+            print('matchNodeLists : %-12s : %6i nodes : indexed %8.4fs : legacy %s' %
+                  (method, size, indexed, '%8.4fs' % legacy if legacy is not None else 'skipped'))
+    return results
+
+
+if __name__ == '__main__':
+    benchmark_matchNodeLists()
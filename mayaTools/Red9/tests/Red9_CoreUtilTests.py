@@ -295,6 +295,31 @@ class Test_FilterNode():
         self.filterNode.settings.searchPattern = ['Cube']
         assert self.filterNode.ProcessFilter() == ['|World_Root|pCube4_AttrMarked']
 
+    def test_FilterMemo(self):
+        self.filterNode.settings.nodeTypes = ['locator']
+        self.filterNode.settings.searchAttrs = ['MarkerAttr']
+        result = self.filterNode.ProcessFilter()
+        assert result == ['|World_Root|Spine_Ctrl|R_Wrist_Ctrl|R_Pole_AttrMarked_Ctrl']
+        assert r9Core.RED9_FILTER_MEMO
+
+        # same roots and filters, from a new FilterNode, come from the memo
+        flt = r9Core.FilterNode(['World_Root'], filterSettings=self.filterNode.settings)
+        assert flt.processFilter() == result
+        assert flt.processFilter(useMemo=False) == result
+
+        # adding the searchAttr to a node under the roots invalidates
+        cmds.addAttr('|World_Root|Spine_Ctrl|L_Pole_Ctrl', ln='MarkerAttr', at='bool')
+        assert not r9Core.RED9_FILTER_MEMO
+        assert self.filterNode.ProcessFilter() == ['|World_Root|Spine_Ctrl|L_Pole_Ctrl',
+                                                 '|World_Root|Spine_Ctrl|R_Wrist_Ctrl|R_Pole_AttrMarked_Ctrl']
+
+        # as does a DAG change
+        cmds.parent('|World_Root|Spine_Ctrl|L_Pole_Ctrl', world=True)
+        assert not r9Core.RED9_FILTER_MEMO
+        assert self.filterNode.ProcessFilter() == ['|World_Root|Spine_Ctrl|R_Wrist_Ctrl|R_Pole_AttrMarked_Ctrl']
+        r9Core.clearFilterMemo()
+        assert not r9Core.RED9_FILTER_CALLBACKS
+
     def test_WorldFilter(self):
         '''
         No rootNode so processing at World/Scene level
@@ -514,6 +539,43 @@ class Test_LockNodes(object):
                                                             'rotateX', 'rotateY', 'rotateZ',
                                                             'scaleX', 'scaleY', 'scaleZ']
 
+class Test_TimeOffset(object):
+    def setup(self):
+        cmds.file(new=True, f=True)
+        self.cubes = [cmds.polyCube(n='cube%i' % i)[0] for i in range(3)]
+        for cube in self.cubes:
+            for frm in [0, 10, 20, 30]:
+                cmds.setKeyframe(cube, at=['tx', 'ry'], t=frm, v=frm)
+
+    def test_offset(self):
+        processed = r9Core.TimeOffset.fromSelected(5, nodes=self.cubes)
+        assert len(processed['animcurves']) == 6
+        for cube in self.cubes:
+            assert cmds.keyframe('%s.tx' % cube, q=True) == [5, 15, 25, 35]
+        assert r9Core.TimeOffset.report()['animcurves']['count'] == 6
+
+        # ripple within a timerange, only keys from 15 on move
+        r9Core.TimeOffset.fromSelected(10, nodes=self.cubes[0], timerange=(15, 40))
+        assert cmds.keyframe('%s.ry' % self.cubes[0], q=True) == [5, 25, 35, 45]
+        assert cmds.keyframe('%s.ry' % self.cubes[1], q=True) == [5, 15, 25, 35]
+
+    def test_flocking(self):
+        r9Core.TimeOffset.fromSelected(2, nodes=self.cubes, flocking=True)
+        for i, cube in enumerate(self.cubes):
+            assert cmds.keyframe('%s.tx' % cube, q=True)[0] == 2 * (i + 1)
+
+    def test_fullScene(self):
+        processed = r9Core.TimeOffset.fullScene(-5)
+        assert processed['animcurves'] == set(cmds.ls(type='animCurve'))
+        assert cmds.keyframe('%s.tx' % self.cubes[2], q=True) == [-5, 5, 15, 25]
+
+    def test_directCalls(self):
+        # calls made on their own don't skip what an earlier call offset
+        r9Core.TimeOffset.fromSelected(5, nodes=self.cubes)
+        for offset in [5, 5]:
+            assert len(r9Core.TimeOffset.animCurves(offset, nodes=self.cubes)) == 6
+        assert cmds.keyframe('%s.tx' % self.cubes[0], q=True) == [15, 25, 35, 45]
+
 class Test_Matching_CoreFuncs(object):
 
 #    def setup(self):
@@ -528,8 +590,26 @@ class Test_Matching_CoreFuncs(object):
         # TODO: Fill Test
         pass
     def test_matchNodeLists(self):
-        # TODO: Fill Test
-        pass  #
+        listA = ['|rigA|rigA:L_Arm', 'rigA:Spine', 'rigA:R_Arm', 'rigA:Head', 'rigA:Missing']
+        listB = ['|rigB|Prefix_Spine', 'rigB:R_Arm', 'rigB:Spine', 'rigB:X_L_Arm', 'rigB:Head_Extra', 'rigB:Head']
+
+        # base : exact shortName only
+        assert r9Core.matchNodeLists(listA, listB, matchMethod='base', returnfails=True) == \
+                ([('rigA:Spine', 'rigB:Spine'), ('rigA:R_Arm', 'rigB:R_Arm'), ('rigA:Head', 'rigB:Head')],
+                 ['|rigA|rigA:L_Arm', 'rigA:Missing'])
+
+        # stripPrefix : base match takes priority, then first suffix match in listB order
+        assert r9Core.matchNodeLists(listA, listB, matchMethod='stripPrefix', returnfails=True) == \
+                ([('|rigA|rigA:L_Arm', 'rigB:X_L_Arm'), ('rigA:Spine', 'rigB:Spine'),
+                  ('rigA:R_Arm', 'rigB:R_Arm'), ('rigA:Head', 'rigB:Head')],
+                 ['rigA:Missing'])
+
+        # the index engine must pair exactly as the original linear implementation
+        listA = ['ns:%s' % name for name in ['Arm', 'L_Arm', 'Arm', 'Leg', 'L_Leg_Ctrl', 'Ctrl', '']]
+        listB = ['|grp|%s' % name for name in ['L_Arm', 'Arm', 'Leg_Ctrl', 'Ctrl', 'L_Leg', 'Arm', 'Foot']]
+        for method in ['base', 'stripPrefix']:
+            assert r9Core.matchNodeLists(listA, listB, matchMethod=method, returnfails=True) == \
+                    r9Core._matchNodeLists_legacy(listA, listB, matchMethod=method, returnfails=True)
     def test_MatchedNodeInputs(self):
         # TODO: Fill Test
         pass  #
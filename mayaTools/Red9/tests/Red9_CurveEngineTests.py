@@ -0,0 +1,115 @@
+'''
+------------------------------------------
+Red9 Studio Pack: Maya Pipeline Solutions
+Author: Mark Jackson
+email: rednineinfo@gmail.com
+
+Red9 blog : http://red9-consultancy.blogspot.co.uk/
+MarkJ blog: http://markj3d.blogspot.co.uk
+------------------------------------------
+
+This is the unittest for the Red9_CurveEngine module, no Maya needed
+================================================================
+
+'''
+
+import os
+import imp
+import math
+
+# load by path so we don't boot the rest of Red9.core
+r9Curves = imp.load_source('Red9_CurveEngine',
+                           os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core', 'Red9_CurveEngine.py'))
+
+
+def _close(a, b, tolerance=1e-6):
+    return len(a) == len(b) and all([abs(x - y) < tolerance for x, y in zip(a, b)])
+
+
+class Test_CurveEngine():
+    def setup(self):
+        self.times = range(0, 49)
+        # 1Hz sine at 24fps with a 10Hz jitter on top
+        self.clean = [math.sin(2 * math.pi * t / 24.0) for t in self.times]
+        self.noisy = [v + 0.2 * math.sin(2 * math.pi * 10 * t / 24.0) for t, v in zip(self.times, self.clean)]
+
+    def test_noise(self):
+        values = [0.0] * 20
+        a = r9Curves.noise(values, [-1, 1], damp=0.5, seed=3)
+        assert a == r9Curves.noise(values, [-1, 1], damp=0.5, seed=3)
+        assert a != r9Curves.noise(values, [-1, 1], damp=0.5, seed=4)
+        assert all([-0.5 <= v <= 0.5 for v in a])
+        # same seed, only the amplitude changes
+        assert _close([v * 2 for v in a], r9Curves.noise(values, [-1, 1], damp=1.0, seed=3))
+
+    def test_valueRange(self):
+        assert r9Curves.valueRange([0, 10, 4]) == [-5, 5]
+        assert r9Curves.valueRange([0, 0.5]) == [-1, 1]
+        assert r9Curves.valueRange([]) == [-1, 1]
+
+    def test_snapTimes(self):
+        times, values = r9Curves.snapTimes([0.0, 0.9, 1.2, 2.4, 4.1], [0, 1, 2, 3, 4])
+        assert times == [0.0, 1.0, 2.0, 4.0]
+        assert values == [0, 1, 3, 4]  # 0.9 beats 1.2 for frame 1
+        assert r9Curves.snapTimes([0.3, 1.6], [1, 2], multiple=0.5)[0] == [0.5, 1.5]
+
+    def test_sampleTimes(self):
+        assert r9Curves.sampleTimes(0, 10, 2.5) == [0, 2.5, 5.0, 7.5, 10.0]
+        assert r9Curves.sampleTimes(1, 4, 2) == [1, 3, 4]
+        try:
+            r9Curves.sampleTimes(0, 10, 0)
+            assert False
+        except ValueError:
+            pass
+
+    def test_gaussian(self):
+        flat = [2.0] * 10
+        assert _close(r9Curves.gaussian(flat, 2.0), flat)
+        assert sum(r9Curves.gaussianKernel(1.5)) - 1.0 < 1e-9
+        smoothed = r9Curves.gaussian(self.noisy, 1.5)
+        assert len(smoothed) == len(self.noisy)
+        err = lambda vals: max([abs(a - b) for a, b in zip(vals, self.clean)])
+        assert err(smoothed) < err(self.noisy)
+
+    def test_butterworth(self):
+        flat = [3.0] * 30
+        assert _close(r9Curves.butterworth(flat, 4, 24), flat)
+        filtered = r9Curves.butterworth(self.noisy, cutoff=3.0, fps=24.0)
+        assert len(filtered) == len(self.noisy)
+        # jitter gone, no phase shift on the 1Hz signal
+        assert max([abs(a - b) for a, b in zip(filtered[6:-6], self.clean[6:-6])]) < 0.05
+        # linear ramps pass straight through, ends included
+        ramp = [t * 0.5 for t in range(20)]
+        assert _close(r9Curves.butterworth(ramp, 2, 24), ramp, 1e-3)
+        assert r9Curves.smooth(self.noisy, 'butterworth', 8, 24) == r9Curves.butterworth(self.noisy, 3.0, 24)
+        try:
+            r9Curves.smooth(self.noisy, 'median')
+            assert False
+        except ValueError:
+            pass
+
+    def test_reduceKeys(self):
+        # a straight line only needs its ends
+        assert r9Curves.reduceKeys(range(10), [t * 2.0 for t in range(10)], 0.01) == [0, 9]
+        # a peak must stay
+        values = [0, 1, 2, 3, 2, 1, 0]
+        assert r9Curves.reduceKeys(range(7), values, 0.01) == [0, 3, 6]
+        kept = r9Curves.reduceKeys(self.times, self.clean, 0.05)
+        assert kept[0] == 0 and kept[-1] == 48
+        assert 3 < len(kept) < len(self.times)
+        for i in range(len(kept) - 1):
+            t0, t1 = kept[i], kept[i + 1]
+            for t in range(t0, t1):
+                lerp = self.clean[t0] + (self.clean[t1] - self.clean[t0]) * (t - t0) / float(t1 - t0)
+                assert abs(lerp - self.clean[t]) <= 0.05
+        spaced = r9Curves.reduceKeys(self.times, self.noisy, 0.0, timeTolerance=5)
+        assert spaced[-1] == 48
+        assert all([b - a >= 5 for a, b in zip(spaced[:-2], spaced[1:-1])])
+        assert r9Curves.reduceKeys([0, 1], [0, 5], 1) == [0, 1]
+
+    def test_decimate(self):
+        items = ['c%i' % i for i in range(10)]
+        assert r9Curves.decimate(items, [10] * 10, 1000) == items
+        picked = r9Curves.decimate(items, [10] * 10, 30)
+        assert picked == ['c0', 'c4', 'c8']
+        assert r9Curves.decimate(['a', 'b'], [50, 40], 30) == ['b']
@@ -65,6 +65,19 @@ class Test_MetaRegistryCalls():
         for mNode in r9Meta.getMClassInstances(r9Meta.MetaRig):
             assert issubclass(mNode, r9Meta.MetaRig)
 
+    def test_getMClassDataFromNodes(self):
+        a = r9Meta.MetaRig(name='rig')
+        b = r9Meta.MetaRigSubSystem(name='subSub')
+        c = r9Meta.MetaClass(name='base')
+        cmds.createNode('network', name='plainNetwork')
+        nodes = cmds.ls(type='network', l=True)
+        bulk = r9Meta.getMClassDataFromNodes(nodes)
+        assert [n for n, _, _ in bulk] == nodes
+        for node, mClass, _ in bulk:
+            assert mClass == r9Meta.getMClassDataFromNode(node)
+        assert r9Meta.getMClassInheritedKeys('MetaRig').issuperset(['MetaRig', 'MetaRigSubSystem'])
+        assert 'MetaClass' not in r9Meta.getMClassInheritedKeys('MetaRig')
+
     def test_getMClassDataFromNode(self):
         a = r9Meta.MetaRig(name='rig')
         b = r9Meta.MetaRigSubSystem(name='subSub')
@@ -93,6 +106,27 @@ class Test_MetaCache():
         a.delete()
         assert not r9Meta.RED9_META_NODECACHE
 
+    def test_cacheStatsAndInvalidation(self):
+        r9Meta.resetMetaCacheStats()
+        a = r9Meta.MetaClass(name='node')
+        b = r9Meta.MetaClass(name='node2')
+        assert r9Meta.MetaClass(a.mNode) == a
+        stats = r9Meta.getMetaCacheStats()
+        assert stats['hits'] == 1
+        assert stats['size'] == 2
+
+        # rename is picked up by the callbacks, the name index stays valid
+        cmds.rename(a.mNode, 'renamedNode')
+        assert r9Meta.getMetaFromCache('renamedNode') == a
+        assert r9Meta.getMetaCacheStats()['hits'] == 2
+
+        # deleting a node only evicts that single entry
+        cmds.delete(b.mNode)
+        stats = r9Meta.getMetaCacheStats()
+        assert stats['size'] == 1
+        assert stats['evictions'] == 1
+        assert r9Meta.getMetaFromCache('renamedNode') == a
+
     def test_uuid(self):
         a = r9Meta.MetaRig(name='rig')
         UUID = a.getUUID()  # a.UUID
@@ -0,0 +1,156 @@
+'''
+------------------------------------------
+Red9 Studio Pack: Maya Pipeline Solutions
+Author: Mark Jackson
+email: rednineinfo@gmail.com
+
+Red9 blog : http://red9-consultancy.blogspot.co.uk/
+MarkJ blog: http://markj3d.blogspot.co.uk
+------------------------------------------
+
+This is the unittest for the Red9_PoseIndex module, no Maya needed
+================================================================
+
+'''
+
+import os
+import imp
+import json
+import shutil
+import tempfile
+
+_testDir = os.path.dirname(os.path.abspath(__file__))
+
+# load by path so we don't boot the rest of Red9.core
+r9PoseIndex = imp.load_source('Red9_PoseIndex', os.path.join(os.path.dirname(_testDir), 'core', 'Red9_PoseIndex.py'))
+
+
+class Test_PoseIndex():
+    def setup(self):
+        self.root = os.path.join(tempfile.mkdtemp(), 'poses')
+        shutil.copytree(os.path.join(_testDir, 'testFiles', 'MetaRig_Poses'), self.root,
+                        ignore=shutil.ignore_patterns('*.py', '*.pyc', '__pycache__'))
+        self.index = r9PoseIndex.PoseIndex(self.root)
+        self.index.update()
+        self._age()
+
+    def teardown(self):
+        r9PoseIndex.clearIndexes()
+        shutil.rmtree(os.path.dirname(self.root), ignore_errors=True)
+
+    def _age(self):
+        '''
+        push the scan times past the mtime grace so unchanged folders are trusted
+        '''
+        for folder in self.index.folders.values():
+            folder['scanned'] += 10
+
+    def _touchDir(self, path):
+        mtime = os.stat(path).st_mtime + 5
+        os.utime(path, (mtime, mtime))
+
+    def test_build(self):
+        assert self.index.indexPath == os.path.join(self.root, '.r9poseIndex', 'index.json')
+        assert os.path.exists(self.index.indexPath)
+        # r9Core.sortNumerically order, case sensitive
+        assert self.index.getPoses() == ['T_Pose', 'jump_f9', 'jump_f9_absolute29', 'jump_f218', 'jump_f218_projected']
+        assert self.index.getPoses('fingers') == ['l_fingers_curled', 'lfingers']
+        assert len(self.index.getPoses(recursive=True)) == 7
+        assert sorted(self.index.folders.keys()) == ['', 'fingers']
+
+        entry = self.index.getEntry('jump_f218')
+        assert entry['nodes'] == 25
+        assert entry['thumb'] == 'jump_f218.bmp'
+        assert entry['author'] == 'Red9'
+        assert 'RED_Rig' in entry['tags']
+        assert self.index.getThumbPath('lfingers', os.path.join(self.root, 'fingers')) == \
+            os.path.join(self.root, 'fingers', 'lfingers.bmp')
+
+    def test_persist(self):
+        index = r9PoseIndex.PoseIndex(self.root)
+        assert index.load()
+        assert index.poses == json.loads(json.dumps(self.index.poses))
+
+    def test_incremental(self):
+        reads = []
+        readPoseInfo = r9PoseIndex.readPoseInfo
+
+        def counted(path):
+            reads.append(os.path.basename(path))
+            return readPoseInfo(path)
+        r9PoseIndex.readPoseInfo = counted
+        try:
+            assert not self.index.update()
+            assert not reads
+
+            shutil.copy(os.path.join(self.root, 'T_Pose.pose'), os.path.join(self.root, 'fingers', 'new_Pose.pose'))
+            self._touchDir(os.path.join(self.root, 'fingers'))
+            assert self.index.update()
+            assert reads == ['new_Pose.pose']
+            assert 'new_Pose' in self.index.getPoses('fingers')
+            assert self.index.getEntry('new_Pose', 'fingers')['thumb'] is None
+
+            os.remove(os.path.join(self.root, 'jump_f9.pose'))
+            self._touchDir(self.root)
+            self.index.update()
+            assert 'jump_f9' not in self.index.getPoses()
+
+            shutil.rmtree(os.path.join(self.root, 'fingers'))
+            self._touchDir(self.root)
+            self.index.update()
+            assert self.index.getPoses('fingers') == []
+            assert 'fingers' not in self.index.folders
+        finally:
+            r9PoseIndex.readPoseInfo = readPoseInfo
+
+    def test_updateFile(self):
+        path = os.path.join(self.root, 'T_Pose.pose')
+        with open(path, 'w') as f:
+            f.write('[info]\n\ttags = hero, idle\n[poseData]\n\t[[a]]\n\t[[b]]\n')
+        r9PoseIndex._INDEXES[self.index.rootPath] = self.index
+        entry = r9PoseIndex.updateFile(path)
+        assert entry['nodes'] == 2
+        assert entry['tags'] == ['hero', 'idle']
+
+    def test_search(self):
+        names = lambda entries: [e['name'] for e in entries]
+        assert names(self.index.search('jump projected')) == ['jump_f218_projected']
+        assert names(self.index.search('t_pose,FINGERS', recursive=True)) == ['T_Pose', 'l_fingers_curled', 'lfingers']
+        assert names(self.index.search('^jump_f9$')) == ['jump_f9']
+        # tags and folder tokens
+        assert len(self.index.search('red_rig', recursive=True)) == 7
+        assert names(self.index.search('fingers', 'fingers')) == ['l_fingers_curled', 'lfingers']
+        assert self.index.filterPoses(['T_Pose', 'jump_f9'], 'f9') == ['jump_f9']
+
+        byDate = self.index.getPoses(sortBy='date')
+        mtimes = [self.index.getEntry(p)['mtime'] for p in byDate]
+        assert mtimes == sorted(mtimes, reverse=True)
+
+    def test_thumbnails(self):
+        loads = []
+
+        def loader(path):
+            loads.append(path)
+            return path
+        self.index.thumbnails = r9PoseIndex.ThumbnailCache(limit=2, loader=loader)
+        for name in ['jump_f9', 'jump_f218', 'jump_f9', 'T_Pose', 'jump_f218']:
+            assert self.index.getThumbnail(name).endswith('%s.bmp' % name)
+        assert len(loads) == 4  # jump_f9 cached, jump_f218 evicted by T_Pose
+        assert len(self.index.thumbnails) == 2
+        assert self.index.getThumbnail('missing') is None
+
+    def test_sharedIndex(self):
+        index = r9PoseIndex.getIndex(self.root)
+        assert index is r9PoseIndex.getIndex(self.root, update=False)
+        assert r9PoseIndex.findIndex(os.path.join(self.root, 'fingers')) is index
+        assert r9PoseIndex.findIndex(tempfile.gettempdir()) is None
+
+    def test_readOnlyRoot(self):
+        os.chmod(self.root, 0o555)
+        try:
+            index = r9PoseIndex.PoseIndex(self.root)
+            if os.access(self.root, os.W_OK):
+                return  # running as root, permissions aren't enforced
+            assert index.indexPath.startswith(tempfile.gettempdir())
+        finally:
+            os.chmod(self.root, 0o755)
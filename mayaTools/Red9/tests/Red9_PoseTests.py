@@ -232,6 +232,57 @@ class Test_PoseData_loaders():
         self.poseData.poseLoad(self.rootNode, filepath=filepath, useFilter=True)
         assert r9Pose.PoseCompare(self.poseData, filepath).compare()
 
+    def test_poseLoad_binaryFormat(self):
+        '''
+        convert a config pose to the binary format and load it back lazily
+        '''
+        self.poseData.matchMethod = 'stripPrefix'
+        cmds.currentTime(0)
+        filepath = os.path.join(self.poseFolder, 'jump_f218.pose')
+        binarypath = os.path.join(self.poseFolder, 'jump_f218UnitTest_binary.pose')
+        try:
+            assert r9Pose.convertPoseFile(filepath, dataformat='binary', outputpath=binarypath)
+            assert r9Pose.isBinaryPoseFile(binarypath)
+            assert not r9Pose.isBinaryPoseFile(filepath)
+
+            # only the matched nodes should have their attr blocks decoded
+            self.poseData.poseLoad(self.rootNode, filepath=binarypath, useFilter=True)
+            matched = [key for key, _ in self.poseData.matchedPairs]
+            for key, block in self.poseData.poseDict.items():
+                if 'attrs' in block and key not in matched:
+                    assert not block['attrs'].loaded
+            assert r9Pose.PoseCompare(self.poseData, filepath).compare()
+        finally:
+            if os.path.exists(binarypath):
+                os.remove(binarypath)
+
+    def test_applyPlan(self):
+        '''
+        the compiled plan, applied in one undoable modifier and blended from the current state
+        '''
+        self.poseData.matchMethod = 'stripPrefix'
+        cmds.currentTime(0)
+        filepath = os.path.join(self.poseFolder, 'jump_f218.pose')
+        self.poseData.filepath = filepath
+        self.poseData.processPoseFile(self.rootNode)
+        plan = self.poseData.applyPlan
+        assert len(plan) and len(plan.values) == len(plan.plugs) == len(plan.rows)
+        assert self.poseData.getApplyPlan() is plan
+
+        plug = plan.plugNames[plan.rows.index(('L_Wrist_Ctrl', 'rotateX'))]
+        start = cmds.getAttr(plug)
+        cmds.undoInfo(openChunk=True)
+        self.poseData._applyData()
+        cmds.undoInfo(closeChunk=True)
+        assert r9Pose.PoseCompare(self.poseData, filepath).compare()
+        cmds.undo()
+        assert r9Core.floatIsEqual(cmds.getAttr(plug), start, 0.001)
+
+        target = plan.values[plan.plugNames.index(plug)]
+        self.poseData._cacheCurrentNodeStates()
+        self.poseData._applyData(percent=50)
+        assert r9Core.floatIsEqual(cmds.getAttr(plug), start + (target - start) / 2.0, 0.001)
+
 #    def test_poseLoad_index(self):
 #        self.poseData.matchMethod='index'
 #        cmds.currentTime(0)
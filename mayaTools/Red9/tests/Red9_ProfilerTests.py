@@ -0,0 +1,133 @@
+'''
+------------------------------------------
+Red9 Studio Pack: Maya Pipeline Solutions
+Author: Mark Jackson
+email: rednineinfo@gmail.com
+
+Red9 blog : http://red9-consultancy.blogspot.co.uk/
+MarkJ blog: http://markj3d.blogspot.co.uk
+------------------------------------------
+
+This is the unittest for the Red9_Profiler module, no Maya needed
+================================================================
+
+'''
+
+import os
+import imp
+import json
+import time
+import tempfile
+import threading
+
+# load by path so we don't boot the rest of Red9.core
+r9Profiler = imp.load_source('Red9_Profiler',
+                             os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core', 'Red9_Profiler.py'))
+
+
+class Test_Profiler():
+    def setup(self):
+        r9Profiler.enable()
+
+    def teardown(self):
+        r9Profiler.disable()
+        r9Profiler.clear()
+
+    def test_disabled(self):
+        r9Profiler.disable()
+        assert r9Profiler.span('test') is r9Profiler._NULLSPAN
+
+        @r9Profiler.profile()
+        def func(x):
+            return x * 2
+
+        assert func(2) == 4
+        assert not r9Profiler.get_spans()
+
+    def test_nesting(self):
+        with r9Profiler.span('block', 'block', blockType='limb'):
+            for step in ['a', 'b']:
+                with r9Profiler.span(step, 'step') as s:
+                    time.sleep(0.01)
+                    s.set(result=step)
+
+        spans = r9Profiler.get_spans()
+        assert [s.name for s in spans] == ['block', 'a', 'b']
+        assert [s.depth for s in spans] == [0, 1, 1]
+        assert spans[0].args == {'blockType': 'limb'}
+        assert spans[1].args == {'result': 'a'}
+        assert spans[0].duration >= spans[1].duration + spans[2].duration
+        assert abs(spans[0].childTime - (spans[1].duration + spans[2].duration)) < 1e-9
+        assert r9Profiler.get_spans('step') == spans[1:]
+
+    def test_decorator(self):
+        @r9Profiler.profile(category='step')
+        def func(x):
+            return x * 2
+
+        assert func(3) == 6
+        assert func.__name__ == 'func'
+        spans = r9Profiler.get_spans()
+        assert len(spans) == 1
+        assert spans[0].category == 'step'
+        assert spans[0].name.endswith('.func')
+
+    def test_exception(self):
+        try:
+            with r9Profiler.span('fail'):
+                raise ValueError('boom')
+        except ValueError:
+            pass
+        spans = r9Profiler.get_spans()
+        assert spans[0].args['error'] == 'boom'
+        with r9Profiler.span('after'):
+            pass
+        assert r9Profiler.get_spans()[-1].depth == 0
+
+    def test_threads(self):
+        def work(i):
+            with r9Profiler.span('thread', 'function', index=i):
+                with r9Profiler.span('inner'):
+                    time.sleep(0.001)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        spans = r9Profiler.get_spans()
+        assert len(spans) == 16
+        assert sorted([s.depth for s in spans]) == [0] * 8 + [1] * 8
+        assert len(set([s.thread for s in spans])) == 8
+
+    def test_summary(self):
+        for i in range(3):
+            with r9Profiler.span('outer'):
+                with r9Profiler.span('inner'):
+                    pass
+        summary = dict([(d['name'], d) for d in r9Profiler.get_summary()])
+        assert summary['outer']['count'] == 3
+        assert summary['inner']['count'] == 3
+        assert summary['outer']['self'] <= summary['outer']['total']
+        assert summary['outer']['min'] <= summary['outer']['mean'] <= summary['outer']['max']
+
+    def test_export(self):
+        with r9Profiler.span('file', 'file', path='c:/temp/a,b.ma', obj=object()):
+            with r9Profiler.span('step', 'step'):
+                pass
+        base = os.path.join(tempfile.mkdtemp(), 'profile')
+        jsonPath, csvPath = r9Profiler.export(base)
+
+        with open(jsonPath) as f:
+            data = json.load(f)
+        events = [e for e in data['traceEvents'] if e['ph'] == 'X']
+        assert [e['name'] for e in events] == ['file', 'step']
+        assert events[0]['dur'] >= events[1]['dur']
+        assert events[0]['args']['path'] == 'c:/temp/a,b.ma'
+        assert [e for e in data['traceEvents'] if e['ph'] == 'M']
+
+        with open(csvPath) as f:
+            lines = f.read().splitlines()
+        assert lines[0].startswith('category,name,count,total_ms')
+        assert len(lines) == 3
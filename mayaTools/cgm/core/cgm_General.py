@@ -24,6 +24,7 @@ import traceback
 import linecache
 import datetime
 import pprint
+import Red9.core.Red9_Profiler as r9Profiler
 # Shared Defaults ========================================================
 
 #=========================================================================
@@ -414,7 +415,8 @@ class cgmFuncCls(object):
         _str_substep = self._str_substep
 
         t1 = time.time()
-        res = func(*args,**kws) 
+        with r9Profiler.span(_str_substep, 'step', func = self._str_funcCombined):
+            res = func(*args,**kws) 
         t2 = time.time()
 
         _str_time = "%0.3f"%(t2-t1)
@@ -1081,19 +1083,20 @@ def stringModuleClassCall(self, module = None,  func = '', *args,**kws):
 #>>> Sub funcs ==============================================================================
 def subTimer(func):
     '''
-    Simple timer decorator 
+    Simple timer decorator for cgmFuncCls methods. Records a 'step' span when r9Profiler is enabled
     -- Taken from red9 and modified. Orignal props to our pal Mark Jackson
     '''
-    def wrapper( *args, **kws):
+    @wraps(func)
+    def wrapper(self, *args, **kws):
         t1 = time.time()
-        res=func(*args,**kws) 
+        with r9Profiler.span(func.__name__, 'step'):
+            res=func(self,*args,**kws) 
         t2 = time.time()
-        log.info("here!")
         functionTrace=func.__name__ 
         _str_time = "%0.3f seconds"%(t2-t1)
         self._l_funcTimes.append([functionTrace,_str_time])
         if self._b_reportTimes:
-            self.log_info(" [TIME] -- Step: '{0}' >>  {1} ".format(pair_time[0],pair_time[1]))	
+            self.log_info(" [TIME] -- Step: '{0}' >>  {1} ".format(functionTrace,_str_time))	
         return res
     return wrapper  
 
@@ -1289,9 +1292,11 @@ def Timer2(func):
     -- Taken from red9 and modified. Orignal props to our pal Mark Jackson
     '''
 
+    _spanName = r9Profiler.get_funcName(func)
     def wrapper( *args, **kws):
         t1 = time.time()
-        res=func(*args,**kws) 
+        with r9Profiler.span(_spanName):
+            res=func(*args,**kws) 
         t2 = time.time()
 
         functionTrace=''
@@ -1331,33 +1336,15 @@ def Timer2(func):
 
 def TimerDebug(func):
     '''
-    Variation,only outputs on debug
+    Variation,only outputs on debug. Records a span when r9Profiler is enabled
     -- Taken from red9 and modified. Orignal props to our pal Mark Jackson
     '''
+    _spanName = r9Profiler.get_funcName(func)
     def wrapper( *args, **kws):
-        t1 = time.time()
-        res=func(*args,**kws) 
-        t2 = time.time()
-
-        functionTrace=''
-        try:
-            #module if found
-            mod = inspect.getmodule(args[0])
-            functionTrace+='%s >>' % mod.__name__.split('.')[-1]
-        except:
-            pass
-            #log.debug('function module inspect failure')
-        try:
-            #class function is part of, if found
-            cls = args[0].__class__
-            functionTrace+='%s.' % args[0].__class__.__name__
-        except:
-            pass
-            #log.debug('function class inspect failure')
-        functionTrace+=func.__name__ 
-        #log.debug('DEBUG TIMER : %s: %0.4f sec' % (functionTrace,(t2-t1)))
-        #log.debug('%s: took %0.3f ms' % (func.func_name, (t2-t1)*1000.0))
-        return res
+        if not r9Profiler.RED9_PROFILING:
+            return func(*args,**kws)
+        with r9Profiler.span(_spanName):
+            return func(*args,**kws)
     return wrapper
 
 def returnTimeStr(arg = "%m%d%Y"):
@@ -1451,6 +1438,7 @@ def Func(func):
 
 def Timer(func):
     '''
+    Prints the call time. Records a span when r9Profiler is enabled
     '''
     @wraps(func)
     def wrapper(*args, **kws):
@@ -1461,7 +1449,8 @@ def Timer(func):
     
         try:
             t1 = time.time()
-            res=func(*args,**kws) 
+            with r9Profiler.span(str(_str_func)):
+                res=func(*args,**kws) 
             t2 = time.time()            
             print("|{0}| >> Time >> = {1} seconds".format(_str_func, "%0.4f"%( t2-t1 ))) 
             
@@ -186,7 +186,7 @@ def reinitializeMetaClass(node):
     _buffer = mObj.mNode
 
     _keyCheck = mc.ls(mObj.mNode,long=True)[0]
-    if _keyCheck in r9Meta.RED9_META_NODECACHE.keys():
+    if _keyCheck in r9Meta.RED9_META_NODECACHE:
         log.debug('Cached already and class to be changed....')
 
         try:
@@ -299,7 +299,7 @@ class cgmNode(r9Meta.MetaClass):
         except:
             # if this fails we have a dead node more than likely
             try:
-                RED9_META_NODECACHE.pop(object.__getattribute__(self, "_lastUUID"))
+                r9Meta.RED9_META_NODECACHE.invalidate(object.__getattribute__(self, "_lastUUID"))
                 log.debug("Dead mNode %s removed from cache..." % object.__getattribute__(self, "_lastDagPath"))
             except:pass
             try:
@@ -559,19 +559,13 @@ class cgmNode(r9Meta.MetaClass):
             newName(str)
         """   
         #try:
+        mQueue = nameTools.queue_get()#...inside a nameTools.NameQueue the rename is deferred to its exit
         if fastName:
-            d_updatedNamesDict = self.getNameDict()
-            ignore = kws.get('ignore') or []
-            if 'cgmName' not in d_updatedNamesDict.keys():
-                test = {}
-                if self.getMayaType() !='group' and 'cgmName' not in ignore:
-                    _short = self.getShortName()
-                    for k,v in d_updatedNamesDict.iteritems():
-                        if v and v in _short:
-                            _short = _short.replace(v,'')
-                    _short = NAMES.clean(_short)
-                    d_updatedNamesDict['cgmName'] = _short
-
+            if mQueue:
+                mQueue.add(self.mNode, ignore = kws.get('ignore'), nameChildren = nameChildren)
+                return self.mNode
+            
+            d_updatedNamesDict = nameTools.get_fastNameDict(self.mNode, kws.get('ignore'))
             _str_nameCandidate =  nameTools.returnCombinedNameFromDict(d_updatedNamesDict)
             mc.rename(self.mNode, _str_nameCandidate	)
             if nameChildren:
@@ -585,6 +579,9 @@ class cgmNode(r9Meta.MetaClass):
                 log.error("'%s' is referenced. Cannot change name"%self.mNode)
                 return False	
             #Name it
+            if mQueue:
+                mQueue.add_call(NameFactory(self).doName, nameChildren = nameChildren,fastIterate=fastIterate,**kws)
+                return self.mNode
             NameFactory(self).doName(nameChildren = nameChildren,fastIterate=fastIterate,**kws)	  
         return self.mNode
         #except Exception,err:
@@ -1063,6 +1060,9 @@ class cgmNode(r9Meta.MetaClass):
         try:kws.pop('asMeta')
         except:pass
         
+        if _asMeta:
+            #...full paths so validateObjListArg can hit the meta cache by name
+            kws.setdefault('longNames',True)
         _res = ATTR.msgList_get(self.mNode,*a,**kws)
         
         #if not _res:
@@ -7018,7 +7018,7 @@ def validateObjArg(arg = None, mType = None, noneValid = False,
 
     _UUID2016 = False#...a flag to see if we need a reg UUID attr 
     try:
-        _UUID2016 = mc.ls(_argShort, uuid=True)[0]
+        _UUID2016 = r9Meta.RED9_META_NODECACHE.getUUID(_arg)
     except:pass
 
     if _UUID2016:
@@ -7035,16 +7035,16 @@ def validateObjArg(arg = None, mType = None, noneValid = False,
     _wasCached = False
 
     #See if it's in the cache
-    _keys = r9Meta.RED9_META_NODECACHE.keys()
+    _cache = r9Meta.RED9_META_NODECACHE
     _cacheKey = None
     _cached = None
     _unicodeArg = unicode( _arg)
     _change = False
 
-    if _UUID in _keys:
+    if _UUID in _cache:
         _cacheKey = _UUID
         _cached = r9Meta.RED9_META_NODECACHE.get(_UUID)
-    elif _unicodeArg in _keys:
+    elif _unicodeArg in _cache:
         _cacheKey = _unicodeArg
         _cached = r9Meta.RED9_META_NODECACHE.get(_unicodeArg)	
 
@@ -7315,7 +7315,7 @@ def validateObjArgOLD(*args,**kws):
             _mClass = ATTR.get(_argShort,'mClass')
 
             _UUID2016 = False#...a flag to see if we need a reg UUID attr 
-            try:_UUID2016= mc.ls(_argShort, uuid=True)[0]
+            try:_UUID2016 = r9Meta.RED9_META_NODECACHE.getUUID(_arg)
             except:pass
 
             if _UUID2016:
@@ -7332,15 +7332,15 @@ def validateObjArgOLD(*args,**kws):
             _wasCached = False
 
             #See if it's in the cache
-            _keys = r9Meta.RED9_META_NODECACHE.keys()
+            _cache = r9Meta.RED9_META_NODECACHE
             _cacheKey = None
             _cached = None
             _unicodeArg = unicode( _arg)
 
-            if _UUID in _keys:
+            if _UUID in _cache:
                 _cacheKey = _UUID
                 _cached = r9Meta.RED9_META_NODECACHE.get(_UUID)
-            elif _unicodeArg in _keys:
+            elif _unicodeArg in _cache:
                 _cacheKey = _unicodeArg
                 _cached = r9Meta.RED9_META_NODECACHE.get(_unicodeArg)	
 
@@ -7519,7 +7519,16 @@ def validateObjListArg(l_args = None, mType = None, noneValid = False, default_m
     if type(l_args) not in [list,tuple]:l_args = [l_args]
     returnList = []
     kws = {'mType':mType,'noneValid':noneValid,'default_mType':default_mType,'mayaType':mayaType,'setClass':setClass}
+    
+    #...with no type checks a cached instance is what validateObjArg would give us anyway
+    _cache = r9Meta.RED9_META_NODECACHE
+    _lookup = mType is None and not mayaType and not setClass and hasattr(_cache,'lookup')
     for arg in l_args:
+        if _lookup and issubclass(type(arg),basestring):
+            _cached = _cache.lookup(arg)[1]
+            if _cached is not None:
+                returnList.append(_cached)
+                continue
         buffer = validateObjArg(arg,**kws)
         if buffer:returnList.append(buffer)
     return returnList	        
@@ -21,6 +21,7 @@
 import time
 import maya.cmds as mc
 import copy
+from collections import deque
 import maya.OpenMayaUI as OpenMayaUI
 import maya.OpenMaya as om
 
@@ -286,6 +287,8 @@ class clickMesh(ContextualPick):
             'local'-- use Bokser's fancy method
             'world' -- use standard maya aiming
         dragInterval(float) -- Distance inverval for drag mode
+        dragRate(float) -- Max drag updates per second. Drag events between are coalesced into the next update. None/0 for every event
+        hitBuffer(int) -- Max hits kept per mesh in d_meshPos/d_meshUV/d_meshNormals during a drag
         tagAndName(dict) -- I don't remember...:)
         toCreate(list) -- list of items names to make, sets's max as well. When it's through the list, it shops
         toSnap(list) -- objects to snap to a final pos value
@@ -317,6 +320,8 @@ class clickMesh(ContextualPick):
                  objOutAxis = 'x+',
                  aimMode = 'local',
                  dragInterval = .2,                 
+                 dragRate = 60,
+                 hitBuffer = 1000,
                  tagAndName = {},
                  toCreate = [],
                  toDuplicate = [],
@@ -334,6 +339,15 @@ class clickMesh(ContextualPick):
         self.d_meshPos = {} #creating this pretty much just for follicle mode so we can attache to a specific mesh
         self.d_meshUV = {}
         self.d_meshNormals = {}
+        self.d_hitData = {}#...mesh data for stored hits, keyed by str(raw pos)
+        self._d_hitBuffer = {}
+        self.int_hitBuffer = hitBuffer
+        self.f_dragRate = dragRate
+        self._castCache = None
+        self._f_dragLast = 0
+        self._b_dragPending = False
+        self._int_dragSkipped = 0
+        self._l_latency = deque(maxlen = 500)
         self.f_meshArea = 1
         self.l_toSnap = cgmValid.listArg(toSnap)
         self.l_toAim = cgmValid.listArg(toAim)
@@ -437,6 +451,7 @@ class clickMesh(ContextualPick):
             buffer = cgmValid.get_mayaType(_mesh)
             if buffer in ['mesh','nurbsSurface']:
                 self.l_mesh.append( _mesh )#...this accounts for deformed mesh 
+                self.clearCastCache()
                 #self.updateMeshArea()
                 return True
             else:
@@ -450,6 +465,7 @@ class clickMesh(ContextualPick):
         """
         if mesh in self.l_mesh:
             self.l_mesh.remove(mesh) 
+            self.clearCastCache()
             log.info("'%s' removed from '%s'"%(mesh,self.name))
 
     def setMode(self,mode):
@@ -494,9 +510,46 @@ class clickMesh(ContextualPick):
         """
         self.l_created = []
         self.l_return = []
+        self.d_hitData = {}
 
         log.debug("'%s' reset."%self.name)
 
+    def getCastCache(self):
+        """
+        Intersection cache for our target mesh. Built on press and used for the rest of the drag
+        """
+        if self._castCache is None:
+            self._castCache = RayCast.CastCache(self.l_mesh)
+        return self._castCache
+
+    def clearCastCache(self):
+        if self._castCache is not None:
+            try:self._castCache.clear()
+            except Exception,err:log.debug("|clearCastCache| >> {0}".format(err))
+        self._castCache = None
+
+    def getLatencyStats(self):
+        """
+        Timing of recent updatePos calls
+
+        :returns
+            dict -- count, mean, max, p95 (seconds), skipped (coalesced drag events)
+        """
+        _l = sorted(self._l_latency)
+        _d = {'count':len(_l),'mean':0.0,'max':0.0,'p95':0.0,'skipped':self._int_dragSkipped}
+        if _l:
+            _d['mean'] = sum(_l)/len(_l)
+            _d['max'] = _l[-1]
+            _d['p95'] = _l[min(int(len(_l) * .95), len(_l)-1)]
+        return _d
+
+    def reportLatency(self):
+        _d = self.getLatencyStats()
+        log.info("|clickMesh| >> updates: {0} | mean: {1:.2f}ms | p95: {2:.2f}ms | max: {3:.2f}ms | coalesced: {4}".format(_d['count'],_d['mean']*1000,
+                                                                                                                         _d['p95']*1000,_d['max']*1000,
+                                                                                                                         _d['skipped']))
+        return _d
+
     def setTool(self):
         ContextualPick.setTool(self)
 
@@ -512,6 +565,10 @@ class clickMesh(ContextualPick):
         """            
         ContextualPick.press(self)
         self._createModeBuffer = []
+        self.clearCastCache()
+        self.getCastCache()
+        self._b_dragPending = False
+        self._f_dragLast = time.time()
         self.updatePos()
 
     def release_post_insert(self):pass
@@ -543,17 +600,18 @@ class clickMesh(ContextualPick):
                 
                 for pos in self.l_returnRaw:
                     log.debug("|{0}|...pos {1}".format(_str_funcName,pos))                
-                    for i,m in enumerate(self.d_meshPos.keys()):
-                        log.debug("|{0}|...mesh: {1}".format(_str_funcName,m))                                    
-                        for i2,h in enumerate(self.d_meshPos[m]):
-                            if h == pos:
-                                log.debug("Found follicle match!")
-                                try:
-                                    _set = [m, self.d_meshUV[m][i2], "{0}_u{1}s_v{2}".format(NAMES.get_short(m),"{0:.4f}".format(self.d_meshUV[m][i2][0]),"{0:.4f}".format(self.d_meshUV[m][i2][1]))]
-                                    self._l_folliclesToMake.append(_set)
-                                    log.debug("|{0}|...uv {1}".format(_str_funcName,_set))                                                
-                                except Exception,err:
-                                    log.error("|{0}| >> Failed to query uv for hit {2} on shape {2} | err:{1}".format(_str_funcName,err,pos,m))                
+                    _d = self.getHitData(pos)
+                    if not _d:
+                        log.error("|{0}| >> No hit data for {1}".format(_str_funcName,pos))
+                        continue
+                    m = _d['m']
+                    _uv = _d['m_uv']
+                    try:
+                        _set = [m, _uv, "{0}_u{1}s_v{2}".format(NAMES.get_short(m),"{0:.4f}".format(_uv[0]),"{0:.4f}".format(_uv[1]))]
+                        self._l_folliclesToMake.append(_set)
+                        log.debug("|{0}|...uv {1}".format(_str_funcName,_set))                                                
+                    except Exception,err:
+                        log.error("|{0}| >> Failed to query uv for hit {2} on shape {3} | err:{1}".format(_str_funcName,err,pos,m))                
 
                 
                 if self._l_folliclesToMake:
@@ -686,6 +744,9 @@ class clickMesh(ContextualPick):
         """               
         _str_funcName = 'release'
         
+        if self._b_dragPending:#...last drag event was coalesced, catch up to where we let go
+            self.updateDrag()
+            
         self.release_pre_insert()
         
         self.l_created = lists.returnListNoDuplicates(self.l_created)
@@ -697,6 +758,7 @@ class clickMesh(ContextualPick):
                     self.l_returnRaw.extend(self._posBufferRaw)
                 else:
                     self.l_returnRaw.extend(self._posBuffer)
+                self.storeHitData()
                     
             if self._createModeBuffer:
                 self.l_created.extend(self._createModeBuffer)
@@ -793,7 +855,7 @@ class clickMesh(ContextualPick):
                             _vec_obj = MATHUTILS.get_vector_of_two_points( _pos_obj,_pos_base)#...Get the vector from there to our hit
                             _dist_base = DIST.get_distance_between_points(_pos_base, _pos_obj)#...get our base distance
                             
-                            _cast = RayCast.cast(self.l_mesh, startPoint=_pos_obj,vector=_vec_obj)
+                            _cast = self.getCastCache().cast(_pos_obj,_vec_obj)
                             _nearHit = _cast['near']
                             _dist_firstHit = DIST.get_distance_between_points(_pos_obj,_nearHit)
                             log.debug("baseDist: {0}".format(_dist_base))
@@ -844,6 +906,8 @@ class clickMesh(ContextualPick):
             log.info("|{0}| >> created: {1}".format(_str_funcName,self.l_created))
             self.dropTool()
             
+        self.clearCastCache()
+        log.debug("|{0}| >> latency: {1}".format(_str_funcName,self.getLatencyStats()))
         self.release_post_insert()
         
             
@@ -853,6 +917,18 @@ class clickMesh(ContextualPick):
         update positions
         """
         ContextualPick.drag(self)
+        if self.f_dragRate and time.time() - self._f_dragLast < 1.0/self.f_dragRate:
+            self._b_dragPending = True
+            self._int_dragSkipped += 1
+            return
+        self.updateDrag()
+
+    def updateDrag(self):
+        """
+        Update from the latest drag point
+        """
+        self._b_dragPending = False
+        self._f_dragLast = time.time()
         self.updatePos()
 
         #print len(self._createModeBuffer)
@@ -862,6 +938,25 @@ class clickMesh(ContextualPick):
         if self._createModeBuffer:
             self.l_created.extend(self._createModeBuffer)          
 
+    def storeHitData(self):
+        """
+        Keep mesh data for the current hits once they're stored. The per mesh hit buffers only hold the
+        most recent hits
+        """
+        for pos in self._posBufferRaw or self._posBuffer or []:
+            _d = self._d_hitBuffer.get(str(pos))
+            if _d:
+                self.d_hitData[str(pos)] = _d
+
+    def getHitData(self,pos):
+        """
+        Mesh data for a stored raw hit pos
+
+        :returns
+            dict -- {'m','m_hit_idx','m_normal','m_uv'} or None
+        """
+        return self.d_hitData.get(str(pos))
+
     def getDistanceToCheck(self,m):
         assert mc.objExists(m), "'%s' doesn't exist. Couldn't check distance!"%m
         baseDistance = distance.returnDistanceBetweenPoints(self.clickPos, distance.returnWorldSpacePosition(m))
@@ -871,9 +966,15 @@ class clickMesh(ContextualPick):
 
     def updatePos(self):
         """
-        Get updated position data via shooting rays
+        Get updated position data via shooting rays. Timing goes to getLatencyStats
         """
+        _t = time.time()
+        try:
+            return self._updatePos()
+        finally:
+            self._l_latency.append(time.time() - _t)
 
+    def _updatePos(self):
         _str_funcName = 'clickMesh.updatePos'
         #log.debug(">>> %s >> "%_str_funcName + "="*75)     	
         if not self.l_mesh:
@@ -901,39 +1002,39 @@ class clickMesh(ContextualPick):
         #checkDistance = self.getDistanceToCheck(m)
         
         #MATHUTILS.get_space_value( self.clickPos,'apiSpace' )
-        kws = {'mesh':self.l_mesh,'startPoint':self.clickPos,'vector':self.clickVector,'maxDistance':self._f_maxDistance}
+        kws = {'startPoint':self.clickPos,'vector':self.clickVector,'maxDistance':self._f_maxDistance}
         
         if self.mode != 'surface' or not self.b_closestOnly:
             kws['firstHit'] = False
                         
         try:
             #buffer = RayCast.findMeshIntersection(m, self.clickPos , self.clickVector, checkDistance) 
-            _res = RayCast.cast(**kws)
+            _res = self.getCastCache().cast(**kws)
         except Exception,error:
             _res = None
             log.error("{0} >>> surface cast fail. More than likely, the offending face lacks uv's. Error:{1}".format(_str_funcName,error))
         
         _d_hit_mesh_queried = {}
+        self._d_hitBuffer = _d_hit_mesh_queried
         if _res:
             try:
                 for i,m in enumerate(_res['meshHits'].keys()):
                     #Buffer our data for processing on release....
-                    if self.d_meshPos.has_key(m):
-                        self.d_meshPos[m].extend(_res['meshHits'][m])
-                    else:
-                        self.d_meshPos[m] = _res['meshHits'][m]  
-                        
-                    if self.d_meshNormals.has_key(m):
-                        self.d_meshNormals[m].extend(_res['meshNormals'][m])
-                    else:
-                        self.d_meshNormals[m] = _res['meshNormals'][m]   
-                                                
+                    if not self.d_meshPos.has_key(m):
+                        self.d_meshPos[m] = deque(maxlen = self.int_hitBuffer)
+                        self.d_meshNormals[m] = deque(maxlen = self.int_hitBuffer)
+                        self.d_meshUV[m] = deque(maxlen = self.int_hitBuffer)
+                    self.d_meshPos[m].extend(_res['meshHits'][m])
+                    self.d_meshNormals[m].extend(_res['meshNormals'][m])
                     _d_UVS = _res.get('uvs',{})
-                    if self.d_meshUV.has_key(m):
-                        self.d_meshUV[m].extend(_d_UVS[m])
-                    else:
-                        self.d_meshUV[m] = _d_UVS[m]    
-                            
+                    self.d_meshUV[m].extend(_d_UVS[m])
+                    
+                    #...hit lookup for this cast
+                    for i2,h in enumerate(_res['meshHits'][m]):
+                        if str(h) not in _d_hit_mesh_queried.keys():
+                            _d_hit_mesh_queried[str(h)] = {'m':m,'m_hit_idx':i2,
+                                                           'm_normal':_res['meshNormals'][m][i2],
+                                                           'm_uv':_d_UVS[m][i2]}
                     #self.d_meshUV[m] = _d.get(m,[])
                     
                 if self.mode == 'surface':
@@ -984,25 +1085,9 @@ class clickMesh(ContextualPick):
                         _m_hit_idx = _d['m_hit_idx']
                         _m_normal = _d['m_normal']
                         _m_uv = _d['m_uv']
-                    else:    
-                        for i2,m in enumerate(self.d_meshPos.keys()):
-                            #log.debug("|{0}|...mesh: {1}".format(_str_funcName,m))                       
-                            for i3,h in enumerate(self.d_meshPos[m]):
-                                if h == pos: 
-                                    log.debug("Found mesh match!")
-                                    _m = m
-                                    _m_hit_idx = _res['meshHits'][_m].index(h)
-                                    _m_normal = _res['meshNormals'][_m][_m_hit_idx]
-                                    _m_uv = _res['uvs'][_m][_m_hit_idx]                                    
-                                    
-                                    if str(pos) not in _d_hit_mesh_queried.keys():
-                                        _d_hit_mesh_queried[str(pos)] = {'m':m,'m_hit_idx':_m_hit_idx,'m_normal':_m_normal,'m_uv':_m_uv}
-                                        
-                                    log.debug("|{0}| >> mesh normal: {1}".format(_str_funcName,_m_normal))
-                                    break      
                         
                     if not _m_normal:
-                        cgmGen.log_info_dict(self.d_meshPos,"Mesh hit dict")
+                        cgmGen.log_info_dict(_d_hit_mesh_queried,"Mesh hit dict")
                         raise ValueError,"|{0}| >> Missing normal for hit: {1}".format(_str_funcName,pos)                    
                     
                     #_p = RayCast.offset_hits_by_distance(pos,self.clickPos,_m_normal,self.f_offsetDistance)
@@ -1032,6 +1117,7 @@ class clickMesh(ContextualPick):
                     self.l_returnRaw.extend(self._posBufferRaw)
                 else:
                     self.l_returnRaw.extend(self._posBuffer)
+                self.storeHitData()
             self._int_runningTally+=1
             
         #>>> Make our stuff ====================================================================================
@@ -1067,17 +1153,7 @@ class clickMesh(ContextualPick):
                             _m_normal = _d['m_normal']  
                             _m_uv = _d['m_uv']  
                         else:
-                            for i2,m in enumerate(self.d_meshPos.keys()):
-                                #log.debug("|{0}|...mesh: {1}".format(_str_funcName,m))                                    
-                                for i3,h in enumerate(self.d_meshPos[m]):
-                                    if h == _rawPos: 
-                                        log.debug("Found mesh match!")
-                                        _m = m
-                                        _m_hit_idx = _res['meshHits'][_m].index(h)
-                                        _m_normal = _res['meshNormals'][_m][_m_hit_idx]
-                                        _m_uv = _res['uvs'][_m][_m_hit_idx]                                    
-                                        log.debug("|{0}| >> mesh normal: {1}".format(_str_funcName,_m_normal))
-                                        break
+                            log.debug("|{0}| >> no hit data for {1}".format(_str_funcName,_rawPos))
                     else:
                         log.debug("no raw pos match")
                     
@@ -1108,7 +1184,7 @@ class clickMesh(ContextualPick):
                                 #_vec_obj = MATHUTILS.get_vector_of_two_points( _pos_obj,_pos_base)#...Get the vector from there to our hit                                
                                 #_cast = RayCast.cast(self.l_mesh, startPoint=_pos_obj,vector=_vec_obj)
                                 
-                                _cast = RayCast.cast(self.l_mesh, startPoint=_pos_obj,vector=self.mAxis_up.inverse.p_vector)
+                                _cast = self.getCastCache().cast(_pos_obj,self.mAxis_up.inverse.p_vector)
                                 
                                 _nearHit = _cast['near']
                                 _dist_firstHit = DIST.get_distance_between_points(_pos_obj,_nearHit)
@@ -9,8 +9,11 @@ Website : http://www.cgmonks.com
 ================================================================
 """
 
+import math
+
 from cgm.core import cgm_Meta as cgmMeta
 from cgm.core.lib import math_utils as MATH
+from cgm.core.lib import euclid as EUCLID
 from cgm.core.cgmPy import validateArgs as VALID
 from cgm.core.lib import snap_utils as SNAP
 from cgm.core.lib import locator_utils as LOC
@@ -27,12 +30,23 @@ log.setLevel(logging.DEBUG)
 
 import maya.cmds as mc
 import maya.mel as mel
+import maya.OpenMaya as OM
 
 class PostBake(object):
-    def __init__(self, obj = None, velocityDamp = 30.0, showBake=False):
+    '''
+    Base class for our simulation bakers. Subclasses implement preBake/update/finishBake.
+
+    Two bake modes:
+        context -- (default) samples the object through a DG context without moving the time slider,
+                   runs update() on those samples in memory and writes whole curves at the end
+        interactive -- steps the time slider and keys every frame. Used whenever showBake 
+                       or debug is on
+    '''
+    def __init__(self, obj = None, velocityDamp = 30.0, showBake=False, sampleMode = 'context'):
         self.obj = None
         self.velocityDamp = velocityDamp
         self.showBake = showBake
+        self.sampleMode = sampleMode
 
         self.velocity = MATH.Vector3.zero()
         self.previousPosition = MATH.Vector3.zero()
@@ -54,6 +68,12 @@ class PostBake(object):
         self.keyableAttrs = ['translate', 'rotate', 'scale']
         self._bakedLoc = None
 
+        self._l_samples = []
+        self._frameSample = None
+        self._d_keyBuffer = {}
+        self._d_orient = {}
+        self._lastEuler = None
+
         self.startTime = int(mc.playbackOptions(q=True, min=True))
         self.endTime = int(mc.playbackOptions(q=True, max=True))
 
@@ -65,6 +85,9 @@ class PostBake(object):
         self.startTime = int(mc.playbackOptions(q=True, min=True)) if startTime is None else startTime
         self.endTime = int(mc.playbackOptions(q=True, max=True)) if endTime is None else endTime
 
+        if self.isContextBake():
+            return self._bakeContext()
+
         previousStart = mc.playbackOptions(q=True, min=True)
         previousEnd = mc.playbackOptions(q=True, max=True)
         previousCurrent = mc.currentTime(q=True)
@@ -140,6 +163,154 @@ class PostBake(object):
 
         return completed
 
+    def isContextBake(self):
+        '''
+        Whether we bake by sampling through a DG context. showBake and debug need to see
+        the scene update so they use the interactive loop
+        '''
+        return self.sampleMode == 'context' and not self.showBake and not getattr(self,'debug',False)
+
+    def _bakeContext(self):
+        _str_func = 'PostBake._bakeContext'
+
+        log.info('Baking from {0} to {1} | context'.format(self.startTime, self.endTime))
+
+        _obj = self.obj.mNode
+        self._l_samples = sample_transform(_obj, range(self.startTime, self.endTime+1))
+        self._d_keyBuffer = {}
+        self._lastEuler = None
+        self._d_orient = get_rotationOffsets(_obj)
+        self._frameSample = self._l_samples[0]
+
+        _len = len(self._l_samples)
+        _step = max(1, _len/10)#...only touch the progress bar a handful of times
+        _progressBar = None
+        completed = True
+
+        try:
+            self.preBake()
+
+            self.setAim(aimFwd = self.aimFwd, aimUp = self.aimUp)
+
+            if self._cancelBake:
+                return
+
+            fps = mel.eval('currentTimeUnitToFPS')
+            fixedDeltaTime = 1.0/fps
+
+            self.velocity = MATH.Vector3.zero()
+
+            _progressBar = cgmUI.doStartMayaProgressBar(_len,"Processing...")
+
+            for i,sample in enumerate(self._l_samples):
+                self._frameSample = sample
+
+                try:
+                    self.update(fixedDeltaTime)
+                except Exception,err:
+                    log.warning('Error on update | {0}'.format(err))   
+                    cgmGEN.cgmException(Exception,err)
+                    return
+
+                _pos = self.get_position()
+                self.velocity = MATH.Vector3.Lerp(self.velocity, _pos - self.previousPosition, min(fixedDeltaTime * self.velocityDamp, 1.0))
+                self.previousPosition = _pos
+
+                if _progressBar and not i % _step:
+                    if mc.progressBar(_progressBar, query=True, isCancelled=True ):
+                        log.warning('Bake cancelled!')
+                        completed = False
+                        break
+                    mc.progressBar(_progressBar, edit=True, status = ("{0} On frame {1}".format(_str_func,sample['frame'])), 
+                                   progress=i, maxValue = _len)
+        finally:
+            self._frameSample = None
+            if _progressBar:
+                cgmUI.doEndMayaProgressBar(_progressBar)
+
+        if completed:
+            #...key the same channels the interactive loop does - everything in keyableAttrs every frame,
+            #...with the buffered values where the update set them
+            _l_frames = [sample['frame'] for sample in self._l_samples]
+            _l_channels = get_keyChannels(_obj, self.keyableAttrs)
+            _d_keys = {}
+            for (node,attr),d in self._d_keyBuffer.iteritems():
+                _d_keys[(node,mc.attributeQuery(attr, node=node, shortName=True))] = d
+            for c,l in sample_channels(_obj, _l_channels, _l_frames).iteritems():
+                d = _d_keys.setdefault((_obj,c),{})
+                for f,v in zip(_l_frames,l):
+                    d.setdefault(f,v)
+
+            for (node,attr),d in _d_keys.iteritems():
+                _l_keyFrames = sorted(d.keys())
+                set_curveValues(node, attr, _l_keyFrames, [d[f] for f in _l_keyFrames])
+            self._d_keyBuffer = {}
+            self.finishBake()
+
+        mc.select(self.obj.mNode)
+
+        return completed
+
+    def get_position(self):
+        '''
+        World position of our object for the frame being evaluated
+        '''
+        if self._frameSample is not None:
+            return MATH.Vector3.Create(self._frameSample['position'])
+        return VALID.euclidVector3Arg(self.obj.p_position)
+
+    def get_bakedDirection(self, v):
+        '''
+        Vector transformed by the baked locator's orientation for the frame being evaluated
+        '''
+        if self._frameSample is not None:
+            v = VALID.euclidVector3Arg(v)
+            _v = OM.MVector(v.x,v.y,v.z) * self._frameSample['rotateMatrix']
+            return MATH.Vector3(_v.x,_v.y,_v.z)
+        return self._bakedLoc.getTransformDirection(v)
+
+    def get_objDirection(self, v):
+        '''
+        Vector transformed by our object for the frame being evaluated
+        '''
+        if self._frameSample is not None:
+            v = VALID.euclidVector3Arg(v)
+            _v = OM.MVector(v.x,v.y,v.z) * self._frameSample['worldMatrix']
+            return MATH.Vector3(_v.x,_v.y,_v.z)
+        return self.obj.getTransformDirection(v)
+
+    def set_key(self, node, attr, value):
+        '''
+        Key a value for the frame being evaluated. Context bakes buffer them to be written as 
+        whole curves at the end
+        '''
+        if self._frameSample is not None:
+            self._d_keyBuffer.setdefault((node,attr),{})[self._frameSample['frame']] = value
+            return
+        mc.setKeyframe(node, at=attr, v=value)
+
+    def aim_atPoint(self, position, vectorUp, mode = 'matrix'):
+        '''
+        Aim our object at a point for the frame being evaluated. In a context bake the rotation is
+        solved here against the sampled parent matrix and buffered rather than set on the node
+        '''
+        if self._frameSample is None:
+            return SNAP.aim_atPoint(obj=self.obj.mNode, mode=mode, position=position, 
+                                    aimAxis=self.aimFwd.p_string, upAxis=self.aimUp.p_string, vectorUp=vectorUp )
+
+        aim = (MATH.Vector3.Create(position) - self.get_position()).normalized()
+        wantedAim, wantedUp = MATH.convert_aim_vectors_to_different_axis(aim, vectorUp, self.aimFwd.p_string, self.aimUp.p_string)
+        rot_matrix = EUCLID.Matrix4.new_look_at(MATH.Vector3.zero(), -wantedAim, wantedUp)
+
+        _world = list_toMatrix(rot_matrix[0:12] + [0.0, 0.0, 0.0, 1.0])
+        _local = OM.MTransformationMatrix(_world * self._frameSample['parentInverseMatrix']).asRotateMatrix()
+        _rot = self._d_orient['rotateAxisInverse'] * _local * self._d_orient['jointOrientInverse']
+
+        _euler = matrix_toEuler(_rot, self._d_orient['rotateOrder'], self._lastEuler)
+        self._lastEuler = _euler
+        for a,v in zip(['rx','ry','rz'],[_euler.x,_euler.y,_euler.z]):
+            self.set_key(self.obj.mNode, a, math.degrees(v))
+
     def preBake(self):
         pass
 
@@ -174,6 +345,26 @@ class PostBake(object):
 
         SNAP.matchTarget_set(self._bakedLoc.mNode, self.obj.mNode)
 
+        if self._frameSample is not None:
+            #...context bake, we already have our samples so just write the curves
+            _loc = self._bakedLoc.mNode
+            _ro = mc.getAttr(_loc + '.rotateOrder')
+            _l_frames = []
+            _d_values = dict((a,[]) for a in ['tx','ty','tz','rx','ry','rz'])
+            _euler = None
+            for sample in self._l_samples:
+                if sample['frame'] < startTime or sample['frame'] > endTime:
+                    continue
+                _l_frames.append(sample['frame'])
+                _euler = matrix_toEuler(sample['rotateMatrix'], _ro, _euler)
+                for a,v in zip(['tx','ty','tz'],sample['position']):
+                    _d_values[a].append(v)
+                for a,v in zip(['rx','ry','rz'],[_euler.x,_euler.y,_euler.z]):
+                    _d_values[a].append(math.degrees(v))
+            for a,l in _d_values.iteritems():
+                set_curveValues(_loc, a, _l_frames, l)
+            return True
+
         _len = endTime - startTime
         _progressBar = cgmUI.doStartMayaProgressBar(_len,"Processing...")
 
@@ -208,3 +399,230 @@ class PostBake(object):
 
         return completed
 
+
+#>>> Sampling
+#===================================================================
+def list_toMatrix(l):
+    '''
+    16 value list to MMatrix
+    '''
+    _m = OM.MMatrix()
+    OM.MScriptUtil.createMatrixFromList(l, _m)
+    return _m
+
+def matrix_toEuler(matrix, rotateOrder = 0, previous = None):
+    '''
+    Rotation of a matrix as a MEulerRotation in the given maya rotateOrder index. If previous is
+    passed we use the closest solution to it so curves don't flip
+    '''
+    _euler = OM.MTransformationMatrix(matrix).eulerRotation()
+    _euler.reorderIt(rotateOrder)
+    if previous is not None:
+        _euler.setToClosestSolution(previous)
+    return _euler
+
+def get_rotationOffsets(node = None):
+    '''
+    The static bits of a node we need to get from a local rotation matrix back to rotate values.
+    '''
+    _ra = [math.radians(v) for v in mc.getAttr(node + '.rotateAxis')[0]]
+    _d = {'rotateOrder':mc.getAttr(node + '.rotateOrder'),
+          'rotateAxisInverse':OM.MEulerRotation(_ra[0],_ra[1],_ra[2]).asMatrix().inverse(),
+          'jointOrientInverse':OM.MMatrix()}
+    if mc.objExists(node + '.jointOrient'):
+        _jo = [math.radians(v) for v in mc.getAttr(node + '.jointOrient')[0]]
+        _d['jointOrientInverse'] = OM.MEulerRotation(_jo[0],_jo[1],_jo[2]).asMatrix().inverse()
+    return _d
+
+def sample_transform(node = None, frames = None):
+    '''
+    Sample a transform over a frame range through a DG context. The time slider isn't touched.
+
+    :parameters:
+        node(str): transform to sample
+        frames(list): frames to sample
+
+    :returns
+        list of dicts, one per frame:
+            frame
+            worldMatrix
+            parentInverseMatrix
+            rotateMatrix -- world rotation only
+            position -- world rotate pivot in ui units
+            translate -- translate channel MVector in internal units
+    '''
+    return sample_transforms([node], frames)[node]
+
+def sample_transforms(nodes = None, frames = None):
+    '''
+    sample_transform for a number of nodes in the same pass - one DG context per frame shared
+    by all of them.
+
+    :returns
+        dict - {node:[samples]}, see sample_transform
+    '''
+    _sel = OM.MSelectionList()
+    _mObj = OM.MObject()
+    _l_plugs = []
+    for node in nodes:
+        _sel.clear()
+        _sel.add(node)
+        _sel.getDependNode(0, _mObj)
+        _fn = OM.MFnDependencyNode(_mObj)
+        _l_plugs.append((_fn.findPlug('worldMatrix').elementByLogicalIndex(0),
+                         _fn.findPlug('parentInverseMatrix').elementByLogicalIndex(0),
+                         _fn.findPlug('rotatePivot'),
+                         _fn.findPlug('translate')))
+    _unit = OM.MTime.uiUnit()
+
+    _d = dict((node,[]) for node in nodes)
+    for f in frames:
+        _ctx = OM.MDGContext(OM.MTime(f, _unit))
+        for node,(_plug_wm,_plug_pim,_plug_rp,_plug_t) in zip(nodes,_l_plugs):
+            _wm = OM.MMatrix(OM.MFnMatrixData(_plug_wm.asMObject(_ctx)).matrix())
+            _pim = OM.MMatrix(OM.MFnMatrixData(_plug_pim.asMObject(_ctx)).matrix())
+            _rp = OM.MPoint(_plug_rp.child(0).asDouble(_ctx),
+                            _plug_rp.child(1).asDouble(_ctx),
+                            _plug_rp.child(2).asDouble(_ctx)) * _wm
+            _d[node].append({'frame':f,
+                             'worldMatrix':_wm,
+                             'parentInverseMatrix':_pim,
+                             'rotateMatrix':OM.MTransformationMatrix(_wm).asRotateMatrix(),
+                             'position':[OM.MDistance.internalToUI(_rp.x),
+                                         OM.MDistance.internalToUI(_rp.y),
+                                         OM.MDistance.internalToUI(_rp.z)],
+                             'translate':OM.MVector(_plug_t.child(0).asDouble(_ctx),
+                                                    _plug_t.child(1).asDouble(_ctx),
+                                                    _plug_t.child(2).asDouble(_ctx))})
+    return _d
+
+def get_keyChannels(node = None, attrs = None):
+    '''
+    Short names of the channels setKeyframe would key for the given attrs - compounds like
+    translate give their children, locked channels are skipped
+    '''
+    _res = []
+    for a in attrs:
+        for c in mc.attributeQuery(a, node=node, listChildren=True) or [a]:
+            _short = mc.attributeQuery(c, node=node, shortName=True)
+            if _short in _res or mc.getAttr("{0}.{1}".format(node,_short), lock=True):
+                continue
+            _res.append(_short)
+    return _res
+
+def sample_channels(node = None, channels = None, frames = None):
+    '''
+    Sample numeric channels over a frame range through a DG context. The time slider isn't touched.
+
+    :parameters:
+        node(str)
+        channels(list)
+        frames(list)
+
+    :returns
+        dict - {channel:[values]}, in ui units - degrees for angles
+    '''
+    _sel = OM.MSelectionList()
+    _sel.add(node)
+    _mObj = OM.MObject()
+    _sel.getDependNode(0, _mObj)
+    _fn = OM.MFnDependencyNode(_mObj)
+
+    _l_plugs = []
+    for c in channels:
+        _plug = _fn.findPlug(c)
+        _convert = None
+        _attr = _plug.attribute()
+        if _attr.hasFn(OM.MFn.kUnitAttribute):
+            _type = OM.MFnUnitAttribute(_attr).unitType()
+            if _type == OM.MFnUnitAttribute.kAngle:
+                _convert = OM.MAngle.internalToUI
+            elif _type == OM.MFnUnitAttribute.kDistance:
+                _convert = OM.MDistance.internalToUI
+        _l_plugs.append((c,_plug,_convert))
+    _unit = OM.MTime.uiUnit()
+
+    _d = dict((c,[]) for c in channels)
+    for f in frames:
+        _ctx = OM.MDGContext(OM.MTime(f, _unit))
+        for c,_plug,_convert in _l_plugs:
+            _v = _plug.asDouble(_ctx)
+            _d[c].append(_convert(_v) if _convert else _v)
+    return _d
+
+def set_curveValues(node = None, attr = None, frames = None, values = None):
+    '''
+    Write a whole run of keys to an attribute. Existing keys in the frame range are replaced.
+
+    Everything goes through cmds so the cut and the write undo together - the keys are 
+    inserted with one setKeyframe call, their times/values pushed with a single setAttr
+    on the curve's keyTimeValue array and their tangents reset to the user's defaults.
+
+    :parameters:
+        node(str)
+        attr(str)
+        frames(list)
+        values(list): in ui units - degrees for angles
+    '''
+    if not frames:
+        return False
+    mc.undoInfo(openChunk=True, chunkName='set_curveValues')
+    try:
+        _combined = "{0}.{1}".format(node,attr)
+        mc.cutKey(node, at=attr, time=(frames[0],frames[-1]), clear=True)
+
+        _l_curves = mc.keyframe(_combined, q=True, name=True) or []
+        if not _l_curves:
+            mc.setKeyframe(node, at=attr, t=frames[0], v=values[0])
+            _l_curves = mc.keyframe(_combined, q=True, name=True)
+            if len(frames) > 1:
+                mc.setKeyframe(_l_curves[0], insert=True, time=frames[1:])
+        else:
+            mc.setKeyframe(_l_curves[0], insert=True, time=frames)
+        _curve = _l_curves[0]
+
+        _l_times = mc.keyframe(_curve, q=True, timeChange=True)
+        _start = 0
+        for i,t in enumerate(_l_times):
+            if t >= frames[0] - .0001:
+                _start = i
+                break
+        _flat = []
+        for t,v in zip(frames,values):
+            _flat.extend((t,v))
+        mc.setAttr('{0}.ktv[{1}:{2}]'.format(_curve,_start,_start + len(frames) - 1), *_flat)
+        set_defaultTangents(_curve, frames[0], frames[-1])
+    finally:
+        mc.undoInfo(closeChunk=True)
+    return True
+
+def set_defaultTangents(curve = None, start = None, end = None):
+    '''
+    Give a run of keys the user's default tangents. Inserted keys come in fixed with slopes from
+    the curve as it was, so after their values are pushed the tangents have to be redone.
+    A fixed default is solved as spline first so the slopes fit the new values.
+    '''
+    _itt = mc.keyTangent(q=True, g=True, itt=True)[0]
+    _ott = mc.keyTangent(q=True, g=True, ott=True)[0]
+    if 'fixed' in (_itt,_ott):
+        mc.keyTangent(curve, time=(start,end), itt='spline', ott='spline')
+    mc.keyTangent(curve, time=(start,end), itt=_itt, ott=_ott)
+
+def get_closestCurveParam(curve = None, point = None):
+    '''
+    Closest parameter on a nurbs curve to a world point (ui units) via MFnNurbsCurve
+    rather than building a nearestPointOnCurve node per call
+    '''
+    _sel = OM.MSelectionList()
+    _sel.add(curve)
+    _dag = OM.MDagPath()
+    _sel.getDagPath(0, _dag)
+    _dag.extendToShape()
+    _fn = OM.MFnNurbsCurve(_dag)
+    _point = OM.MPoint(*[OM.MDistance.uiToInternal(v) for v in point])
+
+    _util = OM.MScriptUtil()
+    _util.createFromDouble(0.0)
+    _ptr = _util.asDoublePtr()
+    _fn.closestPoint(_point, _ptr, 0.0001, OM.MSpace.kWorld)
+    return OM.MScriptUtil.getDouble(_ptr)
@@ -408,6 +408,7 @@ def delete(*a):
                 disconnect(_combined,p)
     
             mc.deleteAttr(_combined)  
+            sequentialLayoutCache_clear(_d['node'])
             return True
         return False
     except Exception,err:
@@ -1476,6 +1477,7 @@ def add(obj,attr=None,attrType=None, enumOptions = ['off','on'],value=None, lock
         else:
             raise ValueError,"Don't know what to do with attrType: {0}".format(attrType)
             #return False
+        sequentialLayoutCache_clear(_node)
             
         if value is not None:
             set(_node,_attr,value=value)
@@ -1869,6 +1871,7 @@ def rename(obj=None, attr=None, name=None):
     if name:
         if name != _longName:
             mc.renameAttr("{0}.{1}".format(_d['obj'],_longName),name)
+            sequentialLayoutCache_clear(_d['obj'])
             #attributes.doRenameAttr(_d['obj'],_longName,name)
             _res = True
         else:
@@ -2741,6 +2744,76 @@ def reorder(node = None, attrs = None, direction = 0,top = False):
 #>>>==============================================================================================
 #>> datList/msgList
 #>>>==============================================================================================
+_d_sequentialLayoutCache = {}#...{node uuid:{attr:layout}}
+
+def _sequentialLayout_key(node):
+    _uuid = mc.ls(node, uuid=True) or []
+    if len(_uuid) == 1:
+        return _uuid[0]
+    return None
+
+def sequentialLayoutCache_clear(node = None):
+    """
+    Clear cached datList/msgList layouts. add/delete/rename call this for their node so lists
+    edited through this module stay in sync. Call it after raw mc.addAttr/mc.deleteAttr work.
+
+    :parameters:
+        node(str) -- node to clear. If None, clears everything
+
+    :returns
+        status(bool)
+    """
+    if node is None:
+        _d_sequentialLayoutCache.clear()
+        return True
+    if not _d_sequentialLayoutCache:
+        return False
+    try:_key = _sequentialLayout_key(node)
+    except:return False
+    return _d_sequentialLayoutCache.pop(_key, None) is not None
+
+def get_sequentialAttrLayout(node, attr = None):
+    """
+    Cached version of get_sequentialAttrDict with the attr types we need for bulk reads. The layout
+    is keyed by node uuid and checked against the end of the list (last index exists, next doesn't)
+    before it's used, otherwise it's rebuilt.
+
+    :parameters:
+        node(str) --
+        attr(str) -- base name for the datList
+
+    :returns
+        layout(list) -- [(index, attr, type, multi),...] sorted by index
+    """
+    _str_func = 'get_sequentialAttrLayout'
+    _attr = str(attr)
+    _key = _sequentialLayout_key(node)
+
+    if _key is not None:
+        _layout = _d_sequentialLayoutCache.get(_key,{}).get(_attr)
+        if _layout is not None:
+            if _layout:
+                _next = _layout[-1][0] + 1
+                _valid = mc.objExists("{0}.{1}".format(node,_layout[-1][1]))
+            else:
+                _next = 0
+                _valid = True
+            if _valid and not mc.objExists("{0}.{1}_{2}".format(node,_attr,_next)):
+                return _layout
+            log.debug("|{0}| >> {1}.{2} stale layout...".format(_str_func,NAMES.get_short(node),_attr))
+
+    d_attrs = get_sequentialAttrDict(node,attr)
+    _layout = []
+    for i in sorted(d_attrs.keys()):
+        _combined = "{0}.{1}".format(node,d_attrs[i])
+        try:_multi = mc.addAttr(_combined,q=True,m=True)
+        except:_multi = False
+        _layout.append((i, d_attrs[i], mc.getAttr(_combined,type=True), _multi))
+
+    if _key is not None:
+        _d_sequentialLayoutCache.setdefault(_key,{})[_attr] = _layout
+    return _layout
+
 def get_sequentialAttrDict(node, attr = None):
     """   
     Get dict of sequential attrs. This is mainly used for our own storage methods
@@ -2999,61 +3072,121 @@ def datList_connect(node = None, attr = None, data = None, mode = None, dataAttr
                     
     return True
 
-def msgList_get(node = None, attr = None, dataAttr = None, cull = False, ):
-    return datList_get(node,attr,'message', dataAttr, cull)
+def msgList_get(node = None, attr = None, dataAttr = None, cull = False, longNames = False):
+    return datList_get(node,attr,'message', dataAttr, cull, longNames = longNames)
 
-def datList_get(node = None, attr = None, mode = None, dataAttr = None, cull = False,enum=False ):
-    """   
+def _datList_getMessages(node, layout, dataAttr, longNames = False):
+    """
+    Read all the message entries of a datList layout with one listConnections call and one read of
+    the extra data attr. Entries that get_message treats specially (string message attrs, multis,
+    referenced targets) still go through it.
+
+    :returns
+        list -- one entry per layout index, None for empty ones
+    """
+    _str_func = '_datList_getMessages'
+
+    l_plugs = ["{0}.{1}".format(node,l[1]) for l in layout if l[2] == 'message' and not l[3]]
+    d_found = {}
+    if l_plugs:
+        _kws = {'connections':True,'destination':True,'source':True,'shapes':True}
+        if longNames:
+            _kws['fullNodeName'] = True
+        _buffer = mc.listConnections(l_plugs, **_kws) or []
+        for i in range(0,len(_buffer),2):
+            _attr = _buffer[i].split('.')[-1]
+            if _attr not in d_found:
+                d_found[_attr] = _buffer[i+1]
+
+    l_refs = []
+    d_data = {}
+    if d_found:
+        l_refs = mc.ls(d_found.values(), type='reference') or []
+        if '.' in dataAttr:
+            dataAttr = validate_arg(dataAttr)['attr']
+        if mc.objExists("{0}.{1}".format(node,dataAttr)):
+            try:d_data = r9Meta.MetaClass(node).__getattribute__(dataAttr) or {}
+            except Exception,err:
+                log.debug("|{0}| >> {1}.{2} extra data failed | {3}".format(_str_func,NAMES.get_short(node),dataAttr,err))
+            if not issubclass(type(d_data),dict):
+                d_data = {}
+
+    l_return = []
+    for i,_attr,_type,_multi in layout:
+        _res = d_found.get(_attr)
+        if _type != 'message' or _multi or (_res and _res.split('|')[-1] in l_refs):
+            _res = get_message(node,_attr,dataAttr,i) or None
+            if _res:_res = _res[0]
+        elif _res and d_data.get(unicode(i)):
+            log.debug("|{0}| >> extra message data found: {1}...".format(_str_func,_attr))
+            _res = _res + '.' + d_data.get(unicode(i))
+        l_return.append(_res)
+    return l_return
+
+def datList_get(node = None, attr = None, mode = None, dataAttr = None, cull = False,enum=False, longNames = False):
+    """
     Get datList return.
-    
+
     :parameters:
-        node(str) -- 
+        node(str) --
         attr(str) -- base name for the datList. becomes attr_0,attr_1,etc...
         mode(str) -- what kind of data to be looking for
             NONE - just get the data
             message - getMessage
         dataAttr(str) - Attr to store extra info. If none specified, makes default
         cull(bool) - Cull for empty entries
+        longNames(bool) - message mode only, return full path names
 
     :returns
         dataList(list)
     """
     _str_func = 'datList_get'
-    
+
     if mode is not None:
         _mode = validate_attrTypeName(mode)
     else:_mode = mode
-    
+
     log.debug("|{0}| >> node: {1} | attr: {2} | mode: {3} | cull: {4}".format(_str_func,node,attr,_mode,cull))
-    
+
     if dataAttr is None:
         dataAttr = "{0}_datdict".format(attr)
     """
     if dataAttr is not None:
         _str_dataAttr = dataAttr
     else:
-        _str_dataAttr = "{0}_datdict".format(attr)    
+        _str_dataAttr = "{0}_datdict".format(attr)
     """
-    d_attrs = get_sequentialAttrDict(node,attr)
-    
+    _layout = get_sequentialAttrLayout(node,attr)
+
     l_return = []
     ml_return = []
-    
-    for k in d_attrs.keys():
+
+    l_messages = []
+    if _mode == 'message' and _layout:
+        try:
+            l_messages = _datList_getMessages(node,_layout,dataAttr,longNames)
+        except Exception,err:
+            #...an attr went missing under the cached layout, relayout once
+            log.debug("|{0}| >> {1}.{2} bulk read failed, relayout | {3}".format(_str_func,node,attr,err))
+            sequentialLayoutCache_clear(node)
+            _layout = get_sequentialAttrLayout(node,attr)
+            l_messages = _datList_getMessages(node,_layout,dataAttr,longNames)
+
+    for idx,l in enumerate(_layout):
+        k,_attr,_type = l[:3]
         if _mode == 'message':
-            _res = get_message(node,d_attrs[k], dataAttr, k ) or None
-            if _res:_res = _res[0]
+            _res = l_messages[idx]
         else:
             try:
                 if enum:
-                    if get_type(node,d_attrs[k]) == 'enum':
-                        _res = get_enumValueString(node,d_attrs[k])
+                    if _type == 'enum':
+                        _res = get_enumValueString(node,_attr)
                     else:
-                        _res = get(node,d_attrs[k])
+                        _res = get(node,_attr)
                 else:
-                    _res = get(node,d_attrs[k])
+                    _res = get(node,_attr)
             except Exception,err:
-                log.warning("|{0}| >> {1}.{2} Failed! || err: {3}".format(_str_func,node,d_attrs[k],err))
+                log.warning("|{0}| >> {1}.{2} Failed! || err: {3}".format(_str_func,node,_attr,err))
                 _res = None
         if issubclass(type(_res),list):
             if _mode == 'message' or mc.objExists(_res[0]):
@@ -0,0 +1,161 @@
+"""
+------------------------------------------
+capture_buffer: cgm.core.lib
+Author: David Bokser
+email: dbokser@cgmonks.com
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Timestamped sample buffer for live recording. Samples go into preallocated flat arrays while
+recording and are resampled to the scene frame rate when the take is done, so a slow tick
+drops a sample rather than stretching the timing.
+
+Stdlib only so it can be run outside of maya.
+================================================================
+"""
+from array import array
+import math
+
+#========================================================================
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+#========================================================================
+
+class CaptureBuffer(object):
+    """
+    Buffer of (time, values) samples with a fixed number of channels.
+
+    :parameters:
+        channels(int): values per sample
+        rate(float): expected samples per second, used to size the buffer
+        duration(float): expected seconds of capture, used to size the buffer. The buffer
+            grows if it's exceeded
+    """
+    def __init__(self, channels = 1, rate = 24.0, duration = 60.0):
+        self.channels = int(channels)
+        self.rate = float(rate)
+        self.count = 0
+        self._capacity = max(int(math.ceil(self.rate * duration)) + 1, 16)
+        self.times = array('d', [0.0]) * self._capacity
+        self.values = array('d', [0.0]) * (self._capacity * self.channels)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        log.debug("|CaptureBuffer._grow| >> {0} -> {1}".format(self._capacity, self._capacity * 2))
+        self.times.extend(array('d', [0.0]) * self._capacity)
+        self.values.extend(array('d', [0.0]) * (self._capacity * self.channels))
+        self._capacity *= 2
+
+    def add(self, t, values):
+        """
+        Store a sample
+
+        :parameters:
+            t(float): timestamp in seconds, expected to increase
+            values(list): one value per channel
+        """
+        if len(values) != self.channels:
+            raise ValueError,"|CaptureBuffer.add| >> expected {0} values, got {1}".format(self.channels, len(values))
+        if self.count == self._capacity:
+            self._grow()
+        self.times[self.count] = t
+        _i = self.count * self.channels
+        self.values[_i:_i + self.channels] = array('d', values)
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def get_times(self):
+        return list(self.times[:self.count])
+
+    def get_channel(self, channel):
+        return list(self.values[channel:self.count * self.channels:self.channels])
+
+    def get_sample(self, index):
+        _i = index * self.channels
+        return self.times[index], list(self.values[_i:_i + self.channels])
+
+    def resample(self, fps = 24.0):
+        """
+        Linearly resample the take to a fixed rate starting at the first sample
+
+        :parameters:
+            fps(float): frames per second
+
+        :returns
+            list of channel lists - frame n of each is at times[0] + n/fps, up to the last sample
+        """
+        if not self.count:
+            return [[] for i in range(self.channels)]
+
+        _t0 = self.times[0]
+        _frames = int(math.floor((self.times[self.count - 1] - _t0) * fps + 1e-6)) + 1
+        _l = [[] for i in range(self.channels)]
+        _c = self.channels
+        _j = 0
+        for n in range(_frames):
+            _t = _t0 + n / float(fps)
+            while _j < self.count - 2 and self.times[_j + 1] < _t:
+                _j += 1
+            if self.count == 1:
+                _w = 0.0
+                _a = _b = 0
+            else:
+                _a, _b = _j, _j + 1
+                _span = self.times[_b] - self.times[_a]
+                _w = (_t - self.times[_a]) / _span if _span > 0 else 1.0
+                _w = min(max(_w, 0.0), 1.0)
+            for c in range(_c):
+                _va = self.values[_a * _c + c]
+                _l[c].append(_va + (self.values[_b * _c + c] - _va) * _w)
+        return _l
+
+    def get_stats(self, fps = 24.0):
+        """
+        Timing of the take against a clean tick per frame
+
+        :returns
+            dict -
+                samples
+                duration -- seconds from first to last sample
+                frames -- frames the take resamples to
+                interval -- mean seconds between samples
+                jitter -- standard deviation of the intervals
+                maxInterval -- longest gap
+                dropped -- ticks missed, intervals longer than a frame count as gaps
+                drift -- seconds the take ran over what a tick per frame would have taken
+        """
+        _d = {'samples':self.count,
+              'duration':0.0,
+              'frames':0,
+              'interval':0.0,
+              'jitter':0.0,
+              'maxInterval':0.0,
+              'dropped':0,
+              'drift':0.0}
+        if self.count < 2:
+            _d['frames'] = self.count
+            return _d
+
+        _frame = 1.0 / fps
+        _l = [self.times[i + 1] - self.times[i] for i in range(self.count - 1)]
+        _mean = sum(_l) / len(_l)
+        _d['duration'] = self.times[self.count - 1] - self.times[0]
+        _d['frames'] = int(math.floor(_d['duration'] * fps + 1e-6)) + 1
+        _d['interval'] = _mean
+        _d['jitter'] = math.sqrt(sum([(v - _mean) ** 2 for v in _l]) / len(_l))
+        _d['maxInterval'] = max(_l)
+        _d['dropped'] = sum([max(int(round(v / _frame)) - 1, 0) for v in _l])
+        _d['drift'] = _d['duration'] - (self.count - 1) * _frame
+        return _d
+
+def format_stats(d):
+    """
+    One line summary of CaptureBuffer.get_stats
+    """
+    return "samples: {samples} | frames: {frames} | duration: {duration:.3f}s | interval: {interval:.4f}s | jitter: {jitter:.4f}s | max: {maxInterval:.4f}s | dropped: {dropped} | drift: {drift:.3f}s".format(**d)
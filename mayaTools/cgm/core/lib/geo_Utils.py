@@ -28,6 +28,15 @@ import maya.mel as mel
 import maya.OpenMaya as OM
 import copy
 import random
+import hashlib
+import math
+from array import array
+from itertools import izip
+from collections import OrderedDict
+try:import maya.api.OpenMaya as OM2
+except:OM2 = False
+try:import numpy as NP
+except:NP = False
 
 from cgm.core import cgm_General as cgmGEN
 from cgm.core.cgmPy import validateArgs as VALID
@@ -627,21 +636,167 @@ def get_deltaBaseLine(mNode = None, excludeDeformers = True):
             mDef.envelope = _d.get('value')
     return _result
 
+def get_mfnMesh(meshShape = None):
+    """
+    Get a MFnMesh for a mesh shape. Uses api 2.0 when available, api 1.0 otherwise.
+
+    :parameters:
+        meshShape | mesh or mesh shape
+
+    :returns
+        MFnMesh
+    """
+    _str_funcName = 'get_mfnMesh'
+    _dict = VALID.MeshDict(meshShape, calledFrom=_str_funcName)
+    _shape = _dict['shape']
+    if OM2:
+        _sel = OM2.MSelectionList()
+        _sel.add(_shape)
+        return OM2.MFnMesh(_sel.getDagPath(0))
+    _sel = OM.MSelectionList()
+    _sel.add(_shape)
+    _dag = OM.MDagPath()
+    _sel.getDagPath(0,_dag)
+    return OM.MFnMesh(_dag)
+
+def get_meshPoints(meshShape = None, space = 'os'):
+    """
+    Bulk query of all the points of a mesh in one MFnMesh.getPoints call rather than
+    an xform per vertex.
+
+    :parameters:
+        meshShape | mesh or mesh shape
+        space | world/object
+
+    :returns
+        list of [x,y,z] lists
+    """
+    _str_funcName = 'get_meshPoints'
+    __space__ = {'world':['w','ws'],'object':['o','os']}
+    _space = VALID.kw_fromDict(space, __space__, calledFrom=_str_funcName)
+
+    _fn = get_mfnMesh(meshShape)
+    if OM2:
+        if _space == 'world':
+            _points = _fn.getPoints(OM2.MSpace.kWorld)
+        else:
+            _points = _fn.getPoints(OM2.MSpace.kObject)
+        return [[p.x,p.y,p.z] for p in _points]
+
+    _points = OM.MPointArray()
+    if _space == 'world':
+        _fn.getPoints(_points, OM.MSpace.kWorld)
+    else:
+        _fn.getPoints(_points, OM.MSpace.kObject)
+    _result = []
+    for i in xrange(_points.length()):
+        _p = _points[i]
+        _result.append([_p.x,_p.y,_p.z])
+    return _result
+
+def set_meshPoints(meshShape = None, points = None, space = 'os', undoable = True):
+    """
+    Bulk set of all the points of a mesh rather than an xform per vertex.
+
+    With undoable on, the offsets from the current points are added onto the mesh's .pnts tweaks
+    in one setAttr so the edit lands in the undo queue. With it off the points go through
+    MFnMesh.setPoints, which is faster on dense meshes but not undoable.
+
+    :parameters:
+        meshShape | mesh or mesh shape
+        points | list of [x,y,z] values, one per vertex
+        space | world/object
+        undoable | bool - write through cmds so the edit can be undone
+
+    :returns
+        None
+    """
+    _str_funcName = 'set_meshPoints'
+    __space__ = {'world':['w','ws'],'object':['o','os']}
+    _space = VALID.kw_fromDict(space, __space__, calledFrom=_str_funcName)
+
+    _fn = get_mfnMesh(meshShape)
+    _len = _fn.numVertices
+    if callable(_len):
+        _len = _len()
+    if len(points) != _len:
+        raise ValueError,"{0} point count mismatch. mesh: {1} | points: {2}".format(_str_funcName,_len,len(points))
+
+    if undoable:
+        _shape = VALID.MeshDict(meshShape, calledFrom=_str_funcName)['shape']
+        if _space == 'world':
+            #...targets into object space with the row vector world inverse
+            _m = mc.getAttr("{0}.worldInverseMatrix[0]".format(_shape))
+            points = [[p[0]*_m[0] + p[1]*_m[4] + p[2]*_m[8] + _m[12],
+                       p[0]*_m[1] + p[1]*_m[5] + p[2]*_m[9] + _m[13],
+                       p[0]*_m[2] + p[1]*_m[6] + p[2]*_m[10] + _m[14]] for p in points]
+        _current = get_meshPoints(_shape,'os')
+        _str_pnts = "{0}.pnts[0:{1}]".format(_shape,_len-1)
+        _tweaks = mc.getAttr(_str_pnts)
+        _flat = []
+        for i,p in enumerate(points):
+            _c = _current[i]
+            _t = _tweaks[i]
+            _flat.extend([_t[0] + p[0] - _c[0],
+                          _t[1] + p[1] - _c[1],
+                          _t[2] + p[2] - _c[2]])
+        mc.undoInfo(openChunk = True, chunkName = _str_funcName)
+        try:
+            mc.setAttr(_str_pnts, *_flat)
+        finally:
+            mc.undoInfo(closeChunk = True)
+        return
+
+    if OM2:
+        _points = OM2.MPointArray([OM2.MPoint(p[0],p[1],p[2]) for p in points])
+        if _space == 'world':
+            _fn.setPoints(_points, OM2.MSpace.kWorld)
+        else:
+            _fn.setPoints(_points, OM2.MSpace.kObject)
+    else:
+        _points = OM.MPointArray()
+        _points.setLength(len(points))
+        for i,p in enumerate(points):
+            _points.set(i,p[0],p[1],p[2])
+        if _space == 'world':
+            _fn.setPoints(_points, OM.MSpace.kWorld)
+        else:
+            _fn.setPoints(_points, OM.MSpace.kObject)
+    _fn.updateSurface()
+
+def get_topologyHash(meshShape = None):
+    """
+    Get a hash of the topology of a mesh (vertex count, face counts and face vertex ids).
+    Meshes that share topology share a hash regardless of point positions.
+
+    :parameters:
+        meshShape | mesh or mesh shape
+
+    :returns
+        hex digest string
+    """
+    _fn = get_mfnMesh(meshShape)
+    if OM2:
+        _counts, _ids = _fn.getVertices()
+    else:
+        _counts = OM.MIntArray()
+        _ids = OM.MIntArray()
+        _fn.getVertices(_counts,_ids)
+    _hash = hashlib.md5()
+    _hash.update(str(_fn.numVertices))
+    _hash.update(array('i',list(_counts)).tostring())
+    _hash.update(array('i',list(_ids)).tostring())
+    return _hash.hexdigest()
+
 def get_shapePosData(meshShape = None, space = 'os'):
     _str_funcName = 'get_shapePosData'
 
     __space__ = {'world':['w','ws'],'object':['o','os']}
     _space = VALID.kw_fromDict(space, __space__, calledFrom=_str_funcName)    
 
-    _result = []
     _dict = VALID.MeshDict(meshShape)
     #cgmGEN.log_info_dict(_dict,'get_shapePosData: {0}'.format(meshShape))
-    for i in range(_dict['pointCount']):
-        if _space == 'world':
-            _result.append(mc.xform("{0}.vtx[{1}]".format(_dict['shape'],i), t = True, ws = True, q=True))                
-        else:
-            _result.append(mc.xform("{0}.vtx[{1}]".format(_dict['shape'],i), t = True, os = True, q=True))    
-    return _result
+    return get_meshPoints(_dict['shape'],_space)
 
 
 _d_meshMathValuesModes_ = {'add':['a','+'],'subtract':['s','sub','-'],
@@ -1072,18 +1227,7 @@ def meshMath(targets = None, mode = 'blend', space = 'object',
 
                 else:
                     _r = _obj
-                guiFactory.doProgressWindow(winName=_str_funcName, 
-                                            statusMessage='Progress...', 
-                                            startingProgress=1, 
-                                            interruptableState=True)            
-                for i,pos in enumerate(_l_toApply):
-                    guiFactory.doUpdateProgressWindow("Moving -- [{0}]".format(i), i,  
-                                                      _len_base, reportItem=False)                
-                    if _space == 'world':
-                        mc.xform("{0}.vtx[{1}]".format(_r,i), t = pos, ws = True)             
-                    else:
-                        mc.xform("{0}.vtx[{1}]".format(_r,i), t = pos, os = True)    
-                guiFactory.doCloseProgressWindow()
+                set_meshPoints(_r,_l_toApply,_space)
                 _result.append(_r)
             if _sel:mc.select(_sel)
             return _result
@@ -1209,18 +1353,18 @@ def meshMath(targets = None, mode = 'blend', space = 'object',
                 _result = _baseObj"""
                 
         log.info("result: {0}".format(_result))
-        for o in _result:
+        _len_result = len(_result)
+        if _len_result > 1:
             guiFactory.doProgressWindow(winName=_str_funcName, 
                                         statusMessage='Progress...', 
                                         startingProgress=1, 
                                         interruptableState=True)            
-            for i,pos in enumerate(_l_toApply):
-                guiFactory.doUpdateProgressWindow("Moving -- [{0}]".format(i), i,  
-                                                  _len_base, reportItem=False)                
-                if _space == 'world':
-                    mc.xform("{0}.vtx[{1}]".format(o,i), t = pos, ws = True)             
-                else:
-                    mc.xform("{0}.vtx[{1}]".format(o,i), t = pos, os = True)    
+        for i,o in enumerate(_result):
+            if _len_result > 1:
+                guiFactory.doUpdateProgressWindow("Moving -- [{0}]".format(o), i,  
+                                                  _len_result, reportItem=False)                
+            set_meshPoints(o,_l_toApply,_space)
+        if _len_result > 1:
             guiFactory.doCloseProgressWindow()
 
     if _sel:mc.select(_sel)
@@ -1272,135 +1416,126 @@ def meshMath_values(sourceValues = None, targetValues = None, mode = 'blend', mu
     _len_obj = len(sourceValues)
     _len_target = len(targetValues) 
     assert _len_obj == _len_target, "{0} Must have same vert count. lenSource> {1} != {2} <lenTarget".format(_str_funcName,_len_obj, _len_target)
+    if not _len_target:
+        return []
 
-    _result = []
-    guiFactory.doProgressWindow(winName=_str_funcName, 
-                                statusMessage='Progress...', 
-                                startingProgress=1, 
-                                interruptableState=True)    
-    if _mode in ['copyTo','reset']:
-        _result = sourceValues  
-
-    else:
-        for i,pos in enumerate(targetValues):
-            guiFactory.doUpdateProgressWindow("{0} -- [{1}]".format(_mode,i), i,  
-                                              _len_target, reportItem=False)                
-            _nPos = []
-            _ssv = None
-            if _multiplyDict:
-                _ssv = _multiplyDict.get(i,0)   
-                
-            if _mode == 'add':
-                #if _ssv is not None:pos = [p * _ssv for p in pos]                
-                _nPos = cgmMath.list_add(pos, sourceValues[i])
-                _nPos = [(p * _multiplier) for p in _nPos]
-            elif _mode == 'subtract':
-                #if _ssv is not None:pos = [p * _ssv for p in pos]                
-                _nPos = cgmMath.list_subtract(pos, sourceValues[i])
-                _nPos = [p * _multiplier for p in _nPos]                
-            elif _mode == 'multiply':
-                #if _ssv is not None:pos = [p * _ssv for p in pos]                
-                for ii,p in enumerate(pos):
-                    _nPos.append((p * sourceValues[i][ii]) * _multiplier)
-            elif _mode == 'average':
-                for ii,p in enumerate(pos):
-                    #_avValue = ((sourceValues[i][ii] + p)/2) * _multiplier
-            
-                    _nPos.append(((sourceValues[i][ii] + p)/2) * _multiplier)
-                        
-                    
-            #elif _mode == 'blend':
-                #for ii,p in enumerate(pos):
-                    #_nPos.append(p - ((p - sourceValues[i][ii]) * (_multiplier)))
-            elif _mode in ['difference','addDiff','blend','subtractDiff','xBlend','yBlend','zBlend','flip','xFlip','yFlip','zFlip','xDiff','yDiff','zDiff']:
-                _diff = []
-                for ii,p in enumerate(pos):
-                    _diff.append((p-sourceValues[i][ii])) 
-                #pprint.pprint(_diff)
-                if _mode == 'difference':
-                    for ii,p in enumerate(pos):
-                        _nPos.append(_diff[ii] * (_multiplier))
-                elif _mode == 'blend':
-                    for ii,p in enumerate(pos):
-                        _nPos.append(sourceValues[i][ii] + (_diff[ii] * _multiplier))                         
-                elif _mode == 'addDiff':
-                    for ii,p in enumerate(pos):
-                        _nPos.append(p + (_diff[ii] * _multiplier))                      
-                elif _mode == 'subtractDiff':
-                    for ii,p in enumerate(pos):
-                        _nPos.append(p - (_diff[ii] * _multiplier))
-                elif _mode == 'xDiff':
-                    _nPos = [_diff[0] * _multiplier,0,0]
-                elif _mode == 'yDiff':
-                    _nPos = [0, _diff[1] * _multiplier,0]
-                elif _mode == 'zDiff':
-                    _nPos = [0, 0, _diff[2] * _multiplier]
-                    
-                elif _mode in ['xBlend','yBlend','zBlend']:
-                    if _mode == 'xBlend':
-                        for ii,p in enumerate(pos):
-                            if ii != 0 and _diff[ii]:
-                                _nPos.append(sourceValues[i][ii])
-                            else:
-                                _nPos.append(p)
-                    elif _mode == 'yBlend':
-                        for ii,p in enumerate(pos):
-                            if ii != 1 and _diff[ii]:
-                                _nPos.append(sourceValues[i][ii])
-                            else:
-                                _nPos.append(p)
-                    elif _mode == 'zBlend':
-                        for ii,p in enumerate(pos):
-                            if ii != 2 and _diff[ii]:
-                                _nPos.append(sourceValues[i][ii])
-                            else:
-                                _nPos.append(p)
-                                """    
-                                elif _mode == 'xBlend':
-                                    for ii,p in enumerate(pos):
-                                        if ii == 0:
-                                            _nPos.append(_diff[ii] + p * _multiplier)
-                                        else:
-                                            _nPos.append(p)
-                                elif _mode == 'yBlend':
-                                    for ii,p in enumerate(pos):
-                                        if ii == 1:
-                                            _nPos.append(_diff[ii] + p * _multiplier)
-                                        else:
-                                            _nPos.append(p)                   
-                                elif _mode == 'zBlend':
-                                    for ii,p in enumerate(pos):
-                                        if ii == 2:
-                                            _nPos.append(_diff[ii] + p * _multiplier)
-                                        else:
-                                            _nPos.append(p)  """
-                            
-                elif _mode == 'flip':
-                    for ii,p in enumerate(pos):
-                        _nPos.append(p - (_diff[ii] * -1) * _multiplier)
-                        
-            else:
-                raise NotImplementedError,"{0} mode not implemented: '{1}'".format(_str_funcName,_mode)
-            _result.append(_nPos)
-
+    _width = len(targetValues[0])
+    _weights = None
     if _multiplyDict:
-        log.info("{0} -- multiplyDict mode".format(_str_funcName))       
-        for i,pos in enumerate(_result):            
-            _ssv = _multiplyDict.get(i,0)
-            _nPos = []
-            if _mode in ['copyTo','reset']:
-                _sValue = targetValues[i]
-            else:
-                _sValue = sourceValues[i]
-            for ii,p in enumerate(pos):
-                _nPos.append( _sValue[ii] + ((p -_sValue[ii]) * _ssv))
-            _result[i] = _nPos
+        log.info("{0} -- multiplyDict mode".format(_str_funcName))
+        #...dense per point weights, anything not in the dict is 0
+        _weights = [0.0] * _len_target
+        for i,v in _multiplyDict.iteritems():
+            if 0 <= i < _len_target:
+                _weights[i] = v
+
+    if NP:
+        _result = _meshMath_valuesNP(sourceValues, targetValues, _mode, _multiplier, _width, _weights)
+    else:
+        _result = _meshMath_valuesArray(sourceValues, targetValues, _mode, _multiplier, _width, _weights)
 
     log.debug("res pos: {0}".format(_result))   
     log.debug(cgmGEN._str_subLine)  
-    guiFactory.doCloseProgressWindow()
     return _result
 
+def _meshMath_valuesArray(sourceValues, targetValues, mode, multiplier, width, weights = None):
+    """
+    meshMath_values engine on flat array('d') buffers for when numpy isn't around.
+    """
+    _s = array('d', [v for pos in sourceValues for v in pos])
+    _t = array('d', [v for pos in targetValues for v in pos])
+    m = multiplier
+
+    if mode in ['copyTo','reset']:
+        _r = array('d', _s)
+    elif mode == 'add':
+        _r = array('d', [(t + s) * m for s,t in izip(_s,_t)])
+    elif mode == 'subtract':
+        _r = array('d', [(t - s) * m for s,t in izip(_s,_t)])
+    elif mode == 'multiply':
+        _r = array('d', [(t * s) * m for s,t in izip(_s,_t)])
+    elif mode == 'average':
+        _r = array('d', [((s + t)/2.0) * m for s,t in izip(_s,_t)])
+    elif mode == 'difference':
+        _r = array('d', [(t - s) * m for s,t in izip(_s,_t)])
+    elif mode == 'blend':
+        _r = array('d', [s + ((t - s) * m) for s,t in izip(_s,_t)])
+    elif mode == 'addDiff':
+        _r = array('d', [t + ((t - s) * m) for s,t in izip(_s,_t)])
+    elif mode == 'subtractDiff':
+        _r = array('d', [t - ((t - s) * m) for s,t in izip(_s,_t)])
+    elif mode == 'flip':
+        _r = array('d', [t - ((t - s) * -1) * m for s,t in izip(_s,_t)])
+    elif mode in ['xDiff','yDiff','zDiff']:
+        _ax = 'xyz'.index(mode[0])
+        _r = array('d', [(t - s) * m if i % width == _ax else 0.0 
+                         for i,(s,t) in enumerate(izip(_s,_t))])
+    elif mode in ['xBlend','yBlend','zBlend']:
+        _ax = 'xyz'.index(mode[0])
+        _r = array('d', [s if (i % width != _ax and t - s) else t 
+                         for i,(s,t) in enumerate(izip(_s,_t))])
+    else:
+        raise NotImplementedError,"{0} mode not implemented: '{1}'".format('meshMath_values',mode)
+
+    if weights is not None:
+        if mode in ['copyTo','reset']:
+            _base = _t
+        else:
+            _base = _s
+        _w = [w for w in weights for i in xrange(width)]
+        _r = array('d', [b + ((r - b) * w) for r,b,w in izip(_r,_base,_w)])
+
+    return [_r[i:i+width].tolist() for i in xrange(0,len(_r),width)]
+
+def _meshMath_valuesNP(sourceValues, targetValues, mode, multiplier, width, weights = None):
+    """
+    meshMath_values engine on numpy arrays.
+    """
+    _s = NP.asarray(sourceValues, dtype=float)
+    _t = NP.asarray(targetValues, dtype=float)
+    m = multiplier
+
+    if mode in ['copyTo','reset']:
+        _r = _s.copy()
+    elif mode == 'add':
+        _r = (_t + _s) * m
+    elif mode == 'subtract':
+        _r = (_t - _s) * m
+    elif mode == 'multiply':
+        _r = (_t * _s) * m
+    elif mode == 'average':
+        _r = ((_s + _t)/2.0) * m
+    elif mode == 'difference':
+        _r = (_t - _s) * m
+    elif mode == 'blend':
+        _r = _s + ((_t - _s) * m)
+    elif mode == 'addDiff':
+        _r = _t + ((_t - _s) * m)
+    elif mode == 'subtractDiff':
+        _r = _t - ((_t - _s) * m)
+    elif mode == 'flip':
+        _r = _t - ((_t - _s) * -1) * m
+    elif mode in ['xDiff','yDiff','zDiff']:
+        _ax = 'xyz'.index(mode[0])
+        _r = NP.zeros_like(_t)
+        _r[:,_ax] = (_t[:,_ax] - _s[:,_ax]) * m
+    elif mode in ['xBlend','yBlend','zBlend']:
+        _ax = 'xyz'.index(mode[0])
+        _mask = (_t - _s) != 0
+        _mask[:,_ax] = False
+        _r = NP.where(_mask, _s, _t)
+    else:
+        raise NotImplementedError,"{0} mode not implemented: '{1}'".format('meshMath_values',mode)
+
+    if weights is not None:
+        if mode in ['copyTo','reset']:
+            _base = _t
+        else:
+            _base = _s
+        _r = _base + ((_r - _base) * NP.asarray(weights, dtype=float)[:,None])
+
+    return _r.tolist()
+
 
 def get_symmetryDict(sourceObj = None, center = 'pivot', axis = 'x',
                      tolerance = .0001, returnMode = 'names'):
@@ -1489,122 +1624,152 @@ def get_symmetryDict(sourceObj = None, center = 'pivot', axis = 'x',
 
     log.debug("mid: {0}".format(_mid))    
 
-    _l_pos = []
-    _l_neg = []
+    _points = get_meshPoints(_shape,'world')
+    _b_names = returnMode == 'names'
+    #...the cache holds indices only, names are built per call for this shape
+    _cacheKey = (get_topologyHash(_shape), _mid, _ax, _tolerance)
+    _pointsHash = hashlib.md5(array('d',[v for p in _points for v in p]).tostring()).hexdigest()
+
+    _cached = _d_symmetryCache.pop(_cacheKey,None)
+    if _cached and _cached[0] == _pointsHash:
+        log.debug("{0} | cache hit: {1}".format(_str_funcName,_shape))
+        _d_symmetryCache[_cacheKey] = _cached#...back on the end as most recent
+        result = copy.deepcopy(_cached[1])
+    else:
+        _l_pos_ids, _l_neg_ids, _d_matches, _l_center, _l_assym = get_symmetryPairs(_points, _mid,
+                                                                                      _ax, _ax2, _ax3,
+                                                                                      _tolerance)
+        log.debug("Assymetrical: {0}".format(_l_assym))        
+        log.debug("Center: {0}".format(_l_center))  
+        log.debug("SymMatches: {0}".format(len(_d_matches.keys())))  
+
+        result = {'center':_l_center,
+                  'positive':_l_pos_ids,
+                  'negative':_l_neg_ids,
+                  'symMap':_d_matches,
+                  'axisVector':_l_axis,            
+                  'asymmetrical':_l_assym}
+
+        while len(_d_symmetryCache) >= _symmetryCacheSize:
+            _d_symmetryCache.popitem(last=False)#...least recently used
+        _d_symmetryCache[_cacheKey] = (_pointsHash, copy.deepcopy(result))
+
+    if _b_names:
+        _l_vtx = ["{0}.vtx[{1}]".format(_shape,i) for i in xrange(len(_points))]
+        _d_convert = {}
+        for k,v in result['symMap'].iteritems():
+            _d_convert[_l_vtx[k]] = [_l_vtx[i] for i in v]
+        result = {'center':[_l_vtx[i] for i in result['center']],
+                  'positive':[_l_vtx[i] for i in result['positive']],
+                  'negative':[_l_vtx[i] for i in result['negative']],
+                  'symMap':_d_convert,
+                  'axisVector':_l_axis,
+                  'asymmetrical':[_l_vtx[i] for i in result['asymmetrical']]}
+    return result
+
+_d_symmetryCache = OrderedDict()#...LRU, most recently used last
+_symmetryCacheSize = 20
+
+def clear_symmetryCache():
+    """
+    Clear the symmetry maps cached by get_symmetryDict.
+    """
+    _d_symmetryCache.clear()
+
+def get_symmetryPairs(points, mid = 0.0, ax = 0, ax2 = 1, ax3 = 2, tolerance = .0001):
+    """
+    Pair up mirrored points across a plane. Points are hashed into a grid at tolerance 
+    resolution over their mirrored coordinates so each point is only tested against its 
+    neighbouring cells rather than every point on the other side.
+
+    :parameters:
+        points | list of [x,y,z] positions
+        mid | position of the mirror plane along ax
+        ax | index of the mirror axis
+        ax2, ax3 | the other two axis indices
+        tolerance | match tolerance
+
+    :returns
+        positive ids, negative ids, symMap {id:[ids]}, center ids, asymmetrical ids
+    """
     _l_pos_ids = []
     _l_neg_ids = []
-    _d_trans = {}
-    _l_cull = []
-    _d_xfpos = {}#...vtx to xform
-    _d_vtxToID = {}
-    guiFactory.doProgressWindow(winName=_str_funcName, 
-                                statusMessage='Progress...', 
-                                startingProgress=1, 
-                                interruptableState=True)
-
-    _points = _dict['pointCountPerShape'][0]
-    log.debug("First pass...")            
-    for i in range(_points):
-        guiFactory.doUpdateProgressWindow("{0} -- [{1}]".format(_str_funcName,i), i,  
-                                          _points, reportItem=False)   
-        _vtx = "{0}.vtx[{1}]".format(_shape,i)
-        _l_cull.append(_vtx)
-        _pos = mc.xform(_vtx, t = True, ws = True, q=True)   
-        _d_xfpos[_vtx] = _pos
-        _d_vtxToID[_vtx] = i
-        _midOffset = _pos[_ax] - _mid
-        if _midOffset >= _tolerance:
-            _l_pos.append(_vtx)
+    for i,p in enumerate(points):
+        if p[ax] - mid >= tolerance:
             _l_pos_ids.append(i)
-            _d_trans[_vtx] = _pos[_ax]
         else:
-            _l_neg.append(_vtx)
             _l_neg_ids.append(i)
-            _d_trans[_vtx] = _pos[_ax]
 
-    log.debug("Pos: {0}".format(_l_pos))        
-    log.debug("Neg: {0}".format(_l_neg))  
-    _i_len_pos = len(_l_pos)
+    _d_matches = {}
     _l_pos_result = []
     _l_neg_result = []
-    _d_matches = {}
-    for i,vtx in enumerate(_l_pos):
-        guiFactory.doUpdateProgressWindow("{0} -verifying- [{1}]".format(_str_funcName,i), i,  
-                                          _i_len_pos, reportItem=False)   
-
-        _posOffset = _d_trans[vtx] - _mid
-
-        for ii,vtx_neg in enumerate(_l_neg):
-            _negOffset = _mid - _d_trans[vtx_neg]        
-
-            if abs(_posOffset - _negOffset) <= _tolerance:
-                _vtx1_trans = _d_xfpos[vtx]
-                _vtx2_trans = _d_xfpos[vtx_neg]
-                _test1 = abs(_vtx1_trans[_ax2] - _vtx2_trans[_ax2])
-                _test2 = abs(_vtx1_trans[_ax3] - _vtx2_trans[_ax3])
-                if _test1 < _tolerance and _test2 < _tolerance:
-                    _pos_id = _d_vtxToID[vtx]
-                    _neg_id = _d_vtxToID[vtx_neg]
-                    if not _d_matches.get(vtx):
-                        _d_matches[vtx] = [vtx_neg]
-                    elif _neg_id not in _d_matches[vtx]:
-                        _d_matches[vtx].append(vtx_neg)
-                    if not _d_matches.get(vtx_neg):
-                        _d_matches[vtx_neg] = [vtx]
-                    elif vtx not in _d_matches[vtx_neg]:
-                        _d_matches[vtx_neg].append(vtx) 
-
-                    #log.debug("{0} == {1}".format(_pos_id,_neg_id))
-                    try:_l_pos_result.index(vtx)
-                    except:_l_pos_result.append(vtx)
-                    try:_l_neg_result.index(vtx_neg)
-                    except:_l_neg_result.append(vtx_neg)                    
-                    try:_l_cull.remove(vtx)
-                    except:pass
-                    try:_l_cull.remove(vtx_neg)
-                    except:pass
+    if tolerance > 0 and _l_pos_ids and _l_neg_ids:
+        #...pad the cell a touch so float noise between the mirrored and 
+        #   offset compares can't push a valid match two cells over
+        _cell = tolerance * (1.0 + 1e-6)
+        _floor = math.floor
+        _d_grid = {}
+        for i in _l_neg_ids:
+            q = points[i]
+            _key = (int(_floor((mid + mid - q[ax])/_cell)),
+                    int(_floor(q[ax2]/_cell)),
+                    int(_floor(q[ax3]/_cell)))
+            _bucket = _d_grid.get(_key)
+            if _bucket is None:
+                _d_grid[_key] = [i]
+            else:
+                _bucket.append(i)
+
+        _l_offsets = (-1,0,1)
+        _d_negSeen = {}
+        for i in _l_pos_ids:
+            p = points[i]
+            _posOffset = p[ax] - mid
+            _k1 = int(_floor(p[ax]/_cell))
+            _k2 = int(_floor(p[ax2]/_cell))
+            _k3 = int(_floor(p[ax3]/_cell))
+            _l_hits = []
+            for o1 in _l_offsets:
+                for o2 in _l_offsets:
+                    for o3 in _l_offsets:
+                        _bucket = _d_grid.get((_k1+o1,_k2+o2,_k3+o3))
+                        if not _bucket:
+                            continue
+                        for ii in _bucket:
+                            q = points[ii]
+                            if abs(_posOffset - (mid - q[ax])) <= tolerance and\
+                               abs(p[ax2] - q[ax2]) < tolerance and\
+                               abs(p[ax3] - q[ax3]) < tolerance:
+                                _l_hits.append(ii)
+            if not _l_hits:
+                continue
+            _l_hits.sort()
+            _d_matches[i] = _l_hits
+            _l_pos_result.append(i)
+            for ii in _l_hits:
+                if ii in _d_negSeen:
+                    _d_matches[ii].append(i)
+                else:
+                    _d_negSeen[ii] = True
+                    _d_matches[ii] = [i]
+                    _l_neg_result.append(ii)
 
     #finding aymetrical dat...
     _l_center = []
     _l_assym = []
-    for vtx in _l_cull:
-        #log.debug("Checking: '{0}'".format(vtx))  
-        if vtx in _l_pos:
-            _offset = _d_trans[vtx] - _mid
-        elif vtx in _l_neg:
-            _offset = _mid - _d_trans[vtx]
-
-        if _offset > _tolerance:
-            _l_assym.append(vtx) 
+    for i,p in enumerate(points):
+        if i in _d_matches:
+            continue
+        if p[ax] - mid >= tolerance:
+            _offset = p[ax] - mid
         else:
-            _l_center.append(vtx)
-
-    guiFactory.doCloseProgressWindow()
+            _offset = mid - p[ax]
+        if _offset > tolerance:
+            _l_assym.append(i) 
+        else:
+            _l_center.append(i)
 
-    log.debug("Assymetrical: {0}".format(_l_assym))        
-    log.debug("Center: {0}".format(_l_center))  
-    log.debug("SymMatches: {0}".format(len(_d_matches.keys())))  
-
-    if returnMode == 'names':
-        return {'center':_l_center,
-                'positive':_l_pos_result,
-                'negative':_l_neg_result,
-                'symMap':_d_matches,
-                'axisVector':_l_axis,
-                'asymmetrical':_l_assym}
-
-    _d_convert = {}
-    for k in _d_matches.keys():
-        _buffer = _d_matches[k]
-        _d_convert[_d_vtxToID[k]] = []
-        for v in _buffer:
-            _d_convert[_d_vtxToID[k]].append( _d_vtxToID[v] )
-    return {'center':[ _d_vtxToID[vtx] for vtx in _l_center ],
-            'positive':[ _d_vtxToID[vtx] for vtx in _l_pos_result ],
-            'negative':[ _d_vtxToID[vtx] for vtx in _l_neg_result ],
-            'symMap':_d_convert,
-            'axisVector':_l_axis,            
-            'asymmetrical':[ _d_vtxToID[vtx] for vtx in _l_assym ]}
+    return _l_pos_result, _l_neg_result, _d_matches, _l_center, _l_assym
 
 @cgmGEN.Timer
 def normalCheck(mesh,ch=0):
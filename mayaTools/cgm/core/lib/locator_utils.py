@@ -151,17 +151,17 @@ def create(target = None, position = None, tag = True, setMatchTarget=True, pivo
                         
                         for pos in self.l_returnRaw:
                             log.debug("|{0}|...pos {1}".format(_str_funcName,pos))                
-                            for i,m in enumerate(self.d_meshPos.keys()):
-                                log.debug("|{0}|...mesh: {1}".format(_str_funcName,m))                                    
-                                for i2,h in enumerate(self.d_meshPos[m]):
-                                    if h == pos:
-                                        log.debug("Found follicle match!")
-                                        try:
-                                            _set = [m, self.d_meshUV[m][i2], "{0}_u{1}_v{2}".format(coreNames.get_short(m),"{0:.4f}".format(self.d_meshUV[m][i2][0]),"{0:.4f}".format(self.d_meshUV[m][i2][1]))]
-                                            self._l_folliclesToMake.append(_set)
-                                            log.debug("|{0}|...uv {1}".format(_str_funcName,_set))                                                
-                                        except Exception,err:
-                                            log.error("|{0}| >> Failed to query uv for hit {2} on shape {2} | err:{1}".format(_str_funcName,err,pos,m))                
+                            _d = self.getHitData(pos)
+                            if not _d:
+                                continue
+                            m = _d['m']
+                            _uv = _d['m_uv']
+                            try:
+                                _set = [m, _uv, "{0}_u{1}_v{2}".format(coreNames.get_short(m),"{0:.4f}".format(_uv[0]),"{0:.4f}".format(_uv[1]))]
+                                self._l_folliclesToMake.append(_set)
+                                log.debug("|{0}|...uv {1}".format(_str_funcName,_set))                                                
+                            except Exception,err:
+                                log.error("|{0}| >> Failed to query uv for hit {2} on shape {3} | err:{1}".format(_str_funcName,err,pos,m))                
                             if self._l_folliclesToMake:
                                 for f_dat in self._l_folliclesToMake:
                                     _follicle = NODES.add_follicle(f_dat[0],f_dat[2])
@@ -15,6 +15,7 @@ __MAYALOCAL = 'NAMETOOLS'
 # From Python =============================================================
 import copy
 import re
+import time
 import pprint
 import logging
 logging.basicConfig()
@@ -33,6 +34,7 @@ import cgm.core.lib.shared_data as CORESHARE
 import cgm.core.lib.search_utils as SEARCH
 import cgm.core.lib.attribute_utils as ATTR
 import cgm.core.lib.transform_utils as TRANS
+import cgm.core.lib.name_utils as NAMES
 #reload(strUtils)
 #reload(CORESHARE)
 #reload(SEARCH)
@@ -203,7 +205,7 @@ combineDict = returnCombinedNameFromDict
 def get_combinedNameDict(obj,ignore=[False], stripInvalid=True, removeDups=True):
     return combineDict(get_objNameDict(obj,ignore), stripInvalid=stripInvalid, removeDups=removeDups)
 
-def get_objNameDict(obj,ignore=[False]):
+def get_objNameDict(obj,ignore=[False],d_sources=None):
     """ 
     >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
     DESCRIPTION:
@@ -213,6 +215,8 @@ def get_objNameDict(obj,ignore=[False]):
     obj(string) - object
     ignore(string) - default is 'none', only culls out cgmtags that are 
                      generated via returnCGMOrder() function
+    d_sources(dict) - optional, filled with {'cgmName':node} when the cgmName
+                     is taken from another node's name
 
     RETURNS:
     namesDict(string)
@@ -277,6 +281,7 @@ def get_objNameDict(obj,ignore=[False]):
                     except:pass
                 log.debug("nameObj: {0}".format(nameObj))
                 namesDict['cgmName'] = names.getBaseName(nameObj)
+                if d_sources is not None:d_sources['cgmName'] = nameObj
                 return namesDict
         
         typeTag = SEARCH.get_nodeTagInfo(obj,'cgmType')
@@ -291,6 +296,7 @@ def get_objNameDict(obj,ignore=[False]):
             groupNamesDict = {}
             if not nameObj:
                 groupNamesDict['cgmName'] = childrenObjects[0]
+                if d_sources is not None:d_sources['cgmName'] = childrenObjects[0]
             else:
                 groupNamesDict['cgmName'] = nameObj
             groupNamesDict['cgmType'] = CORESHARE.d_cgmTypes.get('transform')
@@ -331,3 +337,198 @@ def get_objNameDict(obj,ignore=[False]):
     except Exception,err:
         raise cgmGEN.cgmExceptCB(Exception,err,msg=vars())
 returnObjectGeneratedNameDict = get_objNameDict
+
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Fast names and the deferred name queue
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+def get_fastNameDict(node, ignore = None, d_sources = None):
+    """
+    The name dict cgmNode.doName's fast path names from. A node with no cgmName gets its
+    short name, stripped of its other tag values, in its place
+
+    :parameters:
+        node(str) | object
+        ignore(list) | only 'cgmName' is checked
+        d_sources(dict) | see get_objNameDict
+
+    :returns
+        nameDict(dict)
+    """
+    d_names = get_objNameDict(node, d_sources = d_sources) or {}
+    ignore = ignore or []
+    if 'cgmName' not in d_names.keys():
+        if SEARCH.VALID.get_mayaType(node) !='group' and 'cgmName' not in ignore:
+            _short = NAMES.short(node)
+            for k,v in d_names.iteritems():
+                if v and v in _short:
+                    _short = _short.replace(v,'')
+            d_names['cgmName'] = NAMES.clean(_short)
+    return d_names
+
+_l_nameQueues = []#...active NameQueues, innermost last
+
+def queue_get():
+    """
+    The innermost active NameQueue, None when names aren't being deferred
+    """
+    if _l_nameQueues:
+        return _l_nameQueues[-1]
+    return None
+
+class NameQueue(object):
+    """
+    Defer the cgmNode.doName calls made inside the context. At exit every queued node is
+    resolved in one pass with the tag and parent lookups memoised, checked against an index
+    of the scene's names and renamed children first so the long paths stay valid. A node whose
+    cgmName comes from another queued node's name gets that node's new name.
+
+    Nested queues hand their requests up, the outermost commits. NameFactory names
+    (fastName = False) look at the live scene so they're replayed in order after the batch.
+
+    >>> with nameTools.NameQueue():
+    >>>     mJoint.doName()
+    >>>     mControl.doName(nameChildren = True)
+
+    :parameters:
+        active(bool) | False makes the context a no-op, for callers that only defer on request
+    """
+    def __init__(self, active = True):
+        self.active = active
+        self.d_requests = {}#...uuid : ignore
+        self.l_order = []
+        self.l_calls = []#...(fnc, args, kws) replayed after the batch
+        self.d_report = {}
+
+    def __enter__(self):
+        if self.active:
+            _l_nameQueues.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if not self.active:
+            return False
+        _l_nameQueues.remove(self)
+        mOuter = queue_get()
+        if mOuter:
+            mOuter.merge(self)
+            return False
+        try:
+            self.commit()
+        except Exception,err:
+            if exc_type is None:
+                raise
+            #...don't mask the error that got us here
+            log.error("|NameQueue.commit| >> failed: {0}".format(err))
+        return False
+
+    def add(self, node, ignore = None, nameChildren = False):
+        """
+        Queue a node, and optionally its descendents, for naming
+        """
+        l_nodes = [node]
+        if nameChildren:
+            l_nodes.extend(TRANS.descendents_get(node, True))
+        for o in l_nodes:
+            _uuid = mc.ls(o, uuid=True)
+            if not _uuid:
+                log.warning("|NameQueue.add| >> not found: {0}".format(o))
+                continue
+            if _uuid[0] not in self.d_requests:
+                self.l_order.append(_uuid[0])
+            self.d_requests[_uuid[0]] = ignore if o == node else None
+
+    def add_call(self, fnc, *args, **kws):
+        self.l_calls.append((fnc, args, kws))
+
+    def merge(self, other):
+        for _uuid in other.l_order:
+            if _uuid not in self.d_requests:
+                self.l_order.append(_uuid)
+            self.d_requests[_uuid] = other.d_requests[_uuid]
+        self.l_calls.extend(other.l_calls)
+
+    def commit(self):
+        """
+        Resolve and rename everything queued
+
+        :returns
+            report(dict) | named, unchanged, collisions [(node, name, result)], failed, time
+        """
+        _str_func = 'NameQueue.commit'
+        _start = time.clock()
+        l_order, d_requests, l_calls = self.l_order, self.d_requests, self.l_calls
+        self.l_order, self.d_requests, self.l_calls = [], {}, []
+        self.d_report = {'named':0, 'unchanged':0, 'collisions':[], 'failed':[], 'time':0.0}
+
+        l_nodes = []#...(uuid, longName)
+        for _uuid in l_order:
+            _long = mc.ls(_uuid, long=True)
+            if _long:
+                l_nodes.append((_uuid, _long[0]))
+
+        #>>Resolve --------------------------------------------------------------------------
+        d_dicts = {}
+        d_sources = {}
+        SEARCH.tagCache_start()
+        try:
+            for _uuid, _node in l_nodes:
+                _d_src = {}
+                d_dicts[_uuid] = get_fastNameDict(_node, d_requests[_uuid], _d_src)
+                if _d_src.get('cgmName'):
+                    d_sources[_uuid] = _d_src['cgmName']
+        finally:
+            SEARCH.tagCache_end()
+
+        d_names = {}
+        def _resolve(_uuid, l_stack):
+            if _uuid in d_names:
+                return d_names[_uuid]
+            _d = d_dicts[_uuid]
+            if _uuid in d_sources:
+                _srcUUID = mc.ls(d_sources[_uuid], uuid=True) or []
+                if len(_srcUUID) == 1 and _srcUUID[0] in d_dicts and _srcUUID[0] not in l_stack:
+                    _d = dict(_d)
+                    _d['cgmName'] = _resolve(_srcUUID[0], l_stack + [_uuid])
+            d_names[_uuid] = returnCombinedNameFromDict(_d)
+            return d_names[_uuid]
+
+        for _uuid, _node in l_nodes:
+            _resolve(_uuid, [])
+
+        #>>Commit, deepest first ---------------------------------------------------------------
+        d_index = {}
+        for o in mc.ls():
+            _base = o.split('|')[-1]
+            d_index[_base] = d_index.get(_base,0) + 1
+
+        for _uuid, _node in sorted(l_nodes, key = lambda x: -x[1].count('|')):
+            _name = d_names[_uuid]
+            _base = _node.split('|')[-1]
+            if _base == _name:
+                self.d_report['unchanged'] += 1
+                continue
+            _b_collision = d_index.get(_name, 0) > 0
+            try:
+                _result = mc.rename(_node, _name)
+            except Exception,err:
+                log.error("|{0}| >> {1} | {2}".format(_str_func,_node,err))
+                self.d_report['failed'].append(_node)
+                continue
+            self.d_report['named'] += 1
+            _resultBase = _result.split('|')[-1]
+            d_index[_base] = d_index.get(_base,1) - 1
+            d_index[_resultBase] = d_index.get(_resultBase,0) + 1
+            if _b_collision:
+                self.d_report['collisions'].append((_result, _name, _resultBase))
+
+        for fnc, args, kws in l_calls:
+            fnc(*args, **kws)
+
+        self.d_report['time'] = time.clock() - _start
+        log.debug("|{0}| >> named: {1} | unchanged: {2} | calls: {3} | {4} seconds".format(_str_func,
+                  self.d_report['named'], self.d_report['unchanged'], len(l_calls), "%0.3f"%self.d_report['time']))
+        if self.d_report['collisions']:
+            log.warning("|{0}| >> {1} names collide with existing names".format(_str_func,len(self.d_report['collisions'])))
+            for _result, _name, _resultBase in self.d_report['collisions']:
+                log.debug("|{0}| >> '{1}' : {2}".format(_str_func,_name,_result))
+        return self.d_report
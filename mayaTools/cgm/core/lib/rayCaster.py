@@ -17,6 +17,8 @@ import maya.cmds as mc
 import copy
 import maya.OpenMayaUI as OpenMayaUI
 import maya.OpenMaya as om
+try:import maya.api.OpenMaya as OM2
+except:OM2 = False
 from cgm.core.lib.zoo import apiExtensions
 from cgm.core.cgmPy import validateArgs as VALID
 from cgm.core.lib import position_utils as POS
@@ -394,6 +396,304 @@ def offset_hit_by_distance(h,startPoint,vector,offsetDistance, offsetMode = 'dis
 
     return h
 
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+# Batch casting
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+_d_unitToAPI = {'mm':.1,
+                'cm':1.0,
+                'm':100.0,
+                'in':2.54,
+                'ft':30.48,
+                'yd':91.44}
+
+def get_apiSpaceFactor():
+    """
+    Multiplier from maya space to api space (cm) for the current linear unit. One query instead of one 
+    per value like MATH.get_space_value
+    """
+    _unit = mc.currentUnit(q=True,linear=True)
+    try:return _d_unitToAPI[_unit]
+    except KeyError:
+        raise ValueError,"|get_apiSpaceFactor| >> nonhandled unit: {0}".format(_unit)
+
+def get_castShapes(mesh = None):
+    """
+    Validate a cast arg to a list of mesh/nurbsSurface shapes
+    """
+    if mesh is None:
+        return get_eligibleMesh()
+    _res = []
+    for m in VALID.listArg(mesh):
+        if SEARCH.is_transform(m):
+            for s in TRANS.shapes_get(m,True):
+                if VALID.get_mayaType(s) in ['mesh','nurbsSurface']:
+                    _res.append(s)
+        elif SEARCH.is_shape(m):
+            if VALID.get_mayaType(m) in ['mesh','nurbsSurface']:
+                _res.append(m)
+    return _res
+
+class MeshCaster(object):
+    """
+    Casting for one mesh shape. The function set and intersection accelerator are built once and 
+    reused by every ray cast through it. Values are api space.
+    """
+    def __init__(self, mesh):
+        _sel = OM2.MSelectionList()
+        _sel.add(mesh)
+        self.mesh = mesh
+        self.fn = OM2.MFnMesh(_sel.getDagPath(0))
+        self.accel = self.fn.autoUniformGridParams()
+
+    def cast(self, source, vector, maxDistance = 1000, firstHit = True, tolerance = .001):
+        """
+        :returns
+            None or (point(MFloatPoint), distance, face)
+        """
+        _source = OM2.MFloatPoint(source[0],source[1],source[2])
+        _vector = OM2.MFloatVector(vector[0],vector[1],vector[2])
+        if firstHit:
+            _res = self.fn.closestIntersection(_source, _vector, OM2.MSpace.kWorld, maxDistance, False,
+                                               accelParams = self.accel, tolerance = tolerance)
+            if _res[2] < 0:
+                return None
+            return _res[0],_res[1],_res[2]
+
+        _res = self.fn.allIntersections(_source, _vector, OM2.MSpace.kWorld, maxDistance, False,
+                                        accelParams = self.accel, tolerance = tolerance)
+        if not _res or not len(_res[0]):
+            return None
+        _params = list(_res[1])
+        _i = _params.index(max(_params))
+        return _res[0][_i],_params[_i],_res[2][_i]
+
+    def cast_all(self, source, vector, maxDistance = 1000, tolerance = .001):
+        """
+        :returns
+            list of (point(MFloatPoint), distance, face) sorted near to far
+        """
+        _source = OM2.MFloatPoint(source[0],source[1],source[2])
+        _vector = OM2.MFloatVector(vector[0],vector[1],vector[2])
+        _res = self.fn.allIntersections(_source, _vector, OM2.MSpace.kWorld, maxDistance, False,
+                                        accelParams = self.accel, tolerance = tolerance, sortHits = True)
+        if not _res or not len(_res[0]):
+            return []
+        return [(_res[0][i],_res[1][i],_res[2][i]) for i in range(len(_res[0]))]
+
+    def get_normal(self, point):
+        _n = self.fn.getClosestNormal(OM2.MPoint(point),OM2.MSpace.kWorld)[0]
+        return [_n.x,_n.y,_n.z]
+
+    def get_uv(self, point):
+        try:
+            _uv = self.fn.getUVAtPoint(OM2.MPoint(point),OM2.MSpace.kWorld)
+            return [_uv[0],_uv[1]]
+        except RuntimeError:
+            return None
+
+    def clear(self):
+        self.fn.freeCachedIntersectionAccelerator()
+
+class CastCache(object):
+    """
+    Cast targets validated once with a MeshCaster per mesh shape. For tools casting at the same targets
+    over and over - build on press, cast through it for the drag, clear on release. Surfaces fall back to
+    the per cast path. Per mesh results are keyed by the mesh args as given, like cast.
+
+    :parameters:
+        mesh(string/list) | Surface(s) to cast at. None for all eligible mesh
+    """
+    def __init__(self, mesh = None):
+        self.shapes = get_castShapes(mesh)
+        self.keys = {}#...shape:transform for transform args
+        if mesh is not None:
+            for m in VALID.listArg(mesh):
+                if SEARCH.is_transform(m):
+                    for s in get_castShapes(m):
+                        self.keys[s] = m
+        self.factor = get_apiSpaceFactor()
+        self.casters = {}
+        for m in self.shapes:
+            if OM2 and VALID.get_mayaType(m) == 'mesh':
+                self.casters[m] = MeshCaster(m)
+
+    def cast(self, startPoint, vector, maxDistance = 1000, firstHit = True, tolerance = .001):
+        """
+        Same args and return dict as cast with startPoint and vector.
+        """
+        _str_func = 'CastCache.cast'
+        _vec = MATH.Vector3(vector[0],vector[1],vector[2])
+        _vec.normalize()
+        _vector = [_vec.x,_vec.y,_vec.z]
+        _source = [v * self.factor for v in startPoint]
+        _maxApi = maxDistance * self.factor
+
+        _l_hits = []
+        _l_dist = []
+        _d_meshPos = {}
+        _d_meshUV = {}
+        _d_meshUVRaw = {}
+        _d_meshNormal = {}
+        for m in self.shapes:
+            _k = self.keys.get(m,m)
+            for _d_mesh in _d_meshPos,_d_meshUV,_d_meshUVRaw,_d_meshNormal:
+                _d_mesh.setdefault(_k,[])
+            mCaster = self.casters.get(m)
+            if mCaster:
+                if firstHit:
+                    _res = mCaster.cast(_source, _vector, _maxApi, True, tolerance)
+                    _l = [_res] if _res else []
+                else:
+                    _l = mCaster.cast_all(_source, _vector, _maxApi, tolerance)
+                for p,dist,face in _l:
+                    _l_hits.append([p.x / self.factor, p.y / self.factor, p.z / self.factor])
+                    _l_dist.append(dist / self.factor)
+                    _d_meshPos[_k].append(_l_hits[-1])
+                    _d_meshNormal[_k].append(mCaster.get_normal(p))
+                    _d_meshUV[_k].append(mCaster.get_uv(p))
+                    _d_meshUVRaw[_k].append(None)
+                continue
+
+            log.debug("|{0}| >> per cast: {1}".format(_str_func,m))
+            _l = []
+            if firstHit:
+                _b = findMeshIntersection(m, _source, _vector, maxDistance)
+                if _b:
+                    _l = [(_b['hit'],_b.get('normal',False),_b.get('uv',None),_b.get('uvRaw',None))]
+            else:
+                _b = findMeshIntersections(m, _source, _vector, maxDistance)
+                if _b:
+                    _uvs = _b.get('uvs') or [None] * len(_b['hits'])
+                    _uvsRaw = _b.get('uvsRaw') or [None] * len(_b['hits'])
+                    _normals = _b.get('normals') or [False] * len(_b['hits'])
+                    _l = zip(_b['hits'],_normals,_uvs,_uvsRaw)
+            for h,n,uv,uvRaw in _l:
+                _l_hits.append(h)
+                _l_dist.append(DIST.get_distance_between_points(startPoint,h))
+                _d_meshPos[_k].append(h)
+                _d_meshNormal[_k].append(n)
+                _d_meshUV[_k].append(uv)
+                _d_meshUVRaw[_k].append(uvRaw)
+
+        if not _l_hits:
+            return {}
+
+        _near = _l_hits[_l_dist.index(min(_l_dist))]
+        _far = _l_hits[_l_dist.index(max(_l_dist))]
+        _d = {'source':startPoint, 'near':_near, 'far':_far, 'hits':_l_hits, 'uvs':_d_meshUV, 'uvsRaw':_d_meshUVRaw,
+              'meshHits':_d_meshPos,'meshNormals':_d_meshNormal}
+        if firstHit:
+            _d['hit'] = _near
+        else:_d['hit'] = _far
+        return _d
+
+    def clear(self):
+        for mCaster in self.casters.values():
+            mCaster.clear()
+        self.casters = {}
+
+def cast_many(mesh = None, origins = [], vectors = [],
+              maxDistance = 1000, firstHit = True,
+              normals = True, uvs = True, tolerance = .001):
+    """
+    Cast a batch of rays. Each mesh gets one function set and intersection accelerator for all of the rays 
+    rather than a fresh one per cast. Origins and vectors are maya space and paired by index - a single 
+    origin or vector is used for every ray.
+
+    :parameters:
+        mesh(string/list) | Surface(s) to cast at
+        origins(list) | points to cast from
+        vectors(list) | vectors to cast along
+        maxDistance(float) | max cast range
+        firstHit(bool) | nearest hit per ray. False for the furthest
+        normals(bool) | gather hit normals
+        uvs(bool) | gather hit uvs
+        tolerance(float) | mesh cast tolerance
+
+    :returns:
+        Dict ------------------------------------------------------------------
+        'hits'(list) | world space point per ray. None for no hit
+        'distances'(list) | distance from origin per ray
+        'meshes'(list) | shape hit per ray
+        'faces'(list) | face index per ray. None for surfaces
+        'normals'(list) | normal per ray, if asked for
+        'uvs'(list) | uv per ray, if asked for
+    """
+    _str_func = 'cast_many'
+    
+    _shapes = get_castShapes(mesh)
+    if not _shapes:
+        raise ValueError,"|{0}| >> No valid shapes: {1}".format(_str_func,mesh)
+    if not origins or not vectors:
+        raise ValueError,"|{0}| >> Must have origins and vectors".format(_str_func)
+
+    origins = [list(p) for p in VALID.listArg(origins)] if VALID.isListArg(origins[0]) else [list(origins)]
+    vectors = [list(v) for v in VALID.listArg(vectors)] if VALID.isListArg(vectors[0]) else [list(vectors)]
+    _len = max(len(origins),len(vectors))
+    if len(origins) == 1:origins = origins * _len
+    if len(vectors) == 1:vectors = vectors * _len
+    if len(origins) != len(vectors):
+        raise ValueError,"|{0}| >> origins and vectors must pair. {1} != {2}".format(_str_func,len(origins),len(vectors))
+    
+    _factor = get_apiSpaceFactor()
+    _maxApi = maxDistance * _factor
+    
+    _l_sources = []
+    _l_vectors = []
+    for i,p in enumerate(origins):
+        _l_sources.append([v * _factor for v in p])
+        _vec = MATH.Vector3(vectors[i][0],vectors[i][1],vectors[i][2])
+        _vec.normalize()
+        _l_vectors.append([_vec.x,_vec.y,_vec.z])
+    
+    _d = {'hits':[None] * _len,
+          'distances':[None] * _len,
+          'meshes':[None] * _len,
+          'faces':[None] * _len}
+    if normals:_d['normals'] = [None] * _len
+    if uvs:_d['uvs'] = [None] * _len
+    
+    for m in _shapes:
+        if VALID.get_mayaType(m) == 'mesh' and OM2:
+            mCaster = MeshCaster(m)
+            for i in xrange(_len):
+                _res = mCaster.cast(_l_sources[i], _l_vectors[i], _maxApi, firstHit, tolerance)
+                if not _res:
+                    continue
+                _dist = _res[1] / _factor
+                _current = _d['distances'][i]
+                if _current is not None and (_dist >= _current if firstHit else _dist <= _current):
+                    continue
+                _d['hits'][i] = [_res[0].x / _factor, _res[0].y / _factor, _res[0].z / _factor]
+                _d['distances'][i] = _dist
+                _d['meshes'][i] = m
+                _d['faces'][i] = _res[2]
+                if normals:_d['normals'][i] = mCaster.get_normal(_res[0])
+                if uvs:_d['uvs'][i] = mCaster.get_uv(_res[0])
+            mCaster.clear()
+        else:
+            log.debug("|{0}| >> per ray cast: {1}".format(_str_func,m))
+            for i in xrange(_len):
+                if firstHit:
+                    _b = findMeshIntersection(m, _l_sources[i], _l_vectors[i], maxDistance)
+                    _l = [(_b['hit'],_b.get('normal'),_b.get('uv'))] if _b else []
+                else:
+                    _b = findMeshIntersections(m, _l_sources[i], _l_vectors[i], maxDistance)
+                    _l = [(h,(_b.get('normals') or [None]*len(_b['hits']))[ii],(_b.get('uvs') or [None]*len(_b['hits']))[ii])
+                          for ii,h in enumerate(_b['hits'])] if _b else []
+                for h,n,uv in _l:
+                    _dist = DIST.get_distance_between_points(origins[i],h)
+                    _current = _d['distances'][i]
+                    if _current is not None and (_dist >= _current if firstHit else _dist <= _current):
+                        continue
+                    _d['hits'][i] = h
+                    _d['distances'][i] = _dist
+                    _d['meshes'][i] = m
+                    _d['faces'][i] = None
+                    if normals:_d['normals'][i] = n
+                    if uvs:_d['uvs'][i] = uv
+    return _d
+
 #LOOK AT BELOW FOR OPTIMIZATION =================================================================================================
 
 
@@ -42,6 +42,27 @@ is_transform = VALID.is_transform
 get_mayaType = VALID.get_mayaType
 get_transform = VALID.get_transform 
 
+#>>> Lookup cache
+#===================================================================
+#...set by tagCache_start while a nameTools.NameQueue resolves its names. Nothing is renamed
+#...or retagged during the resolve so tag and parent lookups can be answered once per node
+_d_lookupCache = None
+
+def tagCache_start():
+    global _d_lookupCache
+    _d_lookupCache = {}
+
+def tagCache_end():
+    global _d_lookupCache
+    _d_lookupCache = None
+
+def _cached(key, fnc, *args):
+    if _d_lookupCache is None:
+        return fnc(*args)
+    if key not in _d_lookupCache:
+        _d_lookupCache[key] = fnc(*args)
+    return _d_lookupCache[key]
+
 def get_nodeTagInfo(node = None, tag = None):
     """
     Get the info on a given node with a provided tag
@@ -54,7 +75,10 @@ def get_nodeTagInfo(node = None, tag = None):
     """   
     _str_func = 'get_nodeTagInfo'
     _node = VALID.stringArg(node,False,_str_func) 
-    
+    return _cached(('tag',_node,tag), _get_nodeTagInfo, _node, tag)
+
+def _get_nodeTagInfo(_node, tag):
+    _str_func = 'get_nodeTagInfo'
     if (mc.objExists('%s.%s' %(_node,tag))) == True:
         messageQuery = (mc.attributeQuery (tag,node=_node,msg=True))
         if messageQuery == True:
@@ -167,7 +191,9 @@ def parents_get(node = None, fullPath = True):
     """   
     _str_func = 'parents_get'
     _node =  VALID.mNodeString(node)
-    
+    return list(_cached(('parents',_node,fullPath), _parents_get, _node, fullPath))
+
+def _parents_get(_node, fullPath):
     _l_parents = []
     tmpObj = _node
     noParent = False
@@ -8,6 +8,7 @@ __MAYALOCAL = 'SHAPECAST'
 import copy
 import re
 import time
+import math
 
 #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
 
@@ -18,6 +19,7 @@ log.setLevel(logging.INFO)
 
 # From Maya =============================================================
 import maya.cmds as mc
+import maya.api.OpenMaya as OM2
 
 # From Red9 =============================================================
 from Red9.core import Red9_General as r9General
@@ -548,6 +550,54 @@ def createWrapControlShape(targetObjects,
     #Store for return
     return {'curve':mi_crv.mNode,'instance':mi_crv}  
 
+def get_latheCastDat(rotObj, castObj, latheAxis = 'z', aimAxis = 'y+', values = []):
+    """
+    Cast points and vectors for castObj as if rotObj were rotated to each value on its lathe axis. 
+    Computed from the transforms - nothing in the scene is touched.
+
+    :parameters:
+        rotObj(str) | transform we would rotate. castObj or one of its parents
+        castObj(str) | transform we cast from
+        latheAxis(str) | rotate axis of rotObj
+        aimAxis(str) | axis of castObj to cast along
+        values(list) | rotate values in degrees
+
+    :returns:
+        list of [point, vector] per value. Maya space
+    """
+    _str_func = 'get_latheCastDat'
+    
+    _sel = OM2.MSelectionList()
+    _sel.add(rotObj)
+    _sel.add(castObj)
+    _dag_rot = _sel.getDagPath(0)
+    _dag_cast = _sel.getDagPath(1)
+    
+    _tm = OM2.MFnTransform(_dag_rot).transformation()
+    _rot = _tm.rotation()
+    _idx = 'xyz'.index(latheAxis[0].lower())
+    _aim = 'xyz'.index(aimAxis[0].lower())
+    _sign = -1.0 if aimAxis.endswith('-') else 1.0
+    
+    _mParent = _dag_rot.exclusiveMatrix()
+    #...castObj relative to rotObj and its pivot in its own space, these don't change as we rotate
+    _mCast = _dag_cast.inclusiveMatrix()
+    _mOffset = _mCast * _dag_rot.inclusiveMatrixInverse()
+    #...everything api side is internal units (cm), only the results go back to maya space
+    _rp = OM2.MFnTransform(_dag_cast).rotatePivot(OM2.MSpace.kWorld) * _mCast.inverse()
+    _toUI = OM2.MDistance.internalToUI
+    
+    _res = []
+    for v in values:
+        _l = [_rot.x,_rot.y,_rot.z]
+        _l[_idx] = math.radians(v)
+        _tm.setRotation(OM2.MEulerRotation(_l[0],_l[1],_l[2],_rot.order))
+        _m = _mOffset * _tm.asMatrix() * _mParent
+        _pos = _rp * _m
+        _res.append([[_toUI(_pos.x),_toUI(_pos.y),_toUI(_pos.z)],
+                     [_m.getElement(_aim,i) * _sign for i in range(3)]])
+    return _res
+
 def createMeshSliceCurve(mesh, mi_obj,latheAxis = 'z',aimAxis = 'y+',
                          points = 12, curveDegree = 3, minRotate = None, maxRotate = None, rotateRange = None,
                          posOffset = None, vectorOffset = None, markHits = False,rotateBank = None, closedCurve = True, maxDistance = 1000,
@@ -703,51 +753,31 @@ def createMeshSliceCurve(mesh, mi_obj,latheAxis = 'z',aimAxis = 'y+',
     if not l_rotateSettings:raise ValueError, "Should have had some l_rotateSettings by now"
     log.debug("rotateSettings: %s"%l_rotateSettings)
 
-    #reload(RayCast)
     try:#>>> Pew, pew !
         #================================================================
+        l_castDat = get_latheCastDat(mi_rotObj.mNode, mi_loc.mNode, latheAxis, aimAxis, l_rotateSettings)
+        d_cast = RayCast.cast_many(mesh, [d[0] for d in l_castDat], [d[1] for d in l_castDat],
+                                   maxDistance = maxDistance, normals = False, uvs = False)
+        
         l_hits = []
         for i,rotateValue in enumerate(l_rotateSettings):
-            #guiFactory.doUpdateProgressWindow("Casting {0}".format(rotateValue), i, 
-            #                                  len(l_rotateSettings), 
-            #                                  reportItem=False)	    
-            d_castReturn = {}
-            hit = False
-            
-            #shoot our ray, store the hit
-            log.debug("Casting: %i>>%f"%(i,rotateValue))
-            mc.setAttr("%s.rotate%s"%(mi_rotObj.mNode,latheAxis.capitalize()),rotateValue)
-            log.debug(mc.getAttr("%s.rotate%s"%(mi_rotObj.mNode,latheAxis.capitalize())) )
-
-            #mi_rotObj.__setattr__('rotate%s'%latheAxis.capitalize(),rotateValue)
+            _start, _vec = l_castDat[i]
+            _vecNorm = MATH.Vector3(_vec[0],_vec[1],_vec[2]).normalized()
+            _vecNorm = [_vecNorm.x,_vecNorm.y,_vecNorm.z]
+            hit = d_cast['hits'][i]
             try:
-                log.debug("mesh: %s"%mesh)
-                log.debug("mi_loc.mNode: %s"%mi_loc.mNode)
-                log.debug("aimAxis: %s"%aimAxis)
-                log.debug("latheAxis: %s"%latheAxis)
-                log.debug("maxDistance: %s"%maxDistance)
-                
-                hit = RayCast.cast(mesh,mi_loc.mNode,aimAxis,
-                                   offsetMode='vector',offsetDistance=vectorOffset,
-                                   maxDistance=maxDistance).get('hit')
-                if not hit:
+                if hit:
+                    hit = RayCast.offset_hit_by_distance(hit,_start,_vec,vectorOffset)
+                else:
                     log.debug(cgmGEN.logString_msg(_str_func,
                                                    "No hit, alternate method | {0}".format(rotateValue)))
-                    hit = DIST.get_pos_by_axis_dist(mi_loc.mNode,aimAxis,maxDistance)
+                    hit = DIST.get_pos_by_vec_dist(_start,_vecNorm,maxDistance)
                 
                 if hit:
                     if DIST.get_distance_between_points(pos_base,hit)>maxDistance:
                         log.debug("Max distance exceeded. Using alternative")
-                        hit = DIST.get_pos_by_axis_dist(mi_loc.mNode,aimAxis,maxDistance)
+                        hit = DIST.get_pos_by_vec_dist(_start,_vecNorm,maxDistance)
                         
-                    
-                #d_castReturn = RayCast.findMeshIntersectionFromObjectAxis(mesh, mi_loc.mNode, axis=aimAxis, #maxDistance = maxDistance, firstHit=False) or {}
-               # d_hitReturnFromValue[rotateValue] = d_castReturn	
-                #if closestInRange:
-                    #hit = d_castReturn.get('near') or False
-                #else:
-                    #hit = d_castReturn.get('far') or False
-                #if not hit:log.info("{0} -- {1}".format(rotateValue,d_castReturn))
                 l_hits.append(hit)
                 d_processedHitFromValue[rotateValue] = hit
                 l_pos.append(hit)
@@ -768,7 +798,7 @@ def createMeshSliceCurve(mesh, mi_obj,latheAxis = 'z',aimAxis = 'y+',
         raise ValueError,"Cast fail | {0}".format(error) 	
     try:
         if not l_pos:
-            log.warning("Cast return: %s"%d_castReturn)
+            log.warning("Cast return: %s"%d_cast)
             raise StandardError,"createMeshSliceCurve>> Not hits found. Nothing to do"
         if len(l_pos)>=3:
             if closedCurve:
@@ -13,6 +13,7 @@ Currently only regular skin clusters are storing...
 Features...
 - Skin data gather
 - Read/write skin data to a readable config file
+- Read/write skin data to a compact binary file (sparse weights)
 - Apply skinning data to geo of different vert count
 - 
 
@@ -27,6 +28,10 @@ __MAYALOCAL = 'SKINDAT'
 import copy
 import os
 import pprint
+import sys
+import json
+import struct
+from array import array
 
 #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
 import logging
@@ -81,6 +86,7 @@ class data(object):
         self.d_target = {}
         self.d_sourceInfluences = {}
         self.d_weights = {}
+        self.d_sparse = {}
         self.str_filepath = None
         self.d_general = cgmGeneral.get_mayaEnviornmentDict()
         self.d_general['file'] = mc.file(q = True, sn = True)            
@@ -171,7 +177,7 @@ class data(object):
         if filepath is None:
             startDir = mc.workspace(q=True, rootDirectory=True)
             filepath = mc.fileDialog2(dialogStyle=2, fileMode=fileMode, startingDirectory=startDir,
-                                      fileFilter='Config file (*.cfg)')
+                                      fileFilter='Skin binary (*{0});;Config file (*.cfg)'.format(_binaryExtension))
             if filepath:filepath = filepath[0]
             
         if filepath is None:
@@ -180,27 +186,72 @@ class data(object):
         log.info("filepath validated...")        
         return filepath
 
-    def updateSourceSkinData(self):
+    def updateSourceSkinData(self, componentDicts = True):
         '''
         Updates the stored source skinning data
+        
+        :param componentDicts: Whether to build the per component string keyed dicts the config format needs
         '''        
         if not self.d_source:
             raise ValueError, "No source found. Cannot write data"
         
-        _d = gather_skinning_dict(self.d_source['mesh'])      
+        _d = gather_skinning_dict(self.d_source['mesh'], componentDicts = componentDicts)      
         self.d_source.update(_d['mesh'])#...update source dict
         self.d_sourceSkin = _d['skin']
         self.d_sourceInfluences = _d['influences']
         self.d_weights = _d['weights']
+        self.d_sparse = _d['sparse']
         return True
     
+    def get_componentWeights(self):
+        '''
+        Get the source weights as a list of {influenceIdx:value} dicts, one per component. 
+        Pulls from the sparse data when we have it, the config dicts otherwise.
+        '''
+        if self.d_sparse:
+            _offsets = self.d_sparse['offsets']
+            _indices = self.d_sparse['indices']
+            _values = self.d_sparse['values']
+            return [dict(zip(_indices[_offsets[i]:_offsets[i+1]],_values[_offsets[i]:_offsets[i+1]]))
+                    for i in xrange(len(_offsets)-1)]
+
+        _raw = self.d_sourceInfluences['componentWeights']
+        _l = []
+        for i in range(int(self.d_source['pointCount'])):
+            _l.append(dict((int(k),float(v)) for k,v in _raw[str(i)].iteritems()))
+        return _l
+    
+    def get_sourcePositions(self):
+        '''
+        Get the source component world positions as a list of [x,y,z]
+        '''
+        _positions = self.d_sparse.get('positions') if self.d_sparse else None
+        if _positions:
+            return [list(_positions[i:i+3]) for i in xrange(0,len(_positions),3)]
+        _d_pos = self.d_source['d_vertPositions']
+        return [[float(v) for v in _d_pos[str(i)]] for i in range(int(self.d_source['pointCount']))]
             
-    def write(self, filepath = None):
+    def write(self, filepath = None, dataformat = None):
         '''
-        Write the Data ConfigObj to file
+        Write the data to file
+        
+        :param filepath: file to write
+        :param dataformat: 'binary' or 'config'. If None we go by the file extension, .cfg being config
         '''
         filepath = self.validateFilepath(filepath)
-        self.updateSourceSkinData()
+        if dataformat is None:
+            if os.path.splitext(filepath)[-1].lower() == '.cfg':
+                dataformat = 'config'
+            else:
+                dataformat = 'binary'
+        if dataformat not in ['binary','config']:
+            raise ValueError,"Unknown dataformat: {0}".format(dataformat)
+        
+        self.updateSourceSkinData(componentDicts = dataformat == 'config')
+        
+        if dataformat == 'binary':
+            write_binary(filepath, self)
+            return True
             
         ConfigObj = configobj.ConfigObj(indent_type='\t')
         ConfigObj['configType']= 'cgmSkinConfig'        
@@ -222,6 +273,12 @@ class data(object):
         if not os.path.exists(filepath):            
             raise ValueError('Given filepath doesnt not exist : %s' % filepath)   
         
+        if is_binary(filepath):
+            read_binary(filepath, self)
+            if report:self.report()
+            return True
+        
+        self.d_sparse = {}
         _config = configobj.ConfigObj(filepath)
         if _config.get('configType') != 'cgmSkinConfig':
             raise ValueError,"This isn't a cgmSkinConfig config | {0}".format(filepath)
@@ -260,6 +317,119 @@ class data(object):
                         print(">" + " {0} : {1} ".format(k1,_d_bfr[k1]))                	    
                 print(cgmGeneral._str_subLine)
         
+#>>> Binary format
+#===================================================================
+"""
+Layout, little endian:
+    magic (8s) | version (I) | header length (I) | json header
+    counts (5I): components, influences, nonzero weights, blendWeights, position values
+    offsets (I * components+1) | influence indices (I * nonzero) | weights (d * nonzero)
+    blendWeights (d) | world positions (d, xyz per component)
+
+Weights are stored CSR style - for component i, its influence indices and values 
+live at [offsets[i]:offsets[i+1]].
+"""
+_binaryMagic = 'CGMSKINB'
+_binaryVersion = 1
+_binaryExtension = '.cgmSkin'
+_u32 = 'I' if array('I').itemsize == 4 else 'L'
+
+def is_binary(filepath):
+    """
+    Check if a file is a cgm binary skin file
+    """
+    with open(filepath,'rb') as f:
+        return f.read(len(_binaryMagic)) == _binaryMagic
+
+def _array_toFile(f, arr):
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    arr.tofile(f)
+
+def _array_fromFile(f, typecode, count):
+    arr = array(typecode)
+    if count:
+        arr.fromfile(f, count)
+        if sys.byteorder != 'little':
+            arr.byteswap()
+    return arr
+
+def write_binary(filepath, skinData):
+    """
+    Write a data instance's source skinning to our binary format
+
+    :param filepath: file to write
+    :param skinData: data instance with gathered source data
+    """
+    _sparse = skinData.d_sparse
+    if not _sparse:
+        raise ValueError,"No sparse weight data. Gather skinning data first"
+    
+    _d_source = dict((k,v) for k,v in skinData.d_source.iteritems() if k != 'd_vertPositions')
+    _d_influences = dict((k,v) for k,v in skinData.d_sourceInfluences.iteritems()
+                         if k not in ['componentWeights','blendWeights'])
+    _header = json.dumps({'source':_d_source,
+                          'general':skinData.d_general,
+                          'skin':skinData.d_sourceSkin,
+                          'influences':_d_influences},default=str)
+
+    _offsets = array(_u32, _sparse['offsets'])
+    _indices = array(_u32, _sparse['indices'])
+    _values = array('d', _sparse['values'])
+    _blend = array('d', _sparse.get('blendWeights') or [])
+    _positions = array('d', _sparse.get('positions') or [])
+    
+    with open(filepath,'wb') as f:
+        f.write(_binaryMagic)
+        f.write(struct.pack('<II', _binaryVersion, len(_header)))
+        f.write(_header)
+        f.write(struct.pack('<5I', len(_offsets) - 1, int(_sparse['influenceCount']), len(_values), 
+                            len(_blend), len(_positions)))
+        for arr in _offsets, _indices, _values, _blend, _positions:
+            _array_toFile(f, arr)
+    log.info("Binary skin data written: {0}".format(filepath))
+    return filepath
+
+def read_binary(filepath, skinData = None):
+    """
+    Read our binary format. 
+
+    :param filepath: file to read
+    :param skinData: data instance to push the read data to. If None, a new one is made
+
+    :returns data instance
+    """
+    if skinData is None:
+        skinData = data()
+    with open(filepath,'rb') as f:
+        if f.read(len(_binaryMagic)) != _binaryMagic:
+            raise ValueError,"This isn't a cgm binary skin file | {0}".format(filepath)
+        _version, _len_header = struct.unpack('<II', f.read(8))
+        if _version > _binaryVersion:
+            raise ValueError,"Binary skin file version {0} is newer than supported ({1}) | {2}".format(_version,_binaryVersion,filepath)
+        _header = json.loads(f.read(_len_header))
+        _cnt, _influenceCount, _nnz, _blendCount, _posCount = struct.unpack('<5I', f.read(20))
+        _offsets = _array_fromFile(f, _u32, _cnt + 1)
+        _indices = _array_fromFile(f, _u32, _nnz)
+        _values = _array_fromFile(f, 'd', _nnz)
+        _blend = _array_fromFile(f, 'd', _blendCount)
+        _positions = _array_fromFile(f, 'd', _posCount)
+        
+    skinData.d_source = _header['source']
+    skinData.d_general = _header['general']
+    skinData.d_sourceSkin = _header['skin']
+    skinData.d_sourceInfluences = _header['influences']
+    skinData.d_sourceInfluences['blendWeights'] = _blend.tolist()
+    skinData.d_sparse = {'offsets':_offsets,
+                         'indices':_indices,
+                         'values':_values,
+                         'influenceCount':_influenceCount,
+                         'blendWeights':_blend,
+                         'positions':_positions}
+    skinData.str_filepath = filepath
+    return skinData
+
 #>>> Utilities
 #===================================================================
 _skinclusterAttributesToCopy = {'envelope':float,#...dictionary for pulling config data to native data type
@@ -494,47 +664,16 @@ def applySkin(*args,**kws):
                 return self._FailBreak_("Haven't implemented non matching mesh types | source: {0} | target: {1}".format(_type_source,_type_target))              
             
             #...generate a processed list...
-            #[[jntIdx,v],[jntIdx,v]....] -- the count in the list is the vert count
-            _raw_componentWeights = self.mData.d_sourceInfluences['componentWeights']
-            _raw_blendweights = self.mData.d_sourceInfluences['blendWeights']
-            
+            #[{jntIdx:v,jntIdx:v}....] -- the count in the list is the vert count
             _l_cleanData = []
             
             #...First loop is to only initially clean the data...
-            for i in range(_int_sourceCnt):#...for each vert
-                _str_i = str(i)
-                _subL = []
-                
-                _bfr_raw = _raw_componentWeights[_str_i]
-                
-                _bfr_toNormalize = []
-                _bfr_clean = {}
-                _d_normalized = {}
-                for k,value in _bfr_raw.iteritems():
-                    _bfr_clean[int(k)] = float(value)
-                    _d_normalized[int(k)] = None
-                    
-                #normalize the values...
-                for k,value in _bfr_clean.iteritems():
-                    _bfr_toNormalize.append(value)
-                    
-                _bfr_normalized = cgmMath.normSumList(_bfr_toNormalize,1.0)
-                #self.log_info("To Normalize: {0}".format(_bfr_toNormalize))                
-                #self.log_info("Normalized: {0}".format(_bfr_normalized))
-                #self.log_info("{0} pre sum: {1}".format(i,sum(_bfr_toNormalize)))                
-                #self.log_info("{0} sum: {1}".format(i,sum(_bfr_normalized)))
-                
-                for ii,k in enumerate(_d_normalized.keys()):
-                    _d_normalized[k] = _bfr_normalized[ii]
-                #self.log_info("clean: {0}".format(_bfr_clean))                
-                #self.log_info("norm:  {0}".format(_d_normalized))                
-                    
+            for i,_bfr_clean in enumerate(self.mData.get_componentWeights()):#...for each vert
+                _l_keys = _bfr_clean.keys()
+                _bfr_normalized = cgmMath.normSumList([_bfr_clean[k] for k in _l_keys],1.0)
                 if not cgmMath.isFloatEquivalent(1.0, sum(_bfr_normalized) ):
                     self.log_info("vert {0} not normalized".format(i))
-                #self.log_info("vert {0} base: {1}".format(i,_bfr_toNormalize))
-                #self.log_info("vert {0} norm: {1}".format(i,_bfr_normalized))
-                _l_cleanData.append(_d_normalized)
-                #if i == 3:return self._FailBreak_("stop")
+                _l_cleanData.append(dict(zip(_l_keys,_bfr_normalized)))
             self._l_processed = _l_cleanData#...initial push data
             
             
@@ -588,10 +727,7 @@ def applySkin(*args,**kws):
                     self.log_warning("Non matching component counts. Using closestTo method to remap")
                     _l_closestRetarget = []
                     #...generate a posList of the source data
-                    l_source_pos = []
-                    _d_pos = self.mData.d_source['d_vertPositions']
-                    for i in range(_int_sourceCnt):
-                        l_source_pos.append([float(v) for v in _d_pos[str(i)]])#...turn our strings to values
+                    l_source_pos = self.mData.get_sourcePositions()
                        
                     self.progressBar_start(stepMaxValue=_int_targetCnt, 
                                            statusMessage='Calculating....', 
@@ -758,46 +894,24 @@ def applySkin(*args,**kws):
             #tmpIntArray = OM.MIntArray()
             #baseFmtStr = mi_skinCluster.mNode +'.weightList[{0}]'  #pre build this string: fewer string ops == faster-ness!
             
-            self.progressBar_start(stepMaxValue=self.mData.d_target['pointCount'], 
-                                   statusMessage='Calculating....', 
-                                   interruptableState=False)    
-            
-            
-            for i in range(numInfluences):
-                for c in range(numComponentsPerInfluence):
-                    weights.set(0.0, c*numInfluences+i)                    
-            
-            for vertIdx in self._d_vertToWeighting.keys():
-                self.progressBar_iter(status = 'Setting {0}'.format(vertIdx))                
-                _d_vert = self._d_vertToWeighting[vertIdx]#...{0:value,...}
-                
-                #we need to use the api to query the physical indices used
-                #weightsP.selectAncestorLogicalIndex( vertIdx, weightListObj )
-                #weightsP.getExistingArrayAttributeIndices( tmpIntArray )
-        
-                #weightFmtStr = baseFmtStr.format(vertIdx) +'.weights[{0}]'
-            
-                #clear out any existing skin data - and awesomely we cannot do this with the api - so we need to use a weird ass mel command
-                #for n in range( tmpIntArray.length() ):
-                    #mc.removeMultiInstance( weightFmtStr.format(tmpIntArray[n]) )            
-            
-                #at this point using the api or mel to set the data is a moot point...  we have the strings already so just use mel
-                    
-                for jointIdx in _d_vert.keys():
-                    #self.log_info(" vtx: {0} | jnt:{1} | value:{2}".format(vertIdx,jointIdx, _d_vert[jointIdx]))
-                    #self.log_info("{0} | {1}".format( weightFmtStr.format(jointIdx),_d_vert[jointIdx]))
-                    #mc.setAttr( weightFmtStr.format(jointIdx), _d_vert[jointIdx] ) 
-                    #weights.set(self.data['weights'][src][j], j*numInfluences+1)
-                    #weights.set(_d_vert[jointIdx], vertIdx)
-                    weights.set(_d_vert[jointIdx], vertIdx*numInfluences+jointIdx)#...this was a bugger to get to, 
-            self.progressBar_end()
+            #...build the full weight list in one go rather than setting per component. 
+            #   Anything not in our data is zeroed
+            _l_weights = [0.0] * (numComponentsPerInfluence * numInfluences)
+            for vertIdx,_d_vert in self._d_vertToWeighting.iteritems():#...{0:value,...}
+                _idx_base = vertIdx*numInfluences
+                for jointIdx,value in _d_vert.iteritems():
+                    _l_weights[_idx_base+jointIdx] = value#...this was a bugger to get to, 
+            weights = _doubleArray_fromList(_l_weights)
             
             skinFn.setWeights(dagPath, components, influenceIndices, weights, False)
-            
 
             #...blendWeights
-            
-            #self.setBlendWeights(dagPath, components)
+            _l_blendWeights = self.mData.d_sourceInfluences.get('blendWeights') or []
+            if len(_l_blendWeights) == numComponentsPerInfluence and len(self._d_vertToWeighting) == numComponentsPerInfluence:
+                skinFn.setBlendWeights(dagPath, components, 
+                                       _doubleArray_fromList([float(v) for v in _l_blendWeights]))
+            elif _l_blendWeights:
+                self.log_warning("blendWeights count doesn't match target. Skipping")
                     
             #...apply our settings from our skin...
             
@@ -815,11 +929,21 @@ def applySkin(*args,**kws):
                 #mc.skinCluster(_targetSkin,e = True, smoothWeights = .0005,smoothWeightsMaxIterations = 10)
     return fncWrap(*args,**kws).go()
 
+def _doubleArray_fromList(l):
+    '''
+    Build an MDoubleArray from a list in one call
+    '''
+    util = OM.MScriptUtil()
+    util.createFromList(l, len(l))
+    return OM.MDoubleArray(util.asDoublePtr(), len(l))
+
 def gather_skinning_dict(*args,**kws):
     '''
     Gathers skinning information - most likely for export to a file.
     
-    :param mInstanes: given metaClass to test inheritance - cls or [cls]
+    :param source: source object or skin cluster
+    :param componentDicts: Whether to build the per component string keyed dicts the config format uses. 
+        The sparse data is always gathered.
     '''
     class fncWrap(cgmGeneral.cgmFuncCls):
         def __init__(self,*args, **kws):	    
@@ -828,6 +952,8 @@ def gather_skinning_dict(*args,**kws):
             self._b_reportTimes = True
             self._l_ARGS_KWS_DEFAULTS = [{'kw':'source',"default":None,
                                           'help':"source object or skin cluster"},
+                                         {'kw':'componentDicts',"default":True,
+                                          'help':"Whether to build per component config dicts"},
                                          ]
             self.__dataBind__(*args,**kws)
             self.l_funcSteps = [{'step':'Validate','call':self._validate},
@@ -841,6 +967,7 @@ def gather_skinning_dict(*args,**kws):
                             "skin": {},
                             "weights":{},
                             "blendWeights":[],
+                            "sparse":{},
                             "influences":{}}
             
             #_validate our source
@@ -891,38 +1018,51 @@ def gather_skinning_dict(*args,**kws):
             dagPath, components = self.__getGeometryComponents()
             #self.log_info('dagPath: {0}'.format(dagPath))
             #self.log_info('components: {0}'.format(components))
-            self.gatherInfluenceData(dagPath, components)
+            weights, numInfluences = self.gatherInfluenceData(dagPath, components)
             self.gatherBlendWeightData(dagPath, components)
-            _vtx = self._d_data['mesh']['component']#...link to the component type 
-            l_sourceComponent = (mc.ls ("{0}.{1}[*]".format(self._mesh,_vtx),flatten=True))
-            l_influences = self._d_skin['matrix']
+            _cnt = weights.length() / numInfluences
             
-            self.progressBar_start(stepMaxValue=len(l_sourceComponent), 
-                                   statusMessage='Calculating....', 
-                                   interruptableState=False)
+            #...positions in one call
+            _points = OM.MPointArray()
+            OM.MFnMesh(dagPath).getPoints(_points, OM.MSpace.kWorld)
+            _l_positions = []
+            for i in range(_points.length()):
+                _p = _points[i]
+                _l_positions.extend([_p.x,_p.y,_p.z])
             
-            _d_componentWeights = {}            
-
-            for i,vertice in enumerate(l_sourceComponent):
-                self.progressBar_iter(status = 'Getting {0}'.format(vertice))
-                skinValues = {}
-                _key = str(i)
-                
-                self._d_data['mesh']['d_vertPositions'][_key] = mc.pointPosition("{0}.{1}[{2}]".format(self._mesh,_vtx,i),w=True)
-                                
-                """for ii,influence in enumerate(l_influences):
-                    influenceValue = mc.skinPercent(self._skin, vertice, transform = influence, query = True)
-                    if influenceValue != 0:
-                        skinValues[str(ii)] = influenceValue"""
-                
-                for ii,influence in enumerate(l_influences):
-                    _bfr = self._d_data['weights'][str(ii)][i]#...pull from our weights data to be much much faster...
+            #...sparse rows, component major like the api hands them to us
+            _l_weights = [weights[i] for i in range(weights.length())]
+            _offsets = array(_u32,[0])
+            _indices = array(_u32)
+            _values = array('d')
+            _l_range = range(numInfluences)
+            for i in range(_cnt):
+                _idx_base = i*numInfluences
+                for ii in _l_range:
+                    _bfr = _l_weights[_idx_base+ii]
                     if _bfr != 0:
-                        skinValues[str(ii)] = _bfr
+                        _indices.append(ii)
+                        _values.append(_bfr)
+                _offsets.append(len(_values))
                 
-                _d_componentWeights[_key] = skinValues 
+            self._d_data['sparse'] = {'offsets':_offsets,
+                                      'indices':_indices,
+                                      'values':_values,
+                                      'influenceCount':numInfluences,
+                                      'blendWeights':array('d',self._d_data['influences']['blendWeights']),
+                                      'positions':array('d',_l_positions)}
+            
+            if not self.d_kws.get('componentDicts',True):
+                return self._d_data
+            
+            _d_componentWeights = {}            
+            _d_vertPositions = self._d_data['mesh']['d_vertPositions']
+            for i in range(_cnt):
+                _key = str(i)
+                _d_vertPositions[_key] = _l_positions[i*3:i*3+3]
+                _d_componentWeights[_key] = dict((str(k),v) for k,v in 
+                                                 zip(_indices[_offsets[i]:_offsets[i+1]],_values[_offsets[i]:_offsets[i+1]]))
 
-            self.progressBar_end()
             #self.log_infoDict( _d_componentWeights, "Component Weights...")            
             self._d_data['influences']['componentWeights'] = _d_componentWeights
             return self._d_data
@@ -969,11 +1109,13 @@ def gather_skinning_dict(*args,**kws):
                 
                 # store weights by influence & not by namespace so it can be imported with different namespaces.
                 self.progressBar_iter(status = 'Getting {0}...data'.format(influenceName))                                
-                self._d_data['weights'][_k] = \
-                    [weights[jj*numInfluences+i] for jj in range(numComponentsPerInfluence)]
+                if self.d_kws.get('componentDicts',True):
+                    self._d_data['weights'][_k] = \
+                        [weights[jj*numInfluences+i] for jj in range(numComponentsPerInfluence)]
                 
             self._d_data['influences']['data'] = _d_influenceData  
             self.progressBar_end()
+            return weights, numInfluences
     
         def gatherBlendWeightData(self, dagPath, components):
             weights = OM.MDoubleArray()
@@ -1611,7 +1611,7 @@ class ui(cgmUI.cgmGUI):
         
         _d = copy.copy(self._d_modules)
         for b in _d[1]['blocks']:
-            if _d[0][b].__dict__.get('__menuVisible__'):
+            if RIGBLOCKS.get_blockDat(b).get('menuVisible'):
                 mUI.MelMenuItem(self.uiMenu_add, l=b,
                                 c=cgmGEN.Callback(self.uiFunc_block_create,b),
                                 ann="{0} : {1}".format(b, self.uiFunc_block_create))
@@ -1628,7 +1628,7 @@ class ui(cgmUI.cgmGUI):
             #d_sections[c] = []
             if c == 'blocks':continue
             for b in _d[1][c]:
-                if _d[0][b].__dict__.get('__menuVisible__'):
+                if RIGBLOCKS.get_blockDat(b).get('menuVisible'):
                     #d_sections[c].append( [b,cgmGEN.Callback(self.uiFunc_block_create,b)] )
                     l_options = RIGBLOCKS.get_blockProfile_options(b)
                     if l_options:
@@ -1655,7 +1655,7 @@ class ui(cgmUI.cgmGUI):
             d_sections[c] = []
             if c == 'blocks':continue
             for b in _d[1][c]:
-                if _d[0][b].__dict__.get('__menuVisible__'):
+                if RIGBLOCKS.get_blockDat(b).get('menuVisible'):
                     d_sections[c].append( [b,cgmGEN.Callback(self.uiFunc_block_create,b)] )
                     l_options = RIGBLOCKS.get_blockProfile_options(b)                
                     if l_options:
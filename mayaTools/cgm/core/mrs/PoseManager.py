@@ -30,6 +30,7 @@ from Red9.core import Red9_Meta as r9Meta
 from Red9.core import Red9_AnimationUtils as r9Anim
 import Red9.core.Red9_CoreUtils as r9Core
 import Red9.core.Red9_PoseSaver as r9Pose
+import Red9.core.Red9_PoseIndex as r9PoseIndex
 import Red9.packages.configobj as configobj
 
 import Red9.startup.setup as r9Setup    
@@ -176,12 +177,34 @@ class pathList(object):
         self.mOptionVar.clear()
         self.l_paths = []
 
+def walk_poseIndex(poseIndex):
+    """
+    os.walk style root, dirs, files from a Red9 pose index - pose files only, no filesystem calls
+
+    :parameters:
+        poseIndex(r9PoseIndex.PoseIndex)
+    """
+    _d_files = {}
+    for d in poseIndex.poses.values():
+        _d_files.setdefault(d['folder'],[]).append(d['name'] + poseIndex.poseExt)
+        
+    _l_stack = ['']
+    while _l_stack:
+        _rel = _l_stack.pop()
+        _d = poseIndex.folders.get(_rel)
+        if _d is None:
+            continue
+        _l_subs = sorted(_d['subFolders'])
+        yield PATHS.Path(poseIndex.absPath(_rel)), [s.split('/')[-1] for s in _l_subs], sorted(_d_files.get(_rel,[]))
+        _l_stack.extend(reversed(_l_subs))
+
 def walk_below_dir(arg = _pathTest, tests = None,uiStrings = True,
-                   fileTest=None):
+                   fileTest=None, poseIndex = None):
     """
     Walk directory for pertinent info
 
     :parameters:
+        poseIndex(r9PoseIndex.PoseIndex) | walk the index rather than the filesystem
 
     :returns
         _d_modules, _d_categories, _l_unbuildable
@@ -217,7 +240,13 @@ def walk_below_dir(arg = _pathTest, tests = None,uiStrings = True,
     _i = 0
     
     
-    for root, dirs, files in os.walk(_path, True, None):
+    if poseIndex is not None:
+        _walk = walk_poseIndex(poseIndex)
+    else:
+        _walk = os.walk(_path, True, None)
+        
+    for root, dirs, files in _walk:
+        dirs[:] = [d for d in dirs if not d.startswith('.')]#...skip .r9poseIndex and the like
         _rootPath = PATHS.Path(root)
         _split = _rootPath.split()
         _subRoot = _split[-1]
@@ -438,6 +467,7 @@ def buildFrame_poses(self,parent):
     self.poseGridMode = 'thumb'  # or text
     self.poseRootMode = 'RootNode'  # or MetaRig
     self.poses = None
+    self.poseIndex = None
     self.poseButtonBGC = [0.27, 0.3, 0.3]
     self.poseButtonHighLight = r9Setup.red9ButtonBGC('green')
     self.poseProjectMute = False  # whether to disable the save and update funcs in Project mode
@@ -846,6 +876,7 @@ class manager(mUI.MelColumn):
         self.poseGridMode = 'thumb'  # or text
         self.poseRootMode = 'RootNode'  # or MetaRig
         self.poses = None
+        self.poseIndex = None
         self.poseButtonBGC = [0.27, 0.3, 0.3]
         self.poseButtonHighLight = r9Setup.red9ButtonBGC('green')
         self.poseProjectMute = False  # whether to disable the save and update funcs in Project mode
@@ -1121,6 +1152,7 @@ class manager(mUI.MelColumn):
                                                           useFilter=poseHierarchy,
                                                           storeThumbnail=storeThumbnail)
             log.info('Pose Stored to : %s' % path)
+            r9PoseIndex.updateFile(path)#...updated poses don't change the folder mtime
             self.uiCB_fillPoses(rebuildFileList=True)
         except Exception,error:
             raise cgmGEN.cgmExceptCB(Exception,error,msg=vars())
@@ -1602,7 +1634,7 @@ class manager(mUI.MelColumn):
             if searchFilter:
                 self.uiTS_poses(edit=True, sp='up')
     
-            for pose in r9Core.filterListByString(self.poses, searchFilter, matchcase=False):  # self.buildFilteredPoseList(searchFilter):
+            for pose in self.uiCB_filterPoses(searchFilter):
                 self.uiTS_poses(edit=True,
                                 append=pose,
                                 sc=cgmGEN.Callback(self.uiCB_setPoseSelected))
@@ -1627,7 +1659,12 @@ class manager(mUI.MelColumn):
             except Exception, error:
                 print error
                 
-            for pose in r9Core.filterListByString(self.poses, searchFilter, matchcase=False):  # self.buildFilteredPoseList(searchFilter):
+            for pose in self.uiCB_filterPoses(searchFilter):
+                _thumb = None
+                if self.poseIndex:
+                    _thumb = self.poseIndex.getThumbPath(pose, self.posePath)
+                if not _thumb:
+                    _thumb = os.path.join(self.posePath, '%s.bmp' % pose)
                 #print pose
                 #print PATHS.Path(os.path.join(self.posePath, '%s.bmp' % pose)).exists()
                 try:
@@ -1635,7 +1672,7 @@ class manager(mUI.MelColumn):
                     # first characters which are stripped my Maya!
                     _b = mc.iconTextCheckBox('_%s' % pose,
                                         style='iconAndTextVertical',
-                                        image=os.path.join(self.posePath, '%s.bmp' % pose),
+                                        image=_thumb,
                                         label=pose,
                                         bgc=self.poseButtonBGC,
                                         parent = self.uiGL_poses,
@@ -1720,27 +1757,36 @@ class manager(mUI.MelColumn):
                 mc.iconTextCheckBox(button, e=True, v=True, bgc=self.poseButtonHighLight)
         self.uiCB_setPoseSelected(current)
             
+    def uiCB_getPoseIndex(self):
+        '''
+        The Red9 pose index holding the posePath - the one built for the folder list root if it's loaded
+        '''
+        _index = r9PoseIndex.findIndex(self.posePath)
+        if _index is None:
+            _index = r9PoseIndex.getIndex(self.posePath, update = False)
+        _index.update()
+        self.poseIndex = _index
+        return _index
+    
     def uiCB_buildPoseList(self, sortBy='name'):
         '''
         Get a list of poses from the PoseRootDir, this allows us to
         filter much faster as it stops all the os calls, cached list instead
         '''
         self.poses = []
-        if not PATHS.Path(self.posePath):#os.path.exists(self.posePath):
+        if not PATHS.Path(self.posePath) or not os.path.exists(self.posePath):
             log.debug('posePath is invalid')
             return self.poses
-        files = os.listdir(self.posePath) if os.path.exists(self.posePath) else []
-        if sortBy == 'name':
-            files = r9Core.sortNumerically(files)
-            # files.sort()
-        elif sortBy == 'date':
-            files.sort(key=lambda x: os.stat(os.path.join(self.posePath, x)).st_mtime)
-            files.reverse()
-    
-        for f in files:
-            if f.lower().endswith('.pose'):
-                self.poses.append(f.split('.pose')[0])
+        self.poses = self.uiCB_getPoseIndex().getPoses(self.posePath, sortBy=sortBy)
         return self.poses
+    
+    def uiCB_filterPoses(self, searchFilter):
+        '''
+        Filter the pose list - via the index when we have one so tags and folder tokens match too
+        '''
+        if self.poseIndex and self.poses:
+            return self.poseIndex.filterPoses(self.poses, searchFilter, self.posePath)
+        return r9Core.filterListByString(self.poses or [], searchFilter, matchcase=False)
     #=====================================================================================================
     #Pose Stuff
     #=====================================================================================================#
@@ -1943,6 +1989,7 @@ class manager(mUI.MelColumn):
             except:
                 log.error('Unable to delete the Pose Icon file')
         r9General.thumbNailScreen(thumbPath, 128, 128)
+        r9PoseIndex.updateFile(self.uiPose_getPath())
         if sel:
             mc.select(sel)
         self.uiCB_fillPoses()
@@ -2223,6 +2270,7 @@ def buildColumn_main(self,parent,asScroll=False):
     self.poseGridMode = 'thumb'  # or text
     self.poseRootMode = 'RootNode'  # or MetaRig
     self.poses = None
+    self.poseIndex = None
     self.poseButtonBGC = [0.27, 0.3, 0.3]
     self.poseButtonHighLight = r9Setup.red9ButtonBGC('green')
     self.poseProjectMute = False  # whether to disable the save and update funcs in Project mode
@@ -2646,7 +2694,8 @@ class mrsPoseDirList(mUI.BaseMelWidget):
         
         _d_dir, _d_levels, _l_uiStrings, _d_uiStrings = walk_below_dir(path,
                                                                        uiStrings = 1,
-                                                                       fileTest = {'endsWith':'pose'})        
+                                                                       fileTest = {'endsWith':'pose'},
+                                                                       poseIndex = r9PoseIndex.getIndex(path))        
         
         self._l_uiStrings = _l_uiStrings
         self._d_dir = _d_dir
@@ -2755,7 +2804,7 @@ def mrsPoseDirSelect(self,ui = None):
         log.warning('No current PosePath set')
         return
 
-    dirs = [subdir for subdir in os.listdir(basePath) if os.path.isdir(os.path.join(basePath, subdir))]
+    dirs = [subdir for subdir in os.listdir(basePath) if not subdir.startswith('.') and os.path.isdir(os.path.join(basePath, subdir))]
     if not dirs:
         raise StandardError('Folder has no subFolders for pose scanning')
     for subdir in dirs:
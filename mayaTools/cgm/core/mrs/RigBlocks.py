@@ -24,6 +24,7 @@ import pprint
 # From Red9 =============================================================
 from Red9.core import Red9_Meta as r9Meta
 from Red9.core import Red9_AnimationUtils as r9Anim
+from Red9.core import Red9_Profiler as r9Profiler
 
 #========================================================================
 import logging
@@ -54,8 +55,10 @@ from cgm.core.cgmPy import validateArgs as VALID
 from cgm.core.cgmPy import path_Utils as PATH
 import cgm.core.classes.NodeFactory as NODEFAC
 import cgm.core.mrs.lib.shared_dat as BLOCKSHARE
+import cgm.core.mrs.lib.block_registry as BLOCKREGISTRY
 from cgm.core.mrs.lib import general_utils as BLOCKGEN
 import cgm.core.mrs.lib.builder_utils as BUILDERUTILS
+import cgm.core.mrs.lib.checkpoint_utils as CHECKPOINT
 import cgm.core.mrs.lib.block_utils as BLOCKUTILS
 import cgm.core.mrs.lib.puppet_utils as PUPPETUTILS
 import cgm.core.mrs.lib.module_utils as MODULEUTILS
@@ -2492,9 +2495,11 @@ def get_modules_dict(update=False):
 #@cgmGEN.Timer
 def get_modules_dat(update = False):
     """
-    Data gather for available blocks.
+    Data gather for available blocks. Block modules aren't imported here - the dict imports 
+    each on first access and everything else comes from the block manifest (see get_blockDat).
 
     :parameters:
+        update(bool): rebuild the buffer and reparse the block files
 
     :returns
         _d_modules, _d_categories, _l_unbuildable
@@ -2509,77 +2514,18 @@ def get_modules_dat(update = False):
         log.debug("|{0}| >> passing buffer...".format(_str_func))          
         return CGM_RIGBLOCK_DAT
     
-    
     _b_debug = log.isEnabledFor(logging.DEBUG)
 
-    import cgm.core.mrs.blocks as blocks
-    _path = PATH.Path(blocks.__path__[0])
-    _l_duplicates = []
-    _l_unbuildable = []
-    _base = _path.split()[-1]
-    _d_files =  {}
-    _d_modules = {}
-    _d_import = {}
-    _d_categories = {}
-
-    log.debug("|{0}| >> Checking base: {1} | path: {2}".format(_str_func,_base,_path))   
-    _i = 0
-    for root, dirs, files in os.walk(_path, True, None):
-        # Parse all the files of given path and reload python modules
-        _mBlock = PATH.Path(root)
-        _split = _mBlock.split()
-        _subRoot = _split[-1]
-        _splitUp = _split[_split.index(_base):]
-
-        log.debug("|{0}| >> On subroot: {1} | path: {2}".format(_str_func,_subRoot,root))   
-        log.debug("|{0}| >> On split: {1}".format(_str_func,_splitUp))   
-
-        if len(_split) == 1:
-            _cat = 'base'
-        else:_cat = _split[-1]
-        _l_cat = []
-        _d_categories[_cat]=_l_cat
-
-        for f in files:
-            key = False
-
-            if f.endswith('.py'):
-
-                if f == '__init__.py':
-                    continue
-                else:
-                    name = f[:-3]    
-            else:
-                continue
-
-            if _i == 'cat':
-                key = '.'.join([_base,name])                            
-            else:
-                key = '.'.join(_splitUp + [name])    
-                if key:
-                    log.debug("|{0}| >> ... {1}".format(_str_func,key))                      
-                    if name not in _d_modules.keys():
-                        _d_files[key] = os.path.join(root,f)
-                        _d_import[name] = key
-                        _l_cat.append(name)
-                        try:
-                            module = __import__(key, globals(), locals(), ['*'], -1)
-                            #reload(module) 
-                            _d_modules[name] = module
-                            #if not is_buildable(module):
-                                #_l_unbuildable.append(name)
-                        except Exception, e:
-                            log.warning("|{0}| >> Module failed: {1}".format(_str_func,key))                               
-                            cgmGEN.cgmExceptCB(Exception,e,msg=vars())
-
-                    else:
-                        _l_duplicates.append("{0} >> {1} ".format(key, os.path.join(root,f)))
-            _i+=1
+    _d_manifest = get_blockManifest(update)
+    _d_blocks = _d_manifest['blocks']
+    
+    _d_modules = BLOCKREGISTRY.BlockModules(dict((k,d['module']) for k,d in _d_blocks.iteritems()))
+    _d_categories = BLOCKREGISTRY.get_categories(_d_manifest)
+    _l_unbuildable = sorted([k for k,d in _d_blocks.iteritems() if not d.get('buildable')])
+    _l_duplicates = _d_manifest.get('duplicates',[])
 
     if _b_debug:
-        cgmGEN.walk_dat(_d_modules,"Modules")        
-        cgmGEN.walk_dat(_d_files,"Files")
-        cgmGEN.walk_dat(_d_import,"Imports")
+        cgmGEN.walk_dat(_d_blocks,"Manifest")        
         cgmGEN.walk_dat(_d_categories,"Categories")
 
     if _l_duplicates and _b_debug:
@@ -2588,7 +2534,7 @@ def get_modules_dat(update = False):
         for m in _l_duplicates:
             print(m)
         raise Exception,"Must resolve"
-    log.debug("|{0}| >> Found {1} modules under: {2}".format(_str_func,len(_d_files.keys()),_path))     
+    log.debug("|{0}| >> Found {1} modules".format(_str_func,len(_d_blocks)))     
     if _l_unbuildable and _b_debug:
         log.debug(cgmGEN._str_subLine)
         log.debug("|{0}| >> ({1}) Unbuildable modules....".format(_str_func,len(_l_unbuildable)))
@@ -2598,6 +2544,42 @@ def get_modules_dat(update = False):
     CGM_RIGBLOCK_DAT = _d_modules, _d_categories, _l_unbuildable
     return _d_modules, _d_categories, _l_unbuildable
 
+global CGM_RIGBLOCK_MANIFEST
+CGM_RIGBLOCK_MANIFEST = None
+
+def get_blockManifest(update = False):
+    """
+    Manifest of the block files - read from the on disk cache, reparsing only the files changed since.
+
+    :parameters:
+        update(bool): reparse everything
+
+    :returns
+        manifest(dict) - see block_registry.get_manifest
+    """
+    global CGM_RIGBLOCK_MANIFEST
+    if CGM_RIGBLOCK_MANIFEST and not update:
+        return CGM_RIGBLOCK_MANIFEST
+    
+    import cgm.core.mrs.blocks as blocks
+    CGM_RIGBLOCK_MANIFEST = BLOCKREGISTRY.get_manifest(blocks.__path__[0],
+                                                       blocks.__name__,
+                                                       _d_requiredModuleDat,
+                                                       update)
+    return CGM_RIGBLOCK_MANIFEST
+
+def get_blockDat(blockType):
+    """
+    Manifest data for a blockType without importing it
+
+    :parameters:
+        blockType(str)
+
+    :returns
+        dict - module,category,version,menuVisible,buildOrder,profiles,status,buildable. Empty if not found
+    """
+    return get_blockManifest()['blocks'].get(blockType,{})
+
 
 def get_blockModule(blockType,update=False):
     """
@@ -3364,7 +3346,9 @@ class rigFactory(object):
 
         log.debug("|{0}| >> Rigged: {1}".format(_str_func,_b_rigged))            
 
-        if _b_rigged and not _d_callKWS['forceNew'] and _d_callKWS['ignoreRigCheck'] is not True:
+        _b_incremental = _d_callKWS.get('incremental') and CHECKPOINT.has_checkpoints(self.mBlock)
+
+        if _b_rigged and not _d_callKWS['forceNew'] and _d_callKWS['ignoreRigCheck'] is not True and not _b_incremental:
             log.warning("|{0}| >> Already rigged and not forceNew".format(_str_func))                    
             return False
 
@@ -3372,10 +3356,19 @@ class rigFactory(object):
         if _version != _buildVersion:
             self.b_outOfDate = True
             log.warning("|{0}| >> Versions don't match: rigNull: {1} | buildModule: {2}".format(_str_func,_version,_buildVersion))                            
+            if _b_incremental:
+                log.warning("|{0}| >> Stale version. Clearing checkpoints, full build".format(_str_func))
+                CHECKPOINT.clear(self.mBlock)
         else:
             if _d_callKWS['forceNew'] and _b_rigged:
                 log.warning("|{0}| >> Force new and is rigged. Deleting rig...NOT IMPLEMENTED".format(_str_func))                    
                 #_mModule.rigDelete()
+                if _b_incremental:
+                    log.warning("|{0}| >> Force new. Clearing checkpoints, full build".format(_str_func))
+                    CHECKPOINT.clear(self.mBlock)
+            elif _b_incremental:
+                log.info("|{0}| >> Incremental build from checkpoints".format(_str_func))
+                self.b_outOfDate = True
             else:
                 log.info("|{0}| >> Up to date.".format(_str_func))                    
                 return False
@@ -3682,69 +3675,149 @@ class rigFactory(object):
         log.debug("|{0}| >> Time >> = {1} seconds".format(_str_func, "%0.3f"%(time.clock()-_start)))            
 
     def doBuild(self,buildTo = '',**kws):
+        """
+        Run the block module's __l_rigBuildOrder__. Each finished step is checkpointed - a fingerprint of its
+        inputs, the nodes it made and the factory state going in. With the incremental call kw a rebuild
+        deletes the nodes from the first step whose fingerprint changed on and builds from there.
+
+        :parameters:
+            buildTo(str/int) | step name or index to stop after
+
+        call kws:
+            incremental(bool) | resume from checkpoints where they're current
+            checkpoint(bool) | record checkpoints. Default True
+            deferNames(bool) | queue each step's doName calls and rename in one pass at the end of the step,
+                see nameTools.NameQueue. Default False
+        """
         _str_func = 'doBuild'  
         _start = time.clock()
         
+        with r9Profiler.span(self.d_block['shortName'], 'block', blockType = self.mBlock.blockType):
+            try:
+                _l_buildOrder = self.d_block['buildModule'].__dict__.get('__l_rigBuildOrder__')
+                if not _l_buildOrder:
+                    raise ValueError,"No build order found"
+                _len = len(_l_buildOrder)
 
-        try:
-            _l_buildOrder = self.d_block['buildModule'].__dict__.get('__l_rigBuildOrder__')
-            if not _l_buildOrder:
-                raise ValueError,"No build order found"
-            _len = len(_l_buildOrder)
-
-            if not _len:
-                log.error("|{0}| >> No steps to build!".format(_str_func))                    
-                return False
-            #Build our progress Bar
-            try:mayaMainProgressBar = CGMUI.doStartMayaProgressBar(_len)
-            except:mayaMainProgressBar = None
-
-            for i,fnc in enumerate(_l_buildOrder):
-                _str_func = '_'.join(fnc.split('_')[1:])
+                if not _len:
+                    log.error("|{0}| >> No steps to build!".format(_str_func))                    
+                    return False
                 
-                if mayaMainProgressBar:
-                    mc.progressBar(mayaMainProgressBar, edit=True,
-                                   status = "|{0}| >>Rig>> step: {1}...".format(self.d_block['shortName'],fnc), progress=i+1)                    
+                #>>Checkpoints -------------------------------------------------------------------------
+                _b_checkpoint = self.call_kws.get('checkpoint',True)
+                _b_deferNames = self.call_kws.get('deferNames',False)
+                _l_fingerprints = [None] * _len
+                _idx_start = 0
+                if _b_checkpoint:
+                    _l_fingerprints = CHECKPOINT.get_stepFingerprints(self.mBlock, self.d_block['buildModule'],
+                                                                      _l_buildOrder, self.d_block.get('buildVersion'))
+                    if self.call_kws.get('incremental'):
+                        _idx_start = self.fnc_resumeCheckpoint(_l_buildOrder,_l_fingerprints)
+                        if _idx_start >= _len:
+                            log.info("|{0}| >> [{1}] All steps current.".format(_str_func,self.d_block['shortName']))
+                            return True
+                    else:
+                        CHECKPOINT.clear(self.mBlock)
+                        
+                #Build our progress Bar
+                try:mayaMainProgressBar = CGMUI.doStartMayaProgressBar(_len)
+                except:mayaMainProgressBar = None
+
+                for i,fnc in enumerate(_l_buildOrder):
+                    if i < _idx_start:
+                        continue
+                    _str_subFunc = '_'.join(fnc.split('_')[1:])
                 
-                mc.undoInfo(openChunk=True,chunkName=fnc)
+                    if mayaMainProgressBar:
+                        mc.progressBar(mayaMainProgressBar, edit=True,
+                                       status = "|{0}| >>Rig>> step: {1}...".format(self.d_block['shortName'],fnc), progress=i+1)                    
                 
+                    mc.undoInfo(openChunk=True,chunkName=fnc)
                 
-                err=None
-                try:
-                    getattr(self.d_block['buildModule'],fnc)(self)            
-                except Exception,err:
-                    log.error(err)
+                    if _b_checkpoint:
+                        CHECKPOINT.store_state(self.mBlock, fnc, CHECKPOINT.snapshot_state(self.__dict__))
+                    _stepStart = time.clock()
+                
+                    err=None
+                    _stepNodes = CHECKPOINT.StepNodes(active = _b_checkpoint,
+                                                      watch = CHECKPOINT.get_stepNodes(self.mBlock, _l_buildOrder[:i]) if _b_checkpoint else None)
+                    try:
+                        with r9Profiler.span(fnc, 'step', block = self.d_block['shortName']):
+                            with _stepNodes:
+                                with nameTools.NameQueue(active = _b_deferNames):
+                                    getattr(self.d_block['buildModule'],fnc)(self)            
+                    except Exception,err:
+                        log.error(err)
             
-                finally:
-                    mc.undoInfo(closeChunk=True)            
-                    if err is not None:
-                        cgmGEN.cgmExceptCB(Exception,err,localDat=vars())                        
+                    finally:
+                        mc.undoInfo(closeChunk=True)            
+                        _stepTime = time.clock()-_stepStart
+                        log.debug("|{0}| >> [{1}] step: {2} | {3} seconds".format(_str_func,self.d_block['shortName'],fnc,"%0.3f"%_stepTime))
+                        if _b_checkpoint:
+                            CHECKPOINT.record_step(self.mBlock, fnc,
+                                                   _l_fingerprints[i] if err is None else None,#...failed steps rebuild
+                                                   _stepNodes.get_uuids(), _stepTime, _stepNodes.l_touched)
+                        if err is not None:
+                            cgmGEN.cgmExceptCB(Exception,err,localDat=vars())                        
                 
                 
-                    if buildTo is not None:
-                        _Break = False
-                        if VALID.stringArg(buildTo):
-                            if buildTo == fnc:
+                        if buildTo is not None:
+                            _Break = False
+                            if VALID.stringArg(buildTo):
+                                if buildTo == fnc:
+                                    _Break = True
+                            elif buildTo == i:
                                 _Break = True
-                        elif buildTo == i:
-                            _Break = True
                 
-                        if _Break:
-                            log.debug("|{0}| >> Stopped at step: [{1}]".format(_str_func, _str_subFunc))   
-                            break                                
+                            if _Break:
+                                log.debug("|{0}| >> Stopped at step: [{1}]".format(_str_func, _str_subFunc))   
+                                break                                
                 
                     
-            #self.mBlock.addAttr('rigNodeBuffer','message',l_diff)
+                #self.mBlock.addAttr('rigNodeBuffer','message',l_diff)
             
-            if mayaMainProgressBar:CGMUI.doEndMayaProgressBar(mayaMainProgressBar)#Close out this progress bar    
-        except Exception,err:
-            CGMUI.doEndMayaProgressBar()#Close out this progress bar
-            cgmGEN.cgmException(Exception,err,msg=vars())
+                if mayaMainProgressBar:CGMUI.doEndMayaProgressBar(mayaMainProgressBar)#Close out this progress bar    
+            except Exception,err:
+                CGMUI.doEndMayaProgressBar()#Close out this progress bar
+                cgmGEN.cgmException(Exception,err,msg=vars())
 
-            raise Exception,"|{0}| >> err: {1}".format(_str_func,err)
+                raise Exception,"|{0}| >> err: {1}".format(_str_func,err)
 
         log.info("|{0}| >> Time >> = {1} seconds".format(_str_func, "%0.3f"%(time.clock()-_start)))
 
+    def fnc_resumeCheckpoint(self, l_buildOrder, l_fingerprints):
+        """
+        Rewind to the first step whose checkpoint is out of date and restore the factory state going into it.
+        When a step being rebuilt edited nodes from an earlier step - locks, constraints, connections - the rewind
+        goes back to the step that made those nodes, see CHECKPOINT.get_resumeIndex
+
+        :returns
+            step index to build from
+        """
+        _str_func = 'fnc_resumeCheckpoint'
+        _idx = CHECKPOINT.get_resumeIndex(self.mBlock, l_buildOrder, l_fingerprints)
+        if _idx >= len(l_buildOrder):
+            return _idx
+        
+        _d_state = CHECKPOINT.rewind(self.mBlock, l_buildOrder, _idx)
+        if _idx and _d_state is None:
+            log.warning("|{0}| >> No state for step: {1}. Building from start".format(_str_func,l_buildOrder[_idx]))
+            CHECKPOINT.rewind(self.mBlock, l_buildOrder, 0)
+            return 0
+        
+        if _idx:
+            #...keep this call's module and kws, everything else is as it was going into the step
+            _buildModule = self.d_block['buildModule']
+            _callKWS = self.call_kws
+            self.__dict__.update(CHECKPOINT.snapshot_state(_d_state))
+            self.buildModule = _buildModule
+            self.d_block['buildModule'] = _buildModule
+            self.call_kws = _callKWS
+        
+        log.info("|{0}| >> [{1}] Resuming from step: {2} ({3}/{4})".format(_str_func,self.d_block['shortName'],
+                                                                           l_buildOrder[_idx],_idx+1,len(l_buildOrder)))
+        return _idx
+
     def build_rigJoints(self):
         _str_func = 'build_rigJoints'  
         _res = True
@@ -4832,6 +4905,11 @@ def get_blockProfile_options(arg):
     try:
         _str_func = 'get_blockProfile_options'
         
+        if VALID.stringArg(arg) and not get_modules_dict().is_loaded(arg):
+            _l_profiles = get_blockDat(arg).get('profiles')
+            if _l_profiles is not None:
+                return list(_l_profiles)
+        
         mBlockModule = get_blockModule(arg)
         
         log.debug("|{0}| >>  {1}".format(_str_func,arg)+ '-'*80)
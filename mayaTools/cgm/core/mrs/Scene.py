@@ -20,6 +20,7 @@ from cgm.core import cgm_General as cgmGEN
 from cgm.core.lib import math_utils as MATH
 
 import Red9.core.Red9_General as r9General
+import Red9.core.Red9_Profiler as r9Profiler
 
 import cgm.core.classes.GuiFactory as cgmUI
 mUI = cgmUI.mUI
@@ -2013,7 +2014,10 @@ example:
 
 			pprint.pprint(l_dat)
 
-			BATCH.create_Scene_batchFile(l_dat)
+			if len(l_dat) > 1:
+				BATCH.create_Scene_batchPool(l_dat)
+			else:
+				BATCH.create_Scene_batchFile(l_dat)
 			return
 
 
@@ -2163,35 +2167,39 @@ def BatchExport(dataList = []):
 			log.error("Invalid file: {0}".format(_path))
 			continue
 
-		mc.file(_path, open = 1, f = 1, iv = 1)
+		with r9Profiler.span(mFile.name(), 'file', path = _path, mode = _d['mode']):
+			mc.file(_path, open = 1, f = 1, iv = 1)
 
-		# if not _d['exportObjs']:
-		# 	log.info(cgmGEN.logString_sub(_str_func,"Trying to find masters..."))
+			# if not _d['exportObjs']:
+			# 	log.info(cgmGEN.logString_sub(_str_func,"Trying to find masters..."))
 
-		# 	l_masters = []
-		# 	for item in mc.ls("*:master", r=True):
-		# 		if len(item.split(":")) == 2:
-		# 			masterNode = item
-		# 			l_masters.append(item)
+			# 	l_masters = []
+			# 	for item in mc.ls("*:master", r=True):
+			# 		if len(item.split(":")) == 2:
+			# 			masterNode = item
+			# 			l_masters.append(item)
 
-		# 		#if mc.checkBox(self.updateCB, q=True, v=True):
-		# 			#rig = ASSET.Asset(item)
-		# 			#if rig.UpdateToLatest():
-		# 				#self.SaveVersion()
+			# 		#if mc.checkBox(self.updateCB, q=True, v=True):
+			# 			#rig = ASSET.Asset(item)
+			# 			#if rig.UpdateToLatest():
+			# 				#self.SaveVersion()
 
-		# 	if l_masters:
-		# 		log.info(cgmGEN.logString_msg(_str_func,"Found..."))
-		# 		pprint.pprint(l_masters)
+			# 	if l_masters:
+			# 		log.info(cgmGEN.logString_msg(_str_func,"Found..."))
+			# 		pprint.pprint(l_masters)
 
-		# 		_d['exportObjs'] = l_masters
+			# 		_d['exportObjs'] = l_masters
 
 
-		#if _objs:
-		#    mc.select(_objs)
-		ExportScene(**_d)        
+			#if _objs:
+			#    mc.select(_objs)
+			ExportScene(**_d)        
 
 	t2 = time.time()
 	log.info("|{0}| >> Total Time >> = {1} seconds".format(_str_func, "%0.4f"%( t2-t1 )))         
+	if r9Profiler.isEnabled():
+		r9Profiler.report()
+		r9Profiler.export()
 
 	return
 
@@ -0,0 +1,429 @@
+"""
+------------------------------------------
+cgm.core.mrs.lib.batch_pool
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Parallel batch runner. Shards a dataList across a pool of headless worker processes
+(mayapy by default). Each worker is initialized once and reused for as many files as
+it's handed.
+
+Parent and worker talk json lines over the worker's stdin/stdout. The worker moves
+anything else writing to stdout (maya, prints) over to stderr so the channel stays clean.
+
+    parent -> worker : {"id":0, "data":{...}} | {"event":"quit"}
+    worker -> parent : {"event":"ready", ...} | {"event":"done", "id":0, "status":"ok"/"error", "time":1.2, ...}
+
+This module sticks to the standard library at the top level so it can be run as a
+script by any python:
+
+    mayapy batch_pool.py --run job.json
+    mayapy batch_pool.py --worker --handler scene --workspace d:/project
+
+Handlers:
+    scene -- maya standalone, cgm Scene.BatchExport per file
+    standin -- no maya. Sleeps/fails/crashes on request, for testing the pool
+    module:function -- any importable callable taking the file dict
+================================================================
+"""
+# From Python =============================================================
+import os
+import sys
+import json
+import time
+import threading
+import traceback
+import subprocess
+from collections import deque
+
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+__version__ = 'alpha.1.10212019'
+
+_str_thisFile = os.path.abspath(__file__).replace('.pyc','.py')
+_str_mayaToolsRoot = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(_str_thisFile)))))
+
+#=============================================================================================================
+#>> Parent
+#=============================================================================================================
+def get_mayapy():
+    """
+    Best guess at the mayapy for this session
+    """
+    _exe = 'mayapy.exe' if sys.platform.startswith('win') else 'mayapy'
+    _l_check = []
+    if os.environ.get('MAYA_LOCATION'):
+        _l_check.append(os.path.join(os.environ['MAYA_LOCATION'],'bin',_exe))
+    _l_check.append(os.path.join(os.path.dirname(sys.executable),_exe))
+    for p in _l_check:
+        if os.path.exists(p):
+            return p
+    return sys.executable
+
+def get_workerCount(count = None, tasks = None):
+    """
+    Default worker count - leave a core for the parent, never more workers than tasks
+    """
+    if not count:
+        try:
+            import multiprocessing
+            count = max(1, multiprocessing.cpu_count() - 1)
+        except NotImplementedError:
+            count = 1
+    if tasks is not None:
+        count = min(count, max(1, tasks))
+    return int(count)
+
+class BatchPool(object):
+    """
+    Runs a handler over a dataList with a pool of reusable worker processes.
+
+    :parameters:
+        dataList(list): list of dicts, one per file
+        workers(int): worker count. None for cpu count - 1
+        handler(str): worker handler - 'scene','standin' or 'module:function'
+        python(str): interpreter for the workers. None for mayapy
+        workspace(str): maya workspace for the scene handler
+        plugins(list): plugins to load once per worker
+        retries(int): times to retry a file whose worker crashed or timed out
+        timeout(float): seconds per file before the worker is killed. None for no limit
+        reportPath(str): json summary report path. Worker logs go alongside it
+        onStatus(callable): called with each result dict as it comes in
+
+    :returns
+        report(dict) from run()
+    """
+    def __init__(self, dataList = [], workers = None, handler = 'scene', python = None,
+                 workspace = None, plugins = ['fbxmaya'], retries = 1, timeout = None,
+                 reportPath = None, onStatus = None):
+        self.dataList = list(dataList)
+        self.workers = get_workerCount(workers, len(self.dataList))
+        self.handler = handler
+        self.python = python or get_mayapy()
+        self.workspace = workspace
+        self.plugins = list(plugins or [])
+        self.retries = int(retries)
+        self.timeout = timeout
+        self.reportPath = reportPath
+        self.onStatus = onStatus
+
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._l_results = []
+        self._d_workerStarts = {}
+
+    def get_workerCommand(self):
+        _l = [self.python, _str_thisFile, '--worker', '--handler', self.handler]
+        if self.workspace:
+            _l.extend(['--workspace', self.workspace])
+        for p in self.plugins:
+            _l.extend(['--plugin', p])
+        return _l
+
+    def _startWorker(self, slot):
+        _env = dict(os.environ)
+        _env['PYTHONPATH'] = os.pathsep.join([p for p in [_str_mayaToolsRoot, _env.get('PYTHONPATH')] if p])
+
+        if self.reportPath:
+            _log = open(os.path.join(os.path.dirname(os.path.abspath(self.reportPath)),
+                                     'batch_worker_{0}.log'.format(slot)),'a')
+        else:
+            _log = open(os.devnull,'w')
+
+        proc = subprocess.Popen(self.get_workerCommand(),
+                                stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = _log,
+                                env = _env, universal_newlines = True)
+        proc._cgmLog = _log
+        with self._lock:
+            self._d_workerStarts[slot] = self._d_workerStarts.get(slot,0) + 1
+
+        _msg = self._readMessage(proc)
+        if not _msg or _msg.get('event') != 'ready':
+            self._stopWorker(proc, kill = True)
+            return None
+        log.debug("worker {0} ready | pid: {1} | init: {2}".format(slot, proc.pid, _msg.get('time')))
+        return proc
+
+    def _stopWorker(self, proc, kill = False):
+        try:
+            if kill:
+                proc.kill()
+            else:
+                proc.stdin.write(json.dumps({'event':'quit'}) + '\n')
+                proc.stdin.flush()
+                proc.stdin.close()
+            proc.wait()
+        except Exception:
+            pass
+        try:proc._cgmLog.close()
+        except Exception:pass
+
+    def _readMessage(self, proc):
+        """
+        Next json message from a worker. None if it died.
+        """
+        while True:
+            _line = proc.stdout.readline()
+            if not _line:
+                return None
+            try:
+                return json.loads(_line)
+            except ValueError:
+                continue
+
+    def _runTask(self, proc, task):
+        try:
+            proc.stdin.write(json.dumps({'id':task['index'], 'data':task['data']}) + '\n')
+            proc.stdin.flush()
+        except (IOError, OSError, ValueError):
+            return None
+
+        _timer = None
+        if self.timeout:
+            _timer = threading.Timer(self.timeout, proc.kill)
+            _timer.start()
+        try:
+            while True:
+                _msg = self._readMessage(proc)
+                if _msg is None:
+                    return None
+                if _msg.get('event') == 'done' and _msg.get('id') == task['index']:
+                    return _msg
+        finally:
+            if _timer:
+                _timer.cancel()
+
+    def _nextTask(self):
+        with self._lock:
+            if self._queue:
+                return self._queue.popleft()
+        return None
+
+    def _record(self, task, status, slot, d_msg = {}):
+        _d = {'index':task['index'],
+              'file':task['data'].get('file'),
+              'status':status,
+              'time':d_msg.get('time', time.time() - task['start']),
+              'attempts':task['attempts'],
+              'worker':slot}
+        if d_msg.get('error'):
+            _d['error'] = d_msg.get('error')
+            _d['traceback'] = d_msg.get('traceback')
+        with self._lock:
+            self._l_results.append(_d)
+            _done = len(self._l_results)
+        log.info("[{0}/{1}] {2} | {3} | {4:.2f}s | worker {5}".format(_done, len(self.dataList), status,
+                                                                     _d['file'], _d['time'], slot))
+        if self.onStatus:
+            try:self.onStatus(_d)
+            except Exception,err:
+                log.error("onStatus failed | {0}".format(err))
+
+    def _workerLoop(self, slot):
+        proc = None
+        while True:
+            task = self._nextTask()
+            if task is None:
+                break
+            task['attempts'] += 1
+            task['start'] = time.time()
+
+            if proc is None:
+                proc = self._startWorker(slot)
+            _msg = self._runTask(proc, task) if proc else None
+
+            if _msg is None:
+                #...worker died or timed out. Fresh worker for whatever's next
+                if proc:
+                    self._stopWorker(proc, kill = True)
+                proc = None
+                if task['attempts'] <= self.retries:
+                    log.warning("worker {0} crashed on {1}. Retrying ({2}/{3})".format(slot, task['data'].get('file'),
+                                                                                  task['attempts'], self.retries))
+                    with self._lock:
+                        self._queue.append(task)
+                else:
+                    self._record(task, 'crashed', slot, {'error':'Worker crashed or timed out'})
+                continue
+
+            self._record(task, _msg.get('status','error'), slot, _msg)
+
+        if proc:
+            self._stopWorker(proc)
+
+    def run(self):
+        """
+        Process the dataList. Blocks until done.
+
+        :returns
+            report(dict)
+        """
+        t1 = time.time()
+        self._l_results = []
+        self._d_workerStarts = {}
+        self._queue = deque({'index':i, 'data':d, 'attempts':0} for i,d in enumerate(self.dataList))
+
+        log.info("BatchPool | {0} files | {1} workers | handler: {2}".format(len(self.dataList), self.workers, self.handler))
+
+        _l_threads = []
+        for i in range(self.workers):
+            _t = threading.Thread(target = self._workerLoop, args = (i,))
+            _t.daemon = True
+            _t.start()
+            _l_threads.append(_t)
+        for _t in _l_threads:
+            while _t.is_alive():
+                _t.join(.5)
+
+        _l_results = sorted(self._l_results, key = lambda d:d['index'])
+        _d_counts = {}
+        for d in _l_results:
+            _d_counts[d['status']] = _d_counts.get(d['status'],0) + 1
+
+        report = {'version':__version__,
+                  'handler':self.handler,
+                  'workers':self.workers,
+                  'workerStarts':sum(self._d_workerStarts.values()),
+                  'total':len(self.dataList),
+                  'counts':_d_counts,
+                  'time':time.time() - t1,
+                  'results':_l_results}
+
+        log.info("BatchPool | done in {0:.2f}s | {1}".format(report['time'], _d_counts))
+        if self.reportPath:
+            with open(self.reportPath,'w') as f:
+                json.dump(report, f, indent = 4)
+            log.info("BatchPool | report: {0}".format(self.reportPath))
+        return report
+
+def run_job(jobPath):
+    """
+    Run a job file written by batch_utils.create_Scene_batchPool
+    """
+    with open(jobPath) as f:
+        _d = json.load(f)
+    _dataList = _d.pop('dataList')
+    return BatchPool(_dataList, **_d).run()
+
+#=============================================================================================================
+#>> Worker
+#=============================================================================================================
+def _handler_standin(workspace = None, plugins = []):
+    """
+    No maya. For testing the pool - honors sleep, fail, crash and crashOnce(marker file path) keys
+    """
+    def _handler(fileDat):
+        time.sleep(float(fileDat.get('sleep',0)))
+        if fileDat.get('crashOnce') and not os.path.exists(fileDat['crashOnce']):
+            open(fileDat['crashOnce'],'w').close()
+            os._exit(3)
+        if fileDat.get('crash'):
+            os._exit(3)
+        if fileDat.get('fail'):
+            raise ValueError("standin fail: {0}".format(fileDat.get('file')))
+        return True
+    return _handler, None
+
+def _handler_scene(workspace = None, plugins = []):
+    """
+    Maya standalone, initialized once. Each file goes through Scene.BatchExport
+    and the scene is cleared after.
+    """
+    from maya import standalone
+    standalone.initialize()
+    import maya.cmds as mc
+    for p in plugins:
+        try:mc.loadPlugin(p, quiet = True)
+        except Exception,err:
+            log.error("Plugin failed to load: {0} | {1}".format(p, err))
+    if workspace:
+        mc.workspace(workspace, openWorkspace = 1)
+    from cgm.core.mrs import Scene
+
+    def _handler(fileDat):
+        if not os.path.exists(fileDat.get('file','')):
+            raise ValueError("Invalid file: {0}".format(fileDat.get('file')))
+        try:
+            Scene.BatchExport([fileDat])
+        finally:
+            mc.file(new = True, force = True)
+        return True
+    return _handler, standalone.uninitialize
+
+def _get_handler(handler, workspace = None, plugins = []):
+    if handler == 'scene':
+        return _handler_scene(workspace, plugins)
+    if handler == 'standin':
+        return _handler_standin(workspace, plugins)
+    _module, _func = handler.split(':')
+    __import__(_module)
+    return getattr(sys.modules[_module], _func), None
+
+def worker_main(handler = 'scene', workspace = None, plugins = []):
+    """
+    Worker loop. Initializes the handler once then processes files until stdin closes or it gets quit
+    """
+    #...keep a private copy of stdout for our messages, everything else goes to stderr
+    _proto = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    def _send(d):
+        _proto.write(json.dumps(d) + '\n')
+        _proto.flush()
+
+    t1 = time.time()
+    _handler, _shutdown = _get_handler(handler, workspace, plugins)
+    _send({'event':'ready', 'pid':os.getpid(), 'time':time.time() - t1})
+
+    for _line in iter(sys.stdin.readline, ''):
+        try:
+            _msg = json.loads(_line)
+        except ValueError:
+            continue
+        if _msg.get('event') == 'quit':
+            break
+
+        t1 = time.time()
+        _d = {'event':'done', 'id':_msg.get('id'), 'status':'ok'}
+        try:
+            _handler(_msg.get('data') or {})
+        except Exception,err:
+            _d['status'] = 'error'
+            _d['error'] = str(err)
+            _d['traceback'] = traceback.format_exc()
+        _d['time'] = time.time() - t1
+        _send(_d)
+
+    if _shutdown:
+        try:_shutdown()
+        except Exception:pass
+
+def main(args = None):
+    import argparse
+    parser = argparse.ArgumentParser(description = 'cgm batch pool')
+    parser.add_argument('--worker', action = 'store_true')
+    parser.add_argument('--handler', default = 'scene')
+    parser.add_argument('--workspace', default = None)
+    parser.add_argument('--plugin', action = 'append', default = [])
+    parser.add_argument('--run', default = None, help = 'job json to run as the parent')
+    _args = parser.parse_args(args)
+
+    if _args.worker:
+        worker_main(_args.handler, _args.workspace, _args.plugin)
+        return 0
+    if _args.run:
+        _report = run_job(_args.run)
+        return 0 if _report['counts'].get('ok',0) == _report['total'] else 1
+    parser.print_help()
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,6 +17,7 @@ import time
 import os
 import os.path
 import sys
+import json
 import subprocess, os
 
 #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
@@ -37,6 +38,7 @@ import cgm.core.cgmPy.path_Utils as PATHS
 import cgm.core.mrs.RigBlocks as RIGBLOCKS
 import cgm.core.mrs.lib.general_utils as BLOCKGEN
 from cgm.core.tools import Project as PROJECT
+import cgm.core.mrs.lib.batch_pool as BATCHPOOL
 
 # From cgm ==============================================================
 from cgm.core import cgm_Meta as cgmMeta
@@ -51,6 +53,96 @@ __version__ = 'alpha.1.10212019'
 
 
 
+def get_projectBatchPaths():
+    """
+    Root and content paths of the current project for batch files
+    """
+    var_project = cgmMeta.cgmOptionVar('cgmVar_projectCurrent',defaultValue = '')
+    
+    mProject = PROJECT.data(filepath = var_project.value )
+    
+    d_paths = mProject.userPaths_get()
+    
+    mPath_root = PATHS.Path( d_paths['root'])
+    if mPath_root.exists():
+        log.debug('Root | : {0}'.format(mPath_root.asFriendly()))
+        
+    else:
+        log.debug('Root | Invalid Path: {0}'.format(mPath_root))
+        
+    mPath_content = PATHS.Path( d_paths['content'])
+    if os.path.exists(mPath_content):
+        log.debug('Root | : {0}'.format(mPath_content))
+    else:
+        log.debug('Root | Invalid Path: {0}'.format(mPath_content))        
+    return mPath_root, mPath_content
+
+def get_sceneBatchDat(dat = []):
+    """
+    Scene.BatchExport takes its values as they come out of a written batch file - 
+    lists for paths and objs, strings for everything else. Match that for anything we pass as json.
+    """
+    _l = []
+    for d2 in dat:
+        _d = {}
+        for k,d in d2.iteritems():
+            if k == 'objs' or 'Path' in k:
+                _d[k] = [str(o) for o in (d or [])]
+            else:
+                _d[k] = str(d)
+        _l.append(_d)
+    return _l
+
+def _popen_detached(cmd):
+    if sys.platform.startswith('win'):
+        return subprocess.Popen(cmd, creationflags = subprocess.CREATE_NEW_CONSOLE)
+    return subprocess.Popen(cmd)
+
+def create_Scene_batchPool(dat = [], workers = None, process = True, retries = 1, timeout = None,
+                           jobPath = None, reportPath = None):
+    """
+    Parallel take on create_Scene_batchFile. Writes a job file for batch_pool and runs it in its
+    own process - which shards the dat across a pool of mayapy workers, each initialized once.
+    
+    :parameters:
+        dat(list): file dicts as per Scene.BatchExport
+        workers(int): worker count. None for cpu count - 1
+        process(bool): launch the job
+        retries(int): retries for a file whose worker crashed
+        timeout(float): seconds per file before the worker is killed
+        jobPath(str): job file. Defaults to the project root
+        reportPath(str): json summary report. Defaults to next to the job file
+        
+    :returns
+        jobPath(str)
+    """
+    _str_func = 'create_Scene_batchPool'
+    cgmGEN.log_start(_str_func)
+    
+    mPath_root, mPath_content = get_projectBatchPaths()
+    if jobPath is None:
+        jobPath = os.path.join(mPath_root.asFriendly(),'mrsScene_batchJob.json')
+    if reportPath is None:
+        reportPath = os.path.splitext(jobPath)[0] + '_report.json'
+    
+    _d_job = {'dataList':get_sceneBatchDat(dat),
+              'workers':BATCHPOOL.get_workerCount(workers, len(dat)),
+              'handler':'scene',
+              'python':BATCHPOOL.get_mayapy(),
+              'workspace':PATHS.Path(mPath_content).asFriendly(),
+              'retries':retries,
+              'timeout':timeout,
+              'reportPath':reportPath}
+    
+    log.warning("Writing job: {0} | files: {1} | workers: {2}".format(jobPath, len(dat), _d_job['workers']))
+    with open(jobPath,'w') as f:
+        json.dump(_d_job, f, indent = 4)
+        
+    if process:
+        log.debug(cgmGEN.logString_sub(_str_func,"Processing ..."))        
+        _popen_detached([_d_job['python'], BATCHPOOL._str_thisFile, '--run', jobPath])
+    return jobPath
+
 def create_Scene_batchFile(dat = [], batchFile = None, process = True,
                            postProcesses = True, deleteAfterProcess = False):
     
@@ -58,26 +150,7 @@ def create_Scene_batchFile(dat = [], batchFile = None, process = True,
     cgmGEN.log_start(_str_func)
     
     if batchFile is None:
-        var_project = cgmMeta.cgmOptionVar('cgmVar_projectCurrent',defaultValue = '')
-        
-        mProject = PROJECT.data(filepath = var_project.value )
-        
-        d_paths = mProject.userPaths_get()
-        
-        mPath_root = PATHS.Path( d_paths['root'])
-        if mPath_root.exists():
-            log.debug('Root | : {0}'.format(mPath_root.asFriendly()))
-            
-        else:
-            log.debug('Root | Invalid Path: {0}'.format(mPath_root))
-            
-        mPath_content = PATHS.Path( d_paths['content'])
-        if os.path.exists(mPath_content):
-            log.debug('Root | : {0}'.format(mPath_content))
-        else:
-            log.debug('Root | Invalid Path: {0}'.format(mPath_content))        
-            
-            
+        mPath_root, mPath_content = get_projectBatchPaths()
         _batchPath = os.path.join(mPath_root.asFriendly(),'mrsScene_batch.py')
     
         
@@ -85,6 +158,7 @@ def create_Scene_batchFile(dat = [], batchFile = None, process = True,
     
     
     l_pre = ['import maya',
+    'import sys',
     'from maya import standalone',
     'standalone.initialize()',
     'from cgm.core.mrs import Scene',
@@ -99,9 +173,10 @@ def create_Scene_batchFile(dat = [], batchFile = None, process = True,
     
     l_post = ['except Exception,err:',
               '    print err',
-    '    import msvcrt#...waits for key',
-    '    om2.MGlobal.displayInfo("Hit a key to continue")',
-    '    msvcrt.getch()',
+    '    if sys.platform.startswith("win"):',
+    '        import msvcrt#...waits for key',
+    '        om2.MGlobal.displayInfo("Hit a key to continue")',
+    '        msvcrt.getch()',
     '',
     'om2.MGlobal.displayInfo("End")',
     'standalone.uninitialize()'    ]
@@ -163,10 +238,8 @@ def create_Scene_batchFile(dat = [], batchFile = None, process = True,
         log.debug(cgmGEN.logString_sub(_str_func,"Processing ..."))        
         log.warning("Processing file: {0}".format(mTar.asFriendly()))            
         #subprocess.call([sys.argv[0].replace("maya.exe","mayapy.exe"),f.asFriendly()])
-        subprocess.Popen([sys.argv[0].replace("maya.exe",
-                                              "mayapy.exe"),'-i',
-                          mTar.asFriendly()],
-                         creationflags = subprocess.CREATE_NEW_CONSOLE)# env=my_env
+        _popen_detached([BATCHPOOL.get_mayapy(),'-i',
+                         mTar.asFriendly()])# env=my_env
             
         if deleteAfterProcess:
             os.remove(f)
@@ -0,0 +1,331 @@
+"""
+------------------------------------------
+block_registry: cgm.core.mrs.lib.block_registry
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Lazy registry of rigBlock modules.
+
+Block modules are big (limb is ~9k lines) and importing all of them just to list what's
+available is most of the Builder startup. Instead we parse the block files once into a
+manifest - name, category, mtime, version, build order, profiles, buildable status - and
+cache it on disk. Modules are only imported when a block type is actually used.
+
+Stdlib only so it can be run outside of maya.
+================================================================
+"""
+__MAYALOCAL = 'BLOCKREGISTRY'
+
+import os
+import ast
+import json
+import tempfile
+import importlib
+
+#========================================================================
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+#========================================================================
+
+_manifestVersion = 1
+_str_manifestFile = '.cgmBlockManifest.json'
+
+#Module level names we carry in the manifest for each block
+_d_manifestAttrs = {'__version__':'version',
+                    '__menuVisible__':'menuVisible',
+                    '__l_rigBuildOrder__':'buildOrder'}
+
+#====================================================================================
+#>> Parsing
+#====================================================================================
+def get_literal(node):
+    """
+    Literal value of an ast node or raise ValueError
+    """
+    return ast.literal_eval(node)
+
+def parse_blockFile(path):
+    """
+    Gather module level data from a block file without importing it.
+
+    :parameters:
+        path(str): block .py file
+
+    :returns
+        dict - {'names':{name:truthy},'version','menuVisible','buildOrder','profiles'}
+        profiles is None when d_block_profiles isn't a plain dict literal
+    """
+    _str_func = 'parse_blockFile'
+
+    with open(path,'rb') as f:
+        _tree = ast.parse(f.read(), path)
+
+    _d_names = {}
+    _d = {'version':None,
+          'menuVisible':False,
+          'buildOrder':[],
+          'profiles':[]}
+
+    for node in _tree.body:
+        if isinstance(node,(ast.FunctionDef,ast.ClassDef)):
+            _d_names[node.name] = True
+        elif isinstance(node,(ast.Import,ast.ImportFrom)):
+            for a in node.names:
+                _d_names[(a.asname or a.name).split('.')[0]] = True
+        elif isinstance(node,ast.Assign):
+            for t in node.targets:
+                if not isinstance(t,ast.Name):
+                    #...d_block_profiles['x'] = ... and the like, we can't trust the literal anymore
+                    if isinstance(t,ast.Subscript) and getattr(t.value,'id',None) == 'd_block_profiles':
+                        _d['profiles'] = None
+                    continue
+                try:
+                    _value = get_literal(node.value)
+                    _d_names[t.id] = bool(_value)
+                except ValueError:
+                    _value = None
+                    _d_names[t.id] = True
+
+                if t.id in _d_manifestAttrs:
+                    _d[_d_manifestAttrs[t.id]] = _value
+                elif t.id == 'd_block_profiles':
+                    if isinstance(node.value,ast.Dict) and all([isinstance(k,ast.Str) for k in node.value.keys]):
+                        _d['profiles'] = [k.s for k in node.value.keys]
+                    else:
+                        _d['profiles'] = None
+
+    if isinstance(_d['buildOrder'],tuple):
+        _d['buildOrder'] = list(_d['buildOrder'])
+    _d['names'] = _d_names
+    return _d
+
+def get_blockStatus(d_parse, d_required = {}):
+    """
+    Buildable status by state from parsed data. Mirrors RigBlocks.get_blockModule_status
+
+    :parameters:
+        d_parse(dict): from parse_blockFile
+        d_required(dict): state to required module names
+
+    :returns
+        dict - {state:bool}
+    """
+    _d_names = d_parse['names']
+    _res = {}
+    for state,l_tests in d_required.iteritems():
+        _good = True
+        for test in l_tests:
+            if not _d_names.get(test):
+                _good = False
+        if state == 'rig':
+            _l_buildOrder = d_parse.get('buildOrder') or []
+            if _l_buildOrder:
+                for step in _l_buildOrder:
+                    if not _d_names.get(step):
+                        _good = False
+            elif not _d_names.get('rig'):
+                _good = False
+        _res[state] = _good
+    return _res
+
+#====================================================================================
+#>> Manifest
+#====================================================================================
+def get_blockFiles(path):
+    """
+    Walk a blocks package for block files.
+
+    :returns
+        list of tuples - (name, category, subPackage, filepath). Root files are 'blocks'
+    """
+    _base = os.path.basename(os.path.normpath(path))
+    _l = []
+    for root, dirs, files in os.walk(path, True, None):
+        dirs[:] = sorted([d for d in dirs if not d.startswith(('_','.'))])
+        _rel = os.path.relpath(root, path)
+        if _rel == '.':
+            _cat = _base
+            _subPackage = []
+        else:
+            _subPackage = _rel.replace('\\','/').split('/')
+            _cat = _subPackage[-1]
+        for f in sorted(files):
+            if not f.endswith('.py') or f == '__init__.py':
+                continue
+            _l.append((f[:-3], _cat, _subPackage, os.path.join(root,f)))
+    return _l
+
+def get_manifestPath(path):
+    """
+    Manifest lives with the blocks when we can write there, otherwise in the temp dir
+    """
+    _dir = path
+    if not os.access(path, os.W_OK):
+        _dir = tempfile.gettempdir()
+    return os.path.join(_dir, _str_manifestFile)
+
+def read_manifest(filepath):
+    try:
+        with open(filepath,'r') as f:
+            return json.load(f)
+    except (IOError,ValueError):
+        return None
+
+def write_manifest(filepath, manifest):
+    try:
+        with open(filepath,'w') as f:
+            json.dump(manifest, f, indent = 1, sort_keys = True)
+        return True
+    except (IOError,OSError),err:
+        log.debug("|write_manifest| >> Failed to write: {0} | {1}".format(filepath,err))
+        return False
+
+def get_manifest(path, package, d_required = {}, update = False, manifestPath = None):
+    """
+    Get the block manifest for a blocks package. Only files whose mtime or size changed since
+    the cached manifest are parsed again. New and removed files are picked up as well.
+
+    :parameters:
+        path(str): blocks package directory
+        package(str): blocks package import path - 'cgm.core.mrs.blocks'
+        d_required(dict): state to required module names for buildable status
+        update(bool): ignore the cached manifest
+        manifestPath(str): override the cache file
+
+    :returns
+        manifest(dict) - {'version','required','blocks':{name:dat},'duplicates':[]}
+    """
+    _str_func = 'get_manifest'
+
+    if manifestPath is None:
+        manifestPath = get_manifestPath(path)
+
+    _required = dict((k,sorted(v)) for k,v in d_required.iteritems())
+    _d_cache = {}
+    if not update:
+        _cached = read_manifest(manifestPath)
+        if _cached and _cached.get('version') == _manifestVersion and _cached.get('required') == _required:
+            _d_cache = _cached.get('blocks',{})
+
+    _d_blocks = {}
+    _l_duplicates = []
+    _dirty = bool(update) or not _d_cache
+    for name, cat, subPackage, filepath in get_blockFiles(path):
+        if name in _d_blocks:
+            _l_duplicates.append("{0} >> {1} ".format(name, filepath))
+            continue
+        _stat = os.stat(filepath)
+        _key = '.'.join([package] + subPackage + [name])
+
+        _dat = _d_cache.get(name)
+        if _dat and _dat.get('mtime') == _stat.st_mtime and _dat.get('size') == _stat.st_size and _dat.get('module') == _key:
+            _d_blocks[name] = _dat
+            continue
+
+        log.debug("|{0}| >> parsing: {1}".format(_str_func,filepath))
+        _dirty = True
+        _dat = {'module':_key,
+                'category':cat,
+                'file':filepath,
+                'mtime':_stat.st_mtime,
+                'size':_stat.st_size}
+        try:
+            _parse = parse_blockFile(filepath)
+            _dat['status'] = get_blockStatus(_parse, d_required)
+            _dat.pop('error',None)
+        except (SyntaxError,TypeError),err:
+            log.warning("|{0}| >> Failed to parse: {1} | {2}".format(_str_func,filepath,err))
+            _parse = {'version':None,'menuVisible':False,'buildOrder':[],'profiles':None}
+            _dat['status'] = dict((k,False) for k in d_required)
+            _dat['error'] = str(err)
+        for k in 'version','menuVisible','buildOrder','profiles':
+            _dat[k] = _parse[k]
+        _dat['buildable'] = bool(_dat['status']) and all(_dat['status'].values())
+        _d_blocks[name] = _dat
+
+    if set(_d_blocks.keys()) != set(_d_cache.keys()):
+        _dirty = True
+
+    _manifest = {'version':_manifestVersion,
+                 'required':_required,
+                 'blocks':_d_blocks,
+                 'duplicates':_l_duplicates}
+    if _dirty:
+        log.debug("|{0}| >> writing: {1}".format(_str_func,manifestPath))
+        write_manifest(manifestPath, _manifest)
+    return _manifest
+
+def get_categories(manifest):
+    """
+    Categories to sorted block names
+    """
+    _d = {}
+    for name,dat in manifest['blocks'].iteritems():
+        _d.setdefault(dat['category'],[]).append(name)
+    for l in _d.values():
+        l.sort()
+    return _d
+
+#====================================================================================
+#>> Lazy modules
+#====================================================================================
+class BlockModules(dict):
+    """
+    Dict of blockType to block module that only imports a module when it's first asked for.
+    A module that fails to import comes back as False.
+
+    Membership and keys don't import anything. Values, items and iteration over them do.
+    """
+    def __init__(self, d_import = None):
+        dict.__init__(self)
+        for k,v in (d_import or {}).iteritems():
+            dict.__setitem__(self,k,v)
+
+    def __getitem__(self, key):
+        _v = dict.__getitem__(self, key)
+        if isinstance(_v,basestring):
+            _v = import_blockModule(_v)
+            dict.__setitem__(self, key, _v)
+        return _v
+
+    def get(self, key, default = None):
+        if not dict.__contains__(self, key):
+            return default
+        return self[key]
+
+    def is_loaded(self, key):
+        return not isinstance(dict.get(self, key), basestring)
+
+    def itervalues(self):
+        for k in self.keys():
+            yield self[k]
+
+    def iteritems(self):
+        for k in self.keys():
+            yield k,self[k]
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
+
+    def __copy__(self):
+        _new = self.__class__()
+        dict.update(_new, dict.items(self))
+        return _new
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__, sorted(self.keys()))
+
+def import_blockModule(key):
+    try:
+        return importlib.import_module(key)
+    except Exception,err:
+        log.warning("|import_blockModule| >> Module failed: {0} | {1}".format(key,err))
+        return False
@@ -0,0 +1,465 @@
+"""
+------------------------------------------
+checkpoint_utils: cgm.core.mrs.lib
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Step checkpoints for rigFactory.doBuild. Each step of a block module's __l_rigBuildOrder__ gets a
+fingerprint of its inputs - block attributes, define/form/prerig positions, the rigs of the blocks up its
+blockParent chain and the block module source with the later steps left out - along with the nodes it
+created and the factory state going into it.
+
+An incremental build rewinds to the first step whose fingerprint changed or whose nodes are gone and
+builds from there, so editing rig_segments doesn't mean rebuilding skeleton, shapes, controls and frame.
+
+Checkpoints live for the maya session.
+================================================================
+"""
+__MAYALOCAL = 'CHECKPOINT'
+
+import copy
+import hashlib
+import inspect
+import os
+
+#========================================================================
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+#========================================================================
+
+import maya.cmds as mc
+import maya.OpenMaya as OM
+
+# From cgm ==============================================================
+from cgm.core import cgm_General as cgmGEN
+
+#>>> Data ==========================================================================================
+_d_CHECKPOINTS = {}#...{block uuid:{'blockType','name','steps':{step:{'fingerprint','nodes','time'}},'states':{step:state}}}
+_l_STEPTIMES = []#...(blockType, block, step, seconds) for every step run this session
+
+_l_volatileAttrs = ['blockState']#...block attrs the build itself changes
+_l_blockNulls = ['defineNull','formNull','prerigNull','noTransDefineNull','noTransFormNull','noTransPrerigNull']
+_l_sharedState = ['l_preNodesBuffer','l_preNodesUUIDs']#...never changed after init, so not copied per step
+
+def get_blockKey(mBlock):
+    return mc.ls(mBlock.mNode, uuid=True)[0]
+
+class StepNodes(object):
+    """
+    Record the nodes made inside the context with a node added callback, rather than diffing scene
+    wide ls calls around every step. Nodes deleted before the step is done are dropped.
+
+    Nodes given as watch - the ones earlier steps made - get attribute changed and parent callbacks so
+    the step's edits to them are known. Rewinding the step deletes what it made but can't put those back
+
+    >>> with CHECKPOINT.StepNodes(watch = CHECKPOINT.get_stepNodes(mBlock, steps[:i])) as stepNodes:
+    >>>     buildStep(self)
+    >>> stepNodes.get_uuids()
+    >>> stepNodes.l_touched
+
+    :parameters:
+        active(bool) | False makes the context a no-op
+        watch(list) | uuids of nodes to report edits to
+    """
+    _touchMsg = (OM.MNodeMessage.kAttributeSet | OM.MNodeMessage.kAttributeLocked | OM.MNodeMessage.kAttributeUnlocked |
+                 OM.MNodeMessage.kAttributeAdded | OM.MNodeMessage.kAttributeRemoved | OM.MNodeMessage.kAttributeRenamed |
+                 OM.MNodeMessage.kAttributeKeyable | OM.MNodeMessage.kAttributeUnkeyable |
+                 OM.MNodeMessage.kAttributeArrayAdded | OM.MNodeMessage.kAttributeArrayRemoved)
+    _connectionMsg = OM.MNodeMessage.kConnectionMade | OM.MNodeMessage.kConnectionBroken
+
+    def __init__(self, active = True, watch = None):
+        self.active = active
+        self.l_handles = []
+        self.l_watch = list(watch or [])
+        self.l_touched = []#...uuids of watched nodes the step edited
+        self._l_callbackIDs = []
+
+    def _nodeAdded(self, node, data):
+        self.l_handles.append(OM.MObjectHandle(node))
+
+    def _attributeChanged(self, msg, plug, otherPlug, uuid):
+        if msg & self._connectionMsg:
+            #...connections out to the step's own nodes go when they're deleted
+            if not msg & OM.MNodeMessage.kIncomingDirection:
+                return
+        elif not msg & self._touchMsg:
+            return
+        self._touch(uuid)
+
+    def _parentChanged(self, child, parent, data):
+        try:
+            _uuid = OM.MFnDependencyNode(child.node()).uuid().asString()
+        except Exception:
+            return
+        if _uuid in self._d_watch:
+            self._touch(_uuid)
+
+    def _touch(self, uuid):
+        if uuid not in self.l_touched:
+            self.l_touched.append(uuid)
+
+    def __enter__(self):
+        if not self.active:
+            return self
+        self._l_callbackIDs.append(OM.MDGMessage.addNodeAddedCallback(self._nodeAdded))
+        self._d_watch = {}
+        _sel = OM.MSelectionList()
+        _obj = OM.MObject()
+        for _uuid in self.l_watch:
+            for o in mc.ls(_uuid, long=True) or []:
+                _sel.clear()
+                _sel.add(o)
+                _sel.getDependNode(0,_obj)
+                self._d_watch[_uuid] = OM.MNodeMessage.addAttributeChangedCallback(_obj, self._attributeChanged, _uuid)
+                self._l_callbackIDs.append(self._d_watch[_uuid])
+                break
+        if self._d_watch:
+            self._l_callbackIDs.append(OM.MDagMessage.addParentAddedCallback(self._parentChanged))
+            self._l_callbackIDs.append(OM.MDagMessage.addParentRemovedCallback(self._parentChanged))
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        for _id in self._l_callbackIDs:
+            OM.MMessage.removeCallback(_id)
+        self._l_callbackIDs = []
+        return False
+
+    def get_uuids(self):
+        _res = set()
+        for h in self.l_handles:
+            if h.isValid():
+                _res.add(OM.MFnDependencyNode(h.object()).uuid().asString())
+        return _res
+
+#>>> Fingerprints ==================================================================================
+def get_moduleSource(buildModule):
+    _path = buildModule.__file__
+    if _path.endswith('.pyc'):
+        _path = _path[:-1]
+    if os.path.exists(_path):
+        with open(_path,'r') as f:
+            return f.read()
+    return inspect.getsource(buildModule)
+
+def get_stepSources(source, steps):
+    """
+    Split module source into the top level source for each step and everything else. Scanned rather than
+    inspect.getsource as the steps are usually wrapped by decorators
+
+    :returns
+        rest(str), {step:source}
+    """
+    _d = {}
+    _l_rest = []
+    _current = None
+    _l_pending = []#...decorator lines, go with the def below them
+    for line in source.splitlines():
+        if line and not line[0].isspace() and not line.startswith('#'):
+            if line.startswith('@'):
+                _l_pending.append(line)
+                continue
+            _current = None
+            if line.startswith('def '):
+                _name = line[4:].split('(')[0].strip()
+                if _name in steps:
+                    _current = _name
+                    _d[_name] = list(_l_pending)
+                    _l_pending = []
+            if _l_pending:
+                _l_rest.extend(_l_pending)
+                _l_pending = []
+        if _current:
+            _d[_current].append(line)
+        else:
+            _l_rest.append(line)
+    _l_rest.extend(_l_pending)
+    return '\n'.join(_l_rest), dict([(k,'\n'.join(v)) for k,v in _d.iteritems()])
+
+def get_blockInputs(mBlock):
+    """
+    Block attribute values and block null positions, as a string to hash
+    """
+    _l = []
+    _node = mBlock.mNode
+    for a in sorted(mc.listAttr(_node, ud=True) or []):
+        if a in _l_volatileAttrs or '.' in a:
+            continue
+        try:
+            if mc.getAttr("{0}.{1}".format(_node,a), type=True) == 'message':
+                continue
+            _v = mc.getAttr("{0}.{1}".format(_node,a))
+        except Exception:
+            continue
+        _l.append("{0}={1}".format(a,_roundRepr(_v)))
+
+    _l_transforms = [_node]
+    for a in _l_blockNulls:
+        if not mc.attributeQuery(a, node=_node, exists=True):
+            continue
+        _null = mc.listConnections("{0}.{1}".format(_node,a), destination=False, source=True) or []
+        if _null:
+            _l_transforms.extend(_null)
+            _l_transforms.extend(sorted(mc.listRelatives(_null[0], allDescendents=True,
+                                                         type='transform', fullPath=True) or []))
+    for o in _l_transforms:
+        _l.append("{0}:{1}".format(o.split('|')[-1],_roundRepr(mc.xform(o, q=True, ws=True, m=True))))
+    return '\n'.join(_l)
+
+def get_upstreamInputs(mBlock):
+    """
+    State of the blocks up the blockParent chain, as a string to hash. A child's rig is wired to its parent's
+    rig so a rebuilt parent means the child is out of date. Per parent - its uuid and the uuids of the nodes its
+    checkpointed steps made, or of its rigNull and what hangs off it when it has no checkpoints
+    """
+    _l = []
+    _node = mBlock.mNode
+    _l_seen = [get_blockKey(mBlock)]
+    while True:
+        _parent = _get_messageNode(_node,'blockParent')
+        if not _parent:
+            break
+        _key = mc.ls(_parent, uuid=True)[0]
+        if _key in _l_seen:
+            break
+        _l_seen.append(_key)
+
+        _d = _d_CHECKPOINTS.get(_key)
+        if _d and _d['steps']:
+            _l_uuids = [u for _dStep in _d['steps'].values() for u in _dStep['nodes']]
+        else:
+            _l_uuids = []
+            _rigNull = _get_messageNode(_get_messageNode(_parent,'moduleTarget'),'rigNull')
+            if _rigNull:
+                _l_nodes = [_rigNull]
+                _l_nodes.extend(mc.listRelatives(_rigNull, allDescendents=True, fullPath=True) or [])
+                _l_nodes.extend(mc.listConnections(_rigNull, destination=False, source=True) or [])
+                _l_uuids = mc.ls(_l_nodes, uuid=True)
+        _l.append("{0}:{1}".format(_key,hashlib.md5(','.join(sorted(set(_l_uuids)))).hexdigest()))
+        _node = _parent
+    return '\n'.join(_l)
+
+def _get_messageNode(node, attr):
+    if not node or not mc.attributeQuery(attr, node=node, exists=True):
+        return None
+    _res = mc.listConnections("{0}.{1}".format(node,attr), destination=False, source=True) or []
+    return _res[0] if _res else None
+
+def _roundRepr(v):
+    if isinstance(v,float):
+        return repr(round(v,4))
+    if isinstance(v,(list,tuple)):
+        return '[' + ','.join([_roundRepr(i) for i in v]) + ']'
+    return repr(v)
+
+def get_stepFingerprints(mBlock, buildModule, steps, buildVersion = None):
+    """
+    Fingerprint per step. Each covers the block inputs, the state of the blocks upstream of it, the module
+    source other than the steps and the source of the steps up to and including it - so a change to a step
+    changes it and everything after
+
+    :parameters:
+        mBlock(cgmRigBlock)
+        buildModule(module) | block module
+        steps(list) | build order
+        buildVersion(str)
+
+    :returns
+        list of hex digests, one per step
+    """
+    _rest, _d_steps = get_stepSources(get_moduleSource(buildModule), steps)
+    _hash = hashlib.md5()
+    _hash.update(str(buildVersion))
+    _hash.update(get_blockInputs(mBlock))
+    _hash.update(get_upstreamInputs(mBlock))
+    _hash.update(_rest)
+    _res = []
+    for step in steps:
+        _hash.update(step)
+        _hash.update(_d_steps.get(step,''))
+        _res.append(_hash.hexdigest())
+    return _res
+
+#>>> State =========================================================================================
+def snapshot_state(d):
+    """
+    Copy of a factory __dict__ going into a step. Containers are copied two levels down so later steps
+    filling them in don't leak back. Meta instances themselves are kept as is
+    """
+    _res = {}
+    for k,v in d.iteritems():
+        if k in _l_sharedState:
+            _res[k] = v
+        elif isinstance(v,dict):
+            _res[k] = dict([(k2,_copyContainer(v2)) for k2,v2 in v.iteritems()])
+        else:
+            _res[k] = _copyContainer(v)
+    return _res
+
+def _copyContainer(v):
+    if isinstance(v,(list,dict,set)):
+        return copy.copy(v)
+    return v
+
+#>>> Checkpoints ===================================================================================
+def get_checkpoints(mBlock):
+    return _d_CHECKPOINTS.get(get_blockKey(mBlock))
+
+def has_checkpoints(mBlock):
+    return bool(get_checkpoints(mBlock))
+
+def clear(mBlock = None):
+    """
+    Clear checkpoints for a block or all of them
+    """
+    if mBlock is None:
+        _d_CHECKPOINTS.clear()
+    else:
+        _d_CHECKPOINTS.pop(get_blockKey(mBlock),None)
+
+def _get_entry(mBlock):
+    _key = get_blockKey(mBlock)
+    if _key not in _d_CHECKPOINTS:
+        _d_CHECKPOINTS[_key] = {'blockType':mBlock.blockType,'steps':{},'states':{}}
+    return _d_CHECKPOINTS[_key]
+
+def store_state(mBlock, step, state):
+    """
+    Factory state going into a step, for rewind
+    """
+    _get_entry(mBlock)['states'][step] = state
+
+def record_step(mBlock, step, fingerprint, nodes, seconds, touched = None):
+    """
+    Store a finished step - its fingerprint, the uuids of the nodes it made and of the earlier steps' nodes it edited
+    """
+    _d = _get_entry(mBlock)
+    _d['name'] = mBlock.p_nameShort
+    _d['steps'][step] = {'fingerprint':fingerprint,
+                         'nodes':list(nodes),
+                         'touched':list(touched or []),
+                         'time':seconds}
+    _l_STEPTIMES.append((mBlock.blockType, _d['name'], step, seconds))
+
+def get_stepNodes(mBlock, steps):
+    """
+    uuids of the nodes the given steps made
+    """
+    _d = get_checkpoints(mBlock)
+    if not _d:
+        return []
+    _res = []
+    for step in steps:
+        _dStep = _d['steps'].get(step)
+        if _dStep:
+            _res.extend(_dStep['nodes'])
+    return _res
+
+def get_resumeIndex(mBlock, steps, fingerprints):
+    """
+    First step to build from - the first with a changed fingerprint, no checkpoint or missing nodes. Rewinding
+    can't undo the edits a step made to earlier steps' nodes, so when a step being rebuilt touched nodes from an
+    earlier step the build goes back to the step that made them
+
+    :returns
+        int, len(steps) when everything is current
+    """
+    _str_func = 'get_resumeIndex'
+    _d = get_checkpoints(mBlock)
+    if not _d:
+        return 0
+    _idx = len(steps)
+    for i,step in enumerate(steps):
+        _dStep = _d['steps'].get(step)
+        if not _dStep or _dStep['fingerprint'] != fingerprints[i]:
+            log.debug("|{0}| >> changed: {1}".format(_str_func,step))
+            _idx = i
+            break
+        if _dStep['nodes'] and len(mc.ls(_dStep['nodes'])) != len(_dStep['nodes']):
+            log.debug("|{0}| >> missing nodes: {1}".format(_str_func,step))
+            _idx = i
+            break
+
+    _d_owners = {}
+    for i,step in enumerate(steps):
+        for _uuid in _d['steps'].get(step,{}).get('nodes',[]):
+            _d_owners[_uuid] = i
+    while _idx:
+        _l_owners = [_d_owners[_uuid] for step in steps[_idx:]
+                     for _uuid in _d['steps'].get(step,{}).get('touched',[])
+                     if _d_owners.get(_uuid,_idx) < _idx]
+        if not _l_owners:
+            break
+        log.debug("|{0}| >> {1} edited nodes from: {2}".format(_str_func,steps[_idx],steps[min(_l_owners)]))
+        _idx = min(_l_owners)
+    return _idx
+
+def rewind(mBlock, steps, index):
+    """
+    Delete the nodes made by steps from index on and drop their checkpoints
+
+    :returns
+        factory state going into steps[index], None if there isn't one - then build from scratch
+    """
+    _str_func = 'rewind'
+    _d = get_checkpoints(mBlock)
+    if not _d:
+        return None
+    _l_delete = []
+    for step in steps[index:]:
+        _dStep = _d['steps'].pop(step,None)
+        if _dStep:
+            _l_delete.extend(_dStep['nodes'])
+    _l_delete = mc.ls(_l_delete, long=True)
+    if _l_delete:
+        log.debug("|{0}| >> deleting {1} nodes from: {2}".format(_str_func,len(_l_delete),steps[index]))
+        for o in sorted(_l_delete, key=lambda o: o.count('|')):#...parents first, children go with them
+            if mc.objExists(o):
+                try:mc.delete(o)
+                except Exception,err:log.debug("|{0}| >> {1} | {2}".format(_str_func,o,err))
+
+    for step in steps[index+1:]:
+        _d['states'].pop(step,None)
+    if index < len(steps):
+        return _d['states'].get(steps[index])
+    return None
+
+#>>> Timings =======================================================================================
+def get_stepTimes(blockType = None):
+    """
+    Step timings this session summed by block type and step, slowest first
+
+    :returns
+        list of dicts - blockType, step, count, total, mean
+    """
+    _d = {}
+    for _type,_block,_step,_time in _l_STEPTIMES:
+        if blockType and _type != blockType:
+            continue
+        _key = (_type,_step)
+        if _key not in _d:
+            _d[_key] = {'blockType':_type,'step':_step,'count':0,'total':0.0}
+        _d[_key]['count'] += 1
+        _d[_key]['total'] += _time
+    for v in _d.values():
+        v['mean'] = v['total'] / v['count']
+    return sorted(_d.values(), key=lambda v: v['total'], reverse=True)
+
+def report_stepTimes(blockType = None, limit = 20):
+    _str_func = 'report_stepTimes'
+    _l = get_stepTimes(blockType)
+    _total = sum([v['total'] for v in _l])
+    print(cgmGEN.logString_start(_str_func))
+    for v in _l[:limit]:
+        print("{0:<12} {1:<24} x{2:<4} total: {3:>8.3f}s | mean: {4:.3f}s | {5:.1f}%".format(v['blockType'],v['step'],v['count'],
+                                                                                        v['total'],v['mean'],
+                                                                                        v['total'] / _total * 100 if _total else 0))
+    print("|{0}| >> Total: {1:.3f}s".format(_str_func,_total))
+    return _l
+
+def clear_stepTimes():
+    del _l_STEPTIMES[:]
@@ -28,8 +28,8 @@ log.setLevel(logging.INFO)
 
 
 _d_modules = {'cgmMeta':['base','mClasses','PuppetMeta'],
-              'coreLib':['PATH','ATTR','VALID','NODEFACTORY'],
-              'MRS':['RigBlocks']}
+              'coreLib':['PATH','ATTR','VALID','NODEFACTORY','RAYS','MOCAPBAKE','CAPTURE','NAMETOOLS'],
+              'MRS':['RigBlocks','batchPool','blockRegistry','checkpoint']}
 _l_all_order = ['coreLib','cgmMeta','MRS']
 
 
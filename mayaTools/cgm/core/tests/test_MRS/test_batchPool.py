@@ -0,0 +1,115 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.tests.test_MRS.test_batchPool
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the batch_pool runner using the standin handler - no maya needed
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import os
+import sys
+import json
+import imp
+import shutil
+import tempfile
+
+#...load by path so we don't pull in the maya side of the cgm package
+_str_pool = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         'mrs','lib','batch_pool.py')
+BATCHPOOL = imp.load_source('cgm_batch_pool', _str_pool)
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+BATCHPOOL.log.setLevel(logging.WARNING)
+
+# CLASSES ====================================================================
+class Test_BatchPool(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir, ignore_errors = True)
+
+    def _pool(self, dataList, **kws):
+        return BATCHPOOL.BatchPool(dataList, handler = 'standin', python = sys.executable, **kws)
+
+    def test_all_ok(self):
+        _l_status = []
+        _dat = [{'file':'f{0}.ma'.format(i)} for i in range(12)]
+        _report = self._pool(_dat, workers = 3, onStatus = _l_status.append).run()
+
+        self.assertEqual(_report['total'], 12)
+        self.assertEqual(_report['counts'], {'ok':12})
+        self.assertEqual([d['index'] for d in _report['results']], range(12))
+        self.assertEqual(len(_l_status), 12)
+        #...workers are reused rather than started per file
+        self.assertEqual(_report['workerStarts'], 3)
+
+    def test_errors_reported(self):
+        _dat = [{'file':'good.ma'},{'file':'bad.ma','fail':1}]
+        _report = self._pool(_dat, workers = 2).run()
+
+        self.assertEqual(_report['counts'], {'ok':1,'error':1})
+        _bad = _report['results'][1]
+        self.assertEqual(_bad['status'], 'error')
+        self.assertIn('bad.ma', _bad['error'])
+
+    def test_crash_retry(self):
+        _marker = os.path.join(self._dir,'crashed')
+        _dat = [{'file':'a.ma'},{'file':'b.ma','crashOnce':_marker},{'file':'c.ma'}]
+        _report = self._pool(_dat, workers = 1, retries = 1).run()
+
+        self.assertEqual(_report['counts'], {'ok':3})
+        self.assertEqual(_report['results'][1]['attempts'], 2)
+        self.assertEqual(_report['workerStarts'], 2)
+
+    def test_crash_exhausted(self):
+        _dat = [{'file':'a.ma','crash':1}]
+        _report = self._pool(_dat, workers = 1, retries = 2).run()
+
+        self.assertEqual(_report['counts'], {'crashed':1})
+        self.assertEqual(_report['results'][0]['attempts'], 3)
+
+    def test_timeout(self):
+        _dat = [{'file':'slow.ma','sleep':30},{'file':'fast.ma'}]
+        _report = self._pool(_dat, workers = 1, retries = 0, timeout = 1).run()
+
+        self.assertEqual(_report['results'][0]['status'], 'crashed')
+        self.assertEqual(_report['results'][1]['status'], 'ok')
+
+    def test_report(self):
+        _path = os.path.join(self._dir,'report.json')
+        _job = os.path.join(self._dir,'job.json')
+        with open(_job,'w') as f:
+            json.dump({'dataList':[{'file':'a.ma'},{'file':'b.ma'}],
+                       'workers':2,
+                       'handler':'standin',
+                       'python':sys.executable,
+                       'reportPath':_path}, f)
+        BATCHPOOL.run_job(_job)
+
+        with open(_path) as f:
+            _report = json.load(f)
+        self.assertEqual(_report['total'], 2)
+        self.assertEqual(_report['counts'], {'ok':2})
+        self.assertTrue(os.path.exists(os.path.join(self._dir,'batch_worker_0.log')))
+
+# FUNCTIONS ==================================================================
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_BatchPool))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,169 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.tests.test_MRS.test_blockRegistry
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the rigBlock manifest/lazy module registry - no maya needed
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import os
+import sys
+import imp
+import shutil
+import tempfile
+
+#...load by path so we don't pull in the maya side of the cgm package
+_str_registry = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                             'mrs','lib','block_registry.py')
+BLOCKREGISTRY = imp.load_source('cgm_block_registry', _str_registry)
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+BLOCKREGISTRY.log.setLevel(logging.ERROR)
+
+_d_required = {'define':['__version__'],
+               'form':['form'],
+               'rig':['is_rig','rigDelete']}
+
+_str_good = '''
+import os
+__version__ = '1.0'
+__menuVisible__ = True
+__l_rigBuildOrder__ = ['rig_a','rig_b']
+d_block_profiles = {'arm':{}, 'leg':{'baseSize':[1,2,3]}}
+def form(self):pass
+def rig_a(self):pass
+rig_b = os.path.join
+def is_rig(self):return True
+def rigDelete(self):pass
+'''
+
+_str_partial = '''
+__version__ = '0.1'
+__menuVisible__ = False
+__l_rigBuildOrder__ = ['rig_a','rig_missing']
+def form(self):pass
+def rig_a(self):pass
+def is_rig(self):return True
+def rigDelete(self):pass
+'''
+
+# CLASSES ====================================================================
+class Test_BlockRegistry(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._package = 'cgmTestBlocks{0}'.format(id(self))
+        self._path = os.path.join(self._dir, self._package)
+        os.makedirs(os.path.join(self._path,'organic'))
+        for p in self._path, os.path.join(self._path,'organic'):
+            open(os.path.join(p,'__init__.py'),'w').close()
+        self._write('good.py',_str_good)
+        self._write(os.path.join('organic','partial.py'),_str_partial)
+        self._manifestPath = os.path.join(self._dir,'manifest.json')
+
+    def tearDown(self):
+        for k in sys.modules.keys():
+            if k.startswith(self._package):
+                sys.modules.pop(k)
+        if self._dir in sys.path:
+            sys.path.remove(self._dir)
+        shutil.rmtree(self._dir, ignore_errors = True)
+
+    def _write(self, name, text):
+        _path = os.path.join(self._path,name)
+        with open(_path,'w') as f:
+            f.write(text)
+        return _path
+
+    def _manifest(self, update = False):
+        return BLOCKREGISTRY.get_manifest(self._path, self._package, _d_required,
+                                          update, self._manifestPath)
+
+    def test_parse(self):
+        _d = self._manifest()['blocks']
+
+        self.assertEqual(sorted(_d.keys()), ['good','partial'])
+        self.assertEqual(_d['good']['module'], self._package + '.good')
+        self.assertEqual(_d['partial']['module'], self._package + '.organic.partial')
+        self.assertEqual(_d['good']['version'], '1.0')
+        self.assertEqual(_d['good']['menuVisible'], True)
+        self.assertEqual(sorted(_d['good']['profiles']), ['arm','leg'])
+        self.assertEqual(_d['good']['buildOrder'], ['rig_a','rig_b'])
+        self.assertEqual(_d['good']['buildable'], True)
+        self.assertEqual(_d['partial']['status'], {'define':True,'form':True,'rig':False})
+        self.assertEqual(_d['partial']['buildable'], False)
+
+    def test_categories(self):
+        self.assertEqual(BLOCKREGISTRY.get_categories(self._manifest()),
+                         {self._package:['good'],'organic':['partial']})
+
+    def test_cache(self):
+        self._manifest()
+        self.assertTrue(os.path.exists(self._manifestPath))
+
+        #...a cached entry is reused even if the file would parse differently now
+        _cached = BLOCKREGISTRY.read_manifest(self._manifestPath)
+        _cached['blocks']['good']['version'] = 'cached'
+        BLOCKREGISTRY.write_manifest(self._manifestPath, _cached)
+        self.assertEqual(self._manifest()['blocks']['good']['version'], 'cached')
+
+        #...until it changes on disk
+        _path = self._write('good.py',_str_good.replace("'1.0'","'2.0'"))
+        _stat = os.stat(_path)
+        os.utime(_path,(_stat.st_atime, _stat.st_mtime + 10))
+        self.assertEqual(self._manifest()['blocks']['good']['version'], '2.0')
+
+    def test_added_removed(self):
+        self._manifest()
+        self._write('extra.py',"__version__ = '1'\n")
+        os.remove(os.path.join(self._path,'organic','partial.py'))
+
+        _d = self._manifest()['blocks']
+        self.assertEqual(sorted(_d.keys()), ['extra','good'])
+        self.assertEqual(sorted(BLOCKREGISTRY.read_manifest(self._manifestPath)['blocks'].keys()),
+                         ['extra','good'])
+
+    def test_lazy_modules(self):
+        sys.path.insert(0,self._dir)
+        _manifest = self._manifest()
+        _d = BLOCKREGISTRY.BlockModules(dict((k,d['module']) for k,d in _manifest['blocks'].iteritems()))
+
+        self.assertIn('good', _d)
+        self.assertEqual(sorted(_d.keys()), ['good','partial'])
+        self.assertFalse(_d.is_loaded('good'))
+        self.assertNotIn(self._package + '.good', sys.modules)
+
+        _mod = _d.get('good')
+        self.assertEqual(_mod.__version__, '1.0')
+        self.assertTrue(_d.is_loaded('good'))
+        self.assertFalse(_d.is_loaded('partial'))
+        self.assertIs(_d['good'], _mod)
+        self.assertEqual(_d.get('okra',False), False)
+
+    def test_import_failure(self):
+        sys.path.insert(0,self._dir)
+        self._write('broken.py',"__version__ = '1'\nraise RuntimeError('nope')\n")
+        _manifest = self._manifest()
+        _d = BLOCKREGISTRY.BlockModules(dict((k,d['module']) for k,d in _manifest['blocks'].iteritems()))
+
+        self.assertEqual(_d.get('broken'), False)
+
+# FUNCTIONS ==================================================================
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_BlockRegistry))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
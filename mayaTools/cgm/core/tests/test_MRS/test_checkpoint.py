@@ -0,0 +1,167 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.tests.test_MRS.test_checkpoint
+Author: Josh Burton
+email: jjburton@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the rigFactory step checkpoints
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+
+try:
+    import maya.cmds as mc
+
+except ImportError:
+    raise StandardError('checkpoint test can only be run in Maya')
+import cgm.core.mrs.lib.checkpoint_utils as CHECKPOINT
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+
+_str_source = '''
+import os
+__l_rigBuildOrder__ = ['rig_a','rig_b']
+
+def helper():
+    return 1
+
+@cgmGEN.Timer
+def rig_a(self):
+    return 'a'
+
+def rig_b(self):
+    return 'b'
+'''
+
+class _Block(object):
+    """
+    Stand in for a rigBlock - checkpoints key off the node uuid
+    """
+    def __init__(self, node):
+        self.mNode = node
+        self.p_nameShort = node
+        self.blockType = 'test'
+
+# CLASSES ====================================================================
+class Test_Checkpoint(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True, f=True)
+        self.mBlock = _Block(mc.createNode('transform', name = 'testBlock'))
+        self.l_steps = ['rig_a','rig_b']
+
+    def tearDown(self):
+        CHECKPOINT.clear()
+
+    def test_stepSources(self):
+        _rest, _d = CHECKPOINT.get_stepSources(_str_source, self.l_steps)
+
+        self.assertEqual(sorted(_d.keys()), self.l_steps)
+        self.assertTrue(_d['rig_a'].startswith('@cgmGEN.Timer'))
+        self.assertIn("return 'a'", _d['rig_a'])
+        self.assertNotIn("return 'a'", _rest)
+        self.assertIn('def helper', _rest)
+
+    def test_snapshot(self):
+        _d = {'d_joints':{'ml_skin':[1,2]}, 'l_preNodesBuffer':['a'], 'b_test':True}
+        _snap = CHECKPOINT.snapshot_state(_d)
+        _d['d_joints']['ml_skin'].append(3)
+        _d['d_joints']['ml_rig'] = []
+
+        self.assertEqual(_snap['d_joints'], {'ml_skin':[1,2]})
+        self.assertIs(_snap['l_preNodesBuffer'], _d['l_preNodesBuffer'])
+
+    def test_resume(self):
+        _l_fingerprints = ['a1','b1']
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, _l_fingerprints), 0)
+
+        for i,step in enumerate(self.l_steps):
+            CHECKPOINT.store_state(self.mBlock, step, {'step':i})
+            with CHECKPOINT.StepNodes() as _stepNodes:
+                mc.createNode('transform', name = step)
+            CHECKPOINT.record_step(self.mBlock, step, _l_fingerprints[i], _stepNodes.get_uuids(), 0.1)
+
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, _l_fingerprints), 2)
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, ['a1','b2']), 1)
+
+        mc.delete('rig_a')
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, _l_fingerprints), 0)
+
+        self.assertEqual(CHECKPOINT.rewind(self.mBlock, self.l_steps, 1), {'step':1})
+        self.assertFalse(mc.objExists('rig_b'))
+        self.assertEqual(CHECKPOINT.get_checkpoints(self.mBlock)['steps'].keys(), ['rig_a'])
+
+    def test_stepNodes(self):
+        mc.createNode('transform', name = 'before')
+        with CHECKPOINT.StepNodes() as _stepNodes:
+            _new = mc.createNode('transform', name = 'made')
+            mc.delete(mc.createNode('transform', name = 'temp'))
+        mc.createNode('transform', name = 'after')
+        self.assertEqual(_stepNodes.get_uuids(), set(mc.ls(_new, uuid = True)))
+
+        with CHECKPOINT.StepNodes(active = False) as _stepNodes:
+            mc.createNode('transform')
+        self.assertEqual(_stepNodes.get_uuids(), set())
+
+    def test_touched(self):
+        #...a later step that edits an earlier step's nodes sends the rewind back to that step
+        with CHECKPOINT.StepNodes() as _stepNodes:
+            mc.createNode('transform', name = 'rig_a')
+        CHECKPOINT.store_state(self.mBlock, 'rig_a', {'step':0})
+        CHECKPOINT.record_step(self.mBlock, 'rig_a', 'a1', _stepNodes.get_uuids(), 0.1)
+
+        with CHECKPOINT.StepNodes(watch = CHECKPOINT.get_stepNodes(self.mBlock, ['rig_a'])) as _stepNodes:
+            _new = mc.createNode('transform', name = 'rig_b')
+            mc.connectAttr('rig_a.tx', _new + '.tx')
+        self.assertEqual(_stepNodes.l_touched, [])
+
+        with CHECKPOINT.StepNodes(watch = CHECKPOINT.get_stepNodes(self.mBlock, ['rig_a'])) as _stepNodes:
+            mc.setAttr('rig_a.ty', 2, lock = True)
+        self.assertEqual(_stepNodes.l_touched, mc.ls('rig_a', uuid = True))
+        CHECKPOINT.record_step(self.mBlock, 'rig_b', 'b1', [], 0.1, _stepNodes.l_touched)
+
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, ['a1','b1']), 2)
+        self.assertEqual(CHECKPOINT.get_resumeIndex(self.mBlock, self.l_steps, ['a1','b2']), 0)
+
+    def test_upstream(self):
+        #...a rebuilt parent block changes the child's inputs
+        _parent = _Block(mc.createNode('transform', name = 'parentBlock'))
+        mc.addAttr(self.mBlock.mNode, ln = 'blockParent', at = 'message')
+        mc.connectAttr(_parent.mNode + '.message', self.mBlock.mNode + '.blockParent')
+
+        _l_inputs = []
+        for i in range(2):
+            CHECKPOINT.rewind(_parent, ['rig_a'], 0)
+            with CHECKPOINT.StepNodes() as _stepNodes:
+                mc.createNode('transform')
+            CHECKPOINT.record_step(_parent, 'rig_a', 'a1', _stepNodes.get_uuids(), 0.1)
+            _l_inputs.append(CHECKPOINT.get_upstreamInputs(self.mBlock))
+
+        self.assertTrue(_l_inputs[0])
+        self.assertNotEqual(_l_inputs[0], _l_inputs[1])
+
+    def test_stepTimes(self):
+        CHECKPOINT.clear_stepTimes()
+        for t in 1.0, 3.0:
+            CHECKPOINT.record_step(self.mBlock, 'rig_a', None, [], t)
+        _l = CHECKPOINT.get_stepTimes('test')
+        self.assertEqual(_l[0]['count'], 2)
+        self.assertEqual(_l[0]['mean'], 2.0)
+
+# FUNCTIONS ==================================================================
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_Checkpoint))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
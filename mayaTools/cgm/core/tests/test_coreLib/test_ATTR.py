@@ -21,6 +21,7 @@ try:
     from Red9.core import Red9_Meta as r9Meta
     from cgm.core import cgm_Meta as cgmMeta
     from cgm.core.cgmPy import validateArgs as VALID
+    from cgm.core.lib import attribute_utils as ATTR
     
 except ImportError:
     raise StandardError('objString test can only be run in Maya')
@@ -36,23 +37,54 @@ class Test_base(unittest.TestCase):
         #raise Exception,'To do...' 
         
 class Test_msgList(unittest.TestCase):     
+    def setUp(self):
+        mc.file(new=True,f=True)
+        self.mHolder = cgmMeta.cgmNode(name = 'holder',nodeType = 'network')
+        self.l_nodes = [mc.createNode('transform',name = 'msg{0}'.format(i)) for i in range(3)]
+        ATTR.msgList_connect(self.mHolder.mNode,'things',self.l_nodes)
+        
     def test_create(self):
-        pass
-        #raise Exception,'To do...' 
+        self.assertEqual(ATTR.msgList_get(self.mHolder.mNode,'things'),self.l_nodes)
+        
+    def test_layoutCache(self):
+        _node = self.mHolder.mNode
+        ATTR.msgList_get(_node,'things')
+        _layout = ATTR.get_sequentialAttrLayout(_node,'things')
+        self.assertEqual([l[1] for l in _layout],['things_0','things_1','things_2'])
+        self.assertIs(ATTR.get_sequentialAttrLayout(_node,'things'),_layout)
+        
+        #...appending outside of ATTR still shows up
+        mc.addAttr(_node,ln = 'things_3',at = 'message')
+        mc.connectAttr(mc.createNode('transform',name = 'msg3') + '.message',_node + '.things_3')
+        self.assertEqual(len(ATTR.msgList_get(_node,'things')),4)
+        
+        ATTR.msgList_removeByIndex(_node,'things',[0])
+        self.assertEqual(ATTR.msgList_get(_node,'things'),self.l_nodes[1:] + ['msg3'])
+        
+    def test_emptyAndCull(self):
+        _node = self.mHolder.mNode
+        mc.disconnectAttr(self.l_nodes[1] + '.message',_node + '.things_1')
+        self.assertEqual(ATTR.msgList_get(_node,'things'),[self.l_nodes[0],None,self.l_nodes[2]])
+        self.assertEqual(ATTR.msgList_get(_node,'things',cull = True),[self.l_nodes[0],self.l_nodes[2]])
+        self.assertEqual(ATTR.msgList_get(_node,'nothing'),[])
+        
+    def test_asMeta(self):
+        ml_first = self.mHolder.msgList_get('things')
+        self.assertEqual([mObj.p_nameShort for mObj in ml_first],self.l_nodes)
+        ml_second = self.mHolder.msgList_get('things')
+        for mFirst,mSecond in zip(ml_first,ml_second):
+            self.assertIs(mFirst,mSecond)
+        self.assertEqual(self.mHolder.msgList_get('things',asMeta = False),self.l_nodes)
 
         
 # FUNCTIONS ==================================================================       
-"""def main(**kwargs):
-    #testCases = [Test_r9Issues,]
-    
+def main(**kwargs):
     suite = unittest.TestSuite()
-
-    #for testCase in testCases:
-        #suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(testCase))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_msgList))
 
     debug = kwargs.get('debug', False)
 
     if debug:
         suite.debug()
     else:
-        unittest.TextTestRunner(verbosity=2).run(suite)"""
\ No newline at end of file
+        unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
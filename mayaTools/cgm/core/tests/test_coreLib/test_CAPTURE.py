@@ -0,0 +1,82 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.tests.test_coreLib.test_CAPTURE
+Author: David Bokser
+email: dbokser@cgmonks.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the live record capture buffer - no maya needed
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import os
+import imp
+
+#...load by path so we don't pull in the maya side of the cgm package
+_str_capture = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            'lib','capture_buffer.py')
+CAPTURE = imp.load_source('cgm_capture_buffer', _str_capture)
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+
+# CLASSES ====================================================================
+class Test_CaptureBuffer(unittest.TestCase):
+    def test_add_grow(self):
+        _buffer = CAPTURE.CaptureBuffer(2, 24.0, 0.1)
+        for i in range(100):
+            _buffer.add(i * .01, [i, -i])
+
+        self.assertEqual(len(_buffer), 100)
+        self.assertEqual(_buffer.get_channel(1)[:3], [0.0, -1.0, -2.0])
+        self.assertEqual(_buffer.get_sample(99), (.99, [99.0, -99.0]))
+        self.assertRaises(ValueError, _buffer.add, 1.0, [1])
+
+    def test_resample(self):
+        _buffer = CAPTURE.CaptureBuffer(1, 10.0)
+        #...value is 10 * time, with uneven sample times
+        for t in [0.0, .03, .18, .22, .41, .5]:
+            _buffer.add(t + 5.0, [t * 10])
+
+        _l = _buffer.resample(10.0)[0]
+        self.assertEqual(len(_l), 6)
+        for i,v in enumerate(_l):
+            self.assertAlmostEqual(v, i, 6)
+
+    def test_resample_single(self):
+        _buffer = CAPTURE.CaptureBuffer(2)
+        self.assertEqual(_buffer.resample(24.0), [[],[]])
+        _buffer.add(1.0, [3, 4])
+        self.assertEqual(_buffer.resample(24.0), [[3.0],[4.0]])
+
+    def test_stats(self):
+        _buffer = CAPTURE.CaptureBuffer(1, 10.0)
+        for t in [0.0, .1, .2, .5, .6]:
+            _buffer.add(t, [0])
+
+        _d = _buffer.get_stats(10.0)
+        self.assertEqual(_d['samples'], 5)
+        self.assertEqual(_d['frames'], 7)
+        self.assertEqual(_d['dropped'], 2)
+        self.assertAlmostEqual(_d['maxInterval'], .3)
+        self.assertAlmostEqual(_d['drift'], .2)
+        self.assertAlmostEqual(_d['interval'], .15)
+        self.assertTrue(_d['jitter'] > 0)
+        self.assertIn('dropped: 2', CAPTURE.format_stats(_d))
+
+# FUNCTIONS ==================================================================
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_CaptureBuffer))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,208 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.test.test_coreLib.test_MOCAPBAKE
+Author: Josh Burton
+email: jjburton@gmail.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the mocapBakeTools matrix bake against the per frame bake and the PostBake
+curve writes it goes through.
+
+benchmark_bake() times both modes on a joint chain retarget.
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import time
+import math
+
+try:
+    import maya.cmds as mc
+
+except ImportError:
+    raise StandardError('MOCAPBAKE test can only be run in Maya')
+from cgm.core.tools import mocapBakeTools as MOCAPBAKE
+from cgm.core.classes import PostBake
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+
+def get_testRig(joints = 10, frames = 100):
+    """
+    Animated source joint chain and an offset, differently oriented target chain
+
+    :returns
+        connection_data for the chains
+    """
+    mc.select(cl=True)
+    _l_source = []
+    for i in range(joints):
+        _l_source.append(mc.joint(p = [0, i * 2, 0], n = 'source_{0}'.format(i)))
+    mc.select(cl=True)
+    _l_target = []
+    for i in range(joints):
+        _l_target.append(mc.joint(p = [5, i * 2.2, 1], n = 'target_{0}'.format(i)))
+    mc.joint(_l_target[0], e=True, oj='xyz', sao='zup', ch=True, zso=True)
+
+    for i,j in enumerate(_l_source):
+        for f in range(0, frames + 1, 10):
+            mc.setKeyframe(j, at='rx', t=f, v=math.sin(f * .1 + i) * 40)
+            mc.setKeyframe(j, at='ry', t=f, v=math.cos(f * .07 + i) * 30)
+            mc.setKeyframe(j, at='rz', t=f, v=(f + i * 7) % 90)
+        if not i:
+            mc.setKeyframe(j, at='ty', t=0, v=0)
+            mc.setKeyframe(j, at='ty', t=frames, v=10)
+
+    _l_dat = []
+    for s,t in zip(_l_source,_l_target):
+        _l_dat.append({'source':s,'target':t,'setPosition':s == _l_source[0],'setRotation':True})
+    MOCAPBAKE.set_connection_offsets(_l_dat)
+    return _l_dat
+
+def get_worldMatrices(nodes, frames):
+    _d = {}
+    for f in frames:
+        mc.currentTime(f)
+        for n in nodes:
+            _d[(n,f)] = mc.xform(n, q=True, ws=True, m=True)
+    return _d
+
+# CLASSES ====================================================================
+class Test_bake(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+
+    def test_matches_frameBake(self):
+        _l_dat = get_testRig(5, 30)
+        _l_targets = [d['target'] for d in _l_dat]
+        _frames = range(0,31)
+
+        mc.currentTime(0)
+        MOCAPBAKE.bake(_l_dat, 0, 30, mode = 'frame')
+        _legacy = get_worldMatrices(_l_targets, _frames)
+        mc.cutKey(_l_targets, at=['t','r'], clear=True)
+
+        MOCAPBAKE.bake(_l_dat, 0, 30, mode = 'matrix')
+        _matrix = get_worldMatrices(_l_targets, _frames)
+
+        for k,m in _legacy.iteritems():
+            for a,b in zip(m,_matrix[k]):
+                self.assertAlmostEqual(a, b, 3, "{0} | {1} != {2}".format(k,m,_matrix[k]))
+
+    def test_backwards(self):
+        _l_dat = get_testRig(2, 20)
+        MOCAPBAKE.bake(_l_dat, 20, 5)
+        self.assertEqual(mc.keyframe(_l_dat[0]['target'], at='rx', q=True, tc=True)[0], 5)
+        self.assertEqual(mc.currentTime(q=True), 0)
+
+class Test_curveValues(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+        self._tangents = (mc.keyTangent(q=True, g=True, itt=True)[0],
+                          mc.keyTangent(q=True, g=True, ott=True)[0])
+
+    def tearDown(self):
+        mc.keyTangent(g=True, itt=self._tangents[0], ott=self._tangents[1])
+
+    def test_tangents(self):
+        #...baked keys should match keying frame by frame, over an existing curve of a different shape
+        _frames = range(0,21)
+        _values = [math.sin(f * .3) * 20 for f in _frames]
+        for itt,ott in [('spline','spline'),('linear','linear'),('clamped','step')]:
+            mc.keyTangent(g=True, itt=itt, ott=ott)
+            _bake = mc.createNode('transform')
+            _ref = mc.createNode('transform')
+            for f,v in [(0,100),(10,-100),(20,100)]:
+                mc.setKeyframe(_bake, at='tx', t=f, v=v)
+
+            PostBake.set_curveValues(_bake, 'tx', _frames, _values)
+            for f,v in zip(_frames,_values):
+                mc.setKeyframe(_ref, at='tx', t=f, v=v)
+
+            for k in 'itt','ott':
+                self.assertEqual(mc.keyTangent(_bake, at='tx', q=True, **{k:True}),
+                                 mc.keyTangent(_ref, at='tx', q=True, **{k:True}))
+            for k in 'inAngle','outAngle':
+                for a,b in zip(mc.keyTangent(_bake, at='tx', q=True, **{k:True}),
+                               mc.keyTangent(_ref, at='tx', q=True, **{k:True})):
+                    self.assertAlmostEqual(a, b, 3, "{0} | {1} | {2} != {3}".format(itt,k,a,b))
+
+class _SpinBake(PostBake.PostBake):
+    '''
+    Keys rx from the frame, everything else is left to the bake
+    '''
+    def update(self, deltaTime = .04):
+        _frame = self._frameSample['frame'] if self._frameSample is not None else mc.currentTime(q=True)
+        self.set_key(self.obj.mNode, 'rx', _frame * 2.0)
+
+class Test_postBake(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+
+    def test_contextChannels(self):
+        #...context and interactive bakes key the same channels with the same values
+        _d = {}
+        for mode in 'interactive','context':
+            _obj = mc.spaceLocator(n = mode)[0]
+            mc.setKeyframe(_obj, at='ty', t=0, v=0)
+            mc.setKeyframe(_obj, at='ty', t=10, v=5)
+            mc.setAttr(_obj + '.sz', 3)
+            _bake = _SpinBake(_obj, sampleMode = mode)
+            _bake.bake(0,10)
+            _d[mode] = _obj
+
+        _l_interactive = sorted(mc.keyframe(_d['interactive'], q=True, name=True) or [])
+        _l_context = sorted(mc.keyframe(_d['context'], q=True, name=True) or [])
+        self.assertEqual([c.replace('interactive','context') for c in _l_interactive], _l_context)
+        for a in 'tx','ty','tz','rx','ry','rz','sx','sy','sz':
+            self.assertEqual(mc.keyframe(_d['interactive'], at=a, q=True, tc=True),
+                             mc.keyframe(_d['context'], at=a, q=True, tc=True))
+            for v1,v2 in zip(mc.keyframe(_d['interactive'], at=a, q=True, vc=True),
+                             mc.keyframe(_d['context'], at=a, q=True, vc=True)):
+                self.assertAlmostEqual(v1, v2, 3, a)
+
+# FUNCTIONS ==================================================================
+def benchmark_bake(joints = 60, frames = 500):
+    """
+    Time a chain retarget with the per frame bake vs. the matrix bake
+
+    :returns
+        dict - {'frame':seconds,'matrix':seconds,'speedup':ratio}
+    """
+    mc.file(new=True,f=True)
+    _l_dat = get_testRig(joints, frames)
+    _l_targets = [d['target'] for d in _l_dat]
+
+    _t = time.time()
+    MOCAPBAKE.bake(_l_dat, 0, frames, mode = 'frame')
+    _frame = time.time() - _t
+    mc.cutKey(_l_targets, at=['t','r'], clear=True)
+
+    _t = time.time()
+    MOCAPBAKE.bake(_l_dat, 0, frames, mode = 'matrix')
+    _matrix = time.time() - _t
+
+    _d = {'joints':joints,
+          'frames':frames,
+          'frame':_frame,
+          'matrix':_matrix,
+          'speedup':_frame / max(_matrix, 1e-6)}
+    log.info("|benchmark_bake| >> joints: {joints} | frames: {frames} | frame: {frame:.3f}s | matrix: {matrix:.3f}s | x{speedup:.1f}".format(**_d))
+    return _d
+
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_bake))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_curveValues))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_postBake))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,103 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.test.test_coreLib.test_NAMETOOLS
+Author: Josh Burton
+email: jjburton@gmail.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for the nameTools.NameQueue deferred naming
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import unittest.runner
+import maya.standalone
+
+try:
+    import maya.cmds as mc
+    from cgm.core import cgm_Meta as cgmMeta
+    from cgm.core.lib import nameTools
+except ImportError:
+    raise StandardError('nameTools test can only be run in Maya')
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+
+# CLASSES ====================================================================
+class Test_NameQueue(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+        self.mParent = cgmMeta.cgmObject(name = 'parent')
+        self.mParent.doStore('cgmName','arm')
+        self.mParent.doStore('cgmType','grp')
+        self.l_children = []
+        for i,direction in enumerate(['left','right']):
+            mChild = cgmMeta.cgmObject(name = 'child{0}'.format(i))
+            mChild.doStore('cgmName','hand')
+            mChild.doStore('cgmDirection',direction)
+            mChild.parent = self.mParent.mNode
+            self.l_children.append(mChild)
+
+    def test_matchesImmediate(self):
+        with nameTools.NameQueue() as mQueue:
+            self.mParent.doName(nameChildren = True)
+            #...nothing renamed until the exit
+            self.assertEqual(self.mParent.p_nameBase,'parent')
+        self.assertEqual(mQueue.d_report['named'],3)
+        l_deferred = [self.mParent.p_nameBase] + [mObj.p_nameBase for mObj in self.l_children]
+
+        for mObj in [self.mParent] + self.l_children:
+            mObj.rename('tmp')
+        self.mParent.doName(nameChildren = True)
+        self.assertEqual([self.mParent.p_nameBase] + [mObj.p_nameBase for mObj in self.l_children],
+                         l_deferred)
+
+    def test_nested(self):
+        with nameTools.NameQueue() as mOuter:
+            with nameTools.NameQueue():
+                self.l_children[0].doName()
+            self.assertEqual(self.l_children[0].p_nameBase,'child0')
+            self.l_children[1].doName()
+        self.assertEqual(mOuter.d_report['named'],2)
+        self.assertNotEqual(self.l_children[0].p_nameBase,'child0')
+
+    def test_inactive(self):
+        with nameTools.NameQueue(active = False):
+            self.assertEqual(nameTools.queue_get(),None)
+            self.l_children[0].doName()
+            self.assertNotEqual(self.l_children[0].p_nameBase,'child0')
+
+    def test_nameSource(self):
+        #...cgmName linked to another queued node takes that node's new name
+        mLinked = cgmMeta.cgmObject(name = 'linked')
+        mLinked.doStore('cgmName',self.l_children[0].mNode)
+        mLinked.doStore('cgmType','loc')
+        with nameTools.NameQueue():
+            self.l_children[0].doName()
+            mLinked.doName()
+        self.assertTrue(mLinked.p_nameBase.startswith(self.l_children[0].p_nameBase))
+
+    def test_collisions(self):
+        with nameTools.NameQueue() as mQueue:
+            self.l_children[0].doName()
+        mDup = cgmMeta.cgmObject(mc.duplicate(self.l_children[0].mNode)[0])
+        mc.parent(mDup.mNode,world = True)
+        with nameTools.NameQueue() as mQueue:
+            mDup.doName()
+        self.assertEqual(len(mQueue.d_report['collisions']),1)
+
+# FUNCTIONS ==================================================================
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_NameQueue))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,214 @@
+"""
+------------------------------------------
+cgm_Meta: cgm.core.test.test_coreLib.test_RAYS
+Author: Josh Burton
+email: jjburton@gmail.com
+
+Website : http://www.cgmonks.com
+------------------------------------------
+
+Unit Tests for batch casting in rayCaster/shapeCaster.
+
+benchmark_sliceCast() times shape casting against a dense body sized mesh - the locator rotate +
+per ray cast loop we used to run vs cast_many with computed lathe vectors.
+
+benchmark_dragCast() times the per event cast of a clickMesh drag - cast vs a CastCache built once.
+================================================================
+"""
+# IMPORTS ====================================================================
+import unittest
+import logging
+import time
+
+try:
+    import maya.cmds as mc
+
+except ImportError:
+    raise StandardError('RAYS test can only be run in Maya')
+from cgm.core.lib import rayCaster as RAYS
+from cgm.core.lib import shapeCaster as SHAPECAST
+import cgm.core.lib.distance_utils as DIST
+
+# LOGGING ====================================================================
+log = logging.getLogger(__name__.split('.')[-1])
+log.setLevel(logging.INFO)
+
+def get_testMesh(faces = 30000):
+    """
+    Sphere with roughly the given face count
+    """
+    _sub = int((faces / 2) ** .5)
+    return mc.polySphere(r = 10, sx = _sub * 2, sy = _sub, ch = False)[0]
+
+def get_legacySlice(mesh, obj, latheAxis = 'z', aimAxis = 'y+', values = [], maxDistance = 1000):
+    """
+    What createMeshSliceCurve used to do per point - rotate a locator and cast from it
+    """
+    _loc = mc.spaceLocator()[0]
+    mc.delete(mc.parentConstraint(obj,_loc))
+    _res = []
+    for v in values:
+        mc.setAttr("{0}.rotate{1}".format(_loc,latheAxis.capitalize()),v)
+        _res.append(RAYS.cast(mesh,_loc,aimAxis,maxDistance = maxDistance).get('hit'))
+    mc.delete(_loc)
+    return _res
+
+# CLASSES ====================================================================
+class Test_castMany(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+        self.mesh = get_testMesh(2000)
+
+    def test_matches_cast(self):
+        _origins = [[0,0,0],[1,2,0],[0,-3,1]]
+        _vectors = [[1,0,0],[0,1,0],[0,0,-1]]
+        _d = RAYS.cast_many(self.mesh, _origins, _vectors)
+
+        for i,p in enumerate(_origins):
+            _single = RAYS.cast(self.mesh, startPoint = p, vector = _vectors[i])
+            self.assertLess(DIST.get_distance_between_points(_single['hit'],_d['hits'][i]), .001)
+            self.assertEqual(len(_d['normals'][i]), 3)
+            self.assertEqual(len(_d['uvs'][i]), 2)
+
+    def test_miss(self):
+        _d = RAYS.cast_many(self.mesh, [[0,50,0],[0,0,0]], [[0,1,0]])
+        self.assertEqual(_d['hits'][0], None)
+        self.assertIsNotNone(_d['hits'][1])
+
+    def test_far(self):
+        _near = RAYS.cast_many(self.mesh, [0,-50,0], [0,1,0])
+        _far = RAYS.cast_many(self.mesh, [0,-50,0], [0,1,0], firstHit = False)
+        self.assertAlmostEqual(_near['hits'][0][1], -10, 1)
+        self.assertAlmostEqual(_far['hits'][0][1], 10, 1)
+
+    def test_latheCastDat(self):
+        _values = [0,45,90,180,270]
+        _obj = mc.spaceLocator()[0]
+        mc.xform(_obj, ws = True, t = [1,2,0], ro = [10,20,30])
+
+        _dat = SHAPECAST.get_latheCastDat(_obj, _obj, 'z', 'y+', _values)
+        _legacy = get_legacySlice(self.mesh, _obj, 'z', 'y+', _values)
+        _d = RAYS.cast_many(self.mesh, [d[0] for d in _dat], [d[1] for d in _dat])
+        for i,h in enumerate(_legacy):
+            self.assertLess(DIST.get_distance_between_points(h,_d['hits'][i]), .001)
+        self.assertEqual(mc.getAttr(_obj + '.rotateZ'), 30)
+
+    def test_latheCastDat_units(self):
+        _obj = mc.spaceLocator()[0]
+        mc.xform(_obj, ws = True, t = [1,2,0], ro = [10,20,30])
+        _cm = SHAPECAST.get_latheCastDat(_obj, _obj, 'z', 'y+', [0,90])
+        mc.currentUnit(linear = 'm')
+        try:
+            _m = SHAPECAST.get_latheCastDat(_obj, _obj, 'z', 'y+', [0,90])
+        finally:
+            mc.currentUnit(linear = 'cm')
+        for a,b in zip(_cm,_m):
+            for i in range(3):
+                self.assertAlmostEqual(a[0][i] * .01, b[0][i], 5)
+                self.assertAlmostEqual(a[1][i], b[1][i], 5)
+
+class Test_castCache(unittest.TestCase):
+    def setUp(self):
+        mc.file(new=True,f=True)
+        self.mesh = get_testMesh(2000)
+        self.shape = mc.listRelatives(self.mesh, shapes = True, fullPath = True)[0]
+
+    def test_matches_cast(self):
+        _cache = RAYS.CastCache([self.shape])
+        for firstHit in True,False:
+            _single = RAYS.cast([self.shape], startPoint = [0,-50,1], vector = [0,1,0], firstHit = firstHit)
+            _d = _cache.cast([0,-50,1], [0,1,0], firstHit = firstHit)
+            self.assertEqual(len(_single['hits']), len(_d['hits']))
+            for k in 'near','far','hit':
+                self.assertLess(DIST.get_distance_between_points(_single[k],_d[k]), .001)
+            self.assertEqual(len(_d['meshNormals'][self.shape]), len(_d['hits']))
+            self.assertEqual(len(_d['uvs'][self.shape]), len(_d['hits']))
+        _cache.clear()
+
+    def test_miss(self):
+        _cache = RAYS.CastCache(self.mesh)
+        self.assertEqual(_cache.cast([0,50,0], [0,1,0]), {})
+        self.assertEqual(len(_cache.shapes), 1)
+
+    def test_keys(self):
+        #...transform args keep their per mesh results on the transform, like cast
+        _d = RAYS.CastCache(self.mesh).cast([0,-50,1], [0,1,0])
+        self.assertEqual(_d['meshHits'].keys(), [self.mesh])
+        _d = RAYS.CastCache([self.shape]).cast([0,-50,1], [0,1,0])
+        self.assertEqual(_d['meshHits'].keys(), [self.shape])
+
+# FUNCTIONS ==================================================================
+def benchmark_sliceCast(faces = 30000, casts = 20, points = 12):
+    """
+    Time slice casting on a dense mesh. legacy - locator rotate + RAYS.cast per point vs.
+    batch - get_latheCastDat + cast_many per slice.
+
+    :returns
+        dict - {'legacy':seconds,'batch':seconds,'speedup':ratio}
+    """
+    mc.file(new=True,f=True)
+    _mesh = get_testMesh(faces)
+    _obj = mc.spaceLocator()[0]
+    _values = [360.0 / points * i for i in range(points)]
+
+    _t = time.time()
+    for i in range(casts):
+        get_legacySlice(_mesh, _obj, 'z', 'y+', _values)
+    _legacy = time.time() - _t
+
+    _t = time.time()
+    for i in range(casts):
+        _dat = SHAPECAST.get_latheCastDat(_obj, _obj, 'z', 'y+', _values)
+        RAYS.cast_many(_mesh, [d[0] for d in _dat], [d[1] for d in _dat], normals = False, uvs = False)
+    _batch = time.time() - _t
+
+    _d = {'faces':mc.polyEvaluate(_mesh, face = True),
+          'rays':casts * points,
+          'legacy':_legacy,
+          'batch':_batch,
+          'speedup':_legacy / max(_batch, 1e-6)}
+    log.info("|benchmark_sliceCast| >> faces: {faces} | rays: {rays} | legacy: {legacy:.3f}s | batch: {batch:.3f}s | x{speedup:.1f}".format(**_d))
+    return _d
+
+def benchmark_dragCast(faces = 30000, events = 200):
+    """
+    Time a drag worth of all hit casts. cast per event vs. one CastCache for the drag
+
+    :returns
+        dict - {'cast':seconds,'cache':seconds,'speedup':ratio}
+    """
+    mc.file(new=True,f=True)
+    _mesh = get_testMesh(faces)
+    _l_points = [[-8 + 16.0 * i / events, -50, 1] for i in range(events)]
+
+    _t = time.time()
+    for p in _l_points:
+        RAYS.cast(_mesh, startPoint = p, vector = [0,1,0], firstHit = False)
+    _cast = time.time() - _t
+
+    _t = time.time()
+    _cache = RAYS.CastCache(_mesh)
+    for p in _l_points:
+        _cache.cast(p, [0,1,0], firstHit = False)
+    _cache.clear()
+    _cached = time.time() - _t
+
+    _d = {'faces':mc.polyEvaluate(_mesh, face = True),
+          'events':events,
+          'cast':_cast,
+          'cache':_cached,
+          'speedup':_cast / max(_cached, 1e-6)}
+    log.info("|benchmark_dragCast| >> faces: {faces} | events: {events} | cast: {cast:.3f}s | cache: {cache:.3f}s | x{speedup:.1f}".format(**_d))
+    return _d
+
+def main(**kwargs):
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_castMany))
+    suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(Test_castCache))
+
+    debug = kwargs.get('debug', False)
+
+    if debug:
+        suite.debug()
+    else:
+        unittest.TextTestRunner(verbosity=2).run(suite)
@@ -24,6 +24,8 @@ from cgm.core.classes import DraggerContextFactory as cgmDrag
 from cgm.core.lib import ease_utils as EASE
 from cgm.core.lib import snap_utils as SNAP
 from cgm.core import cgm_General as cgmGeneral
+from cgm.core.lib import capture_buffer as CAPTURE
+from cgm.core.classes import PostBake as PostBake
 
 from cgm.core.tools.liveRecord import LiveRecord
 
@@ -31,6 +33,7 @@ import time
 
 import maya.mel as mel
 import maya.cmds as mc
+import maya.OpenMaya as OM
 
 #========================================================================
 import logging
@@ -77,13 +80,13 @@ class RecordableObj(object):
         
         self._prevDataDict = {}
 
-        mc.refresh(su=True)
-        for i in range(int(ct), int(mc.playbackOptions(q=True, max=True))+1):
-            mc.currentTime(i)
-            self._prevDataDict[i] = {'p':obj.p_position, 'f':obj.getTransformDirection(EUCLID.Vector3(0,0,1)), 'u':obj.getTransformDirection(EUCLID.Vector3(0,1,0))}
-        mc.refresh(su=False)
-
-        mc.currentTime(ct)
+        #...sampled through a DG context rather than stepping the time slider
+        for sample in PostBake.sample_transform(obj.mNode, range(int(ct), int(mc.playbackOptions(q=True, max=True))+1)):
+            _f = OM.MVector(0,0,1) * sample['worldMatrix']
+            _u = OM.MVector(0,1,0) * sample['worldMatrix']
+            self._prevDataDict[sample['frame']] = {'p':EUCLID.Vector3(*sample['position']),
+                                                   'f':EUCLID.Vector3(_f.x,_f.y,_f.z),
+                                                   'u':EUCLID.Vector3(_u.x,_u.y,_u.z)}
 
     def saveKeys(self, attrs, replaceStored = True, removeOld = True):
         if self.hasSavedKeys and replaceStored:
@@ -155,12 +158,19 @@ class AnimDraw(LiveRecord):
         self._debugLoc = None
         self._prevDataDict = {}
         self._useCache = False
+        self._buffered = False
+        self._previewFrame = None
 
         self._recordButtons = [1]
 
     def update(self, deltaTime = .04):
         mp = MOUSE.getMousePosition()
         pos, vec = cgmDrag.screenToWorld( mp['x']+self.offset.x, mp['y']+self.offset.y )
+
+        if self._buffered:
+            self.updateBuffered(vec)
+            LiveRecord.update(self, deltaTime)
+            return
         
         startPos = VALID.euclidVector3Arg(self.recordableObjs[0].obj.p_position)
         currentFrame = int(mc.currentTime(q=True))
@@ -188,6 +198,65 @@ class AnimDraw(LiveRecord):
 
         LiveRecord.update(self, deltaTime)
 
+    def updateBuffered(self, vec):
+        '''
+        Buffered take - the time slider follows the clock and the objects are moved for the
+        preview, but nothing is keyed. The keyable values are captured and written on completion
+        '''
+        frame = int(self.get_recordFrame())
+        if frame != self._previewFrame:
+            self._previewFrame = frame
+            mc.currentTime(frame)
+            if self.recordableObjs[0]._bakedLoc:
+                if not self.recordableObjs[0].restoreBakedLocFromData(frame):
+                    self.recordableObjs[0]._bakedLoc.p_position = self._currentPlaneObject.p_position
+
+        if self.mode == 'position':
+            self.moveObjOnPlane(vec, key=False)
+        elif self.mode == 'aim':
+            self.aimObjToPlane(vec, key=False)
+
+        _values = []
+        for recordable in self.recordableObjs:
+            _values.extend([mc.getAttr('{0}.{1}'.format(recordable.obj.mNode, a)) for a in self.keyableAttrs])
+        _pos = VALID.euclidVector3Arg(self.recordableObjs[0].obj.p_position)
+        _values.extend([_pos.x, _pos.y, _pos.z])
+        self.capture(_values)
+
+    def writeCapture(self):
+        '''
+        Resample the buffered take to the scene rate and write each keyable channel in one go.
+        The whole take is one undo chunk
+        '''
+        _str_func = 'AnimDraw.writeCapture'
+
+        _l_channels = self.captureBuffer.resample(1.0/self.fixedDeltaTime)
+        if not _l_channels[0]:
+            log.warning("|{0}| >> Nothing captured".format(_str_func))
+            return False
+
+        _start = int(self.recordStartFrame)
+        _frames = [_start + i for i in range(len(_l_channels[0]))]
+        _i = 0
+        mc.undoInfo(openChunk=True, chunkName='animDrawTake')
+        try:
+            for recordable in self.recordableObjs:
+                for a in self.keyableAttrs:
+                    PostBake.set_curveValues(recordable.obj.mNode, a, _frames, _l_channels[_i])
+                    _i += 1
+        finally:
+            mc.undoInfo(closeChunk=True)
+
+        _l_pos = _l_channels[_i:_i+3]
+        if len(_frames) > 1:
+            self._velocity = MATHUTILS.Vector3(*[l[-1] - l[-2] for l in _l_pos])
+        else:
+            self._velocity = MATHUTILS.Vector3.zero()
+
+        log.debug("|{0}| >> {1} frames from {2} samples".format(_str_func, len(_frames), len(self.captureBuffer)))
+        mc.currentTime(_frames[-1] + 1)
+        return True
+
     def completeRecording(self):
         if self.clickAction.modifier != 'ctrl':
             mc.currentTime(currentFrame-1)
@@ -230,6 +299,15 @@ class AnimDraw(LiveRecord):
             
             self.recordableObjs[0].restoreBakedLocFromData(mc.currentTime(q=True))
 
+            #...takes are buffered and written on completion unless we're repositioning or looping
+            self._buffered = self.clickAction.modifier != 'ctrl' and not self.loopTime
+            self._previewFrame = None
+            self.captureBuffer = None
+            if self._buffered:
+                fps = 1.0/self.fixedDeltaTime
+                self.captureBuffer = CAPTURE.CaptureBuffer(len(self.recordableObjs) * len(self.keyableAttrs) + 3, fps,
+                                                           (mc.playbackOptions(q=True, max=True) - mc.currentTime(q=True)) / fps + 1.0)
+
             self.record()
 
         else:
@@ -250,6 +328,9 @@ class AnimDraw(LiveRecord):
 
     def completeRecording(self):
         if self.clickAction.modifier != 'ctrl':
+            if self._buffered:
+                self.writeCapture()
+
             log.warning("Completing Recording - Frame {0}".format(mc.currentTime(q=True)))
 
             self.endTime = mc.currentTime(q=True)
@@ -268,6 +349,7 @@ class AnimDraw(LiveRecord):
                 self.onReposition()
 
         self._useCache = False
+        self._buffered = False
 
         LiveRecord.completeRecording(self)
 
@@ -407,7 +489,7 @@ class AnimDraw(LiveRecord):
 
         return pos
 
-    def moveObjOnPlane(self,vector):
+    def moveObjOnPlane(self,vector, key = True):
         _str_func = 'LiveRecord.moveObjOnPlane'
 
         projectedPosition = self.projectOntoPlane(vector)
@@ -423,13 +505,14 @@ class AnimDraw(LiveRecord):
             recordable.obj.p_position = wantedPos
             #log.info('{0} wantedPos : {1}, projectedPos : {2}, objOffset : {3}'.format(recordable.obj.mNode, wantedPos, projectedPosition, recordable.dataDict['objOffset']))
 
-        mc.setKeyframe([x.obj.mNode for x in self.recordableObjs], at=self.keyableAttrs)
+        if key:
+            mc.setKeyframe([x.obj.mNode for x in self.recordableObjs], at=self.keyableAttrs)
 
         if self._debugLoc:
             self._debugLoc.p_position = projectedPosition
             mc.setKeyframe(self._debugLoc.mNode, at='translate')
 
-    def aimObjToPlane(self, vector):
+    def aimObjToPlane(self, vector, key = True):
         _str_func = 'LiveRecord.aimObjToPlane'
 
         wantedPos = self.projectOntoPlane(vector)
@@ -439,7 +522,8 @@ class AnimDraw(LiveRecord):
         for recordable in self.recordableObjs:
             SNAP.aim_atPoint(obj=recordable.obj, mode='matrix', position=wantedPos, aimAxis=self.aimFwd.p_string, upAxis=self.aimUp.p_string, vectorUp=vectorUp)
         
-        mc.setKeyframe([x.obj.mNode for x in self.recordableObjs], at=self.keyableAttrs)
+        if key:
+            mc.setKeyframe([x.obj.mNode for x in self.recordableObjs], at=self.keyableAttrs)
 
         if self._debugLoc:
             self._debugLoc.p_position = wantedPos
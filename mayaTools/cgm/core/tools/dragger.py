@@ -42,18 +42,19 @@ class Dragger(PostBake.PostBake):
     def update(self, deltaTime=.04):
         #dir = self.obj.getTransformDirection(self.aimFwd.p_vector)
 
-        self.dir = self._bakedLoc.getTransformDirection(self.aimFwd.p_vector)*self.objectScale
+        self.dir = self.get_bakedDirection(self.aimFwd.p_vector)*self.objectScale
 
-        wantedTargetPos = ((VALID.euclidVector3Arg(self.obj.p_position) + self.dir) - self.obj.p_position).normalized()*self.objectScale + self.obj.p_position
+        _pos = self.get_position()
+        wantedTargetPos = ((_pos + self.dir) - _pos).normalized()*self.objectScale + _pos
         
-        self.lastUp = MATH.Vector3.Lerp( self.lastUp, self._bakedLoc.getTransformDirection(self.aimUp.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
+        self.lastUp = MATH.Vector3.Lerp( self.lastUp, self.get_bakedDirection(self.aimUp.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
 
-        self.aimTargetPos = (MATH.Vector3.Lerp(self.aimTargetPos, wantedTargetPos, deltaTime*self.damp) - self.obj.p_position).normalized()*self.objectScale + self.obj.p_position
-        self.upTargetPos = (MATH.Vector3.Lerp(self.aimTargetPos, wantedTargetPos, deltaTime*self.damp) - self.obj.p_position).normalized()*self.objectScale + self.obj.p_position
+        self.aimTargetPos = (MATH.Vector3.Lerp(self.aimTargetPos, wantedTargetPos, deltaTime*self.damp) - _pos).normalized()*self.objectScale + _pos
+        self.upTargetPos = (MATH.Vector3.Lerp(self.aimTargetPos, wantedTargetPos, deltaTime*self.damp) - _pos).normalized()*self.objectScale + _pos
 
-        self.lastFwd = MATH.Vector3.Lerp( self.lastFwd, self._bakedLoc.getTransformDirection(self.aimFwd.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
+        self.lastFwd = MATH.Vector3.Lerp( self.lastFwd, self.get_bakedDirection(self.aimFwd.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
         
-        SNAP.aim_atPoint(obj=self.obj.mNode, mode='matrix', position=self.aimTargetPos, aimAxis=self.aimFwd.p_string, upAxis=self.aimUp.p_string, vectorUp=self.lastUp )
+        self.aim_atPoint(self.aimTargetPos, self.lastUp, 'matrix')
 
         if self.debug:
             if not self._debugLoc:
@@ -65,8 +66,8 @@ class Dragger(PostBake.PostBake):
         if not self.bakeTempLocator():
             self.cancelBake()
 
-        self.lastFwd = self._bakedLoc.getTransformDirection(self.aimFwd.p_vector)
-        self.lastUp = self._bakedLoc.getTransformDirection(self.aimUp.p_vector)
+        self.lastFwd = self.get_bakedDirection(self.aimFwd.p_vector)
+        self.lastUp = self.get_bakedDirection(self.aimUp.p_vector)
 
     def finishBake(self):
         self.aimTargetPos = self.startPosition + self.dir
@@ -30,9 +30,13 @@ class KeyframeToMotionCurve(PostBake.PostBake):
         self.debug = debug
 
     def update(self, deltaTime=.04):
-        d_closest = DIST.get_closest_point_data(self.motionCurve.mNode,self._bakedLoc.mNode)
-        self.motionPath.uValue = d_closest['parameter']
-        mc.setKeyframe(self.motionPath.mNode, at='uValue', v=d_closest['parameter'])
+        if self.isContextBake():
+            _pos = self.get_position()
+            _param = PostBake.get_closestCurveParam(self.motionCurve.mNode, [_pos.x,_pos.y,_pos.z])
+        else:
+            _param = DIST.get_closest_point_data(self.motionCurve.mNode,self._bakedLoc.mNode)['parameter']
+            self.motionPath.uValue = _param
+        self.set_key(self.motionPath.mNode, 'uValue', _param)
 
     def bake(self):
         startTime = int(mc.findKeyframe(self.obj.mNode, which='first'))
@@ -47,10 +51,15 @@ class KeyframeToMotionCurve(PostBake.PostBake):
         ks = [0]
         k = -1
 
+        _b_context = self.isContextBake()
+        if _b_context:
+            points = [sample['position'] for sample in self._l_samples]
+
         mc.refresh(su=not self.showBake)
         for i in range(self.startTime, self.endTime+1):
-            mc.currentTime(i)
-            points.append(self._bakedLoc.p_position)
+            if not _b_context:
+                mc.currentTime(i)
+                points.append(self._bakedLoc.p_position)
             ks.append( min(max(k,0),self.endTime-self.startTime-2) )
             k = k + 1
         mc.refresh(su=False)
@@ -11,6 +11,7 @@ Website : http://www.cgmonks.com
 
 from cgm.core.classes import DraggerContextFactory as cgmDrag
 from cgm.core.lib import mouse_utils as MOUSE
+from cgm.core.lib import capture_buffer as CAPTURE
 
 import time
 import maya.mel as mel
@@ -45,6 +46,13 @@ class LiveRecord(object):
         fps = mel.eval('currentTimeUnitToFPS')
         self.fixedDeltaTime = 1.0/fps
 
+        # Capture - subclasses that buffer their takes set captureBuffer before record()
+        self.captureBuffer = None
+        self.captureStats = None
+        self.l_takeStats = []
+        self.recordStartTime = None
+        self.recordStartFrame = None
+
     def activate(self):
         _str_func = 'LiveRecord.activate'
 
@@ -63,22 +71,58 @@ class LiveRecord(object):
             mc.refresh(force=True)
 
         fps = mel.eval('currentTimeUnitToFPS')
-               
+        self.fixedDeltaTime = 1.0/fps
+
         startTime = time.time()
         prevTime = startTime
-
-        currentFrame = mc.currentTime(q=True)
-
-        while any([MOUSE.getMouseDown(x) for x in self._recordButtons]) and currentFrame < mc.playbackOptions(q=True, max=True):
-            deltaTime = time.time() - prevTime
-            waitTime = self.fixedDeltaTime - deltaTime
-            time.sleep( max(waitTime, 0.0) )
-            prevTime = time.time()
-            self.update(self.fixedDeltaTime)
-
-        print "Duration: %f" % (time.time() - startTime)
-        
-        mc.refresh()        
+        self.recordStartTime = startTime
+        self.recordStartFrame = mc.currentTime(q=True)
+        self.captureStats = None
+        endFrame = mc.playbackOptions(q=True, max=True)
+
+        #...ticks are scheduled off the start time rather than the last tick so a slow
+        #...update doesn't push every tick after it back. If we fall a tick behind we skip it
+        tick = 0
+        while any([MOUSE.getMouseDown(x) for x in self._recordButtons]):
+            currentFrame = self.recordStartFrame
+            if self.captureBuffer is not None:
+                currentFrame = self.get_recordFrame()
+            if currentFrame >= endFrame:
+                break
+            waitTime = startTime + tick * self.fixedDeltaTime - time.time()
+            if waitTime > 0:
+                time.sleep(waitTime)
+            now = time.time()
+            self.update(now - prevTime if tick else self.fixedDeltaTime)
+            prevTime = now
+            tick = max(tick + 1, int((now - startTime) / self.fixedDeltaTime) + 1)
+
+        log.info("|{0}| >> Duration: {1:.3f}s".format(_str_func, time.time() - startTime))
+
+        if self.captureBuffer is not None:
+            self.captureStats = self.captureBuffer.get_stats(fps)
+            self.l_takeStats.append(self.captureStats)
+            log.info("|{0}| >> Take {1} | {2}".format(_str_func, len(self.l_takeStats), CAPTURE.format_stats(self.captureStats)))
+
+        mc.refresh()
+
+    def get_recordTime(self):
+        '''
+        Seconds since the current take started
+        '''
+        return time.time() - self.recordStartTime
+
+    def get_recordFrame(self):
+        '''
+        Scene frame the current take is at by the clock, not by the number of updates
+        '''
+        return self.recordStartFrame + self.get_recordTime() / self.fixedDeltaTime
+
+    def capture(self, values):
+        '''
+        Add a sample to the capture buffer at the current record time
+        '''
+        self.captureBuffer.add(self.get_recordTime(), values)
 
     def completeRecording(self):
         if self.onComplete != None:
@@ -26,6 +26,7 @@ log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
 import maya.cmds as mc
+import maya.OpenMaya as OM
 
 import cgm.core.classes.GuiFactory as cgmUI
 mUI = cgmUI.mUI
@@ -42,6 +43,7 @@ from cgm.core.lib import search_utils as SEARCH
 from cgm.core.lib import snap_utils as SNAP
 from cgm.core.lib import distance_utils as DIST
 from cgm.core.lib import euclid
+from cgm.core.classes import PostBake as PostBake
 from cgm.core.cgmPy import validateArgs as VALID
 from cgm.core.cgmPy import path_Utils as CGMPATH
 from cgm.lib import lists
@@ -954,12 +956,26 @@ def set_connection_offsets(connection_data):
         connection['offsetUp'] = [v.x, v.y, v.z]
 
 
-def bake(connection_data, start, end):
+def get_bakeRange(start, end):
     bake_range = range( int(math.floor(start)), int(math.floor(end+1)))
     if end < start:
         bake_range = range(int(math.floor(end)),int(math.floor(start+1)))
         bake_range.reverse()
+    return bake_range
 
+def bake(connection_data, start, end, mode = 'matrix'):
+    '''bakes the targets to their sources over the range. end < start bakes backwards
+    input >
+    connection_data -- see set_connection_offsets
+    mode --
+        'matrix' -- (default) sample everything in one DG context pass and write whole curves
+        'frame' -- step the time slider and key every frame'''
+    bake_range = get_bakeRange(start, end)
+    if mode == 'matrix':
+        return bake_matrix(connection_data, bake_range)
+    return bake_frames(connection_data, bake_range)
+
+def bake_frames(connection_data, bake_range):
     for i in bake_range:
         mc.currentTime(i)
         for conn in connection_data:
@@ -989,6 +1005,115 @@ def bake(connection_data, start, end):
                 SNAP.aim_atPoint(conn['target'], target_pos + fwd, vectorUp=up, mode='matrix')
                 mc.setKeyframe('%s.rotate' % conn['target'])
 
+def bake_matrix(connection_data, bake_range):
+    '''Same result as bake_frames without moving the time slider. All sources and targets are 
+    sampled through a DG context in one pass, the offsets and aim are solved as matrix math 
+    against the sampled parent space and each target channel is written as a whole curve.
+    
+    Connections are solved in order like bake_frames, so a target under an earlier target 
+    gets its parent space from that target's baked pose. Pivots on targets with baked children
+    are assumed to be zeroed.'''
+    _str_func = 'bake_matrix'
+    if not connection_data or not bake_range:
+        return False
+
+    _l_nodes = []
+    for conn in connection_data:
+        for k in 'source','target':
+            if conn[k] not in _l_nodes:
+                _l_nodes.append(conn[k])
+
+    log.debug("|{0}| >> sampling {1} nodes over {2} frames".format(_str_func,len(_l_nodes),len(bake_range)))
+    _d_samples = PostBake.sample_transforms(_l_nodes, bake_range)
+
+    #...static data per connection
+    _l_dat = []
+    for i,conn in enumerate(connection_data):
+        _long = mc.ls(conn['target'], l=True)[0]
+        _d_orient = PostBake.get_rotationOffsets(conn['target'])
+        _d = {'long':_long,
+              'orient':_d_orient,
+              'rotateAxis':_d_orient['rotateAxisInverse'].inverse(),
+              'jointOrient':_d_orient['jointOrientInverse'].inverse(),
+              'positionOffset':OM.MVector(*[OM.MDistance.uiToInternal(v) for v in conn.get('positionOffset',[0,0,0])]),
+              'offsetForward':OM.MVector(*conn.get('offsetForward',[0,0,1])),
+              'offsetUp':OM.MVector(*conn.get('offsetUp',[0,1,0])),
+              'ancestor':None,
+              'isParent':False,
+              'euler':None}
+        #...nearest earlier target above us
+        for j in range(i):
+            _parent = _l_dat[j]['long']
+            if _long.startswith(_parent + '|'):
+                if _d['ancestor'] is None or len(_parent) > len(_l_dat[_d['ancestor']]['long']):
+                    _d['ancestor'] = j
+        if _d['ancestor'] is not None:
+            _l_dat[_d['ancestor']]['isParent'] = True
+        _d['keys'] = dict((a,[]) for a in ['tx','ty','tz','rx','ry','rz'])
+        _l_dat.append(_d)
+
+    for k,f in enumerate(bake_range):
+        _l_world = [None] * len(connection_data)
+        for i,conn in enumerate(connection_data):
+            _d = _l_dat[i]
+            _source = _d_samples[conn['source']][k]
+            _target = _d_samples[conn['target']][k]
+
+            _pim = _target['parentInverseMatrix']
+            if _d['ancestor'] is not None:
+                _ancestor = _d_samples[connection_data[_d['ancestor']]['target']][k]
+                _pm = _pim.inverse() * _ancestor['worldMatrix'].inverse() * _l_world[_d['ancestor']]
+                _pim = _pm.inverse()
+
+            #...position, the rotate pivot goes to the source's plus the offset
+            _t = _target['translate']
+            if conn['setPosition']:
+                _p = OM.MPoint(*[OM.MDistance.uiToInternal(v) for v in _source['position']]) + _d['positionOffset']
+                _rp = OM.MPoint(*[OM.MDistance.uiToInternal(v) for v in _target['position']]) * _target['parentInverseMatrix']
+                _t = OM.MVector(_p * _pim) - (OM.MVector(_rp) - _target['translate'])
+                for a,v in zip(['tx','ty','tz'],[_t.x,_t.y,_t.z]):
+                    _d['keys'][a].append(OM.MDistance.internalToUI(v))
+
+            #...rotation, aim down the source's offset forward with its offset up
+            _local = OM.MTransformationMatrix(_target['worldMatrix'] * _target['parentInverseMatrix']).asRotateMatrix()
+            if conn['setRotation']:
+                _fwd = _d['offsetForward'] * _source['worldMatrix']
+                _up = _d['offsetUp'] * _source['worldMatrix']
+                wantedAim, wantedUp = MATH.convert_aim_vectors_to_different_axis(MATH.Vector3(_fwd.x,_fwd.y,_fwd.z),
+                                                                                  MATH.Vector3(_up.x,_up.y,_up.z))
+                rot_matrix = euclid.Matrix4.new_look_at(MATH.Vector3.zero(), -wantedAim, wantedUp)
+                _world = PostBake.list_toMatrix(rot_matrix[0:12] + [0.0, 0.0, 0.0, 1.0])
+                _local = OM.MTransformationMatrix(_world * _pim).asRotateMatrix()
+                _rot = _d['orient']['rotateAxisInverse'] * _local * _d['orient']['jointOrientInverse']
+                _euler = PostBake.matrix_toEuler(_rot, _d['orient']['rotateOrder'], _d['euler'])
+                _d['euler'] = _euler
+                for a,v in zip(['rx','ry','rz'],[_euler.x,_euler.y,_euler.z]):
+                    _d['keys'][a].append(math.degrees(v))
+
+            if _d['isParent']:
+                #...our new world matrix for the targets below us
+                _tm = OM.MTransformationMatrix(_target['worldMatrix'] * _target['parentInverseMatrix'])
+                _tm.setTranslation(OM.MVector(), OM.MSpace.kTransform)
+                _scale = _tm.asMatrix() * _tm.asRotateMatrix().inverse()
+                _tm = OM.MTransformationMatrix(_scale * _local)
+                _tm.setTranslation(_t, OM.MSpace.kTransform)
+                _l_world[i] = _tm.asMatrix() * _pim.inverse()
+
+    #...write the curves, one undo chunk for the whole bake
+    _l_frames = sorted(bake_range)
+    mc.undoInfo(openChunk=True, chunkName='mocapMatrixBake')
+    try:
+        for i,conn in enumerate(connection_data):
+            _d_keys = _l_dat[i]['keys']
+            for a,l in _d_keys.iteritems():
+                if not l:
+                    continue
+                _d_frame = dict(zip(bake_range,l))
+                PostBake.set_curveValues(conn['target'], a, _l_frames, [_d_frame[f] for f in _l_frames])
+    finally:
+        mc.undoInfo(closeChunk=True)
+    return True
+
 
 _d_annotations = {'addSource':'Adds the selected objects to the source list.',
                   'removeSource':'Removed the selected object from the source list.',
@@ -66,10 +66,11 @@ class Spring(PostBake.PostBake):
     def update(self, deltaTime=.04):
         #log.info("Updating")
         
-        self.dir = self._bakedLoc.getTransformDirection(self.aimFwd.p_vector) * self.objectScale
+        self.dir = self.get_bakedDirection(self.aimFwd.p_vector) * self.objectScale
 
-        wantedTargetPos = ((VALID.euclidVector3Arg(self.obj.p_position) + self.dir) - self.obj.p_position).normalized() * self.objectScale + self.obj.p_position
-        wantedUp = self._bakedLoc.getTransformDirection(self.aimUp.p_vector) * self.objectScale
+        _pos = self.get_position()
+        wantedTargetPos = ((_pos + self.dir) - _pos).normalized() * self.objectScale + _pos
+        wantedUp = self.get_bakedDirection(self.aimUp.p_vector) * self.objectScale
         
         self.positionForce = self.positionForce + ((wantedTargetPos - self.aimTargetPos) * self.springForce)
         self.positionForce = self.positionForce * (1.0 - self.damp)
@@ -80,7 +81,7 @@ class Spring(PostBake.PostBake):
         self.aimTargetPos = self.aimTargetPos + (self.positionForce * deltaTime)
         self.upTargetPos = self.upTargetPos + (self.angularForce * deltaTime)
                 
-        SNAP.aim_atPoint(obj=self.obj.mNode, mode='matrix', position=self.aimTargetPos, aimAxis=self.aimFwd.p_string, upAxis=self.aimUp.p_string, vectorUp=self.upTargetPos.normalized() )
+        self.aim_atPoint(self.aimTargetPos, self.upTargetPos.normalized(), 'matrix')
 
         if self.debug:
             if not self._debugLoc:
@@ -90,7 +91,7 @@ class Spring(PostBake.PostBake):
 
             if not self._wantedUpLoc:
                 self._wantedUpLoc = cgmMeta.asMeta(LOC.create(name='wanted_up_loc'))
-            self._wantedUpLoc.p_position = self.obj.p_position + self.upTargetPos
+            self._wantedUpLoc.p_position = _pos + self.upTargetPos
             mc.setKeyframe(self._wantedUpLoc.mNode, at='translate')
 
             if not self._wantedPosLoc:
@@ -102,10 +103,10 @@ class Spring(PostBake.PostBake):
         if not self.bakeTempLocator():
             self.cancelBake()
         
-        self.dir = self._bakedLoc.getTransformDirection(self.aimFwd.p_vector) * self.objectScale
-        self.aimTargetPos = self.obj.p_position + self.dir
+        self.dir = self.get_bakedDirection(self.aimFwd.p_vector) * self.objectScale
+        self.aimTargetPos = self.get_position() + self.dir
         
-        self.upTargetPos = self._bakedLoc.getTransformDirection(self.aimUp.p_vector) * self.objectScale
+        self.upTargetPos = self.get_bakedDirection(self.aimUp.p_vector) * self.objectScale
         
         self.positionForce = MATH.Vector3.zero()
         self.angularForce = MATH.Vector3.zero()
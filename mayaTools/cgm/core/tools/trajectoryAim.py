@@ -31,16 +31,16 @@ class TrajectoryAim(PostBake.PostBake):
         self.lastUp = MATH.Vector3.up()
 
     def update(self, deltaTime=.04):
-        self.lastUp = MATH.Vector3.Lerp( self.lastUp, self._bakedLoc.getTransformDirection(self.aimUp.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
+        self.lastUp = MATH.Vector3.Lerp( self.lastUp, self.get_bakedDirection(self.aimUp.p_vector), min(deltaTime * self.damp, 1.0) ).normalized()
         self.lastFwd = MATH.Vector3.Lerp( self.lastFwd, self.velocity.normalized(), min(deltaTime * self.damp, 1.0) ).normalized()
         
-        SNAP.aim_atPoint(obj=self.obj.mNode, mode='vector', position=self.obj.p_position + self.lastFwd, aimAxis=self.aimFwd.p_string, upAxis=self.aimUp.p_string, vectorUp=self.lastUp )
+        self.aim_atPoint(self.get_position() + self.lastFwd, self.lastUp, 'vector')
 
     def preBake(self):
         self.bakeTempLocator()
 
-        self.lastFwd = self.obj.getTransformDirection(self.aimFwd.p_vector)
-        self.lastUp = self.obj.getTransformDirection(self.aimUp.p_vector)
+        self.lastFwd = self.get_objDirection(self.aimFwd.p_vector)
+        self.lastUp = self.get_objDirection(self.aimUp.p_vector)
 
     def finishBake(self):
         if self._bakedLoc: